@@ -272,20 +272,16 @@ def find_lecturer_for_course(course_identifier, group_name):
         if not input_data:
             return "Unknown"
         
-        for student_group in input_data.student_groups:
-            if student_group.name == group_name:
-                for i, course_id_from_group in enumerate(student_group.courseIDs):
-                    course = input_data.getCourse(course_id_from_group)
-                    if course and (
-                        str(course_id_from_group).strip().lower() == str(course_identifier).strip().lower() or
-                        str(getattr(course, 'code', '')).strip().lower() == str(course_identifier).strip().lower() or
-                        str(getattr(course, 'name', '')).strip().lower() == str(course_identifier).strip().lower()
-                    ):
-                        faculty_id = student_group.teacherIDS[i]
-                        faculty = input_data.getFaculty(faculty_id)
-                        if faculty:
-                            return faculty.name if faculty.name else faculty.faculty_id
-                        break
+        student_group = input_data.getStudentGroupByName(group_name)
+        if student_group:
+            # Several courses can share a name; use the one this group takes
+            for course in input_data.findCourses(course_identifier):
+                faculty_id = input_data.getCourseLecturer(student_group.id, course.code)
+                if faculty_id is not None:
+                    faculty = input_data.getFaculty(faculty_id)
+                    if faculty:
+                        return faculty.name if faculty.name else faculty.faculty_id
+                    break
         return "Unknown"
     except Exception as e:
         print(f"Error finding lecturer for course {course_identifier}: {e}")
@@ -397,7 +393,7 @@ def recompute_constraint_violations_simplified(timetables_data, rooms_data=None)
                     try:
                         if room and room in room_lookup and input_data is not None:
                             cap = room_lookup[room].get('capacity', 999999)
-                            grp = next((g for g in input_data.student_groups if getattr(g, 'name', '') == group_name), None)
+                            grp = input_data.getStudentGroupByName(group_name)
                             if grp and getattr(grp, 'no_students', 0) > cap:
                                 violations['Room Capacity/Type Conflicts'].append({
                                     'type': 'Room Capacity Exceeded',
@@ -10,55 +10,37 @@ Fixed issues:
 6. Proper initialization flow
 """
 
+import time
+# Started before every other import so the startup report includes their cost
+_startup_started = time.perf_counter()
 import os
+import gzip
+import json
 import uuid
+import hashlib
 import tempfile
 import threading
-import numpy as np
-import random
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-from Dash_UI import create_app  # Use the new lightweight Dash UI factory
 
 # Your project imports (must exist in repo)
 from transformer_api import transform_excel_to_json, validate_excel_structure
 from input_data_api import initialize_input_data_from_json
-from differential_evolution_api import DifferentialEvolution
-from export_service import create_export_service, TimetableExportService
-
-# Prefer the OG DifferentialEvolution implementation if available to match OG behavior
-DifferentialEvolutionClass = DifferentialEvolution
-try:
-    import importlib.util
-    base_dir = os.path.dirname(__file__)
-    # Only consider safe algorithm modules that don't launch Dash or execute top-level runs
-    og_candidates = [
-        os.path.join(base_dir, 'differential_evolution.py'),
-        os.path.join(base_dir, 'differential-evolution.py'),
-    ]
-    for path in og_candidates:
-        if os.path.exists(path):
-            spec = importlib.util.spec_from_file_location('de_og_module', path)
-            if spec and spec.loader:
-                de_og_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(de_og_module)
-                if hasattr(de_og_module, 'DifferentialEvolution'):
-                    DifferentialEvolutionClass = getattr(de_og_module, 'DifferentialEvolution')
-                    print(f"Using DifferentialEvolution from: {os.path.basename(path)}")
-                    break
-except Exception as e:
-    print(f"Warning: Could not load alternative DifferentialEvolution. Using API version. Error: {e}")
+from export_service import create_export_service
+from timetable_processor import make_json_serializable, run_job, run_parameters, split_result
+from job_store import get_job_store, start_sweeper, QueueFull, JobActive, FINISHED_STATUSES
+from job_queue import JobQueue, estimate_event_count, job_size, DEFAULT_MAX_QUEUED, DEFAULT_MAX_WORKERS
+from timetable_snapshot import SnapshotRenderer
+from result_cache import ResultCache
 
 # --- Config & app setup ---
 FRONTEND_HTML_PATH = Path(__file__).parent / "timetable_generator.html"
 
 app = Flask(__name__)
-# Create the Dash app instance from the new UI module
-# This Dash instance is later mounted under /interactive/
-dash_app = create_app()
 # Configure CORS explicitly for local dev and typical headers
 CORS(
     app,
@@ -71,13 +53,15 @@ CORS(
     ]}},
     supports_credentials=False,
     methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Origin", "Accept"],
-    expose_headers=["Content-Type", "Content-Disposition"]
+    allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Origin", "Accept", "If-None-Match"],
+    expose_headers=["Content-Type", "Content-Disposition", "ETag"]
 )
 
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024
 app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp()
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'change-this-in-prod')
+# The Dash UI under /interactive is built on its first request; ENABLE_DASH_UI=false leaves it out entirely
+app.config['ENABLE_DASH_UI'] = os.environ.get('ENABLE_DASH_UI', 'True').lower() == 'true'
 
 # Allow embedding Dash UI in iframe from the React dev server
 @app.after_request
@@ -95,662 +79,35 @@ def add_frame_headers(resp):
         pass
     return resp
 
-# Also add the same headers to the Dash server so responses under /interactive come with proper CSP
-try:
-    @dash_app.server.after_request
-    def add_dash_frame_headers(resp):
-        try:
-            resp.headers['Content-Security-Policy'] = "frame-ancestors 'self' http://localhost:3000 http://127.0.0.1:3000" \
-                + (" " + os.environ.get('EXTRA_FRAME_ANCESTORS', '') if os.environ.get('EXTRA_FRAME_ANCESTORS') else '')
-            try:
-                del resp.headers['X-Frame-Options']
-            except Exception:
-                pass
-        except Exception:
-            pass
-        return resp
-except Exception as e:
-    print(f"Warning: Could not attach after_request to Dash server: {e}")
-
 ALLOWED_EXTENSIONS = {'xlsx', 'xls'}
 
-# Thread-safe job storage with locks
-processing_jobs = {}       # upload_id -> { status, progress, result, error, ... }
-generated_timetables = {}  # upload_id -> stored input/metadata
-job_locks = {}             # upload_id -> threading.Lock()
+# Uploads and jobs live in a SQLite store (JOB_DB_PATH) shared by every API and worker process.
+# Finished jobs and uploads are purged after JOB_TTL_HOURS (0 keeps them forever).
+job_store = get_job_store()
+job_ttl_hours = float(os.environ.get('JOB_TTL_HOURS', 24))
+start_sweeper(job_store, job_ttl_hours * 3600)
 
 # Exporter instance
 export_service = create_export_service()
 
+# Generation runs go through a bounded worker pool instead of one thread per request.
+# MAX_CONCURRENT_JOBS defaults to 1: DE runs are CPU-bound and threads here share one GIL, so
+# concurrent jobs come from `python worker.py` processes (one per core). SCHEDULE_SMALLEST_FIRST
+# starts small jobs first. EMBEDDED_WORKERS=false keeps this process API-only.
+embedded_workers = os.environ.get('EMBEDDED_WORKERS', 'True').lower() == 'true'
+job_queue = JobQueue(
+    job_store, run_job,
+    max_workers=int(os.environ.get('MAX_CONCURRENT_JOBS', DEFAULT_MAX_WORKERS)) if embedded_workers else 0,
+    max_queued=int(os.environ.get('MAX_QUEUED_JOBS', DEFAULT_MAX_QUEUED)),
+    smallest_first=os.environ.get('SCHEDULE_SMALLEST_FIRST', 'False').lower() == 'true',
+).start()
+
 
 # --- Helpers ---
 def allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def get_job_lock(upload_id):
-    """Get or create a lock for a specific job"""
-    if upload_id not in job_locks:
-        job_locks[upload_id] = threading.Lock()
-    return job_locks[upload_id]
-
-
-def make_json_serializable(obj):
-    """
-    Convert custom objects to JSON-serializable format
-    Recursively handles complex nested structures
-    """
-    if obj is None:
-        return None
-    elif isinstance(obj, (str, int, float, bool)):
-        return obj
-    elif isinstance(obj, (list, tuple)):
-        return [make_json_serializable(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {str(k): make_json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif hasattr(obj, '__dict__'):
-        # Convert custom objects to dictionaries using their attributes
-        result = {}
-        try:
-            # Get all non-private, non-method attributes
-            for attr_name in dir(obj):
-                if (not attr_name.startswith('_') and 
-                    not callable(getattr(obj, attr_name, None))):
-                    try:
-                        attr_value = getattr(obj, attr_name)
-                        # Skip methods, properties, and complex objects that might cause recursion
-                        if not callable(attr_value):
-                            result[attr_name] = make_json_serializable(attr_value)
-                    except (AttributeError, TypeError, ValueError):
-                        # Skip attributes that can't be accessed or serialized
-                        continue
-                        
-            # Also try common attributes that might not show up in dir()
-            for common_attr in ['id', 'name', 'code', 'title', 'value']:
-                if (hasattr(obj, common_attr) and 
-                    common_attr not in result):
-                    try:
-                        attr_val = getattr(obj, common_attr)
-                        if attr_val is not None and not callable(attr_val):
-                            result[common_attr] = str(attr_val)
-                    except (AttributeError, TypeError):
-                        continue
-                        
-            return result if result else str(obj)
-        except Exception:
-            # If all else fails, convert to string
-            return str(obj)
-    else:
-        # Fallback: convert to string
-        try:
-            return str(obj)
-        except Exception:
-            return "unserializable_object"
-
-
-def update_job_status(upload_id, status=None, progress=None, error=None, result=None):
-    """Thread-safe update to the processing_jobs dict with JSON serialization."""
-    lock = get_job_lock(upload_id)
-    with lock:
-        if upload_id not in processing_jobs:
-            return
-        job = processing_jobs[upload_id]
-        if status is not None:
-            job['status'] = str(status)
-        if progress is not None:
-            job['progress'] = int(progress)
-        if error is not None:
-            job['error'] = str(error)
-        if result is not None:
-            # Ensure result is JSON serializable before storing
-            job['result'] = make_json_serializable(result)
-        
-        # simple stdout log for debugging
-        print(f"[{upload_id}] status={job.get('status')} progress={job.get('progress')} error={job.get('error')}")
-
-
-# --- Timetable Processor ---
-class TimetableProcessor:
-    def __init__(self, upload_id, input_data, config):
-        self.upload_id = upload_id
-        self.input_data = input_data
-        self.config = config or {}
-        self.start_time = datetime.now()
-
-    def update_job_progress(self, job_id, pct=None, message=None):
-        """Update job progress with thread safety"""
-        if pct is None:
-            lock = get_job_lock(job_id)
-            with lock:
-                pct = processing_jobs.get(job_id, {}).get('progress', 0)
-        update_job_status(job_id, progress=int(pct), status="processing")
-
-    def update_job_result(self, job_id, result):
-        update_job_status(job_id, status="completed", progress=100, result=result)
-
-    def update_job_error(self, job_id, error_msg):
-        update_job_status(job_id, status="error", error=error_msg)
-
-    def make_timetables_json_safe(self, all_timetables):
-        """Convert timetables into a JSON-friendly structure to avoid deep recursion."""
-        safe_list = []
-        for item in all_timetables or []:
-            try:
-                sg = item.get('student_group')
-                # Extract basic identifiers only
-                sg_name = None
-                sg_id = None
-                if sg is not None:
-                    try:
-                        if hasattr(sg, 'name') and getattr(sg, 'name') is not None:
-                            sg_name = str(getattr(sg, 'name'))
-                    except Exception:
-                        pass
-                    for attr in ['id', 'student_group_id', 'group_id']:
-                        try:
-                            if hasattr(sg, attr) and getattr(sg, attr) is not None:
-                                sg_id = str(getattr(sg, attr))
-                                break
-                        except Exception:
-                            continue
-                if not sg_name:
-                    # Fallback to string repr (kept minimal)
-                    try:
-                        sg_name = str(sg) if sg is not None else 'Unknown Group'
-                    except Exception:
-                        sg_name = 'Unknown Group'
-
-                # Timetable grid rows
-                rows = item.get('timetable', [])
-                rows = make_json_serializable(rows)
-
-                safe_list.append({
-                    'student_group': {
-                        'name': sg_name,
-                        'id': sg_id
-                    },
-                    'timetable': rows
-                })
-            except Exception:
-                # Skip any problematic entry instead of blocking the whole job
-                continue
-        return safe_list
-
-    def build_empty_timetables(self, de):
-        """Build empty grids per student group so UI can render even if optimization failed."""
-        try:
-            days = int(getattr(de.input_data, 'days', 5) or 5)
-            hours = int(getattr(de.input_data, 'hours', 6) or 6)
-            day_start_time = 9
-            data = []
-            for sg in getattr(de.input_data, 'student_groups', []) or []:
-                rows = []
-                for h in range(hours):
-                    time_label = f"{day_start_time + h}:00"
-                    row = [time_label] + ["FREE" for _ in range(days)]
-                    rows.append(row)
-                data.append({"student_group": sg, "timetable": rows})
-            return data
-        except Exception as e:
-            print(f"Warning: build_empty_timetables failed: {e}")
-            return []
-
-    def run_optimization(self, job_id, input_data, pop_size, max_gen, F, CR):
-        """
-        Runs the differential evolution optimization in the background.
-        This version is modified to be closer to the Sept 13 `differential_evolution.py` script's flow.
-        """
-        self.start_time = datetime.now()
-        de = None
-        try:
-            # Ensure randomized runs
-            try:
-                import secrets
-                seed = secrets.randbits(64)
-                random.seed(seed)
-                np.random.seed(None) # Use system entropy for numpy
-                print(f"[{job_id}] RNG seeded for this run (seed bits set) with pop={pop_size}, gens={max_gen}")
-            except Exception as seed_err:
-                print(f"[{job_id}] Warning: RNG seeding failed: {seed_err}")
-
-            # Initialize DE with correct parameters
-            try:
-                de = DifferentialEvolutionClass(input_data, pop_size, F, CR)
-            except TypeError:
-                try:
-                    de = DifferentialEvolutionClass(input_data=input_data, pop_size=pop_size, F=F, CR=CR)
-                except TypeError:
-                    de = DifferentialEvolutionClass(input_data, pop_size)
-        except Exception as e:
-            print(f"FATAL: DifferentialEvolution initialization failed: {e}")
-            self.update_job_error(job_id, f"DE Initialization failed: {e}")
-            return
-
-        best_solution = None
-        fitness_history = []
-        final_generation = 0
-        best_fitness = float("inf")
-
-        try:
-            self.update_job_progress(job_id, pct=5)
-
-            # This block mirrors the Sept 13 differential_evolution.py execution flow
-            # The run method returns: best_solution, fitness_history, final_generation, diversity_history
-            if hasattr(de, 'run'):
-                try:
-                    print(f"[{job_id}] Starting DE algorithm run for {max_gen} generations...")
-                    run_result = de.run(max_gen)
-                    
-                    # Sept 13 version returns exactly 4 values
-                    if isinstance(run_result, tuple) and len(run_result) >= 2:
-                        best_solution = run_result[0]
-                        fitness_history = run_result[1]
-                        
-                        # Optional: capture generation and diversity if available
-                        if len(run_result) > 2:
-                            final_generation = run_result[2]
-                        else:
-                            final_generation = len(fitness_history) if fitness_history else max_gen
-                            
-                        if len(run_result) > 3:
-                            diversity_history = run_result[3]
-                    else:
-                        # Fallback if return format is unexpected
-                        best_solution = run_result if not isinstance(run_result, tuple) else run_result[0]
-                        fitness_history = []
-                        final_generation = max_gen
-                    
-                    # Get the best fitness score
-                    if fitness_history and len(fitness_history) > 0:
-                        best_fitness = float(fitness_history[-1])
-                        print(f"[{job_id}] DE completed - Final fitness: {best_fitness:.4f}")
-                    else:
-                        best_fitness = float("inf")
-                        print(f"[{job_id}] DE completed - No fitness history available")
-
-                    # CRITICAL: The Sept 13 version re-evaluates the best solution with verbose=True
-                    # to get final violations printed to console
-                    if best_solution is not None and hasattr(de, 'evaluate_fitness'):
-                        print(f"[{job_id}] Re-evaluating final best solution for constraint violations...")
-                        try:
-                            # Try with verbose flag if supported, otherwise call without it
-                            de.evaluate_fitness(best_solution, verbose=True)
-                        except TypeError:
-                            # API version doesn't support verbose parameter
-                            de.evaluate_fitness(best_solution)
-                    
-                    self.update_job_progress(job_id, pct=85)
-
-                except Exception as e:
-                    print(f"[{job_id}] ERROR: de.run() failed. Error: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    best_solution = None
-                    fitness_history = []
-                    final_generation = 0
-            else:
-                # Fallback if `run` method is not present
-                print(f"[{job_id}] ERROR: DE instance lacks a `run` method.")
-                self.update_job_error(job_id, "DE instance is missing the 'run' method.")
-                return
-
-        except Exception as main_error:
-            print(f"[{job_id}] FATAL ERROR in run_optimization: {main_error}")
-            import traceback
-            traceback.print_exc()
-            self.update_job_error(job_id, f"Optimization failed: {str(main_error)}")
-            return
-        finally:
-            # Progress update after optimization finishes
-            self.update_job_progress(job_id, pct=90)
-
-
-        # Post-processing
-        self.update_job_progress(job_id, pct=95)
-
-        # Final repairs if method exists
-        if best_solution is not None:
-            try:
-                if hasattr(de, 'verify_and_repair_course_allocations'):
-                    best_solution = de.verify_and_repair_course_allocations(best_solution)
-            except Exception as e:
-                print(f"Warning: Course allocation repair failed: {e}")
-
-        # Generate timetables
-        all_timetables = []
-        if best_solution is not None:
-            try:
-                # The original script uses `print_all_timetables` to get the final grid data.
-                # CRITICAL: print_all_timetables requires 4 parameters matching Sept 13 signature
-                if hasattr(de, 'print_all_timetables'):
-                    days = getattr(de.input_data, 'days', 5)
-                    hours = getattr(de.input_data, 'hours', 8)
-                    day_start_time = 9
-                    print(f"[{job_id}] Generating timetables with days={days}, hours={hours}, start_time={day_start_time}")
-                    all_timetables = de.print_all_timetables(best_solution, days, hours, day_start_time)
-                    print(f"[{job_id}] Generated {len(all_timetables) if all_timetables else 0} timetables")
-                else:
-                    print(f"[{job_id}] Warning: DE instance lacks `print_all_timetables` method.")
-            except Exception as e:
-                print(f"[{job_id}] ERROR: Timetable generation failed: {e}")
-                import traceback
-                traceback.print_exc()
-                all_timetables = []
-
-        # Fallback: if empty, build blank timetables so UI still works
-        if not all_timetables and de is not None:
-            print(f"[{job_id}] No timetables produced; building empty grids as fallback")
-            all_timetables = self.build_empty_timetables(de)
-
-        # Build UI card summaries
-        timetable_cards = self.format_timetable_results_from_raw(all_timetables)
-
-        # Get constraint violations - BOTH summary and detailed for UI
-        violations = {}
-        detailed_violations = {}
-        if best_solution is not None and hasattr(de, 'constraints'):
-            try:
-                # Get summary violations (numerical counts)
-                if hasattr(de.constraints, 'get_constraint_violations'):
-                    violations = de.constraints.get_constraint_violations(best_solution, debug=True)
-                    print(f"[{job_id}] Got constraint violations summary: {violations.get('total', 0)} total violations")
-                
-                # Get detailed violations (with locations and descriptions) for UI
-                if hasattr(de.constraints, 'get_detailed_constraint_violations'):
-                    detailed_violations = de.constraints.get_detailed_constraint_violations(best_solution)
-                    print(f"[{job_id}] Got detailed constraint violations with {len(detailed_violations)} constraint types")
-                    # Print summary of detailed violations
-                    for constraint_type, violation_list in detailed_violations.items():
-                        if violation_list:
-                            print(f"  - {constraint_type}: {len(violation_list)} violations")
-            except Exception as e:
-                print(f"Warning: Constraint violation check failed: {e}")
-                import traceback
-                traceback.print_exc()
-
-        # Build parsed timetables for frontend
-        parsed = []
-        if all_timetables:
-            exporter = TimetableExportService()
-            for item in all_timetables:
-                try:
-                    student_group = item.get("student_group")
-                    if hasattr(student_group, "name"):
-                        group_name = str(student_group.name)
-                    else:
-                        group_name = str(student_group)
-                    rows = exporter._grid_to_rows(item.get("timetable", []))
-                    serializable_rows = make_json_serializable(rows)
-                    parsed.append({"group": group_name, "rows": serializable_rows})
-                except Exception as e:
-                    print(f"Warning: Parsing timetable failed: {e}")
-
-        # Convert raw timetables into a safe, lightweight structure
-        self.update_job_progress(job_id, pct=99)
-        safe_all_timetables = self.make_timetables_json_safe(all_timetables)
-
-        # Make all result data JSON serializable
-        result = {
-            "timetables": timetable_cards,
-            "timetables_raw": safe_all_timetables,
-            "parsed_timetables": parsed,
-            "fitness_score": best_fitness if best_fitness != float("inf") else None,
-            "generations_completed": int(final_generation) + 1 if isinstance(final_generation, (int, np.integer)) else 1,
-            "fitness_history": fitness_history[-20:] if isinstance(fitness_history, list) else [],
-            "summary": make_json_serializable(self.generate_summary_safe(de, best_solution, violations)) if best_solution is not None else {},
-            "constraint_violations": make_json_serializable(violations),
-            "performance_metrics": {
-                "population_size": pop_size,
-                "total_events": len(getattr(de, "events_list", [])),
-                "scheduled_events": self.count_scheduled_events(best_solution),
-                "optimization_time_seconds": (datetime.now() - self.start_time).total_seconds(),
-            },
-        }
-
-        # Persist violations separately for Dash UI and print a concise summary to console
-        try:
-            dash_data_dir = os.path.join(os.path.dirname(__file__), 'data')
-            os.makedirs(dash_data_dir, exist_ok=True)
-            
-            # Save DETAILED violations for Dash UI (with locations and descriptions)
-            violations_path = os.path.join(dash_data_dir, 'constraint_violations.json')
-            with open(violations_path, 'w', encoding='utf-8') as vf:
-                import json as _json
-                # Save the detailed violations, not the summary
-                detailed_to_save = make_json_serializable(detailed_violations) if detailed_violations else {}
-                _json.dump(detailed_to_save, vf, indent=2, ensure_ascii=False)
-                print(f"[{job_id}] Saved {len(detailed_to_save)} detailed constraint types to {violations_path}")
-            
-            # Print a compact summary
-            try:
-                if isinstance(detailed_violations, dict):
-                    print("[DETAILED VIOLATIONS] Summary:")
-                    for k, val in detailed_violations.items():
-                        try:
-                            count = len(val) if isinstance(val, list) else (int(val) if isinstance(val, (int, float)) else 1)
-                        except Exception:
-                            count = 0
-                        if count > 0:
-                            print(f"  - {k}: {count}")
-                else:
-                    print("[DETAILED VIOLATIONS] No detailed violations dict available")
-            except Exception as _log_err:
-                print(f"[DETAILED VIOLATIONS] Warning: could not print summary: {_log_err}")
-        except Exception as dash_save_error:
-            print(f"[{job_id}] WARNING: Could not save constraint violations for Dash UI. Error: {dash_save_error}")
-            import traceback
-            traceback.print_exc()
-
-        try:
-            dash_data_dir = os.path.join(os.path.dirname(__file__), 'data')
-            os.makedirs(dash_data_dir, exist_ok=True)
-            dash_save_path = os.path.join(dash_data_dir, 'timetable_data.json')
-            fresh_save_path = os.path.join(dash_data_dir, 'fresh_timetable_data.json')
-
-            if safe_all_timetables:
-                import json
-                data_to_save = {
-                    'timetables': safe_all_timetables,
-                    'manual_cells': []
-                }
-                # Write session file used by Dash for persistence + manual edits
-                with open(dash_save_path, 'w', encoding='utf-8') as f:
-                    json.dump(data_to_save, f, indent=2)
-                # Write fresh results file preferred by Dash on startup
-                try:
-                    with open(fresh_save_path, 'w', encoding='utf-8') as f2:
-                        json.dump(safe_all_timetables, f2, indent=2)
-                    print(f"[{job_id}] Successfully saved data for Dash UI at: {dash_save_path} and fresh: {fresh_save_path}")
-                except Exception as fresh_err:
-                    print(f"[{job_id}] WARNING: Could not save fresh timetable JSON. Error: {fresh_err}")
-
-        except Exception as dash_save_error:
-            print(f"[{job_id}] WARNING: Could not save data for Dash UI. Error: {dash_save_error}")
-
-        # Save and mark job completed
-        self.update_job_result(job_id, result)
-        return result
-
-    def count_scheduled_events(self, solution):
-        """Count scheduled events in solution"""
-        if solution is None:
-            return 0
-        
-        count = 0
-        try:
-            if isinstance(solution, np.ndarray):
-                # Count non-None values
-                count = np.count_nonzero(solution != None)
-            else:
-                # Handle other solution formats
-                for room_schedule in solution:
-                    if not room_schedule:
-                        continue
-                    for event in room_schedule:
-                        if event is not None:
-                            count += 1
-        except Exception as e:
-            print(f"Warning: Could not count scheduled events: {e}")
-        
-        return count
-
-    def format_timetable_results_from_raw(self, all_timetables):
-        """Create compact UI cards from raw timetables - JSON serializable"""
-        timetables = []
-        if not all_timetables:
-            return timetables
-            
-        for timetable_data in all_timetables:
-            try:
-                student_group = timetable_data.get('student_group', {})
-                timetable_rows = timetable_data.get('timetable', [])
-
-                courses = set()
-                total_hours = 0
-                
-                for row in timetable_rows:
-                    if not row or len(row) < 2:
-                        continue
-                    # Skip time label (first column)
-                    for i, cell in enumerate(row[1:], 1):
-                        if cell and 'Course:' in str(cell) and 'BREAK' not in str(cell).upper():
-                            try:
-                                course_part = str(cell).split('Course:')[1].split(',')[0].strip()
-                                if course_part and course_part != "Unknown":
-                                    courses.add(course_part)
-                                    total_hours += 1
-                            except Exception:
-                                continue
-
-                # Safely extract group information and convert to JSON-safe types
-                title = "Unknown Group"
-                student_group_id = None
-                student_count = 0
-                
-                if hasattr(student_group, "name"):
-                    title = str(student_group.name)
-                elif hasattr(student_group, "id"):
-                    title = f"Group {student_group.id}"
-                    
-                if hasattr(student_group, 'id'):
-                    student_group_id = str(student_group.id)  # Convert to string
-                    
-                if hasattr(student_group, 'no_students'):
-                    student_count = int(student_group.no_students) if student_group.no_students else 0
-
-                timetables.append({
-                    'title': title,
-                    'department': str(self.extract_department(student_group)),
-                    'level': str(self.extract_level(student_group)),
-                    'student_group_id': student_group_id,
-                    'courses': [str(c) for c in list(courses)[:10]],  # Convert to strings
-                    'total_courses': len(courses),
-                    'total_hours_scheduled': total_hours,
-                    'student_count': student_count
-                })
-            except Exception as e:
-                print(f"Warning: Error formatting timetable card: {e}")
-                continue
-                
-        return timetables
-
-    def extract_level(self, student_group):
-        """Extract level from student group"""
-        try:
-            if hasattr(student_group, 'level') and student_group.level:
-                return f"{student_group.level} Level"
-            
-            name = getattr(student_group, "name", "") or ""
-            name_lower = name.lower()
-            
-            if "year 1" in name_lower or name.startswith("1"):
-                return "100 Level"
-            elif "year 2" in name_lower or name.startswith("2"):
-                return "200 Level"
-            elif "year 3" in name_lower or name.startswith("3"):
-                return "300 Level"
-            elif "year 4" in name_lower or name.startswith("4"):
-                return "400 Level"
-        except Exception:
-            pass
-        return "Unknown Level"
-
-    def extract_department(self, student_group):
-        """Extract department from student group"""
-        try:
-            if hasattr(student_group, 'dept') and getattr(student_group, 'dept'):
-                return student_group.dept
-            
-            name = getattr(student_group, "name", "") or ""
-            parts = name.split()
-            if len(parts) > 1:
-                return ' '.join(parts[1:])
-        except Exception:
-            pass
-        return "Unknown Department"
-
-    def generate_summary_safe(self, de, best_solution, violations):
-        """Safe summary builder that won't crash if properties are missing - returns JSON serializable data"""
-        try:
-            total_events = len(getattr(de, 'events_list', []))
-        except Exception:
-            total_events = 0
-        
-        scheduled_events = self.count_scheduled_events(best_solution)
-        
-        # Calculate completion rates safely
-        group_completion_rates = []
-        try:
-            student_groups = getattr(de, 'student_groups', [])
-            for student_group in student_groups:
-                expected = sum(getattr(student_group, 'hours_required', []) or [])
-                actual = 0
-                
-                try:
-                    if hasattr(de, 'count_course_occurrences'):
-                        counts = de.count_course_occurrences(best_solution, student_group)
-                        actual = sum(counts.values()) if isinstance(counts, dict) else 0
-                except Exception:
-                    actual = 0
-                
-                if expected > 0:
-                    group_completion_rates.append((actual / expected) * 100)
-        except Exception:
-            group_completion_rates = []
-
-        avg_completion_rate = (sum(group_completion_rates) / len(group_completion_rates) 
-                              if group_completion_rates else 0)
-
-        # Safe fitness evaluation
-        fitness_score = None
-        try:
-            if best_solution is not None and hasattr(de, 'evaluate_fitness'):
-                fitness_score = float(de.evaluate_fitness(best_solution))  # Ensure it's a float
-        except Exception:
-            fitness_score = None
-
-        # Ensure all values are JSON serializable
-        return {
-            'total_student_groups': int(len(getattr(de, 'student_groups', []))),
-            'total_courses': int(len(getattr(de, 'courses', []))),
-            'total_rooms': int(len(getattr(de, 'rooms', []))),
-            'total_events': int(total_events),
-            'scheduled_events': int(scheduled_events),
-            'completion_rate': float(avg_completion_rate),
-            'scheduling_efficiency': float((scheduled_events / total_events * 100) if total_events > 0 else 0),
-            'hard_constraints_satisfied': bool(violations.get('total', float('inf')) < 100 if isinstance(violations, dict) else False),
-            'fitness_score': fitness_score,
-            'constraint_satisfaction_score': float(max(0, 100 - violations.get('total', 100)) if isinstance(violations, dict) else 0),
-            'groups_fully_scheduled': int(len([r for r in group_completion_rates if r >= 100]))
-        }
-
-
 # --- API Endpoints ---
 
 # JSON 500 handler for unexpected errors
@@ -784,11 +141,13 @@ def upload_excel():
         except Exception:
             return jsonify({'error': 'Legacy .xls files may not be supported. Please upload as .xlsx.'}), 400
 
+    file_path = None
     try:
         upload_id = str(uuid.uuid4())
         filename = secure_filename(file.filename)
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{upload_id}_{filename}")
         file.save(file_path)
+        file_size = os.path.getsize(file_path)
         print(f"Uploaded file saved to: {file_path}")
 
         # Validate & transform
@@ -806,14 +165,14 @@ def upload_excel():
         except Exception as exc:
             return jsonify({'error': f'Failed to initialize input data: {str(exc)}'}), 400
 
-        # Store input_data and metadata for later processing
-        generated_timetables[upload_id] = {
-            'input_data': input_data,
-            'file_path': file_path,
-            'filename': filename,
-            'upload_time': datetime.now().isoformat(),
-            'json_data': json_data
-        }
+        # Store the transformer JSON and metadata; the worker that runs the job rebuilds input_data from it.
+        # The Excel file itself is not needed again and is removed below.
+        job_store.save_upload(
+            upload_id, json_data,
+            filename=filename,
+            upload_time=datetime.now().isoformat(),
+            event_count=estimate_event_count(input_data),
+        )
 
         # Generate preview safely
         try:
@@ -834,7 +193,7 @@ def upload_excel():
             'success': True,
             'upload_id': upload_id,
             'filename': filename,
-            'file_size': os.path.getsize(file_path),
+            'file_size': file_size,
             'preview': preview_data
         }), 200
 
@@ -843,11 +202,26 @@ def upload_excel():
         import traceback
         print(f"Full traceback: {traceback.format_exc()}")
         return jsonify({'error': f'Failed to process Excel file: {str(exc)}'}), 500
+    finally:
+        if file_path and os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                print(f"Warning: Could not remove uploaded file {file_path}: {e}")
+
+
+def estimated_time_minutes(config, max_gen):
+    """Rough run time: 3 s per generation, capped by the job's time budget."""
+    estimate = max_gen * 0.05
+    budget = config.get('time_budget_seconds')
+    if budget:
+        estimate = min(estimate, float(budget) / 60)
+    return estimate
 
 
 @app.route('/generate-timetable', methods=['POST'])
 def generate_timetable():
-    """Kick off timetable generation in background thread."""
+    """Queue timetable generation on the worker pool."""
     data = request.get_json()
     if not data:
         return jsonify({'error': 'No JSON data provided'}), 400
@@ -857,32 +231,10 @@ def generate_timetable():
 
     if not upload_id:
         return jsonify({'error': 'upload_id is required'}), 400
-    if upload_id not in generated_timetables:
+    if not job_store.has_upload(upload_id):
         return jsonify({'error': 'Invalid upload ID. Please upload an Excel file first.'}), 400
-    
-    # Thread-safe check for existing processing job
-    lock = get_job_lock(upload_id)
-    with lock:
-        if upload_id in processing_jobs and processing_jobs[upload_id]['status'] == 'processing':
-            return jsonify({'error': 'Timetable generation already in progress for this upload'}), 409
 
     try:
-        stored = generated_timetables[upload_id]
-        input_data = stored['input_data']
-
-        # Initialize job record with thread safety and ensure all values are serializable
-        job_data = {
-            'status': 'processing',
-            'progress': 0,
-            'start_time': datetime.now().isoformat(),
-            'config': make_json_serializable(config),  # Ensure config is serializable
-            'error': None,
-            'result': None
-        }
-        
-        with lock:
-            processing_jobs[upload_id] = job_data
-
         # Remove stale fresh timetable so UI won't show previous results while new run is in progress
         try:
             dash_data_dir = os.path.join(os.path.dirname(__file__), 'data')
@@ -893,29 +245,35 @@ def generate_timetable():
         except Exception as rm_err:
             print(f"[GEN] Warning: Could not remove stale fresh file: {rm_err}")
 
-        processor = TimetableProcessor(upload_id, input_data, config)
-
         # Extract config parameters with defaults
-        pop_size = int(config.get('population_size', 50))
-        max_gen = int(config.get('max_generations', 40))
-        F = float(config.get('F', config.get('mutation_factor', 0.4)))
-        CR = float(config.get('CR', config.get('crossover_rate', 0.9)))
-
-        # Start optimization in separate thread
-        thread = threading.Thread(
-            target=processor.run_optimization,
-            args=(upload_id, input_data, pop_size, max_gen, F, CR),
-            daemon=True
-        )
-        thread.start()
-        print(f"[GEN] Started generation thread for {upload_id} (pop={pop_size}, gens={max_gen}, F={F}, CR={CR})")
+        pop_size, max_gen, F, CR = run_parameters(config)
+
+        # Queue the optimization; a worker moves it to 'processing' when it claims it
+        try:
+            position = job_queue.submit(
+                upload_id,
+                make_json_serializable(config),  # Ensure config is serializable
+                start_time=datetime.now().isoformat(),
+                size=job_size(job_store.upload_event_count(upload_id), pop_size, max_gen),
+            )
+        except QueueFull as full:
+            response = jsonify({'error': 'Too many timetable jobs queued. Please retry later.',
+                                'retry_after_seconds': full.retry_after})
+            response.headers['Retry-After'] = str(full.retry_after)
+            return response, 429
+        except JobActive:
+            # An earlier submit for this upload is still queued or running
+            return jsonify({'error': 'Timetable generation already in progress for this upload'}), 409
+        print(f"[GEN] Queued generation for {upload_id} at position {position} (pop={pop_size}, gens={max_gen}, F={F}, CR={CR})")
 
         return jsonify({
             'success': True,
             'upload_id': upload_id,
-            'message': 'Timetable generation started',
+            'message': 'Timetable generation queued',
+            'status': 'queued',
+            'queue_position': position,
             'config': config,
-            'estimated_time_minutes': max_gen * 0.05
+            'estimated_time_minutes': estimated_time_minutes(config, max_gen)
         }), 202
 
     except Exception as exc:
@@ -923,56 +281,126 @@ def generate_timetable():
         import traceback
         print(f"Full traceback: {traceback.format_exc()}")
         
-        # Update job status safely
-        with lock:
-            if upload_id in processing_jobs:
-                processing_jobs[upload_id]['status'] = 'error'
-                processing_jobs[upload_id]['error'] = str(exc)
-        
         return jsonify({'error': f'Failed to start timetable generation: {str(exc)}'}), 500
 
 
+# Statuses whose status response carries the job's result
+RESULT_STATUSES = {
+    'completed': 'Timetable generation completed successfully',
+    'completed_partial': 'Time budget reached; returning the best timetable found',
+    'cancelled': 'Timetable generation cancelled',
+}
+
+# Finished-job responses (status with summary, group pages) are built once and kept as bytes
+# (plus a gzip copy) under their ETag. STATUS_CACHE_MB bounds the cache; STATUS_GZIP=false
+# turns compression off.
+status_bodies = ResultCache(float(os.environ.get('STATUS_CACHE_MB', 32)) * 1024 * 1024)
+status_gzip = os.environ.get('STATUS_GZIP', 'True').lower() == 'true'
+
+
+def has_result(job):
+    """Whether a job has a stored result; a job cancelled while queued has none."""
+    return bool(job.get('result_path')) or job_store.result_text(job['upload_id']) is not None
+
+
+def result_key(job):
+    """Identifies a job's current result: its result file, which is replaced on every new result."""
+    return job.get('result_path') or f"inline:{job.get('finished_at')}"
+
+
+def cached_json_response(header, key, body_text):
+    """
+    JSON response for a finished job: `header` plus the JSON text that body_text() returns,
+    spliced in as stored so it is never parsed or re-encoded here. The body only changes with
+    the header and `key`, which the strong ETag covers; If-None-Match polls get 304.
+    """
+    header_text = json.dumps(header, sort_keys=True)
+    etag = hashlib.blake2b(f"{header_text}\n{key}".encode('utf-8'), digest_size=16).hexdigest()
+    gzip_etag = f"{etag}-gzip"
+    use_gzip = status_gzip and 'gzip' in request.accept_encodings
+
+    if request.if_none_match.contains(etag) or request.if_none_match.contains(gzip_etag):
+        response = Response(status=304)
+    else:
+        cached = status_bodies.get(etag)
+        if cached is None:
+            name, text = body_text()
+            body = f'{header_text[:-1]}, "{name}": {text}}}'.encode('utf-8')
+            compressed = gzip.compress(body, compresslevel=6) if status_gzip else None
+            cached = (body, compressed)
+            status_bodies.put(etag, cached, len(body) + len(compressed or b''))
+        body, compressed = cached
+        if use_gzip and compressed is not None:
+            response = Response(compressed, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(body, mimetype='application/json')
+    response.set_etag(gzip_etag if use_gzip else etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Clients may keep the body but must revalidate it on every poll
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def ensure_group_index(upload_id):
+    """Build the summary and per-group index of a job stored before they existed (from its full result)."""
+    if job_store.summary_text(upload_id) is not None:
+        return
+    job = job_store.get_job(upload_id) or {}
+    summary, entries = split_result(job.get('result') or {})
+    job_store.save_groups(upload_id, entries)
+    job_store.update_job(upload_id, summary=summary)
+
+
+def result_summary_text(upload_id):
+    ensure_group_index(upload_id)
+    return job_store.summary_text(upload_id) or '{}'
+
+
 @app.route('/get-timetable-status/<upload_id>', methods=['GET'])
 def get_timetable_status(upload_id):
-    if upload_id not in processing_jobs:
-        return jsonify({'error': 'No processing job found for this upload ID'}), 404
-
+    """
+    Job status. Queued and running jobs get a small status header; finished jobs with a
+    result get the header plus the result summary, with an ETag so unchanged polls return 304.
+    """
     try:
-        # Thread-safe read of job status
-        lock = get_job_lock(upload_id)
-        with lock:
-            job = processing_jobs[upload_id].copy()  # Create a copy to avoid race conditions
-        
-        # Make sure all job data is JSON serializable
-        serialized_job = make_json_serializable(job)
-        
+        job = job_store.get_job(upload_id, with_result=False)
+        if job is None:
+            return jsonify({'error': 'No processing job found for this upload ID'}), 404
+
+        status = str(job.get('status') or 'unknown')
         response = {
             'upload_id': str(upload_id),
-            'status': str(serialized_job.get('status', 'unknown')),
-            'progress': int(serialized_job.get('progress', 0)),
-            'start_time': str(serialized_job.get('start_time', '')),
+            'status': status,
+            'progress': int(job.get('progress') or 0),
+            'start_time': str(job.get('start_time') or ''),
         }
-
-        if serialized_job.get('status') == 'completed':
-            # Ensure result is fully serializable
-            result = serialized_job.get('result', {})
-            if result:
-                result = make_json_serializable(result)
-            
-            response.update({
-                'message': 'Timetable generation completed successfully',
-                'result': result
-            })
-        elif serialized_job.get('status') == 'error':
-            error_msg = str(serialized_job.get('error', 'Unknown error'))
+        if job.get('best_fitness') is not None:
+            response['best_fitness'] = float(job['best_fitness'])
+
+        if status in RESULT_STATUSES and has_result(job):
+            # The result summary only; group timetables come from /jobs/<upload_id>/groups
+            response['message'] = RESULT_STATUSES[status]
+            response['groups_url'] = f"/jobs/{upload_id}/groups"
+            return cached_json_response(response, result_key(job), lambda: ('result', result_summary_text(upload_id)))
+        elif status == 'cancelled':
+            # Cancelled before a best-so-far result was saved
+            response['message'] = RESULT_STATUSES[status]
+        elif status == 'error':
+            error_msg = str(job.get('error') or 'Unknown error')
             response.update({
                 'message': f'Generation failed: {error_msg}',
                 'error': error_msg
             })
+        elif status == 'queued':
+            position = job_queue.position(upload_id)
+            response.update({
+                'message': f'Queued (position {position})' if position else 'Queued',
+                'queue_position': position
+            })
         else:
-            progress = int(serialized_job.get('progress', 0))
             response.update({
-                'message': f'Processing... {progress}% complete'
+                'message': f"Processing... {response['progress']}% complete"
             })
 
         return jsonify(response), 200
@@ -992,24 +420,255 @@ def get_timetable_status(upload_id):
         }), 500
 
 
+# Group pages: default and largest page size
+GROUPS_PAGE_SIZE = 20
+MAX_GROUPS_PAGE_SIZE = 100
+
+
+def finished_job_or_error(upload_id):
+    """(job, None) for a job with a result, else (None, error response)."""
+    job = job_store.get_job(upload_id, with_result=False)
+    if job is None:
+        return None, (jsonify({'error': 'No processing job found for this upload ID'}), 404)
+    if job['status'] not in RESULT_STATUSES or not has_result(job):
+        return None, (jsonify({'error': f"Job has no result yet (status: {job['status']})",
+                               'status': job['status']}), 409)
+    ensure_group_index(upload_id)
+    return job, None
+
+
+@app.route('/jobs/<upload_id>/groups', methods=['GET'])
+def list_job_groups(upload_id):
+    """
+    One page of a finished job's group timetables, in result order: ?offset= (default 0) and
+    ?limit= (default 20, at most 100). Each entry has the group's id, name, card, raw grid and rows.
+    """
+    job, error = finished_job_or_error(upload_id)
+    if error:
+        return error
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+        limit = min(MAX_GROUPS_PAGE_SIZE, max(1, int(request.args.get('limit', GROUPS_PAGE_SIZE))))
+    except ValueError:
+        return jsonify({'error': 'offset and limit must be integers'}), 400
+
+    total = job_store.count_groups(upload_id)
+    header = {'upload_id': upload_id, 'status': job['status'], 'total': total, 'offset': offset, 'limit': limit}
+    if offset + limit < total:
+        header['next'] = f"/jobs/{upload_id}/groups?offset={offset + limit}&limit={limit}"
+    return cached_json_response(
+        header, result_key(job),
+        lambda: ('groups', '[' + ', '.join(job_store.group_texts(upload_id, offset, limit)) + ']'))
+
+
+@app.route('/jobs/<upload_id>/groups/<path:group_id>', methods=['GET'])
+def get_job_group(upload_id, group_id):
+    """A single group's timetable from a finished job, looked up by group id or name."""
+    job, error = finished_job_or_error(upload_id)
+    if error:
+        return error
+    group_text = job_store.group_text(upload_id, group_id)
+    if group_text is None:
+        return jsonify({'error': f'Unknown student group: {group_id}'}), 404
+    header = {'upload_id': upload_id, 'status': job['status']}
+    return cached_json_response(header, f"{result_key(job)}\n{group_id}", lambda: ('group', group_text))
+
+
 @app.route('/get-timetable-status', methods=['GET'])
 def list_timetable_jobs():
     try:
         summary = {}
-        for uid, job in processing_jobs.items():
+        for job in job_store.list_jobs():
+            uid = job['upload_id']
             summary[uid] = {
                 'status': str(job.get('status')),
                 'progress': int(job.get('progress', 0)),
-                'has_result': bool(job.get('result') is not None)
+                'has_result': bool(job.get('has_result'))
             }
+            if job.get('status') == 'queued':
+                summary[uid]['queue_position'] = job_queue.position(uid)
         return jsonify({
             'count': len(summary),
-            'jobs': summary
+            'jobs': summary,
+            'queue': job_queue.stats()
         }), 200
     except Exception as e:
         return jsonify({'error': f'Failed to list jobs: {str(e)}'}), 500
 
 
+@app.route('/store-stats', methods=['GET'])
+def store_stats():
+    """What the API process and the job store currently hold, for capacity monitoring."""
+    try:
+        upload_folder = app.config['UPLOAD_FOLDER']
+        temp_files = [os.path.join(upload_folder, name) for name in os.listdir(upload_folder)]
+        with snapshot_renderers_lock:
+            renderers = len(snapshot_renderers)
+        return jsonify({
+            'job_ttl_hours': job_ttl_hours,
+            'peak_rss_mb': peak_rss_mb(),
+            'store': job_store.stats(),
+            'queue': job_queue.stats(),
+            'snapshot_renderers': {'size': renderers, 'capacity': SNAPSHOT_RENDERER_CACHE_SIZE},
+            'status_bodies': status_bodies.stats(),
+            'temp_uploads': {'files': len(temp_files),
+                             'bytes': sum(os.path.getsize(path) for path in temp_files if os.path.isfile(path))},
+        }), 200
+    except Exception as e:
+        return jsonify({'error': f'Failed to collect store stats: {str(e)}'}), 500
+
+
+@app.route('/cancel-timetable/<upload_id>', methods=['POST'])
+def cancel_timetable(upload_id):
+    """
+    Cancel a job. A queued job is dropped at once; a running one stops after its current
+    generation (or repair step) and still saves the best timetable found so far.
+    """
+    outcome = job_store.request_cancel(upload_id)
+    if outcome is None:
+        return jsonify({'error': 'No processing job found for this upload ID'}), 404
+    if outcome == 'cancelling':
+        return jsonify({'upload_id': upload_id, 'status': 'processing',
+                        'message': 'Cancellation requested; the run will stop after the current generation'}), 202
+    if outcome == 'cancelled':
+        return jsonify({'upload_id': upload_id, 'status': 'cancelled', 'message': 'Timetable generation cancelled'}), 200
+    status = (job_store.get_job(upload_id, with_result=False) or {}).get('status')
+    return jsonify({'error': f'Job already finished with status: {status}', 'status': status}), 409
+
+
+# Server-Sent Events: how often the stream checks the job store, and the keep-alive interval
+PROGRESS_POLL_SECONDS = 0.5
+PROGRESS_KEEPALIVE_SECONDS = 15
+
+
+def sse_message(data, event=None, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+@app.route('/timetable-progress/<upload_id>', methods=['GET'])
+def timetable_progress(upload_id):
+    """
+    Stream a job's progress as Server-Sent Events: 'status' when the job status changes,
+    'generation' per DE generation (island runs: per migration epoch) and a final 'done'
+    with the end status. Reconnecting clients resume after the Last-Event-ID they send.
+    """
+    job = job_store.get_job(upload_id, with_result=False)
+    if job is None:
+        return jsonify({'error': 'No processing job found for this upload ID'}), 404
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.args.get('since') or 0)
+    except ValueError:
+        last_id = 0
+
+    def stream(last_id):
+        status = None
+        last_sent = time.time()
+        while True:
+            job = job_store.get_job(upload_id, with_result=False)
+            if job is None:
+                yield sse_message({'status': 'missing'}, event='done')
+                return
+            if job['status'] != status:
+                status = job['status']
+                message = {'status': status, 'progress': job['progress']}
+                if status == 'queued':
+                    message['queue_position'] = job_queue.position(upload_id)
+                yield sse_message(message, event='status')
+                last_sent = time.time()
+            for event_id, event in job_store.events_since(upload_id, last_id):
+                last_id = event_id
+                yield sse_message(event, event='generation', event_id=event_id)
+                last_sent = time.time()
+            if status in FINISHED_STATUSES:
+                yield sse_message({'status': status, 'error': job.get('error'), 'best_fitness': job.get('best_fitness')},
+                                  event='done')
+                return
+            if time.time() - last_sent >= PROGRESS_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = time.time()
+            time.sleep(PROGRESS_POLL_SECONDS)
+
+    return Response(stream(last_id), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # do not let a reverse proxy buffer the stream
+    })
+
+
+# Snapshot previews: renderers (compiled problem data) are kept for the most recently previewed uploads
+SNAPSHOT_RENDERER_CACHE_SIZE = 4
+snapshot_renderers = OrderedDict()
+snapshot_renderers_lock = threading.Lock()
+
+
+def snapshot_renderer(upload_id):
+    """SnapshotRenderer for an upload's input data, or None if the upload is unknown."""
+    with snapshot_renderers_lock:
+        renderer = snapshot_renderers.get(upload_id)
+        if renderer is not None:
+            snapshot_renderers.move_to_end(upload_id)
+            return renderer
+    upload = job_store.get_upload(upload_id)
+    if upload is None:
+        return None
+    renderer = SnapshotRenderer(initialize_input_data_from_json(upload['json_data']))
+    with snapshot_renderers_lock:
+        snapshot_renderers[upload_id] = renderer
+        while len(snapshot_renderers) > SNAPSHOT_RENDERER_CACHE_SIZE:
+            snapshot_renderers.popitem(last=False)
+    return renderer
+
+
+@app.route('/timetable-snapshot/<upload_id>', methods=['GET'])
+def timetable_snapshot(upload_id):
+    """
+    Preview of a job's best timetable so far. With ?group=<id or name> the group's rows are
+    rendered from the latest snapshot; without it the response lists the groups to ask for.
+    """
+    job = job_store.get_job(upload_id, with_result=False)
+    if job is None:
+        return jsonify({'error': 'No processing job found for this upload ID'}), 404
+    snapshot = job_store.get_snapshot(upload_id)
+    if snapshot is None:
+        return jsonify({'upload_id': upload_id, 'status': job['status'],
+                        'error': 'No snapshot yet; the first one is stored after the first generation'}), 404
+
+    try:
+        renderer = snapshot_renderer(upload_id)
+        if renderer is None:
+            return jsonify({'error': 'Upload not found'}), 404
+        best_fitness = snapshot['best_fitness']
+        response = {
+            'upload_id': upload_id,
+            'status': job['status'],
+            'final': job['status'] in FINISHED_STATUSES,
+            'generation': snapshot['generation'],
+            'best_fitness': best_fitness if best_fitness is not None and best_fitness != float('inf') else None,
+            'snapshot_age_seconds': round(time.time() - snapshot['created_at'], 3),
+        }
+
+        group_key = request.args.get('group')
+        if not group_key:
+            response['groups'] = renderer.groups()
+            return jsonify(response), 200
+        student_group = renderer.find_group(group_key)
+        if student_group is None:
+            return jsonify({'error': f'Unknown student group: {group_key}'}), 404
+        response.update({
+            'student_group': {'id': str(student_group.id), 'name': str(getattr(student_group, 'name', student_group.id))},
+            'timetable': renderer.group_rows(snapshot['grid'], student_group),
+        })
+        return jsonify(response), 200
+    except Exception as e:
+        print(f"Error in timetable_snapshot: {e}")
+        return jsonify({'error': f'Snapshot preview failed: {str(e)}'}), 500
+
+
 @app.route('/export-timetable', methods=['POST'])
 def export_timetable():
     data = request.get_json()
@@ -1021,15 +680,12 @@ def export_timetable():
 
     if not upload_id:
         return jsonify({'error': 'upload_id is required'}), 400
-    if upload_id not in processing_jobs:
+    job = job_store.get_job(upload_id)
+    if job is None:
         return jsonify({'error': 'Invalid upload ID or no results available'}), 404
 
-    # Thread-safe read of job
-    lock = get_job_lock(upload_id)
-    with lock:
-        job = processing_jobs[upload_id].copy()
-    
-    if job.get('status') != 'completed':
+    # Runs stopped by their time budget or a cancel request still carry their best timetable
+    if job.get('status') not in ('completed', 'completed_partial', 'cancelled') or not job.get('result'):
         return jsonify({'error': f'Timetable not ready for export. Status: {job.get("status")}' }), 400
 
     try:
@@ -1095,17 +751,96 @@ def download_template():
 
 @app.route('/', methods=['GET'])
 def index():
-    return jsonify({'status': 'ok', 'message': 'Timetable Generator API is running.'}), 200
-
-# Ensure Dash knows it is mounted under /interactive so it generates correct asset URLs
-# IMPORTANT: Since we mount Dash via DispatcherMiddleware at '/interactive', do NOT set
-# requests_pathname_prefix or routes_pathname_prefix here. Dash will respect SCRIPT_NAME
-# from the WSGI mount and generate correct asset URLs automatically.
-try:
-    if hasattr(dash_app, 'config'):
-        dash_app.config.suppress_callback_exceptions = True
-except Exception as e:
-    print(f"Warning: Could not adjust Dash config: {e}")
+    interactive_ui = dash_server.status if dash_server is not None else 'disabled'
+    return jsonify({'status': 'ok', 'message': 'Timetable Generator API is running.',
+                    'interactive_ui': interactive_ui}), 200
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where the resource module is unavailable)."""
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except Exception:
+        return None
+
+
+def format_rss(rss_mb):
+    return f"{rss_mb:.0f} MB" if rss_mb is not None else "n/a"
+
+
+def create_dash_server():
+    """Build the Dash UI and return its Flask server. Imports dash, pandas and plotly on first use."""
+    started, rss_before = time.perf_counter(), peak_rss_mb()
+    from Dash_UI import create_app  # Use the new lightweight Dash UI factory
+    dash_app = create_app()
+    # Ensure Dash knows it is mounted under /interactive so it generates correct asset URLs
+    # IMPORTANT: Since we mount Dash via DispatcherMiddleware at '/interactive', do NOT set
+    # requests_pathname_prefix or routes_pathname_prefix here. Dash will respect SCRIPT_NAME
+    # from the WSGI mount and generate correct asset URLs automatically.
+    try:
+        if hasattr(dash_app, 'config'):
+            dash_app.config.suppress_callback_exceptions = True
+    except Exception as e:
+        print(f"Warning: Could not adjust Dash config: {e}")
+    # Also add the same headers to the Dash server so responses under /interactive come with proper CSP
+    try:
+        dash_app.server.after_request(add_frame_headers)
+    except Exception as e:
+        print(f"Warning: Could not attach after_request to Dash server: {e}")
+    rss_after = peak_rss_mb()
+    rss_added = f"{rss_after - rss_before:.0f} MB" if rss_before is not None and rss_after is not None else "n/a"
+    print(f"Dash UI built in {(time.perf_counter() - started) * 1000:.0f} ms "
+          f"(peak RSS {format_rss(rss_after)}, +{rss_added})")
+    return dash_app.server
+
+
+class LazyDashServer:
+    """
+    WSGI app for the /interactive mount that builds the Dash UI on its first request.
+    A lock makes concurrent first requests share one build. If the build fails, the
+    request (and every later one) goes back to the Flask app, whose /interactive
+    route serves the fallback page.
+    """
+    def __init__(self, factory, fallback, mount_path):
+        self.factory = factory
+        self.fallback = fallback
+        self.mount_path = mount_path
+        self.server = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    @property
+    def status(self):
+        if self.server is not None:
+            return 'ready'
+        return 'failed' if self.error is not None else 'not built'
+
+    def get_server(self):
+        if self.server is None and self.error is None:
+            with self._lock:
+                if self.server is None and self.error is None:
+                    try:
+                        self.server = self.factory()
+                    except Exception as e:
+                        self.error = e
+                        print(f"Warning: Could not build Dash UI, serving the fallback page. Error: {e}")
+        return self.server
+
+    def __call__(self, environ, start_response):
+        server = self.get_server()
+        if server is not None:
+            return server(environ, start_response)
+        # Undo the mount's path split so Flask routes the request to the fallback page
+        environ = dict(environ)
+        script_name = environ.get('SCRIPT_NAME', '')
+        if script_name.endswith(self.mount_path):
+            environ['SCRIPT_NAME'] = script_name[:-len(self.mount_path)]
+        environ['PATH_INFO'] = self.mount_path + environ.get('PATH_INFO', '')
+        return self.fallback(environ, start_response)
+
 
 # Mount Dash UI under /interactive using DispatcherMiddleware (most reliable across Dash versions)
 from werkzeug.middleware.dispatcher import DispatcherMiddleware
@@ -1142,17 +877,24 @@ def dash_assets_redirect(path):
 def dash_trailing_redirect():
     return redirect('/interactive/', code=302)
 
-# Unconditionally mount the Dash server under /interactive
-try:
-    app.wsgi_app = DispatcherMiddleware(app.wsgi_app, {'/interactive': dash_app.server})
-    print("Dash app mounted via DispatcherMiddleware at /interactive/")
-except Exception as e:
-    print(f"Warning: Failed to mount Dash app via DispatcherMiddleware: {e}")
+# Mount the Dash server under /interactive; it is built on the first request there
+dash_server = None
+if app.config['ENABLE_DASH_UI']:
+    try:
+        dash_server = LazyDashServer(create_dash_server, app.wsgi_app, '/interactive')
+        app.wsgi_app = DispatcherMiddleware(app.wsgi_app, {'/interactive': dash_server})
+        print("Dash app mounted via DispatcherMiddleware at /interactive/ (built on first request)")
+    except Exception as e:
+        print(f"Warning: Failed to mount Dash app via DispatcherMiddleware: {e}")
+else:
+    print("Dash UI disabled (ENABLE_DASH_UI=false); /interactive is not served")
 
 # If something still fails later in startup, provide a simple fallback page at /interactive
 @app.route('/interactive/', defaults={'path': ''})
 @app.route('/interactive/<path:path>')
 def interactive_fallback(path):
+    if not app.config['ENABLE_DASH_UI']:
+        return jsonify({'error': 'Interactive UI is disabled on this server'}), 404
     try:
         # If the request is for dash internal endpoints, let the mounted app handle them (no fallback)
         if path.startswith('_dash') or path.startswith('assets'):
@@ -1201,6 +943,9 @@ def interactive_fallback(path):
     except Exception as e:
         return jsonify({'error': f'Fallback page error: {str(e)}'}), 500
 
+print(f"Startup: app loaded in {(time.perf_counter() - _startup_started) * 1000:.0f} ms, "
+      f"peak RSS {format_rss(peak_rss_mb())}, Dash UI {'lazy' if app.config['ENABLE_DASH_UI'] else 'disabled'}")
+
 if __name__ == '__main__':
     print("Starting Timetable Generator API...")
     debug_mode = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
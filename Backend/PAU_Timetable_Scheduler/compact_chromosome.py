@@ -0,0 +1,256 @@
+# compact_chromosome.py
+"""
+Compact integer-coded chromosome used by the differential evolution engines.
+
+A timetable is stored as a rooms x timeslots int32 grid where every cell holds
+an event index or EMPTY (-1), plus a parallel length-E array that maps every
+event to its flat (room * num_timeslots + timeslot) position, or EMPTY when the
+event is not scheduled. All writes go through the small mutation API below
+(or `chromosome[r, t] = value`, which uses it) so both views stay in sync and
+"where is event X" is an O(1) lookup.
+
+Optionally (track_occupancy) the chromosome also keeps group x timeslot and
+lecturer x timeslot event counts, updated by the same mutation API, so "is
+this group/lecturer free at t" and "which timeslots have a clash" are array
+lookups instead of scans over every room.
+"""
+
+import numpy as np
+
+EMPTY = -1
+
+
+class CompactChromosome:
+    __slots__ = ('grid', 'positions', 'event_group', 'event_lecturer', 'group_slots', 'lecturer_slots')
+
+    def __init__(self, num_rooms: int, num_timeslots: int, num_events: int, grid=None, positions=None):
+        if grid is None:
+            grid = np.full((num_rooms, num_timeslots), EMPTY, dtype=np.int32)
+        if positions is None:
+            positions = np.full(num_events, EMPTY, dtype=np.int32)
+        self.grid = grid
+        self.positions = positions
+        self.event_group = None
+        self.event_lecturer = None
+        self.group_slots = None
+        self.lecturer_slots = None
+
+    def track_occupancy(self, event_group, event_lecturer, num_groups: int, num_lecturers: int):
+        """
+        Start keeping group x timeslot and lecturer x timeslot event counts.
+        `event_group`/`event_lecturer` map every event to its group/lecturer index
+        (shared, never modified). Returns self.
+        """
+        num_timeslots = self.grid.shape[1]
+        events = np.flatnonzero(self.positions >= 0)
+        timeslots = self.positions[events] % num_timeslots
+        self.event_group = event_group
+        self.event_lecturer = event_lecturer
+        self.group_slots = np.bincount(
+            event_group[events].astype(np.int64) * num_timeslots + timeslots,
+            minlength=num_groups * num_timeslots).astype(np.int32).reshape(num_groups, num_timeslots)
+        self.lecturer_slots = np.bincount(
+            event_lecturer[events].astype(np.int64) * num_timeslots + timeslots,
+            minlength=num_lecturers * num_timeslots).astype(np.int32).reshape(num_lecturers, num_timeslots)
+        return self
+
+    def _occupy(self, event_id: int, timeslot_idx: int, delta: int):
+        if self.group_slots is not None:
+            self.group_slots[self.event_group[event_id], timeslot_idx] += delta
+            self.lecturer_slots[self.event_lecturer[event_id], timeslot_idx] += delta
+
+    @classmethod
+    def from_grid(cls, grid, num_events: int):
+        """
+        Build a compact chromosome from any rooms x timeslots grid (int grid with
+        EMPTY cells or a legacy object grid with None cells). If an event appears
+        more than once, the first occurrence (row-major) is kept.
+        """
+        grid = np.asarray(grid)
+        num_rooms, num_timeslots = grid.shape
+        chromosome = cls(num_rooms, num_timeslots, num_events)
+        if grid.dtype == object:
+            cells = np.array([EMPTY if e is None else int(e) for e in grid.ravel()], dtype=np.int32)
+        else:
+            cells = grid.astype(np.int32, copy=False).ravel()
+        occupied = np.flatnonzero((cells >= 0) & (cells < num_events))
+        event_ids, first = np.unique(cells[occupied], return_index=True)
+        keep = occupied[first]
+        chromosome.grid.ravel()[keep] = event_ids
+        chromosome.positions[event_ids] = keep
+        return chromosome
+
+    @classmethod
+    def coerce(cls, chromosome, num_events: int):
+        """Return `chromosome` unchanged if already compact, otherwise convert it."""
+        if isinstance(chromosome, cls):
+            return chromosome
+        return cls.from_grid(chromosome, num_events)
+
+    # --- read access ---
+    @property
+    def shape(self):
+        return self.grid.shape
+
+    @property
+    def num_events(self) -> int:
+        return len(self.positions)
+
+    def __len__(self):
+        return self.grid.shape[0]
+
+    def __iter__(self):
+        return iter(self.grid)
+
+    def __getitem__(self, key):
+        return self.grid[key]
+
+    def __setitem__(self, key, value):
+        room_idx, timeslot_idx = key
+        if value is None or value == EMPTY:
+            self.remove(room_idx, timeslot_idx)
+        else:
+            self.place(int(value), room_idx, timeslot_idx)
+
+    def tobytes(self) -> bytes:
+        return self.grid.tobytes()
+
+    def position(self, event_id: int):
+        """Return the (room, timeslot) of an event, or None if it is unscheduled."""
+        flat = self.positions[event_id]
+        if flat < 0:
+            return None
+        return divmod(int(flat), self.grid.shape[1])
+
+    def is_scheduled(self, event_id: int) -> bool:
+        return self.positions[event_id] >= 0
+
+    def scheduled_events(self):
+        return np.flatnonzero(self.positions >= 0)
+
+    def missing_events(self):
+        return np.flatnonzero(self.positions < 0)
+
+    def count_scheduled(self) -> int:
+        return int(np.count_nonzero(self.positions >= 0))
+
+    def occupied_cells(self):
+        """(N, 2) array of (room, timeslot) pairs that hold an event."""
+        return np.argwhere(self.grid != EMPTY)
+
+    def empty_mask(self):
+        return self.grid == EMPTY
+
+    def group_busy(self, group_idx: int, timeslot_idx: int) -> bool:
+        """True if the group has an event at the timeslot (needs track_occupancy)."""
+        return self.group_slots[group_idx, timeslot_idx] > 0
+
+    def lecturer_busy(self, lecturer_idx: int, timeslot_idx: int) -> bool:
+        """True if the lecturer has an event at the timeslot (needs track_occupancy)."""
+        return self.lecturer_slots[lecturer_idx, timeslot_idx] > 0
+
+    def clash_timeslots(self, lecturer_rows=None):
+        """
+        Timeslots where a group or lecturer has more than one event (needs
+        track_occupancy). `lecturer_rows` optionally restricts which lecturer
+        rows count, e.g. to skip events without an assigned lecturer.
+        """
+        lecturer_slots = self.lecturer_slots if lecturer_rows is None else self.lecturer_slots[lecturer_rows]
+        return np.flatnonzero((self.group_slots > 1).any(axis=0) | (lecturer_slots > 1).any(axis=0))
+
+    # --- mutation API ---
+    def place(self, event_id: int, room_idx: int, timeslot_idx: int):
+        """
+        Put `event_id` at (room_idx, timeslot_idx). The event leaves its previous
+        cell, and whatever occupied the target cell becomes unscheduled.
+        Returns the displaced event id or EMPTY.
+        """
+        num_timeslots = self.grid.shape[1]
+        flat = room_idx * num_timeslots + timeslot_idx
+        grid = self.grid.ravel()
+        old_flat = self.positions[event_id]
+        if old_flat == flat:
+            return EMPTY
+        if old_flat >= 0:
+            grid[old_flat] = EMPTY
+            self._occupy(event_id, old_flat % num_timeslots, -1)
+        displaced = int(grid[flat])
+        if displaced >= 0:
+            self.positions[displaced] = EMPTY
+            self._occupy(displaced, timeslot_idx, -1)
+        grid[flat] = event_id
+        self.positions[event_id] = flat
+        self._occupy(event_id, timeslot_idx, 1)
+        return displaced
+
+    def remove(self, room_idx: int, timeslot_idx: int) -> int:
+        """Clear a cell and return the event that was there (or EMPTY)."""
+        event_id = int(self.grid[room_idx, timeslot_idx])
+        if event_id >= 0:
+            self.grid[room_idx, timeslot_idx] = EMPTY
+            self.positions[event_id] = EMPTY
+            self._occupy(event_id, timeslot_idx, -1)
+        return event_id
+
+    def unplace(self, event_id: int):
+        """Remove an event from the timetable, returning its old (room, timeslot) or None."""
+        pos = self.position(event_id)
+        if pos is not None:
+            self.remove(*pos)
+        return pos
+
+    def swap(self, pos1, pos2):
+        """Exchange the contents of two cells (either may be empty)."""
+        (r1, t1), (r2, t2) = pos1, pos2
+        event1 = int(self.grid[r1, t1])
+        event2 = int(self.grid[r2, t2])
+        num_timeslots = self.grid.shape[1]
+        self.grid[r1, t1], self.grid[r2, t2] = event2, event1
+        if event1 >= 0:
+            self.positions[event1] = r2 * num_timeslots + t2
+        if event2 >= 0:
+            self.positions[event2] = r1 * num_timeslots + t1
+        if t1 != t2:
+            if event1 >= 0:
+                self._occupy(event1, t1, -1)
+                self._occupy(event1, t2, 1)
+            if event2 >= 0:
+                self._occupy(event2, t2, -1)
+                self._occupy(event2, t1, 1)
+
+    def inherit(self, donor_grid, take):
+        """
+        New chromosome with the donor's cells wherever `take` is True, applied as one
+        masked assignment. Incoming events leave their previous cells and events they
+        overwrite become unscheduled, the same outcome as setting the cells one by one.
+        """
+        grid = self.grid.copy()
+        incoming = donor_grid[take]
+        previous = self.positions[incoming[incoming >= 0]]
+        grid.ravel()[previous[previous >= 0]] = EMPTY
+        grid[take] = incoming
+        child = CompactChromosome.from_grid(grid, len(self.positions))
+        if self.group_slots is not None:
+            child.track_occupancy(self.event_group, self.event_lecturer,
+                                  self.group_slots.shape[0], self.lecturer_slots.shape[0])
+        return child
+
+    def copy(self):
+        clone = CompactChromosome(0, 0, 0, self.grid.copy(), self.positions.copy())
+        if self.group_slots is not None:
+            clone.event_group = self.event_group
+            clone.event_lecturer = self.event_lecturer
+            clone.group_slots = self.group_slots.copy()
+            clone.lecturer_slots = self.lecturer_slots.copy()
+        return clone
+
+    # --- interop ---
+    def to_object_grid(self):
+        """Legacy rooms x timeslots object grid with None for empty cells."""
+        object_grid = self.grid.astype(object)
+        object_grid[self.grid == EMPTY] = None
+        return object_grid
+
+    def __repr__(self):
+        return (f"CompactChromosome(rooms={self.grid.shape[0]}, timeslots={self.grid.shape[1]}, "
+                f"scheduled={self.count_scheduled()}/{len(self.positions)})")
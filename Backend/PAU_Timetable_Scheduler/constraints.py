@@ -1,17 +1,20 @@
-from input_data import input_data
+from compact_chromosome import CompactChromosome
+from problem_model import ProblemModel, BUILDING_SST
 import random
 
 import re
 
 class Constraints:
-    def __init__(self, input_data):
+    def __init__(self, input_data, model=None):
         self.input_data = input_data
         self.validate_faculty_data() # Validate data on initialization
         self.rooms = input_data.rooms
         self.timeslots = input_data.create_time_slots(no_hours_per_day=input_data.hours, no_days_per_week=input_data.days, day_start_time=9)
         self.student_groups = input_data.student_groups
         self.courses = input_data.courses
-        self.events_list, self.events_map = self.create_events()
+        # Share the compiled model with the DE engine when one is passed in
+        self.model = model if model is not None else ProblemModel(input_data)
+        self.events_list, self.events_map = self.model.events_list, self.model.events_map
 
     def validate_faculty_data(self):
         """
@@ -47,42 +50,17 @@ class Constraints:
                         f"Found invalid day '{day}'. Valid days are {valid_days}. Please correct the input data."
                     )
     
-    def create_events(self):
-        """Create events list and mapping similar to genetic algorithm"""
-        events_list = []
-        event_map = {}
-        
-        from entitities.Class import Class
-        
-        idx = 0
-        for student_group in self.student_groups:
-            for i in range(student_group.no_courses):
-                # Get the course to check its credits
-                course = input_data.getCourse(student_group.courseIDs[i])
-                
-                # SPECIAL HANDLING FOR 1-CREDIT COURSES:
-                # If course has 1 credit, it must have 3 hours (with 2 consecutive rule)
-                if course and course.credits == 1:
-                    required_hours = 3  # Force 1-credit courses to have 3 hours
-                else:
-                    # Use original hours required for other courses
-                    required_hours = student_group.hours_required[i]
-                
-                hourcount = 1 
-                while hourcount <= required_hours:
-                    event = Class(student_group, student_group.teacherIDS[i], student_group.courseIDs[i])
-                    events_list.append(event)
-                    
-                    # Add the event to the index map with the current index
-                    event_map[idx] = event
-                    idx += 1
-                    hourcount += 1
-                    
-        return events_list, event_map    
+    def _as_grid(self, chromosome):
+        """Return a rooms x timeslots grid with None for empty cells, whatever the encoding."""
+        if isinstance(chromosome, CompactChromosome):
+            return chromosome.to_object_grid()
+        return chromosome
+
     def check_room_constraints(self, chromosome, debug=False):
         """
         rooms must meet the capacity and type of the scheduled event
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         violations = []
         days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
@@ -92,7 +70,7 @@ class Constraints:
             for timeslot_idx in range(len(self.timeslots)):
                 class_event = self.events_map.get(chromosome[room_idx][timeslot_idx])
                 if class_event is not None:
-                    course = input_data.getCourse(class_event.course_id)
+                    course = self.model.get_course(class_event.course_id)
                     timeslot = self.timeslots[timeslot_idx]
                     day_abbr = days_map.get(timeslot.day)
                     time = timeslot.start_time + 9
@@ -134,6 +112,7 @@ class Constraints:
         """
         No student group can have overlapping classes at the same time
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         clashes = []
         days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
@@ -153,8 +132,8 @@ class Constraints:
                                 first_event = student_group_watch[student_group.id]
                                 second_event = class_event
                                 
-                                first_course = self.input_data.getCourse(first_event.course_id)
-                                second_course = self.input_data.getCourse(second_event.course_id)
+                                first_course = self.model.get_course(first_event.course_id)
+                                second_course = self.model.get_course(second_event.course_id)
                                 
                                 timeslot = self.timeslots[i]
                                 day_abbr = days_map.get(timeslot.day)
@@ -182,6 +161,7 @@ class Constraints:
         """
         No lecturer can have overlapping classes at the same time
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         clashes = []
         days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
@@ -201,9 +181,9 @@ class Constraints:
                                     first_event = lecturer_watch[faculty_id]
                                     second_event = class_event
                                     
-                                    faculty = self.input_data.getFaculty(faculty_id)
-                                    first_course = self.input_data.getCourse(first_event.course_id)
-                                    second_course = self.input_data.getCourse(second_event.course_id)
+                                    faculty = self.model.get_faculty(faculty_id)
+                                    first_course = self.model.get_course(first_event.course_id)
+                                    second_course = self.model.get_course(second_event.course_id)
                                     
                                     timeslot = self.timeslots[i]
                                     day_abbr = days_map.get(timeslot.day)
@@ -234,6 +214,7 @@ class Constraints:
         """
         Checks if courses are scheduled according to the lecturer's available days and times.
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         violations = []
         days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
@@ -244,94 +225,31 @@ class Constraints:
                 if event_id is not None:
                     class_event = self.events_map.get(event_id)
                     if class_event and class_event.faculty_id is not None:
-                        faculty = self.input_data.getFaculty(class_event.faculty_id)
+                        faculty = self.model.get_faculty(class_event.faculty_id)
                         if not faculty:
                             continue
 
                         timeslot = self.timeslots[timeslot_idx]
-                        day_idx = timeslot.day
-                        day_abbr = days_map.get(day_idx)
-                        
+                        day_abbr = days_map.get(timeslot.day)
                         # The actual hour of the day (e.g., 9, 10, 11)
                         slot_hour = timeslot.start_time + 9
 
-                        # 1. Check available days
-                        is_available_day = False
-                        avail_days = faculty.avail_days
-                        if not avail_days or (isinstance(avail_days, str) and avail_days.upper() == "ALL"):
-                            is_available_day = True
-                        else:
-                            # Normalize to a list of capitalized day abbreviations
-                            if isinstance(avail_days, str):
-                                avail_days_list = [d.strip().capitalize() for d in avail_days.split(',')]
-                            else: # is a list
-                                avail_days_list = [d.strip().capitalize() for d in avail_days]
-                            
-                            if "All" in avail_days_list or day_abbr in avail_days_list:
-                                is_available_day = True
-
-                        if not is_available_day:
-                            penalty += 2  # Reduced from 10 to 2
-                            if debug:
-                                # Use faculty name if available, otherwise use faculty_id (email)
-                                lecturer_name = faculty.name if faculty.name else faculty.faculty_id
-                                violation_info = (
-                                    f"Lecturer Schedule Violation: '{lecturer_name}' is scheduled on {day_abbr}, "
-                                    f"but is only available on: {faculty.avail_days}."
-                                )
-                                if violation_info not in violations:
-                                    violations.append(violation_info)
-                            continue # Skip time check if day is already wrong
-
-                        # 2. Check available times
-                        is_available_time = False
-                        avail_times = faculty.avail_times
-
-                        if not avail_times:
-                            is_available_time = True
-                        elif isinstance(avail_times, str) and avail_times.upper() == "ALL":
-                            is_available_time = True
-                        elif isinstance(avail_times, list) and any(str(t).strip().upper() == 'ALL' for t in avail_times):
-                            is_available_time = True
-                        else:
-                            # It's a list or string of specific times/ranges
-                            if isinstance(avail_times, str):
-                                avail_times_list = [t.strip() for t in avail_times.split(',')]
-                            else: # is a list
-                                avail_times_list = avail_times
-
-                            for time_spec in avail_times_list:
-                                time_spec_str = str(time_spec).strip()
-                                if '-' in time_spec_str: # It's a range, e.g., "09:00-12:00"
-                                    try:
-                                        start_str, end_str = time_spec_str.split('-')
-                                        start_h = int(start_str.split(':')[0])
-                                        end_h = int(end_str.split(':')[0])
-                                        # The slot is valid if its start time is within the range [start, end).
-                                        # e.g., for "09:00-12:00", slots 9, 10, 11 are valid. Slot 12 is not.
-                                        if start_h <= slot_hour < end_h:
-                                            is_available_time = True
-                                            break
-                                    except (ValueError, IndexError):
-                                        continue # Ignore malformed range
-                                else: # It's a single time, e.g., "09:00"
-                                    try:
-                                        h = int(time_spec_str.split(':')[0])
-                                        if h == slot_hour:
-                                            is_available_time = True
-                                            break
-                                    except (ValueError, IndexError):
-                                        continue # Ignore malformed time
-                        
-                        if not is_available_time:
+                        violation = self.get_lecturer_schedule_violation(faculty, timeslot)
+                        if violation is not None:
                             penalty += 2  # Reduced from 10 to 2
                             if debug:
                                 # Use faculty name if available, otherwise use faculty_id (email)
                                 lecturer_name = faculty.name if faculty.name else faculty.faculty_id
-                                violation_info = (
-                                    f"Lecturer Schedule Violation: '{lecturer_name}' is scheduled at {slot_hour}:00 on {day_abbr}, "
-                                    f"but is only available during: {faculty.avail_times}."
-                                )
+                                if violation == 'day':
+                                    violation_info = (
+                                        f"Lecturer Schedule Violation: '{lecturer_name}' is scheduled on {day_abbr}, "
+                                        f"but is only available on: {faculty.avail_days}."
+                                    )
+                                else:
+                                    violation_info = (
+                                        f"Lecturer Schedule Violation: '{lecturer_name}' is scheduled at {slot_hour}:00 on {day_abbr}, "
+                                        f"but is only available during: {faculty.avail_times}."
+                                    )
                                 if violation_info not in violations:
                                     violations.append(violation_info)
         
@@ -343,12 +261,79 @@ class Constraints:
             
         return penalty
 
+    def get_lecturer_schedule_violation(self, faculty, timeslot):
+        """
+        Returns 'day' if the lecturer is not available on the timeslot's day, 'time' if the
+        day is fine but the hour is outside their available times, or None if available.
+        """
+        days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
+        day_abbr = days_map.get(timeslot.day)
+        slot_hour = timeslot.start_time + 9
+
+        # 1. Check available days
+        is_available_day = False
+        avail_days = faculty.avail_days
+        if not avail_days or (isinstance(avail_days, str) and avail_days.upper() == "ALL"):
+            is_available_day = True
+        else:
+            # Normalize to a list of capitalized day abbreviations
+            if isinstance(avail_days, str):
+                avail_days_list = [d.strip().capitalize() for d in avail_days.split(',')]
+            else: # is a list
+                avail_days_list = [d.strip().capitalize() for d in avail_days]
+            
+            if "All" in avail_days_list or day_abbr in avail_days_list:
+                is_available_day = True
+
+        if not is_available_day:
+            return 'day' # Skip time check if day is already wrong
+
+        # 2. Check available times
+        avail_times = faculty.avail_times
+
+        if not avail_times:
+            return None
+        elif isinstance(avail_times, str) and avail_times.upper() == "ALL":
+            return None
+        elif isinstance(avail_times, list) and any(str(t).strip().upper() == 'ALL' for t in avail_times):
+            return None
+
+        # It's a list or string of specific times/ranges
+        if isinstance(avail_times, str):
+            avail_times_list = [t.strip() for t in avail_times.split(',')]
+        else: # is a list
+            avail_times_list = avail_times
+
+        for time_spec in avail_times_list:
+            time_spec_str = str(time_spec).strip()
+            if '-' in time_spec_str: # It's a range, e.g., "09:00-12:00"
+                try:
+                    start_str, end_str = time_spec_str.split('-')
+                    start_h = int(start_str.split(':')[0])
+                    end_h = int(end_str.split(':')[0])
+                    # The slot is valid if its start time is within the range [start, end).
+                    # e.g., for "09:00-12:00", slots 9, 10, 11 are valid. Slot 12 is not.
+                    if start_h <= slot_hour < end_h:
+                        return None
+                except (ValueError, IndexError):
+                    continue # Ignore malformed range
+            else: # It's a single time, e.g., "09:00"
+                try:
+                    h = int(time_spec_str.split(':')[0])
+                    if h == slot_hour:
+                        return None
+                except (ValueError, IndexError):
+                    continue # Ignore malformed time
+
+        return 'time'
+
     def check_lecturer_workload_constraints(self, chromosome, debug=False):
         """
         Checks lecturer workload constraints:
         1. No more than 4 total hours of teaching per day
         2. No more than 3 consecutive hours of teaching per day
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         violations = []
         days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
@@ -368,7 +353,7 @@ class Constraints:
                         hour_in_day = timeslot.start_time  # 0-based hour index within the day
                         
                         # Get course details
-                        course = self.input_data.getCourse(class_event.course_id)
+                        course = self.model.get_course(class_event.course_id)
                         course_name = course.name if course else class_event.course_id
                         
                         if faculty_id not in lecturer_schedules:
@@ -380,7 +365,7 @@ class Constraints:
         
         # Check workload constraints for each lecturer
         for faculty_id, days_schedule in lecturer_schedules.items():
-            faculty = self.input_data.getFaculty(faculty_id)
+            faculty = self.model.get_faculty(faculty_id)
             lecturer_name = faculty.name if faculty and faculty.name else faculty_id
             
             for day_idx, hour_course_pairs in days_schedule.items():
@@ -443,6 +428,7 @@ class Constraints:
         """
         Ensure only one event is scheduled per room per timeslot
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         violations = []
         days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
@@ -464,7 +450,7 @@ class Constraints:
                             for event_id in event:
                                 class_event = self.events_map.get(event_id)
                                 if class_event:
-                                    course = input_data.getCourse(class_event.course_id)
+                                    course = self.model.get_course(class_event.course_id)
                                     event_details.append(f"'{course.code}' (Group: '{class_event.student_group.name}')")
                             
                             violation_info = (
@@ -491,15 +477,16 @@ class Constraints:
         Ensure no classes are scheduled during break time (13:00 - 14:00) on Mon, Wed, Fri.
         Break time corresponds to timeslot index 4 on each day (9:00, 10:00, 11:00, 12:00, 13:00)
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         violations = []
         break_hour = 4  # 13:00 is the 5th hour (index 4) starting from 9:00
         days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
         
-        for day in range(input_data.days):  # For each day
+        for day in range(self.input_data.days):  # For each day
             # Apply break constraint only on Monday (0), Wednesday (2), and Friday (4)
             if day in [0, 2, 4]:
-                break_timeslot = day * input_data.hours + break_hour  # Calculate break timeslot index
+                break_timeslot = day * self.input_data.hours + break_hour  # Calculate break timeslot index
                 day_abbr = days_map.get(day)
                 
                 for room_idx in range(len(self.rooms)):
@@ -510,7 +497,7 @@ class Constraints:
                             room = self.rooms[room_idx]
                             class_event = self.events_map.get(event_id)
                             if class_event:
-                                course = input_data.getCourse(class_event.course_id)
+                                course = self.model.get_course(class_event.course_id)
                                 violation_info = (
                                     f"Break Time Violation: Course '{course.code}' for group "
                                     f"'{class_event.student_group.name}' is scheduled during break time "
@@ -535,75 +522,40 @@ class Constraints:
         - Exception: Computer lab courses can use any computer lab regardless of building
           (since there are only 2 computer labs in SST but more courses may need them)
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         
-        # Identify engineering groups more comprehensively
-        engineering_groups = []
-        for student_group in self.student_groups:
-            group_name = student_group.name.lower()
-            # Check for engineering, computer science, software engineering keywords
-            if any(keyword in group_name for keyword in [
-                'engineering', 'eng', 'computer science', 'software engineering', 'data science',
-                'mechatronics', 'electrical', 'mechanical', 'csc', 'sen', 'data', 'ds'
-            ]):
-                engineering_groups.append(student_group.id)
-        
+        model = self.model
         for room_idx in range(len(self.rooms)):
+            room_is_sst = model.room_building[room_idx] == BUILDING_SST
+            room_is_computer_lab = model.room_is_computer_lab[room_idx]
             for timeslot_idx in range(len(self.timeslots)):
                 event_id = chromosome[room_idx][timeslot_idx]
                 if event_id is not None:
-                    class_event = self.events_map.get(event_id)
-                    if class_event is None:
+                    if model.event_course[event_id] < 0:
                         continue
-                        
-                    room = self.rooms[room_idx]
-                    course = input_data.getCourse(class_event.course_id)
-                    
-                    if course:
-                        # Computer lab exception: Check if this needs a computer lab
-                        needs_computer_lab = (
-                            course.required_room_type.lower() in ['comp lab', 'computer_lab'] or
-                            room.room_type.lower() in ['comp lab', 'computer_lab'] or
-                            'lab' in course.name.lower() and ('computer' in course.name.lower() or 
-                                                             'programming' in course.name.lower() or
-                                                             'software' in course.name.lower())
-                        )
-                        
-                        # Get room's building
-                        room_building = None
-                        if hasattr(room, 'building'):
-                            room_building = room.building.upper()
-                        elif hasattr(room, 'name') and room.name:
-                            room_name = room.name.upper()
-                            if 'SST' in room_name:
-                                room_building = 'SST'
-                            elif 'TYD' in room_name:
-                                room_building = 'TYD'
-                        elif hasattr(room, 'room_id'):
-                            room_id = str(room.room_id).upper()
-                            if 'SST' in room_id:
-                                room_building = 'SST'
-                            elif 'TYD' in room_id:
-                                room_building = 'TYD'
-                        
-                        # Apply LENIENT building assignment rules (reduced penalties)
-                        if class_event.student_group.id in engineering_groups:
-                            # Engineering groups prefer SST but small penalty for TYD
-                            if not needs_computer_lab and room_building != 'SST':
-                                penalty += 0.5  # Very small penalty (reduced from 2)
-                        else:
-                            # Non-engineering groups prefer TYD but small penalty for SST
-                            if not needs_computer_lab and room_building == 'SST':
-                                penalty += 0.5  # Very small penalty (reduced from 20)
-        
-        return penalty
-                        
+
+                    # Computer lab exception: course needs a computer lab or room is one
+                    if model.event_needs_computer_lab[event_id] or room_is_computer_lab:
+                        continue
+
+                    # Apply LENIENT building assignment rules (reduced penalties)
+                    if model.group_is_engineering[model.event_group[event_id]]:
+                        # Engineering groups prefer SST but small penalty for TYD
+                        if not room_is_sst:
+                            penalty += 0.5  # Very small penalty (reduced from 2)
+                    else:
+                        # Non-engineering groups prefer TYD but small penalty for SST
+                        if room_is_sst:
+                            penalty += 0.5  # Very small penalty (reduced from 20)
+
         return penalty
 
     def check_same_course_same_room_per_day(self, chromosome, debug=False):
         """
         Same course appearing multiple times on same day must be in same room.
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         violations = []
         course_day_rooms = {}  # {(course_id, day): set_of_rooms}
@@ -615,9 +567,9 @@ class Constraints:
                 if event_id is not None:
                     class_event = self.events_map.get(event_id)
                     if class_event:
-                        day_idx = timeslot_idx // input_data.hours
+                        day_idx = timeslot_idx // self.input_data.hours
                         # Use the correct course identifier
-                        course = input_data.getCourse(class_event.course_id)
+                        course = self.model.get_course(class_event.course_id)
                         course_id = getattr(course, 'course_id', None) or getattr(course, 'id', None) or getattr(course, 'code', None) if course else class_event.course_id
                         # The key now includes the student group to correctly handle multiple groups taking the same course
                         course_day_key = (course_id, day_idx, class_event.student_group.id)
@@ -635,8 +587,8 @@ class Constraints:
                     day_abbr = days_map.get(day_idx)
                     
                     # Get student group and course details
-                    student_group = input_data.getStudentGroup(student_group_id)
-                    course = input_data.getCourse(course_id)
+                    student_group = self.model.get_student_group(student_group_id)
+                    course = self.model.get_course(course_id)
                     
                     # Get room names
                     room_names = [self.rooms[r_idx].name for r_idx in rooms_used]
@@ -659,10 +611,11 @@ class Constraints:
 
 
     def check_single_event_per_day(self, chromosome):
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         
         # Create a dictionary to track events per day for each student group
-        events_per_day = {group.id: [0] * input_data.days for group in self.student_groups}
+        events_per_day = {group.id: [0] * self.input_data.days for group in self.student_groups}
 
         for room_idx in range(len(self.rooms)):
             for timeslot_idx in range(len(self.timeslots)):
@@ -671,7 +624,7 @@ class Constraints:
                     class_event = self.events_map.get(class_event_idx)
                     if class_event is not None:
                         student_group = class_event.student_group
-                        day_idx = timeslot_idx // input_data.hours  # Calculate which day this timeslot falls on
+                        day_idx = timeslot_idx // self.input_data.hours  # Calculate which day this timeslot falls on
                         
                         # S1: Try to avoid scheduling more than one event per day for each student group
                         events_per_day[student_group.id][day_idx] += 1
@@ -686,6 +639,7 @@ class Constraints:
         - 3-credit courses MUST have at least a 2-hour block.
         - Penalizes the single hour of a 3-credit course if it's not consecutive with the block.
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         violations = []
         
@@ -698,7 +652,7 @@ class Constraints:
                 if event_id is not None:
                     event = self.events_map.get(event_id)
                     if event:
-                        course = self.input_data.getCourse(event.course_id)
+                        course = self.model.get_course(event.course_id)
                         if course:
                             key = (course.code, event.student_group.id)
                             if key not in course_schedule:
@@ -706,8 +660,8 @@ class Constraints:
                             course_schedule[key].append(timeslot_idx)
 
         for (course_id, student_group_id), timeslots in course_schedule.items():
-            course = self.input_data.getCourse(course_id)
-            student_group = self.input_data.getStudentGroup(student_group_id)
+            course = self.model.get_course(course_id)
+            student_group = self.model.get_student_group(student_group_id)
             if not course or course.credits <= 1:
                 continue
 
@@ -754,6 +708,7 @@ class Constraints:
 
     # Optional: Spread events over the week
     def check_spread_events(self, chromosome):
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         group_event_days = {group.id: set() for group in self.student_groups}
         
@@ -765,14 +720,14 @@ class Constraints:
                     class_event = self.events_map.get(class_event_idx)
                     if class_event is not None:
                         student_group = class_event.student_group
-                        day_idx = timeslot_idx // input_data.hours
+                        day_idx = timeslot_idx // self.input_data.hours
                         
                         # Track which days each student group has events
                         group_event_days[student_group.id].add(day_idx)
 
         # Penalize student groups that have events tightly clustered in the week
         for group_id, event_days in group_event_days.items():
-            if len(event_days) < input_data.days // 2:  # If events are clustered in less than half the week
+            if len(event_days) < self.input_data.days // 2:  # If events are clustered in less than half the week
                 penalty += 0.025  # Small penalty for clustering events
 
         return penalty
@@ -782,6 +737,7 @@ class Constraints:
         Check that all courses appear the correct number of times for each student group
         based on their credit hours/hours_required.
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         allocation_issues = []
         
@@ -800,7 +756,7 @@ class Constraints:
             # Check expected vs actual course occurrences
             for i, course_id in enumerate(student_group.courseIDs):
                 # Get the course to check if it's a 1-credit course
-                course = self.input_data.getCourse(course_id)
+                course = self.model.get_course(course_id)
                 
                 # SPECIAL HANDLING FOR 1-CREDIT COURSES:
                 # If course has 1 credit, it must have 3 hours
@@ -852,6 +808,7 @@ class Constraints:
         Evaluate the overall fitness of a chromosome by checking all constraints.
         Lower values indicate better fitness.
         """
+        chromosome = self._as_grid(chromosome)
         penalty = 0
         cost = 0
         
@@ -880,6 +837,7 @@ class Constraints:
         Identifies all conflicts in a given chromosome to guide the crossover process.
         Returns a dictionary of conflicts.
         """
+        chromosome = self._as_grid(chromosome)
         conflicts = {
             'student_group': [],
             'lecturer': [],
@@ -925,7 +883,7 @@ class Constraints:
                 if event_id is not None:
                     event = self.events_map.get(event_id)
                     room = self.rooms[room_idx]
-                    course = input_data.getCourse(event.course_id)
+                    course = self.model.get_course(event.course_id)
                     if event and course:
                         if room.room_type != course.required_room_type or event.student_group.no_students > room.capacity:
                             conflicts['room'].append({
@@ -939,6 +897,7 @@ class Constraints:
         """
         Get detailed information about constraint violations for debugging.
         """
+        chromosome = self._as_grid(chromosome)
         violations = {
             'room_constraints': self.check_room_constraints(chromosome, debug=debug),
             'student_group_constraints': self.check_student_group_constraints(chromosome, debug=debug),
@@ -962,6 +921,7 @@ class Constraints:
         Get detailed constraint violations with occurrence locations for UI display.
         Returns a dictionary with constraint names and their detailed violation information.
         """
+        chromosome = self._as_grid(chromosome)
         detailed_violations = {}
         days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
         
@@ -977,8 +937,8 @@ class Constraints:
                         student_group = class_event.student_group
                         if student_group.id in student_group_watch:
                             first_event = student_group_watch[student_group.id]
-                            first_course = self.input_data.getCourse(first_event.course_id)
-                            second_course = self.input_data.getCourse(class_event.course_id)
+                            first_course = self.model.get_course(first_event.course_id)
+                            second_course = self.model.get_course(class_event.course_id)
                             
                             timeslot = self.timeslots[i]
                             day_abbr = days_map.get(timeslot.day)
@@ -1011,7 +971,7 @@ class Constraints:
                     for event_id in event:
                         class_event = self.events_map.get(event_id)
                         if class_event:
-                            course = self.input_data.getCourse(class_event.course_id)
+                            course = self.model.get_course(class_event.course_id)
                             event_details.append(f"'{course.code}' (Group: '{class_event.student_group.name}')")
                     
                     room_conflicts.append({
@@ -1036,9 +996,9 @@ class Constraints:
                         faculty_id = class_event.faculty_id
                         if faculty_id in lecturer_watch:
                             first_event = lecturer_watch[faculty_id]
-                            first_course = self.input_data.getCourse(first_event.course_id)
-                            second_course = self.input_data.getCourse(class_event.course_id)
-                            faculty = self.input_data.getFaculty(faculty_id)
+                            first_course = self.model.get_course(first_event.course_id)
+                            second_course = self.model.get_course(class_event.course_id)
+                            faculty = self.model.get_faculty(faculty_id)
                             
                             timeslot = self.timeslots[i]
                             day_abbr = days_map.get(timeslot.day)
@@ -1068,7 +1028,7 @@ class Constraints:
                 if class_event_idx is not None:
                     class_event = self.events_map.get(class_event_idx)
                     if class_event is not None and class_event.faculty_id:
-                        faculty = self.input_data.getFaculty(class_event.faculty_id)
+                        faculty = self.model.get_faculty(class_event.faculty_id)
                         if faculty:
                             timeslot = self.timeslots[timeslot_idx]
                             day_abbr = days_map.get(timeslot.day, "Unknown")
@@ -1079,7 +1039,7 @@ class Constraints:
                             is_available_time = self._is_faculty_available_time(faculty, slot_hour)
                             
                             if not is_available_day or not is_available_time:
-                                course = self.input_data.getCourse(class_event.course_id)
+                                course = self.model.get_course(class_event.course_id)
                                 
                                 # Use faculty name if available, otherwise use faculty_id (email)
                                 lecturer_name = faculty.name if faculty.name else faculty.faculty_id
@@ -1118,7 +1078,7 @@ class Constraints:
                         hour_in_day = timeslot.start_time
                         
                         # Get course details
-                        course = self.input_data.getCourse(class_event.course_id)
+                        course = self.model.get_course(class_event.course_id)
                         course_name = course.name if course else class_event.course_id
                         
                         if faculty_id not in lecturer_schedules:
@@ -1130,7 +1090,7 @@ class Constraints:
         
         # Check workload violations
         for faculty_id, days_schedule in lecturer_schedules.items():
-            faculty = self.input_data.getFaculty(faculty_id)
+            faculty = self.model.get_faculty(faculty_id)
             lecturer_name = faculty.name if faculty and faculty.name else faculty_id
             
             for day_idx, hour_course_pairs in days_schedule.items():
@@ -1205,8 +1165,8 @@ class Constraints:
         
         for course_key, events in events_by_course.items():
             course_id, student_group_id = course_key
-            course = self.input_data.getCourse(course_id)
-            student_group = self.input_data.getStudentGroup(student_group_id)
+            course = self.model.get_course(course_id)
+            student_group = self.model.get_student_group(student_group_id)
             
             if not course or course.credits <= 1:
                 continue
@@ -1263,7 +1223,7 @@ class Constraints:
             
             for i, course_id in enumerate(student_group.courseIDs):
                 # Get the course to check if it's a 1-credit course that should be 3 hours
-                course = self.input_data.getCourse(course_id)
+                course = self.model.get_course(course_id)
                 
                 # SPECIAL HANDLING FOR 1-CREDIT COURSES:
                 # If course has 1 credit, it must have 3 hours (not flagged as extra)
@@ -1306,7 +1266,7 @@ class Constraints:
                 
                 for day, rooms_used in events_by_day.items():
                     if len(rooms_used) > 1:
-                        course = self.input_data.getCourse(course_id)
+                        course = self.model.get_course(course_id)
                         day_abbr = days_map.get(day, "Unknown")
                         room_names = [self.rooms[r_idx].name for r_idx in rooms_used]
                         same_course_violations.append({
@@ -1328,7 +1288,7 @@ class Constraints:
                 if class_event_idx is not None:
                     class_event = self.events_map.get(class_event_idx)
                     if class_event is not None:
-                        course = self.input_data.getCourse(class_event.course_id)
+                        course = self.model.get_course(class_event.course_id)
                         timeslot = self.timeslots[timeslot_idx]
                         day_abbr = days_map.get(timeslot.day)
                         time = timeslot.start_time + 9
@@ -1374,7 +1334,7 @@ class Constraints:
                     if class_event_idx is not None:
                         class_event = self.events_map.get(class_event_idx)
                         if class_event is not None:
-                            course = self.input_data.getCourse(class_event.course_id)
+                            course = self.model.get_course(class_event.course_id)
                             day_abbr = days_map.get(timeslot.day)
                             time = timeslot.start_time + 9
                             room = self.rooms[room_idx]
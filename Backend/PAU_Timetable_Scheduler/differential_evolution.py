@@ -1,16 +1,9 @@
-import random
-from typing import List
-import copy
-from utils import Utility
-from entitities.Class import Class
-from input_data import input_data
-import numpy as np
 from constraints import Constraints
+# The engine itself lives in differential_evolution_engine.py; this script runs the demo and Dash UI
+from differential_evolution_engine import DifferentialEvolution
 import re
 import dash
 
-# Create global constraint checker for real-time validation
-global_constraints = Constraints(input_data)
 from dash import dcc, html, Input, Output, State, clientside_callback
 from dash.dependencies import ALL
 import dash.exceptions
@@ -31,1317 +24,19 @@ def store_original_violations(violations_dict):
     print(f"🔒 Stored {len(violations_dict)} original violation types from algorithm")
 
 # population initialization using input_data
-class DifferentialEvolution:
-    def __init__(self, input_data, pop_size: int, F: float, CR: float):
-        self.desired_fitness = 0
-        self.input_data = input_data
-        self.rooms = input_data.rooms
-        self.timeslots = input_data.create_time_slots(no_hours_per_day=input_data.hours, no_days_per_week=input_data.days, day_start_time=9)
-        self.student_groups = input_data.student_groups
-        self.courses = input_data.courses
-        self.events_list, self.events_map = self.create_events()
-        self.pop_size = pop_size
-        self.F = F
-        self.CR = CR
-        self.constraints = Constraints(input_data)
-        
-        # Optimization: Cache fitness values to avoid recalculation
-        self.fitness_cache = {}
-        
-        # Optimization: Pre-calculate building assignments for rooms to speed up evaluation
-        self.room_building_cache = {}
-        for idx, room in enumerate(self.rooms):
-            self.room_building_cache[idx] = self.get_room_building(room)
-        
-        # Optimization: Pre-calculate engineering groups to avoid repeated checks
-        self.engineering_groups = set()
-        for student_group in self.student_groups:
-            group_name = student_group.name.lower()
-            if any(keyword in group_name for keyword in [
-                'engineering', 'eng', 'computer science', 'software engineering', 'data science',
-                'mechatronics', 'electrical', 'mechanical', 'csc', 'sen', 'data', 'ds'
-            ]):
-                self.engineering_groups.add(student_group.id)
-        
-        self.population = self.initialize_population()  # List to hold all chromosomes
-
-    def create_events(self):
-        events_list = []
-        event_map = {}
-
-        idx = 0
-        for student_group in self.student_groups:
-            for i in range(student_group.no_courses):
-                # Get the course to check its credits
-                course = input_data.getCourse(student_group.courseIDs[i])
-                
-                # SPECIAL HANDLING FOR 1-CREDIT COURSES:
-                # If course has 1 credit, it must have 3 hours (with 2 consecutive rule)
-                if course and course.credits == 1:
-                    required_hours = 3  # Force 1-credit courses to have 3 hours
-                    print(f"📚 1-CREDIT COURSE: {course.name} ({course.code}) - Converting to 3 hours")
-                else:
-                    # Use original hours required for other courses
-                    required_hours = student_group.hours_required[i]
-                
-                # Reset hourcount for each new course to correctly group events
-                hourcount = 1 
-                while hourcount <= required_hours:
-                    event = Class(student_group, student_group.teacherIDS[i], student_group.courseIDs[i])
-                    events_list.append(event)
-                    
-                    # Add the event to the index map with the current index
-                    event_map[idx] = event
-                    idx += 1
-                    hourcount += 1
-                    
-        return events_list, event_map
-
-    def initialize_population(self):
-        population = [] 
-        for i in range(self.pop_size):
-            chromosome = self.create_chromosome()
-            population.append(chromosome)
-        return np.array(population)
-
-    def create_chromosome(self):
-        chromosome = np.empty((len(self.rooms), len(self.timeslots)), dtype=object)
-        
-        # Group events by student group and course to handle them as blocks
-        events_by_group_course = {}
-        for idx, event in enumerate(self.events_list):
-            key = (event.student_group.id, event.course_id)
-            if key not in events_by_group_course:
-                events_by_group_course[key] = []
-            events_by_group_course[key].append(idx)
-
-        # --- STRATEGY: Prioritize placing larger courses first ("big rocks first") ---
-        course_items = sorted(
-            events_by_group_course.items(),
-            key=lambda item: len(item[1]),
-            reverse=True
-        )
-
-        # Trackers for optimized placement
-        hours_per_day_for_group = {sg.id: [0] * input_data.days for sg in self.student_groups}
-
-        for (student_group_id, course_id), event_indices in course_items:
-            course = input_data.getCourse(course_id)
-            student_group = input_data.getStudentGroup(student_group_id)
-            hours_required = len(event_indices)
-
-            if hours_required == 0:
-                continue
-
-            # --- STRATEGY: Stricter split strategies to enforce consecutive constraints ---
-            split_strategies = []
-            if hours_required >= 4: # 4-hour courses and above
-                split_strategies = [(4,), (2, 2), (3, 1)]
-            elif hours_required == 3: # 3-hour courses (including 1-credit courses converted to 3 hours)
-                # For 1-credit courses: prioritize 3 consecutive, fallback to 2 consecutive + 1 separate
-                split_strategies = [(3,), (2, 1)]
-            elif hours_required == 2: # 2-hour courses
-                split_strategies = [(2,)] # MUST be consecutive
-            else: # 1-hour courses (only original 1-hour courses that weren't 1-credit)
-                split_strategies = [(1,)]
-
-            course_placed = False
-            for split_strategy in split_strategies:
-                if course_placed:
-                    break
-
-                placements_for_strategy = []
-                all_blocks_found = True
-                temp_chromosome = chromosome.copy()
-                
-                event_idx_counter = 0
-                
-                temp_hours_per_day = hours_per_day_for_group[student_group_id][:]
-                temp_course_days_used = set()
-
-                for block_hours in split_strategy:
-                    placed = False
-                    block_event_indices = event_indices[event_idx_counter : event_idx_counter + block_hours]
-                    
-                    available_days = [d for d in range(input_data.days) if d not in temp_course_days_used]
-                    sorted_days = sorted(available_days, key=lambda d: temp_hours_per_day[d])
-
-                    for day_idx in sorted_days:
-                        day_start = day_idx * input_data.hours
-                        day_end = (day_idx + 1) * input_data.hours
-                        
-                        possible_slots = []
-                        for room_idx, room in enumerate(self.rooms):
-                            # --- STRATEGY: Enforce building constraints during placement ---
-                            is_engineering_group = student_group.id in self.engineering_groups
-                            room_building = self.room_building_cache.get(room_idx, 'UNKNOWN')
-                            
-                            # Non-engineering groups cannot use SST rooms
-                            if not is_engineering_group and room_building == 'SST':
-                                continue # Skip this room entirely for this group
-
-                            if self.is_room_suitable(room, course):
-                                for timeslot_start in range(day_start, day_end - block_hours + 1):
-                                    is_block_placeable = True
-                                    for i in range(block_hours):
-                                        ts = timeslot_start + i
-                                        event_for_slot = self.events_list[block_event_indices[i]]
-                                        if not (self.is_slot_available_for_event(temp_chromosome, room_idx, ts, event_for_slot) and
-                                                self._is_student_group_available(temp_chromosome, student_group_id, ts) and
-                                                self._is_lecturer_available(temp_chromosome, event_for_slot.faculty_id, ts)):
-                                            is_block_placeable = False
-                                            break
-                                    
-                                    if is_block_placeable:
-                                        possible_slots.append((room_idx, timeslot_start))
-                        
-                        if possible_slots:
-                            # Prefer slots that don't cause building conflicts if possible
-                            preferred_slots = []
-                            for r_idx, t_start in possible_slots:
-                                room_bldg = self.room_building_cache.get(r_idx, 'UNKNOWN')
-                                is_eng_grp = student_group.id in self.engineering_groups
-                                if is_eng_grp and room_bldg != 'SST':
-                                    pass # This is a potential soft conflict
-                                else:
-                                    preferred_slots.append((r_idx, t_start))
-                            
-                            if preferred_slots:
-                                room_idx, timeslot_start = random.choice(preferred_slots)
-                            else: # If all options cause a soft conflict, just pick one
-                                room_idx, timeslot_start = random.choice(possible_slots)
-
-                            for i in range(block_hours):
-                                ts = timeslot_start + i
-                                event_id = block_event_indices[i]
-                                placements_for_strategy.append((room_idx, ts, event_id))
-                                temp_chromosome[room_idx, ts] = event_id
-                            
-                            temp_hours_per_day[day_idx] += block_hours
-                            temp_course_days_used.add(day_idx)
-                            placed = True
-                            event_idx_counter += block_hours
-                            break 
-                    
-                    if not placed:
-                        all_blocks_found = False
-                        break
-                
-                if all_blocks_found:
-                    for r, t, e_id in placements_for_strategy:
-                        chromosome[r, t] = e_id
-                    
-                    hours_per_day_for_group[student_group_id] = temp_hours_per_day
-                    
-                    course_placed = True
-                    break
-
-        # Final verification to place any unassigned events
-        chromosome = self.verify_and_repair_course_allocations(chromosome)
-        
-        # Basic clash prevention only
-        chromosome = self.prevent_student_group_clashes(chromosome)
-        
-        return chromosome
-
-    def find_consecutive_slots(self, chromosome, course):
-        # Randomly find consecutive time slots in the same room
-        two_slot_rooms = []
-        for room_idx, room in enumerate(self.rooms):
-            if self.is_room_suitable(room, course):
-                # Collect pairs of consecutive available time slots
-                for i in range(len(self.timeslots) - 1):
-                    if self.is_slot_available(chromosome, room_idx, i) and self.is_slot_available(chromosome, room_idx, i + 1):
-                        two_slot_rooms.append((room_idx, i, i+1))
-
-        if len(two_slot_rooms) != 0:
-            _room_idx, slot1, slot2 = random.choice(two_slot_rooms)           
-            return _room_idx, slot1, slot2
-        
-        return None, None, None
-
-    def find_single_slot(self, chromosome, course):
-        # Randomly find a single available slot
-        single_slot_rooms = []
-        for room_idx, room in enumerate(self.rooms):
-            if self.is_room_suitable(room, course):
-                for i in range(len(self.timeslots)):
-                    if self.is_slot_available(chromosome, room_idx, i):
-                        single_slot_rooms.append((room_idx, i))
-        
-        # Randomly pick from the available single slots
-        if len(single_slot_rooms) > 0:
-            return random.choice(single_slot_rooms)
-        
-        # If no valid single slots are found
-        return None, None
-
-    def is_slot_available(self, chromosome, room_idx, timeslot_idx):
-        # Check if the slot is available (i.e., not already assigned)
-        if chromosome[room_idx][timeslot_idx] is not None:
-            return False
-        
-        # Check if this is break time (13:00 - 14:00)
-        # Break time is the 5th hour (index 4) of each day starting from 9:00
-        break_hour = 4  # 13:00 is the 5th hour (index 4) starting from 9:00
-        day = timeslot_idx // input_data.hours
-        hour_in_day = timeslot_idx % input_data.hours
-        
-        # No break time on Tuesday (1) and Thursday (3)
-        if hour_in_day == break_hour and day not in [1, 3]:
-            return False  # Break time slot is not available
-        
-        return True
-
-    def is_slot_available_for_event(self, chromosome, room_idx, timeslot_idx, event):
-        """
-        Checks if a slot is available for a specific event, considering lecturer availability.
-        """
-        # Check if the slot is physically empty
-        if chromosome[room_idx][timeslot_idx] is not None:
-            return False
-
-        # Check for break time
-        break_hour = 4
-        day = timeslot_idx // input_data.hours
-        hour_in_day = timeslot_idx % input_data.hours
-        if hour_in_day == break_hour and day not in [1, 3]:
-            return False
-
-        # Check lecturer schedule constraints
-        if event and event.faculty_id is not None:
-            faculty = input_data.getFaculty(event.faculty_id)
-            if faculty:
-                days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
-                day_abbr = days_map.get(day)
-                slot_hour = self.timeslots[timeslot_idx].start_time + 9
-
-                # Check day availability
-                is_day_ok = False
-                avail_days = faculty.avail_days
-                if not avail_days or (isinstance(avail_days, str) and avail_days.upper() == "ALL"):
-                    is_day_ok = True
-                else:
-                    if isinstance(avail_days, str):
-                        avail_days_list = [d.strip().capitalize() for d in avail_days.split(',')]
-                    else: # is a list
-                        avail_days_list = [d.strip().capitalize() for d in avail_days]
-                    if "All" in avail_days_list or day_abbr in avail_days_list:
-                        is_day_ok = True
-                
-                if not is_day_ok:
-                    return False
-
-                # Check time availability (Corrected Logic)
-                is_time_ok = False
-                avail_times = faculty.avail_times
-                if not avail_times or (isinstance(avail_times, str) and avail_times.upper() == "ALL") or \
-                   (isinstance(avail_times, list) and any(str(t).strip().upper() == 'ALL' for t in avail_times)):
-                    is_time_ok = True
-                else:
-                    time_list = avail_times if isinstance(avail_times, list) else [avail_times]
-                    for time_spec in time_list:
-                        time_spec_str = str(time_spec).strip()
-                        if '-' in time_spec_str:
-                            try:
-                                start_str, end_str = time_spec_str.split('-')
-                                start_h = int(start_str.split(':')[0])
-                                end_h = int(end_str.split(':')[0])
-                                if start_h <= slot_hour < end_h:
-                                    is_time_ok = True
-                                    break
-                            except (ValueError, IndexError):
-                                continue
-                        else:
-                            try:
-                                h = int(time_spec_str.split(':')[0])
-                                if h == slot_hour:
-                                    is_time_ok = True
-                                    break
-                            except (ValueError, IndexError):
-                                continue
-                
-                if not is_time_ok:
-                    return False
-
-        return True
-
-    def is_room_suitable(self, room, course):
-        if course is None:
-            return False
-        return room.room_type == course.required_room_type
-    
-    def get_room_building(self, room):
-        """Helper method to determine room building"""
-        if hasattr(room, 'building'):
-            return room.building.upper()
-        elif hasattr(room, 'name') and room.name:
-            room_name = room.name.upper()
-            if 'SST' in room_name:
-                return 'SST'
-            elif 'TYD' in room_name:
-                return 'TYD'
-        elif hasattr(room, 'room_id'):
-            room_id = str(room.room_id).upper()
-            if 'SST' in room_id:
-                return 'SST'
-            elif 'TYD' in room_id:
-                return 'TYD'
-        return 'UNKNOWN'
-
-    def _is_student_group_available(self, chromosome, student_group_id, timeslot_idx):
-        """Checks if a student group is already scheduled at a given timeslot."""
-        for r_idx in range(len(self.rooms)):
-            event_id = chromosome[r_idx][timeslot_idx]
-            if event_id is not None:
-                event = self.events_map.get(event_id)
-                if event and event.student_group.id == student_group_id:
-                    return False  # Clash: Student group is not available
-        return True
-
-    def _is_lecturer_available(self, chromosome, faculty_id, timeslot_idx):
-        """Checks if a lecturer is already scheduled at a given timeslot."""
-        for r_idx in range(len(self.rooms)):
-            event_id = chromosome[r_idx][timeslot_idx]
-            if event_id is not None:
-                event = self.events_map.get(event_id)
-                if event and event.faculty_id == faculty_id:
-                    return False  # Clash: Lecturer is not available
-        return True
-
-    def find_clash(self, chromosome):
-        """Finds a random timeslot with a student or lecturer clash."""
-        clash_slots = []
-        for t_idx in range(len(self.timeslots)):
-            simultaneous_events = chromosome[:, t_idx]
-            
-            student_group_watch = set()
-            lecturer_watch = set()
-            
-            has_student_clash = False
-            has_lecturer_clash = False
-            
-            event_ids_in_slot = [e for e in simultaneous_events if e is not None]
-            if len(event_ids_in_slot) <= 1:
-                continue
-
-            for event_id in event_ids_in_slot:
-                event = self.events_map.get(event_id)
-                if not event: continue
-                
-                # Check for student clash
-                if event.student_group.id in student_group_watch:
-                    has_student_clash = True
-                student_group_watch.add(event.student_group.id)
-                
-                # Check for lecturer clash
-                if event.faculty_id and event.faculty_id in lecturer_watch:
-                    has_lecturer_clash = True
-                if event.faculty_id:
-                    lecturer_watch.add(event.faculty_id)
-            
-            if has_student_clash or has_lecturer_clash:
-                clash_slots.append(t_idx)
-                
-        if clash_slots:
-            return random.choice(clash_slots)
-        return None
-    
-    def hamming_distance(self, chromosome1, chromosome2):
-        return np.sum(chromosome1.flatten() != chromosome2.flatten())
-
-    def calculate_population_diversity(self):
-        # Optimization: Sample diversity calculation instead of full O(n²)
-        if self.pop_size <= 10:
-            # For small populations, calculate full diversity
-            total_distance = 0
-            comparisons = 0
-            
-            for i in range(self.pop_size):
-                for j in range(i + 1, self.pop_size):
-                    total_distance += self.hamming_distance(self.population[i], self.population[j])
-                    comparisons += 1
-            
-            return total_distance / comparisons if comparisons > 0 else 0
-        else:
-            # For larger populations, sample 10 random pairs
-            total_distance = 0
-            comparisons = 10
-            
-            for _ in range(comparisons):
-                i, j = random.sample(range(self.pop_size), 2)
-                total_distance += self.hamming_distance(self.population[i], self.population[j])
-            
-            return total_distance / comparisons
-
-
-    def mutate(self, target_idx):
-        mutant_vector = self.population[target_idx].copy()
-        
-        # Increase mutation attempts to encourage exploration
-        mutation_attempts = random.randint(3, 8)
-
-        for _ in range(mutation_attempts):
-            strategy = random.choice(['resolve_clash', 'safe_swap', 'safe_move'])
-
-            # Strategy 1: Find a clash and try to resolve it by moving one event
-            if strategy == 'resolve_clash':
-                clash_timeslot = self.find_clash(mutant_vector)
-                if clash_timeslot is not None:
-                    # Find events involved in the clash
-                    events_in_slot = [(r, mutant_vector[r, clash_timeslot]) for r in range(len(self.rooms)) if mutant_vector[r, clash_timeslot] is not None]
-                    if not events_in_slot: continue
-                    
-                    # Pick one event to move
-                    room_to_move_from, event_id_to_move = random.choice(events_in_slot)
-                    event_to_move = self.events_map.get(event_id_to_move)
-                    if not event_to_move: continue
-
-                    # Find a new, valid, empty slot for this event
-                    new_pos = self.find_safe_empty_slot_for_event(mutant_vector, event_to_move, ignore_pos=(room_to_move_from, clash_timeslot))
-                    if new_pos:
-                        new_r, new_t = new_pos
-                        mutant_vector[new_r, new_t] = event_id_to_move
-                        mutant_vector[room_to_move_from, clash_timeslot] = None
-                        continue # Move successful, try another mutation
-
-            # Strategy 2: Swap two existing events if it's safe
-            elif strategy == 'safe_swap':
-                occupied_slots = np.argwhere(mutant_vector != None)
-                if len(occupied_slots) < 2: continue
-                
-                idx1, idx2 = random.sample(range(len(occupied_slots)), 2)
-                pos1, pos2 = tuple(occupied_slots[idx1]), tuple(occupied_slots[idx2])
-                
-                event1_id, event2_id = mutant_vector[pos1], mutant_vector[pos2]
-                event1, event2 = self.events_map.get(event1_id), self.events_map.get(event2_id)
-                
-                if not event1 or not event2: continue
-
-                # Check if swapping is feasible
-                course1, course2 = self.input_data.getCourse(event1.course_id), self.input_data.getCourse(event2.course_id)
-                
-                # Check room suitability
-                room1_ok_for_event2 = self.is_room_suitable(self.rooms[pos1[0]], course2)
-                room2_ok_for_event1 = self.is_room_suitable(self.rooms[pos2[0]], course1)
-
-                if room1_ok_for_event2 and room2_ok_for_event1:
-                    # Check clash constraints for the swap
-                    # Is event2 OK at pos1's timeslot?
-                    clash_free_at_pos1 = not self.constraints.check_student_group_clash_at_slot(mutant_vector, event2.student_group.id, pos1[1], ignore_room_idx=pos2[0]) and \
-                                         not self.constraints.check_lecturer_clash_at_slot(mutant_vector, event2.faculty_id, pos1[1], ignore_room_idx=pos2[0])
-                    
-                    # Is event1 OK at pos2's timeslot?
-                    clash_free_at_pos2 = not self.constraints.check_student_group_clash_at_slot(mutant_vector, event1.student_group.id, pos2[1], ignore_room_idx=pos1[0]) and \
-                                         not self.constraints.check_lecturer_clash_at_slot(mutant_vector, event1.faculty_id, pos2[1], ignore_room_idx=pos1[0])
-
-                    if clash_free_at_pos1 and clash_free_at_pos2:
-                        mutant_vector[pos1], mutant_vector[pos2] = event2_id, event1_id
-                        continue
-
-            # Strategy 3: Move a single event to a new, safe, empty location
-            elif strategy == 'safe_move':
-                occupied_slots = np.argwhere(mutant_vector != None)
-                if not len(occupied_slots): continue
-                
-                pos_to_move = tuple(random.choice(occupied_slots))
-                event_id_to_move = mutant_vector[pos_to_move]
-                event_to_move = self.events_map.get(event_id_to_move)
-                if not event_to_move: continue
-
-                # Find a new, valid, empty slot
-                new_pos = self.find_safe_empty_slot_for_event(mutant_vector, event_to_move, ignore_pos=pos_to_move)
-                if new_pos:
-                    new_r, new_t = new_pos
-                    mutant_vector[new_r, new_t] = event_id_to_move
-                    mutant_vector[pos_to_move] = None
-                    continue
-
-        return mutant_vector
-
-    def find_safe_empty_slot_for_event(self, chromosome, event, ignore_pos=None):
-        """Finds a random empty slot that is safe for the given event."""
-        course = self.input_data.getCourse(event.course_id)
-        if not course: return None
-
-        possible_slots = []
-        for r_idx, room in enumerate(self.rooms):
-            if self.is_room_suitable(room, course):
-                for t_idx in range(len(self.timeslots)):
-                    if (r_idx, t_idx) == ignore_pos: continue
-                    
-                    # Check if slot is physically empty and available (break time, etc.)
-                    if chromosome[r_idx, t_idx] is None and self.is_slot_available_for_event(chromosome, r_idx, t_idx, event):
-                        # Check for potential clashes if we place the event here
-                        student_clash = self.constraints.check_student_group_clash_at_slot(chromosome, event.student_group.id, t_idx, ignore_room_idx=ignore_pos[0] if ignore_pos else -1)
-                        lecturer_clash = self.constraints.check_lecturer_clash_at_slot(chromosome, event.faculty_id, t_idx, ignore_room_idx=ignore_pos[0] if ignore_pos else -1)
-                        
-                        if not student_clash and not lecturer_clash:
-                            possible_slots.append((r_idx, t_idx))
-        
-        return random.choice(possible_slots) if possible_slots else None
-
-    def ensure_valid_solution(self, mutant_vector):
-        """Ensure same course on same day appears in same room and handle course splits."""
-        course_day_room_mapping = {}
-        
-        # First pass: collect course-day-room mappings
-        for room_idx in range(len(self.rooms)):
-            for timeslot_idx in range(len(self.timeslots)):
-                event_id = mutant_vector[room_idx][timeslot_idx]
-                if event_id is not None:
-                    class_event = self.events_map.get(event_id)
-                    if class_event:
-                        day_idx = timeslot_idx // input_data.hours
-                        course = input_data.getCourse(class_event.course_id)
-                        course_id = getattr(course, 'course_id', None) or getattr(course, 'id', None) or getattr(course, 'code', None) if course else class_event.course_id
-                        course_day_key = (course_id, day_idx, class_event.student_group.id)
-                        
-                        if course_day_key not in course_day_room_mapping:
-                            course_day_room_mapping[course_day_key] = room_idx
-        
-        # Second pass: fix room violations
-        events_to_move = []
-        for room_idx in range(len(self.rooms)):
-            for timeslot_idx in range(len(self.timeslots)):
-                event_id = mutant_vector[room_idx][timeslot_idx]
-                if event_id is not None:
-                    class_event = self.events_map.get(event_id)
-                    if class_event:
-                        day_idx = timeslot_idx // input_data.hours
-                        course = input_data.getCourse(class_event.course_id)
-                        course_id = getattr(course, 'course_id', None) or getattr(course, 'id', None) or getattr(course, 'code', None) if course else class_event.course_id
-                        course_day_key = (course_id, day_idx, class_event.student_group.id)
-                        expected_room = course_day_room_mapping.get(course_day_key)
-                        
-                        if expected_room is not None and room_idx != expected_room:
-                            mutant_vector[room_idx][timeslot_idx] = None
-                            events_to_move.append((event_id, expected_room, timeslot_idx))
-        
-        # Third pass: place moved events in correct rooms
-        for event_id, correct_room, original_timeslot in events_to_move:
-            placed = False
-            # Try to find an available slot in the correct room
-            for timeslot in range(len(self.timeslots)):
-                if self.is_slot_available(mutant_vector, correct_room, timeslot):
-                    mutant_vector[correct_room][timeslot] = event_id
-                    placed = True
-                    break
-            
-            # If not placed, it will be handled by the repair function
-        
-        # Repair course allocations to ensure all events are scheduled
-        mutant_vector = self.verify_and_repair_course_allocations(mutant_vector)
-        
-        # Final pass to ensure multi-hour courses are consecutive
-        mutant_vector = self.ensure_consecutive_slots(mutant_vector)
-        
-        # CRITICAL SAFETY: Ensure NO student group clashes after mutation
-        mutant_vector = self.prevent_student_group_clashes(mutant_vector)
-        
-        return mutant_vector
-
-    def prevent_student_group_clashes(self, chromosome):
-        """
-        Smart clash prevention that tries to move conflicting events rather than just deleting them.
-        This prevents missing classes while still eliminating student group clashes.
-        """
-        max_attempts = 5  # Increased attempts
-        
-        for attempt in range(max_attempts):
-            clashes_found = False
-            
-            # Check each timeslot for student group conflicts
-            for t_idx in range(len(self.timeslots)):
-                student_groups_seen = {}
-                conflicting_events = []
-                
-                # First pass: identify all conflicts in this timeslot
-                for r_idx in range(len(self.rooms)):
-                    event_id = chromosome[r_idx, t_idx]
-                    if event_id is not None:
-                        event = self.events_map.get(event_id)
-                        if event:
-                            sg_id = event.student_group.id
-                            if sg_id in student_groups_seen:
-                                # Conflict detected - both events clash
-                                conflicting_events.append((r_idx, event_id))
-                                clashes_found = True
-                            else:
-                                student_groups_seen[sg_id] = (r_idx, event_id)
-                
-                # Second pass: try to move conflicting events to other slots
-                for r_idx, event_id in conflicting_events:
-                    event = self.events_map.get(event_id)
-                    course = input_data.getCourse(event.course_id)
-                    
-                    # Clear the conflicting position
-                    chromosome[r_idx, t_idx] = None
-                    
-                    # Try to find an alternative slot for this event
-                    moved = False
-                    alternative_slots = []
-                    
-                    for alt_r_idx, room in enumerate(self.rooms):
-                        if self.is_room_suitable(room, course):
-                            for alt_t_idx in range(len(self.timeslots)):
-                                if (chromosome[alt_r_idx, alt_t_idx] is None and
-                                    self.is_slot_available_for_event(chromosome, alt_r_idx, alt_t_idx, event) and
-                                    self._is_student_group_available(chromosome, event.student_group.id, alt_t_idx) and
-                                    self._is_lecturer_available(chromosome, event.faculty_id, alt_t_idx)):
-                                    alternative_slots.append((alt_r_idx, alt_t_idx))
-                    
-                    if alternative_slots:
-                        # Move to a good alternative slot
-                        alt_r, alt_t = random.choice(alternative_slots)
-                        chromosome[alt_r, alt_t] = event_id
-                        moved = True
-                    else:
-                        # If no perfect slot, try to find any suitable room slot
-                        for alt_r_idx, room in enumerate(self.rooms):
-                            if self.is_room_suitable(room, course):
-                                for alt_t_idx in range(len(self.timeslots)):
-                                    if (chromosome[alt_r_idx, alt_t_idx] is None and
-                                        self.is_slot_available_for_event(chromosome, alt_r_idx, alt_t_idx, event)):
-                                        chromosome[alt_r_idx, alt_t_idx] = event_id
-                                        moved = True
-                                        break
-                                if moved:
-                                    break
-                    
-                    # If we couldn't move it anywhere, it becomes a missing class
-                    # This will be handled by the repair function later
-            
-            if not clashes_found:
-                break
-        
-        return chromosome
-
-    def verify_no_student_group_clashes(self, chromosome):
-        """
-        VERIFICATION FUNCTION: Checks that absolutely NO student group clashes exist.
-        Returns True if no clashes, False if clashes found.
-        """
-        for t_idx in range(len(self.timeslots)):
-            student_groups_seen = set()
-            
-            for r_idx in range(len(self.rooms)):
-                event_id = chromosome[r_idx, t_idx]
-                if event_id is not None:
-                    event = self.events_map.get(event_id)
-                    if event:
-                        sg_id = event.student_group.id
-                        if sg_id in student_groups_seen:
-                            print(f"❌ CRITICAL ERROR: Student group clash detected at timeslot {t_idx}!")
-                            print(f"   Student group {sg_id} appears multiple times at the same time!")
-                            return False
-                        student_groups_seen.add(sg_id)
-        
-        print("✅ VERIFIED: NO student group clashes detected!")
-        return True
-
-    def count_non_none(self, arr):
-        # Flatten the 2D array and count elements that are not None
-        return np.count_nonzero(arr != None)
-    
-    def crossover(self, target_vector, mutant_vector):
-        """
-        Simple, robust crossover that avoids creating student group clashes.
-        """
-        trial_vector = target_vector.copy()
-        num_rooms, num_timeslots = target_vector.shape
-        
-        # Ensure at least one gene from the mutant vector is picked (j_rand)
-        j_rand_r = random.randrange(num_rooms)
-        j_rand_t = random.randrange(num_timeslots)
-
-        for r in range(num_rooms):
-            for t in range(num_timeslots):
-                if random.random() < self.CR or (r == j_rand_r and t == j_rand_t):
-                    mutant_event_id = mutant_vector[r, t]
-                    
-                    # Simple placement - if mutant slot is None, just place it
-                    if mutant_event_id is None:
-                        trial_vector[r, t] = None
-                    else:
-                        # For non-None events, check basic safety
-                        mutant_event = self.events_map.get(mutant_event_id)
-                        if mutant_event:
-                            # Simple clash check - only place if student group is available
-                            if self._is_student_group_available(trial_vector, mutant_event.student_group.id, t):
-                                trial_vector[r, t] = mutant_event_id
-                    
-        return trial_vector
-
-    
-    def evaluate_fitness(self, chromosome):
-        # Optimization: Use cached fitness if available
-        chromosome_key = str(chromosome.tobytes())
-        if chromosome_key in self.fitness_cache:
-            return self.fitness_cache[chromosome_key]
-        
-        # Use the centralized Constraints class for consistent evaluation
-        fitness = self.constraints.evaluate_fitness(chromosome)
-        
-        # Cache management: prevent unlimited growth (reduced frequency for speed)
-        if len(self.fitness_cache) > 1000:  # Reduced from 2000 for faster cache management
-            # Keep only the most recent 500 entries
-            keys_to_remove = list(self.fitness_cache.keys())[:-500]
-            for key in keys_to_remove:
-                del self.fitness_cache[key]
-        
-        # Cache the result
-        self.fitness_cache[chromosome_key] = fitness
-        return fitness
-
-    # Original DE constraint methods preserved for reference
-    # These are now replaced by the centralized Constraints class above   
-
-    def check_room_constraints(self, chromosome):
-        """
-        rooms must meet the capacity and type of the scheduled event
-        """
-        point = 0
-        for room_idx in range(len(self.rooms)):
-            room = self.rooms[room_idx]
-            for timeslot_idx in range(len(self.timeslots)):
-                class_event = self.events_map.get(chromosome[room_idx][timeslot_idx])
-                if class_event is not None:
-                    course = input_data.getCourse(class_event.course_id)
-                    # H1: Room capacity and type constraints
-                    if room.room_type != course.required_room_type or class_event.student_group.no_students > room.capacity:
-                        point += 1
-
-        return point
-       
-    
-    def check_student_group_constraints(self, chromosome):
-        penalty = 0
-        for i in range(len(self.timeslots)):
-            simultaneous_class_events = chromosome[:, i]
-            student_group_watch = set()
-            for class_event_idx in simultaneous_class_events:
-                if class_event_idx is not None:
-                    class_event = self.events_map.get(class_event_idx)
-                    student_group = class_event.student_group
-                    if student_group.id in student_group_watch:
-                        penalty += 1
-                    else:
-                        student_group_watch.add(student_group.id)
-
-        return penalty
-    
-    def check_lecturer_availability(self, chromosome):
-        penalty = 0
-        for i in range(len(self.timeslots)):
-            simultaneous_class_events = chromosome[:, i]
-            lecturer_watch = set()
-            for class_event_idx in simultaneous_class_events:
-                if class_event_idx is not None:
-                    class_event = self.events_map.get(class_event_idx)
-                    faculty_id = class_event.faculty_id
-                    if faculty_id in lecturer_watch:
-                        penalty += 1
-                    else:
-                        lecturer_watch.add(faculty_id)
-
-        return penalty
-
-
-    # def check_room_time_conflict(self, chromosome):
-        penalty = 0
-
-        # Check if multiple events are scheduled in the same room at the same time
-        for room_idx, room_schedule in enumerate(chromosome):
-            for timeslot_idx, class_event in enumerate(room_schedule):
-                if class_event is not None:
-                    # H3: Ensure only one event is scheduled per timeslot per room
-                    if isinstance(class_event, list) and len(class_event) > 1:
-                        penalty += 1000  # Penalty for multiple events in the same room at the same time
-
-        return penalty
-# -------------------------------------------
-    # def check_valid_timeslot(self, chromosome):
-    #     penalty = 0
-        
-    #     for room_idx, room_schedule in enumerate(chromosome):
-    #         for timeslot_idx, class_event in enumerate(room_schedule):
-    #             if class_event is not None:  # Event scheduled
-    #                 # H5: Ensure the timeslot is valid for this event
-    #                 if not self.timeslots[timeslot_idx].is_valid_for_event(class_event):
-    #                     penalty += 500  # Moderate penalty for invalid timeslot
-
-    #     return penalty
-
-
-    def select(self, target_idx, trial_vector):
-        trial_violations = self.constraints.get_constraint_violations(trial_vector)
-        target_violations = self.constraints.get_constraint_violations(self.population[target_idx])
-
-        # Define which constraints are "hard" and must be prioritized
-        hard_constraints = [
-            'student_group_constraints', 
-            'lecturer_availability', 
-            'course_allocation_completeness',
-            'room_time_conflict',
-            'break_time_constraint',
-            'room_constraints',
-            'same_course_same_room_per_day',
-            'lecturer_schedule_constraints',
-            'lecturer_workload_constraints'
-        ]
-
-        trial_hard_violations = sum(trial_violations.get(c, 0) for c in hard_constraints)
-        target_hard_violations = sum(target_violations.get(c, 0) for c in hard_constraints)
-
-        accept = False
-        if trial_hard_violations < target_hard_violations:
-            accept = True
-        elif trial_hard_violations == target_hard_violations:
-            # If hard constraints are equal, compare total fitness (which includes soft constraints)
-            if trial_violations.get('total', float('inf')) <= target_violations.get('total', float('inf')):
-                accept = True
-
-        if accept:
-            # Decouple repair from selection: Accept the trial vector as is.
-            # The repair function will be called on all population members later in the main loop.
-            self.population[target_idx] = trial_vector
-
-
-    def run(self, max_generations):
-        # Population already initialized in __init__, don't reinitialize
-        fitness_history = []
-        best_solution = self.population[0]
-        diversity_history = []
-        
-        # Optimization: Calculate initial fitness and find best solution
-        initial_fitness = [self.evaluate_fitness(ind) for ind in self.population]
-        best_idx = np.argmin(initial_fitness)
-        best_solution = self.population[best_idx].copy()
-        best_fitness = initial_fitness[best_idx]
-        
-        # Track fitness for early convergence detection
-        stagnation_counter = 0
-        last_improvement = best_fitness
-
-        for generation in range(max_generations):
-            generation_improved = False
-            
-            for i in range(self.pop_size):
-                # Step 1: Mutation
-                mutant_vector = self.mutate(i)
-                
-                # Step 2: Crossover
-                target_vector = self.population[i]
-                trial_vector = self.crossover(target_vector, mutant_vector)
-                
-                # Step 3: Repair course allocations FIRST (highest priority)
-                trial_vector = self.verify_and_repair_course_allocations(trial_vector)
-                
-                # Step 4: THEN handle clashes (lower priority)
-                trial_vector = self.prevent_student_group_clashes(trial_vector)
-                
-                # Step 5: Final repair to catch any missing events after clash resolution
-                trial_vector = self.verify_and_repair_course_allocations(trial_vector)
-
-                # Step 6: Evaluation and Selection
-                self.select(i, trial_vector)
-                
-            # Optimization: Find best solution more efficiently
-            current_fitness = [self.evaluate_fitness(ind) for ind in self.population]
-            current_best_idx = np.argmin(current_fitness)
-            current_best_fitness = current_fitness[current_best_idx]
-            
-            if current_best_fitness < best_fitness:
-                best_solution = self.population[current_best_idx].copy()
-                best_fitness = current_best_fitness
-                stagnation_counter = 0
-                last_improvement = best_fitness
-            else:
-                stagnation_counter += 1
-            
-            fitness_history.append(best_fitness)
-
-            # Optimization: Calculate diversity less frequently for speed
-            if generation % 20 == 0:  # Only every 20 generations (reduced from 10)
-                population_diversity = self.calculate_population_diversity()
-                diversity_history.append(population_diversity)
-
-            print(f"Best solution for generation {generation+1}/{max_generations} has a fitness of: {best_fitness}")
-
-            if best_fitness == self.desired_fitness:
-                print(f"Solution with desired fitness of {self.desired_fitness} found at Generation {generation}! 🎉")
-                break  # Stop if the best solution has no constraint violations
-            
-            # Early termination if no improvement for 20 generations (reduced from 50)
-            if stagnation_counter >= 20:
-                print(f"Early termination due to stagnation after {stagnation_counter} generations without improvement at generation {generation+1}")
-                print(f"Final fitness achieved: {best_fitness}")
-                break
-            
-            # Additional early termination if no improvement for many generations and fitness is acceptable
-            if stagnation_counter > 50 and best_fitness < 100:
-                print(f"Early termination due to convergence at generation {generation+1}")
-                break
-
-        # CRITICAL: Ensure the final best solution has NO missing classes
-        # Track fitness before post-algorithm repairs
-        pre_repair_fitness = self.evaluate_fitness(best_solution)
-        print(f"\n🔧 APPLYING POST-ALGORITHM REPAIRS...")
-        print(f"   Fitness before repairs: {pre_repair_fitness:.4f}")
-        
-        best_solution = self.verify_and_repair_course_allocations(best_solution)
-        best_solution = self.ensure_consecutive_slots(best_solution)
-        best_solution = self.prevent_student_group_clashes(best_solution)
-        
-        # FINAL repair pass to absolutely guarantee no missing classes
-        best_solution = self.verify_and_repair_course_allocations(best_solution)
-        
-        # Track fitness after repairs
-        post_repair_fitness = self.evaluate_fitness(best_solution)
-        repair_impact = post_repair_fitness - pre_repair_fitness
-        print(f"   Fitness after repairs: {post_repair_fitness:.4f}")
-        
-        if abs(repair_impact) > 0.01:
-            impact_direction = "improved" if repair_impact < 0 else "worsened"
-            print(f"   🎯 Repair impact: {impact_direction} fitness by {abs(repair_impact):.4f} points")
-        else:
-            print(f"   ✅ Repair impact: minimal change ({repair_impact:.4f})")
-        print(f"🔧 POST-ALGORITHM REPAIRS COMPLETE\n")
-        
-        return best_solution, fitness_history, generation, diversity_history
-
-
-    def print_timetable(self, individual, student_group, days, hours_per_day, day_start_time=9):
-        timetable = [["" for _ in range(days)] for _ in range(hours_per_day)]
-        
-        # First, fill break time slots on Mon, Wed, Fri
-        break_hour = 4  # 13:00 is the 5th hour (index 4) starting from 9:00
-        if break_hour < hours_per_day:
-            for day in range(days):
-                if day in [0, 2, 4]: # Monday, Wednesday, Friday
-                    timetable[break_hour][day] = "BREAK"
-        
-        for room_idx, room_slots in enumerate(individual):
-            for timeslot_idx, event in enumerate(room_slots):
-                class_event = self.events_map.get(event)
-                if class_event is not None and class_event.student_group.id == student_group.id:
-                    day = timeslot_idx // hours_per_day
-                    hour = timeslot_idx % hours_per_day
-                    
-                    # Check if it's a break slot that should be skipped in the display
-                    is_display_break = (hour == break_hour and day in [0, 2, 4])
-
-                    if day < days and not is_display_break:
-                        course = input_data.getCourse(class_event.course_id)
-                        faculty = input_data.getFaculty(class_event.faculty_id)
-                        course_code = course.code if course is not None else "Unknown"
-                        
-                        # Use faculty name if available, otherwise use faculty email (ID)
-                        if faculty is not None:
-                            faculty_display = faculty.name if faculty.name else faculty.faculty_id
-                        else:
-                            faculty_display = "Unknown"
-                        
-                        room_obj = input_data.rooms[room_idx]
-                        room_display = getattr(room_obj, "name", getattr(room_obj, "Id", str(room_idx)))
-                        
-                        # Format as: Course Code\nRoom Name\nFaculty Name
-                        timetable[hour][day] = f"{course_code}\n{room_display}\n{faculty_display}"
-        return timetable
-
-    def print_all_timetables(self, individual, days, hours_per_day, day_start_time=9):
-        # app.layout = html.Div([
-        #     html.H1("Timetable"),
-        #     html.Div([
-        #         html.Label("Select Student Group:"),
-        #         dcc.Dropdown(
-        #             id='student-group-dropdown',
-        #             options=[{'label': student_group.name, 'value': student_group.id} for student_group in input_data.student_groups],
-        #             value=input_data.student_groups[0].id
-        #         ),
-        #     ]),
-        #     html.Div(id='timetable-container')
-        # ])
-        data = []
-        # Find all unique student groups in the individual
-        student_groups = input_data.student_groups
-        
-        # Print timetable for each student group
-        for student_group in student_groups:
-            timetable = self.print_timetable(individual, student_group, days, hours_per_day, day_start_time)
-            rows = []
-            for hour in range(hours_per_day):
-                time_label = f"{day_start_time + hour}:00"
-                row = [time_label] + [timetable[hour][day] for day in range(days)]
-                rows.append(row)
-            data.append({"student_group": student_group, "timetable": rows})
-        return data
-
-    def ensure_consecutive_slots(self, chromosome):
-        """
-        Scans the timetable and attempts to repair any multi-hour courses
-        that have been split into non-consecutive slots.
-        """
-        # Group all scheduled events by course and student group
-        events_by_course = {}
-        for r_idx in range(len(self.rooms)):
-            for t_idx in range(len(self.timeslots)):
-                event_id = chromosome[r_idx, t_idx]
-                if event_id is not None:
-                    event = self.events_map.get(event_id)
-                    if not event: continue
-                    
-                    course_key = (event.student_group.id, event.course_id)
-                    if course_key not in events_by_course:
-                        events_by_course[course_key] = []
-                    events_by_course[course_key].append({'event_id': event_id, 'pos': (r_idx, t_idx)})
-
-        for course_key, events in events_by_course.items():
-            hours_required = len(events)
-            if hours_required < 2:
-                continue # Not a multi-hour course that needs checking
-
-            # Check if the events are consecutive
-            positions = sorted([e['pos'] for e in events], key=lambda p: p[1])
-            is_consecutive = True
-            for i in range(len(positions) - 1):
-                # Check if they are in the same room and adjacent timeslots
-                if not (positions[i][0] == positions[i+1][0] and positions[i][1] + 1 == positions[i+1][1]):
-                    is_consecutive = False
-                    break
-            
-            if is_consecutive:
-                continue # This course is fine, move to the next one
-
-            # --- If not consecutive, attempt to repair ---
-            # 1. Find a new, valid, consecutive block of slots for the entire course
-            student_group_id, course_id = course_key
-            course = self.input_data.getCourse(course_id)
-            
-            possible_blocks = []
-            for r_idx, room in enumerate(self.rooms):
-                if self.is_room_suitable(room, course):
-                    for t_start in range(len(self.timeslots) - hours_required + 1):
-                        is_block_valid = True
-                        # Temporarily clear old positions to check availability
-                        temp_chromosome = chromosome.copy()
-                        for event_info in events:
-                            r, t = event_info['pos']
-                            temp_chromosome[r, t] = None
-                        
-                        for i in range(hours_required):
-                            t_check = t_start + i
-                            event_to_place = self.events_list[events[i]['event_id']]
-                            
-                            # Check if the new slot is valid for this event
-                            if not (self.is_slot_available_for_event(temp_chromosome, r_idx, t_check, event_to_place) and
-                                    self._is_student_group_available(temp_chromosome, student_group_id, t_check) and
-                                    self._is_lecturer_available(temp_chromosome, event_to_place.faculty_id, t_check)):
-                                is_block_valid = False
-                                break
-                        
-                        if is_block_valid:
-                            possible_blocks.append((r_idx, t_start))
-            
-            # 2. If a valid block is found, perform the move
-            if possible_blocks:
-                new_r, new_t_start = random.choice(possible_blocks)
-                
-                # Clear the old, non-consecutive event positions
-                for event_info in events:
-                    r, t = event_info['pos']
-                    chromosome[r, t] = None
-                
-                # Place the events in the new consecutive block
-                for i in range(hours_required):
-                    chromosome[new_r, new_t_start + i] = events[i]['event_id']
-
-        return chromosome
-
-    def verify_and_repair_course_allocations(self, chromosome):
-        """
-        AGGRESSIVE method to ensure every required event is scheduled exactly once.
-        MISSING CLASSES MUST NEVER OCCUR - this is the highest priority.
-        """
-        max_repair_passes = 5  # Increased from 3
-        
-        for pass_num in range(max_repair_passes):
-            # --- Phase 1: Count scheduled events ---
-            scheduled_event_counts = {}
-            for r_idx in range(len(self.rooms)):
-                for t_idx in range(len(self.timeslots)):
-                    event_id = chromosome[r_idx, t_idx]
-                    if event_id is not None:
-                        scheduled_event_counts[event_id] = scheduled_event_counts.get(event_id, 0) + 1
-
-            # --- Phase 2: Remove duplicates ---
-            extra_event_ids = {event_id for event_id, count in scheduled_event_counts.items() if count > 1}
-            
-            if extra_event_ids:
-                positions_to_clear = []
-                for event_id in extra_event_ids:
-                    locations = np.argwhere(chromosome == event_id)
-                    # Keep one, mark the rest for removal
-                    for i in range(1, len(locations)):
-                        positions_to_clear.append(tuple(locations[i]))
-                
-                for r_idx, t_idx in positions_to_clear:
-                    chromosome[r_idx, t_idx] = None
-            
-            # --- Phase 3: AGGRESSIVELY place missing events ---
-            scheduled_events = set(np.unique([e for e in chromosome.flatten() if e is not None]))
-            all_required_events = set(range(len(self.events_list)))
-            missing_events = list(all_required_events - scheduled_events)
-            random.shuffle(missing_events)
-
-            if not missing_events:
-                break  # All events are scheduled
-
-            for event_id in missing_events:
-                event = self.events_list[event_id]
-                course = input_data.getCourse(event.course_id)
-                if not course: continue
-
-                placed = False
-                
-                # Strategy 1: Find perfect slots (no conflicts)
-                perfect_slots = []
-                for r_idx, room in enumerate(self.rooms):
-                    if self.is_room_suitable(room, course):
-                        for t_idx in range(len(self.timeslots)):
-                            if (chromosome[r_idx, t_idx] is None and
-                                self.is_slot_available_for_event(chromosome, r_idx, t_idx, event) and
-                                self._is_student_group_available(chromosome, event.student_group.id, t_idx) and
-                                self._is_lecturer_available(chromosome, event.faculty_id, t_idx)):
-                                perfect_slots.append((r_idx, t_idx))
-                
-                if perfect_slots:
-                    r, t = random.choice(perfect_slots)
-                    chromosome[r, t] = event_id
-                    placed = True
-                    continue
-                
-                # Strategy 2: Accept student/lecturer conflicts but respect room/time constraints
-                acceptable_slots = []
-                for r_idx, room in enumerate(self.rooms):
-                    if self.is_room_suitable(room, course):
-                        for t_idx in range(len(self.timeslots)):
-                            if (chromosome[r_idx, t_idx] is None and
-                                self.is_slot_available_for_event(chromosome, r_idx, t_idx, event)):
-                                acceptable_slots.append((r_idx, t_idx))
-                
-                if acceptable_slots:
-                    r, t = random.choice(acceptable_slots)
-                    chromosome[r, t] = event_id
-                    placed = True
-                    continue
-                
-                # Strategy 3: FORCE placement by displacing an existing event
-                if not placed:
-                    # Find any suitable room and displace whatever is there
-                    for r_idx, room in enumerate(self.rooms):
-                        if self.is_room_suitable(room, course):
-                            for t_idx in range(len(self.timeslots)):
-                                # Check basic availability (break time, lecturer schedule)
-                                if self.is_slot_available_for_event(chromosome, r_idx, t_idx, event):
-                                    # Force place this event, even if it displaces another
-                                    displaced_event_id = chromosome[r_idx, t_idx]
-                                    chromosome[r_idx, t_idx] = event_id
-                                    placed = True
-                                    
-                                    # If we displaced something, try to reschedule it quickly
-                                    if displaced_event_id is not None:
-                                        self._try_quick_reschedule(chromosome, displaced_event_id)
-                                    break
-                            if placed:
-                                break
-                
-                # If STILL not placed, something is very wrong - but we continue
-
-        return chromosome
-    
-    def _try_quick_reschedule(self, chromosome, displaced_event_id):
-        """Helper to quickly try to reschedule a displaced event"""
-        displaced_event = self.events_list[displaced_event_id]
-        displaced_course = input_data.getCourse(displaced_event.course_id)
-        
-        # Try to find any suitable empty slot
-        for r_idx, room in enumerate(self.rooms):
-            if self.is_room_suitable(room, displaced_course):
-                for t_idx in range(len(self.timeslots)):
-                    if (chromosome[r_idx, t_idx] is None and
-                        self.is_slot_available_for_event(chromosome, r_idx, t_idx, displaced_event)):
-                        chromosome[r_idx, t_idx] = displaced_event_id
-                        return True
-        return False
-
-    def count_course_occurrences(self, chromosome, student_group):
-        """
-        Count how many times each course appears for a specific student group
-        """
-        course_counts = {}
-        
-        for room_idx in range(len(self.rooms)):
-            for timeslot_idx in range(len(self.timeslots)):
-                event_id = chromosome[room_idx][timeslot_idx]
-                if event_id is not None:
-                    event = self.events_map.get(event_id)
-                    if event and event.student_group.id == student_group.id:
-                        course_id = event.course_id
-                        course_counts[course_id] = course_counts.get(course_id, 0) + 1
-        
-        return course_counts
-
-    def diagnose_course_allocations(self, chromosome):
-        """
-        Diagnostic method to check course allocations for debugging
-        """
-        print("\n=== COURSE ALLOCATION DIAGNOSIS ===")
-        
-        # Count total scheduled events
-        scheduled_events = set()
-        for room_idx in range(len(self.rooms)):
-            for timeslot_idx in range(len(self.timeslots)):
-                event_id = chromosome[room_idx][timeslot_idx]
-                if event_id is not None:
-                    scheduled_events.add(event_id)
-        
-        print(f"Total events: {len(self.events_list)}")
-        print(f"Scheduled events: {len(scheduled_events)}")
-        print(f"Missing events: {len(self.events_list) - len(scheduled_events)}")
-        
-        # Check each student group
-        for student_group in self.student_groups:
-            print(f"\nStudent Group: {student_group.name}")
-            course_counts = self.count_course_occurrences(chromosome, student_group)
-            
-            # Calculate expected hours considering 1-credit = 3-hour conversion
-            expected_hours = []
-            for i in range(len(student_group.hours_required)):
-                required_hours = student_group.hours_required[i]
-                if required_hours == 1:
-                    required_hours = 3
-                expected_hours.append(required_hours)
-            
-            total_expected = sum(expected_hours)
-            total_actual = sum(course_counts.values())
-            
-            print(f"  Total hours: Expected {total_expected}, Got {total_actual}")
-            
-            for i, course_id in enumerate(student_group.courseIDs):
-                expected = expected_hours[i]
-                actual = course_counts.get(course_id, 0)
-                status = "✓" if actual == expected else "✗"
-                print(f"  {course_id}: Expected {expected}, Got {actual} {status}")
-        
-        print("=== END DIAGNOSIS ===\n")
 
 # ============================================================================
 # DEMO/TEST CODE SECTION
 # This code only runs when this file is executed directly (python differential_evolution.py)
 # It will NOT run when imported by app.py
 # ============================================================================
+# The engine above only uses the input_data instance it is given; the static
+# dataset is loaded here for the demo and the Dash UI below.
+from input_data import input_data
+
+# Create global constraint checker for real-time validation
+global_constraints = Constraints(input_data)
+
 if __name__ == '__main__':
     # Create DE instance and run optimization
     print("Starting Differential Evolution")
@@ -3725,23 +2420,16 @@ def handle_missing_class_selection(n_clicks_list, class_ids, missing_data, all_t
 def find_lecturer_for_course(course_identifier, group_name):
     """Find the lecturer assigned to teach a specific course for a specific group using code, ID, or name."""
     try:
-        # Look through the input data to find the lecturer for this course and group
-        for student_group in input_data.student_groups:
-            if student_group.name == group_name:
-                for i, course_id_from_group in enumerate(student_group.courseIDs):
-                    course = input_data.getCourse(course_id_from_group)
-                    # MODIFIED: Safely check against course ID, code, or name, ignoring case and whitespace.
-                    if course and (
-                        str(course_id_from_group).strip().lower() == str(course_identifier).strip().lower() or
-                        str(getattr(course, 'code', '')).strip().lower() == str(course_identifier).strip().lower() or
-                        str(getattr(course, 'name', '')).strip().lower() == str(course_identifier).strip().lower()
-                    ):
-                        # Found the course, get the lecturer
-                        faculty_id = student_group.teacherIDS[i]
-                        faculty = input_data.getFaculty(faculty_id)
-                        if faculty:
-                            return faculty.name if faculty.name else faculty.faculty_id
-                        break  # Found the course, no need to check other courses for this group
+        student_group = input_data.getStudentGroupByName(group_name)
+        if student_group:
+            # Several courses can share a name; use the one this group takes
+            for course in input_data.findCourses(course_identifier):
+                faculty_id = input_data.getCourseLecturer(student_group.id, course.code)
+                if faculty_id is not None:
+                    faculty = input_data.getFaculty(faculty_id)
+                    if faculty:
+                        return faculty.name if faculty.name else faculty.faculty_id
+                    break
         return "Unknown"
     except Exception as e:
         print(f"Error finding lecturer for course {course_identifier}: {e}")
@@ -3939,23 +2627,16 @@ def handle_room_selection(n_clicks_list, room_ids, current_room_data, all_timeta
 def find_lecturer_for_course(course_identifier, group_name):
     """Find the lecturer assigned to teach a specific course for a specific group using code, ID, or name."""
     try:
-        # Look through the input data to find the lecturer for this course and group
-        for student_group in input_data.student_groups:
-            if student_group.name == group_name:
-                for i, course_id_from_group in enumerate(student_group.courseIDs):
-                    course = input_data.getCourse(course_id_from_group)
-                    # MODIFIED: Check if the identifier matches the course code, ID, or name (case-insensitive)
-                    if course and (
-                        str(course.code).strip().lower() == str(course_identifier).strip().lower() or
-                        str(course.id).strip().lower() == str(course_identifier).strip().lower() or
-                        str(course.name).strip().lower() == str(course_identifier).strip().lower()
-                    ):
-                        # Found the course, get the lecturer
-                        faculty_id = student_group.teacherIDS[i]
-                        faculty = input_data.getFaculty(faculty_id)
-                        if faculty:
-                            return faculty.name if faculty.name else faculty.faculty_id
-                        break  # Found the course, no need to check other courses for this group
+        student_group = input_data.getStudentGroupByName(group_name)
+        if student_group:
+            # Several courses can share a name; use the one this group takes
+            for course in input_data.findCourses(course_identifier):
+                faculty_id = input_data.getCourseLecturer(student_group.id, course.code)
+                if faculty_id is not None:
+                    faculty = input_data.getFaculty(faculty_id)
+                    if faculty:
+                        return faculty.name if faculty.name else faculty.faculty_id
+                    break
         return "Unknown"
     except Exception as e:
         print(f"Error finding lecturer for course {course_identifier}: {e}")
@@ -4218,7 +2899,7 @@ def recompute_constraint_violations_simplified(timetables_data, rooms_data=None,
                                 lecturer_usage[lecturer].append({'group': group_name, 'course': course_code})
 
                                 if room in room_lookup:
-                                    group_size = next((g.get('no_students', 0) for g in input_data.student_groups if g.name == group_name), 0)
+                                    group_size = getattr(input_data.getStudentGroupByName(group_name), 'no_students', 0)
                                     if group_size > room_lookup[room].get('capacity', 999):
                                         violations['Room Capacity/Type Conflicts'].append({
                                             'type': 'Room Capacity Exceeded', 'room': room, 'group': group_name,
@@ -5,12 +5,20 @@ passed from the Flask application instead of static imports.
 """
 
 import random
+import time
 from typing import List
 import copy
-from utils import Utility
 from entitities.Class import Class
 import numpy as np
 from constraints import Constraints
+from vectorized_constraints import VectorizedConstraints, VIOLATION_KEYS, violation_summary
+from incremental_fitness import IncrementalFitness
+from feasibility_masks import FeasibilityMasks
+from fitness_cache import FitnessCache, chromosome_digest
+from parallel_generation import ParallelGeneration
+from vectorized_operators import BatchedRandom, clash_cells, safe_genes
+from problem_model import ProblemModel
+from compact_chromosome import CompactChromosome, EMPTY
 import re
 
 class DifferentialEvolution:
@@ -25,61 +33,68 @@ class DifferentialEvolution:
         )
         self.student_groups = input_data.student_groups
         self.courses = input_data.courses
-        self.events_list, self.events_map = self.create_events()
+        self.model = ProblemModel(input_data)
+        self.events_list, self.events_map = self.model.events_list, self.model.events_map
         self.pop_size = pop_size
         self.F = F
         self.CR = CR
-        self.constraints = Constraints(input_data)
+        self.constraints = Constraints(input_data, model=self.model)
+        # Vectorised evaluator for the hot path; Constraints stays the reference for debug/detailed reports
+        self.evaluator = VectorizedConstraints(self.constraints)
+        # Room type / break time / lecturer availability per (course, lecturer), built once
+        self.feasibility = FeasibilityMasks(self.evaluator)
+        # Number of candidate slots scored with the incremental evaluator when moving an event
+        self.move_candidates = 8
+        # Chance that a mutation move takes a random safe slot instead of the best-scoring sample
+        self.mutation_explore_rate = 0.5
+        # Operators draw their random decisions in batches (seeded from `random` so runs stay reproducible)
+        self.rng = BatchedRandom(random.getrandbits(64))
         
-        # Optimization: Cache fitness values to avoid recalculation
-        self.fitness_cache = {}
+        # Optimization: content-addressed LRU cache of violation breakdowns (see fitness_cache.py)
+        self.fitness_cache = FitnessCache()
+
+        # Cooperative stop (time budget / cancellation): set by run(), checked between generations
+        self.should_stop = None
+        self.stopped_early = False
+        # Best solution of the current run, updated every generation (read by progress callbacks)
+        self.best_solution = None
+        # Generation-loop state that evolve() carries from one call to the next
+        self.best_fitness = None
+        self.stagnation_counter = 0
+        self.generations_done = 0
+        self.converged = False
         
-        # Optimization: Pre-calculate building assignments for rooms to speed up evaluation
-        self.room_building_cache = {}
-        for idx, room in enumerate(self.rooms):
-            self.room_building_cache[idx] = self.get_room_building(room)
-        
-        # Optimization: Pre-calculate engineering groups to avoid repeated checks
-        self.engineering_groups = set()
-        for student_group in self.student_groups:
-            group_name = student_group.name.lower()
-            if any(keyword in group_name for keyword in [
-                'engineering', 'eng', 'computer science', 'software engineering',
-                'mechatronics', 'electrical', 'mechanical', 'csc', 'sen'
-            ]):
-                self.engineering_groups.add(student_group.id)
+        # Optimization: building per room and engineering flag per group come from the compiled model
+        self.room_building_cache = dict(enumerate(self.model.room_building_names))
+        self.engineering_groups = {
+            student_group.id for student_group in self.student_groups
+            if self.model.is_engineering_group(student_group.id)
+        }
         
         self.population = self.initialize_population()
 
-    def create_events(self):
-        """Create events list and mapping for the timetabling problem"""
-        events_list = []
-        event_map = {}
-
-        idx = 0
-        for student_group in self.student_groups:
-            for i in range(student_group.no_courses):
-                hourcount = 1 
-                while hourcount <= student_group.hours_required[i]:
-                    event = Class(student_group, student_group.teacherIDS[i], student_group.courseIDs[i])
-                    events_list.append(event)
-                    event_map[idx] = event
-                    idx += 1
-                    hourcount += 1
-                    
-        return events_list, event_map
-
     def initialize_population(self):
         """Initialize the population with valid chromosomes"""
         population = [] 
         for i in range(self.pop_size):
             chromosome = self.create_chromosome()
             population.append(chromosome)
-        return np.array(population)
+        return population
+
+    def new_chromosome(self):
+        """Empty compact chromosome sized for this problem"""
+        return self.track_occupancy(CompactChromosome(len(self.rooms), len(self.timeslots), len(self.events_list)))
+
+    def track_occupancy(self, chromosome):
+        """Make sure the chromosome keeps group/lecturer x timeslot counts for O(1) availability checks."""
+        if chromosome.group_slots is None:
+            chromosome.track_occupancy(self.model.event_group, self.model.event_lecturer,
+                                       len(self.student_groups), len(self.model.lecturer_index))
+        return chromosome
 
     def create_chromosome(self):
         """Create a single chromosome (timetable solution)"""
-        chromosome = np.empty((len(self.rooms), len(self.timeslots)), dtype=object)
+        chromosome = self.new_chromosome()
         
         # Group events by student group and course to handle them as blocks
         events_by_group_course = {}
@@ -99,8 +114,8 @@ class DifferentialEvolution:
         random.shuffle(course_items)
 
         for (student_group_id, course_id), event_indices in course_items:
-            course = self.input_data.getCourse(course_id)
-            student_group = self.input_data.getStudentGroup(student_group_id)
+            course = self.model.get_course(course_id)
+            student_group = self.model.get_student_group(student_group_id)
             hours_required = len(event_indices)
 
             if hours_required == 0:
@@ -186,77 +201,21 @@ class DifferentialEvolution:
 
     def is_slot_available(self, chromosome, room_idx, timeslot_idx):
         """Check if a timeslot is available"""
-        if chromosome[room_idx][timeslot_idx] is not None:
+        if chromosome.grid[room_idx, timeslot_idx] != EMPTY:
             return False
         
-        # Check if this is break time (13:00 - 14:00)
-        break_hour = 4  # 13:00 is the 5th hour (index 4) starting from 9:00
-        day = timeslot_idx // self.input_data.hours
-        hour_in_day = timeslot_idx % self.input_data.hours
-        
-        # No break time on Tuesday (1) and Thursday (3)
-        if hour_in_day == break_hour and day not in [1, 3]:
-            return False
-        
-        return True
+        # Break time (13:00 - 14:00 on Mon/Wed/Fri) is precomputed in the feasibility masks
+        return self.feasibility.is_open(None, timeslot_idx)
 
     def is_slot_available_for_event(self, chromosome, room_idx, timeslot_idx, event):
         """Check if a slot is available for a specific event, considering lecturer availability"""
         # Check if the slot is physically empty
-        if chromosome[room_idx][timeslot_idx] is not None:
+        if chromosome.grid[room_idx, timeslot_idx] != EMPTY:
             return False
 
-        # Check for break time
-        break_hour = 4
-        day = timeslot_idx // self.input_data.hours
-        hour_in_day = timeslot_idx % self.input_data.hours
-        if hour_in_day == break_hour and day not in [1, 3]:
-            return False
-
-        # Check lecturer schedule constraints
-        if event and event.faculty_id is not None:
-            faculty = self.input_data.getFaculty(event.faculty_id)
-            if faculty:
-                days_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri"}
-                day_abbr = days_map.get(day)
-
-                # Check day availability
-                is_day_ok = False
-                if isinstance(faculty.avail_days, str):
-                    if faculty.avail_days.upper() == "ALL":
-                        is_day_ok = True
-                    else:
-                        avail_days = [d.strip().capitalize() for d in faculty.avail_days.split(',')]
-                        if day_abbr in avail_days:
-                            is_day_ok = True
-                elif isinstance(faculty.avail_days, list):
-                    avail_days = [d.strip().capitalize() for d in faculty.avail_days]
-                    if "All" in avail_days or day_abbr in avail_days:
-                        is_day_ok = True
-                
-                if not is_day_ok:
-                    return False
-
-                # Check time availability
-                if isinstance(faculty.avail_times, str) and faculty.avail_times.upper() != "ALL":
-                    try:
-                        start_avail_str, end_avail_str = faculty.avail_times.split('-')
-                        start_avail_h = int(start_avail_str.split(':')[0])
-                        end_avail_h = int(end_avail_str.split(':')[0])
-                        
-                        timeslot_obj = self.timeslots[timeslot_idx]
-                        # TimeSlot.start_time may be 0-based hour index (int) or 'HH:MM' string; support both
-                        if isinstance(getattr(timeslot_obj, 'start_time', None), (int, np.integer)):
-                            slot_start_h = 9 + int(timeslot_obj.start_time)
-                        else:
-                            slot_start_h = int(str(timeslot_obj.start_time).split(':')[0])
-
-                        if not (start_avail_h <= slot_start_h < end_avail_h):
-                            return False
-                    except (ValueError, IndexError):
-                        return False
-
-        return True
+        # Break time and lecturer available days/times come from the precomputed masks
+        # (same availability rule as the lecturer schedule constraint used for scoring)
+        return self.feasibility.is_open(event, timeslot_idx)
 
     def is_room_suitable(self, room, course):
         """Check if room is suitable for course"""
@@ -264,231 +223,166 @@ class DifferentialEvolution:
             return False
         return room.room_type == course.required_room_type
     
-    def get_room_building(self, room):
-        """Helper method to determine room building"""
-        if hasattr(room, 'building'):
-            return room.building.upper()
-        elif hasattr(room, 'name') and room.name:
-            room_name = room.name.upper()
-            if 'SST' in room_name:
-                return 'SST'
-            elif 'TYD' in room_name:
-                return 'TYD'
-        elif hasattr(room, 'room_id'):
-            room_id = str(room.room_id).upper()
-            if 'SST' in room_id:
-                return 'SST'
-            elif 'TYD' in room_id:
-                return 'TYD'
-        return 'UNKNOWN'
-
     def _is_student_group_available(self, chromosome, student_group_id, timeslot_idx):
         """Check if a student group is already scheduled at a given timeslot"""
-        for r_idx in range(len(self.rooms)):
-            event_id = chromosome[r_idx][timeslot_idx]
-            if event_id is not None:
-                event = self.events_map.get(event_id)
-                if event and event.student_group.id == student_group_id:
-                    return False
-        return True
+        group_idx = self.model.group_index.get(student_group_id)
+        if group_idx is None:
+            return True
+        return not self.track_occupancy(chromosome).group_busy(group_idx, timeslot_idx)
 
     def _is_lecturer_available(self, chromosome, faculty_id, timeslot_idx):
         """Check if a lecturer is already scheduled at a given timeslot"""
-        for r_idx in range(len(self.rooms)):
-            event_id = chromosome[r_idx][timeslot_idx]
-            if event_id is not None:
-                event = self.events_map.get(event_id)
-                if event and event.faculty_id == faculty_id:
-                    return False
-        return True
+        lecturer_idx = self.model.lecturer_index.get(faculty_id)
+        if lecturer_idx is None:
+            return True
+        return not self.track_occupancy(chromosome).lecturer_busy(lecturer_idx, timeslot_idx)
 
     def find_clash(self, chromosome):
         """Find a random timeslot with a student or lecturer clash"""
-        clash_slots = []
-        for t_idx in range(len(self.timeslots)):
-            simultaneous_events = chromosome[:, t_idx]
-            
-            student_group_watch = set()
-            lecturer_watch = set()
-            has_student_clash = False
-            has_lecturer_clash = False
-            
-            event_ids_in_slot = [e for e in simultaneous_events if e is not None]
-            if len(event_ids_in_slot) <= 1:
-                continue
-
-            for event_id in event_ids_in_slot:
-                event = self.events_map.get(event_id)
-                if not event: 
-                    continue
-                
-                # Check for student clash
-                if event.student_group.id in student_group_watch:
-                    has_student_clash = True
-                student_group_watch.add(event.student_group.id)
-                
-                # Check for lecturer clash
-                if event.faculty_id and event.faculty_id in lecturer_watch:
-                    has_lecturer_clash = True
-                if event.faculty_id:
-                    lecturer_watch.add(event.faculty_id)
-            
-            if has_student_clash or has_lecturer_clash:
-                clash_slots.append(t_idx)
-                
-        if clash_slots:
-            return random.choice(clash_slots)
+        # Student and (assigned) lecturer clashes are read straight from the occupancy counts
+        clash_slots = self.track_occupancy(chromosome).clash_timeslots(self.model.lecturer_is_assigned)
+        if len(clash_slots):
+            return int(self.rng.choice(clash_slots))
         return None
     
     def hamming_distance(self, chromosome1, chromosome2):
         """Calculate Hamming distance between two chromosomes"""
-        return np.sum(chromosome1.flatten() != chromosome2.flatten())
+        return np.count_nonzero(chromosome1.grid != chromosome2.grid)
 
     def calculate_population_diversity(self):
         """Calculate population diversity using sampling for efficiency"""
+        grids = self.population_grid
         if self.pop_size <= 10:
-            total_distance = 0
-            comparisons = 0
-            
-            for i in range(self.pop_size):
-                for j in range(i + 1, self.pop_size):
-                    total_distance += self.hamming_distance(self.population[i], self.population[j])
-                    comparisons += 1
-            
-            return total_distance / comparisons if comparisons > 0 else 0
+            # Hamming distance of every pair from one broadcast comparison of the population tensor
+            first, second = np.triu_indices(len(grids), k=1)
         else:
             # For larger populations, sample 10 random pairs
-            total_distance = 0
-            comparisons = 10
-            
-            for _ in range(comparisons):
-                i, j = random.sample(range(self.pop_size), 2)
-                total_distance += self.hamming_distance(self.population[i], self.population[j])
-            
-            return total_distance / comparisons
+            pairs = [random.sample(range(self.pop_size), 2) for _ in range(10)]
+            first, second = np.array(pairs).T
+        if len(first) == 0:
+            return 0
+        return float(np.mean(np.count_nonzero(grids[first] != grids[second], axis=(1, 2))))
 
     def mutate(self, target_idx):
         """Mutation operation with targeted clash resolution"""
         mutant_vector = self.population[target_idx].copy()
+        # Tracks the mutant's fitness so candidate moves can be scored without a full re-evaluation
+        tracker = IncrementalFitness(self.evaluator, mutant_vector)
 
         # Strategy 1: Targeted Clash Resolution
-        if random.random() < 0.7:
+        if self.rng.random() < 0.7:
             clash_timeslot = self.find_clash(mutant_vector)
             if clash_timeslot is not None:
-                events_in_clash = [mutant_vector[r][clash_timeslot] for r in range(len(self.rooms)) if mutant_vector[r][clash_timeslot] is not None]
+                column = mutant_vector.grid[:, clash_timeslot]
+                events_in_clash = [int(e) for e in column[column != EMPTY]]
                 
                 if events_in_clash:
-                    event_id_to_move = random.choice(events_in_clash)
+                    event_id_to_move = self.rng.choice(events_in_clash)
                     event_to_move = self.events_map.get(event_id_to_move)
 
                     if event_to_move:
-                        # Find original position and remove it
-                        for r_idx in range(len(self.rooms)):
-                            if mutant_vector[r_idx][clash_timeslot] == event_id_to_move:
-                                mutant_vector[r_idx][clash_timeslot] = None
-                                break
+                        # Remove it from its original position
+                        tracker.move(event_id_to_move, None)
                         
                         # Find a new, completely valid slot for this event
-                        possible_slots = []
-                        course = self.input_data.getCourse(event_to_move.course_id)
-                        for r_idx, room in enumerate(self.rooms):
-                            if self.is_room_suitable(room, course):
-                                for t_idx in range(len(self.timeslots)):
-                                    if (self.is_slot_available_for_event(mutant_vector, r_idx, t_idx, event_to_move) and
-                                        self._is_student_group_available(mutant_vector, event_to_move.student_group.id, t_idx)):
-                                        possible_slots.append((r_idx, t_idx))
+                        possible_slots = self.feasibility.free_cells(mutant_vector, event_to_move, group_free=True)
                         
                         if possible_slots:
-                            r, t = random.choice(possible_slots)
-                            mutant_vector[r][t] = event_id_to_move
+                            tracker.move(event_id_to_move, self.pick_mutation_slot(tracker, event_id_to_move, possible_slots))
 
         # Strategy 2: Perform a few swaps to introduce small variations
-        if random.random() < 0.2:
-            for _ in range(random.randint(1, 2)):
-                occupied_slots = np.argwhere(mutant_vector != None)
+        if self.rng.random() < 0.2:
+            for _ in range(self.rng.randint(1, 2)):
+                occupied_slots = mutant_vector.occupied_cells()
                 if len(occupied_slots) < 2: 
                     continue
-                idx1, idx2 = random.sample(range(len(occupied_slots)), 2)
+                idx1, idx2 = self.rng.sample(range(len(occupied_slots)), 2)
                 pos1, pos2 = tuple(occupied_slots[idx1]), tuple(occupied_slots[idx2])
-                mutant_vector[pos1], mutant_vector[pos2] = mutant_vector[pos2], mutant_vector[pos1]
+                # Random swaps are kept whatever they do to fitness; the tracker only keeps its counters in step
+                tracker.swap(pos1, pos2)
 
         return mutant_vector
 
+    def pick_mutation_slot(self, tracker, event_id, slots):
+        """Slot for a mutation move: random with probability mutation_explore_rate, otherwise the best-scoring sample."""
+        if not slots:
+            return None
+        if self.rng.random() < self.mutation_explore_rate:
+            return self.rng.choice(slots)
+        return self.pick_best_slot(tracker, event_id, slots)
+
+    def pick_best_slot(self, tracker, event_id, slots):
+        """Score a random sample of candidate slots with the incremental evaluator and return the best one."""
+        if not slots:
+            return None
+        if len(slots) > self.move_candidates:
+            slots = self.rng.sample(slots, self.move_candidates)
+        best_pos, _ = tracker.best_move(event_id, slots)
+        return best_pos
+
     def crossover(self, target_vector, mutant_vector):
         """Enhanced Strategic Crossover with conflict resolution"""
-        trial_vector = target_vector.copy()
-        conflicts = self.constraints.get_all_conflicts(trial_vector)
-        
-        # Combine all hard conflicts to be resolved
-        all_clashes = conflicts.get('student_group', []) + conflicts.get('lecturer', [])
+        trial_vector = self.track_occupancy(target_vector.copy())
+        mutant_grid = mutant_vector.grid
+
+        # Cells whose event shares its timeslot with another class of the same group or lecturer
+        clash_positions = clash_cells(trial_vector)
         
-        if not all_clashes:
-            # If no clashes, perform a more standard DE crossover
-            for r in range(len(self.rooms)):
-                for t in range(len(self.timeslots)):
-                    if random.random() < self.CR:
-                        trial_vector[r, t] = mutant_vector[r, t]
-            return trial_vector
-
-        # Create a set of positions that have clashes for quick lookup
-        clash_positions = set()
-        for clash in all_clashes:
-            for pos in clash['positions']:
-                clash_positions.add(tuple(pos))
-
-        # Iterate through the mutant and bring in non-conflicting genes
-        for r in range(len(self.rooms)):
-            for t in range(len(self.timeslots)):
-                if (r, t) in clash_positions:
-                    mutant_gene = mutant_vector[r, t]
-                    target_gene = trial_vector[r, t]
-
-                    if mutant_gene != target_gene and mutant_gene is not None:
-                        mutant_event = self.events_map.get(mutant_gene)
-                        if not mutant_event: 
-                            continue
-
-                        is_safe_to_swap = True
-                        # Check against all other events in the same timeslot in the trial vector
-                        for r_check in range(len(self.rooms)):
-                            if r_check != r:
-                                existing_event_id = trial_vector[r_check, t]
-                                if existing_event_id is not None:
-                                    existing_event = self.events_map.get(existing_event_id)
-                                    if existing_event:
-                                        if (existing_event.student_group.id == mutant_event.student_group.id or
-                                            existing_event.faculty_id == mutant_event.faculty_id):
-                                            is_safe_to_swap = False
-                                            break
-                        
-                        if is_safe_to_swap:
-                            trial_vector[r, t] = mutant_gene
-                            
-        return trial_vector
+        if not clash_positions.any():
+            # If no clashes, perform a more standard DE crossover (whole CR mask in one draw)
+            return trial_vector.inherit(mutant_grid, self.rng.mask(mutant_grid.shape, self.CR))
+
+        # Bring in the mutant's genes at clash positions unless they clash with
+        # another event of the same group or lecturer in that timeslot
+        take = safe_genes(trial_vector, mutant_grid, clash_positions, lecturer=True)
+        return trial_vector.inherit(mutant_grid, take)
 
     def evaluate_fitness(self, chromosome):
         """Evaluate fitness using cached results"""
-        chromosome_key = str(chromosome.tobytes())
-        if chromosome_key in self.fitness_cache:
-            return self.fitness_cache[chromosome_key]
-        
-        # Use the centralized Constraints class for consistent evaluation
-        fitness = self.constraints.evaluate_fitness(chromosome)
-        
-        # Cache management: prevent unlimited growth
-        if len(self.fitness_cache) > 1000:
-            keys_to_remove = list(self.fitness_cache.keys())[:-500]
-            for key in keys_to_remove:
-                del self.fitness_cache[key]
-        
-        # Cache the result
-        self.fitness_cache[chromosome_key] = fitness
-        return fitness
+        # Same scores as Constraints.evaluate_fitness, computed from the compiled model
+        return self.get_violations(chromosome)['total']
+
+    def get_violations(self, chromosome):
+        """Per-constraint violations (plus 'total') for a chromosome, served from the fitness cache."""
+        chromosome = CompactChromosome.coerce(chromosome, len(self.events_list))
+        return self.fitness_cache.violations(chromosome, self.evaluator.get_constraint_violations)
+
+    def evaluate_population(self):
+        """
+        Pack the population into one (members, rooms, timeslots) int32 tensor and
+        score it with a single batched evaluator call; select and best tracking
+        read these arrays. Member grids become views into the tensor.
+        """
+        for idx, member in enumerate(self.population):
+            self.population[idx] = self.track_occupancy(CompactChromosome.coerce(member, len(self.events_list)))
+        self.population_grid = np.stack([member.grid for member in self.population]).astype(np.int32, copy=False)
+        for idx, member in enumerate(self.population):
+            member.grid = self.population_grid[idx]
+        self.population_violations = self.evaluator.compute_violation_matrix(self.population_grid)
+        self.population_fitness = np.zeros(len(self.population))
+        for idx, (member, row) in enumerate(zip(self.population, self.population_violations.tolist())):
+            # Same dict (and summation order) as get_violations, so later lookups hit the cache
+            violations = dict(zip(VIOLATION_KEYS, row))
+            violations['total'] = sum(row)
+            self.fitness_cache.put(chromosome_digest(member), violations)
+            self.population_fitness[idx] = violations['total']
+
+    def record_member(self, idx, violations=None):
+        """Store the grid, violation vector and total of population member `idx`."""
+        member = self.population[idx]
+        if violations is None:
+            violations = self.get_violations(member)
+        self.population_grid[idx] = member.grid
+        member.grid = self.population_grid[idx]
+        self.population_violations[idx] = self.evaluator.violation_vector(violations)
+        self.population_fitness[idx] = violations['total']
 
     def select(self, target_idx, trial_vector):
         """Selection operation with hard constraint prioritization"""
-        trial_violations = self.constraints.get_constraint_violations(trial_vector)
-        target_violations = self.constraints.get_constraint_violations(self.population[target_idx])
+        trial_violations = self.get_violations(trial_vector)
+        # The target's violations were stored when it joined the population
+        target_violations = dict(zip(VIOLATION_KEYS, self.population_violations[target_idx]))
+        target_violations['total'] = self.population_fitness[target_idx]
 
         # Define which constraints are "hard" and must be prioritized
         hard_constraints = [
@@ -514,48 +408,120 @@ class DifferentialEvolution:
 
         if accept:
             self.population[target_idx] = trial_vector
+            self.record_member(target_idx, trial_violations)
+        return accept
+
+    def build_trial(self, target_idx):
+        """Mutation and crossover for one target; only reads population[target_idx]."""
+        mutant_vector = self.mutate(target_idx)
+        return self.crossover(self.population[target_idx], mutant_vector)
+
+    def run(self, max_generations, workers=1, on_generation=None, should_stop=None):
+        """
+        Run the differential evolution algorithm. With workers > 1 (0: one per CPU)
+        the trial vectors of each generation are built and scored in a process pool.
+        on_generation(event) is called after every generation with a progress dict
+        (see generation_event); self.best_solution holds the best so far at that
+        point. When should_stop() returns true the run ends after the current
+        generation and returns the best solution so far (stopped_early is set).
+        """
+        self.reset_evolution()
+        best_solution, fitness_history, generation, diversity_history = self.evolve(
+            max_generations, workers, on_generation, should_stop)
+        return self.repair_best(best_solution), fitness_history, generation, diversity_history
 
-    def run(self, max_generations):
-        """Run the differential evolution algorithm"""
+    def evolve(self, max_generations, workers=1, on_generation=None, should_stop=None):
+        """
+        Run up to `max_generations` more generations, without the final repairs.
+        Each call carries on from the previous one (best solution, stagnation
+        count, generation number), so island epochs and multi-start chunks stop
+        early as a single run would; reset_evolution() starts over. Returns the
+        same tuple as run() for this call's generations. Once the search has
+        converged (desired fitness or stagnation) it returns at once with no
+        generations and self.converged set.
+        """
+        pool = ParallelGeneration(self, workers) if workers != 1 and not self.converged else None
+        self.should_stop, self.stopped_early = should_stop, False
+        try:
+            return self._run(max_generations, pool, on_generation)
+        finally:
+            self.should_stop = None
+            if pool is not None:
+                pool.close()
+
+    def reset_evolution(self):
+        """Forget the generation-loop state so the next evolve() starts a fresh run."""
+        self.best_solution, self.best_fitness = None, None
+        self.stagnation_counter, self.generations_done = 0, 0
+        self.converged = False
+
+    def stop_requested(self):
+        """True once the run's should_stop callback asks it to wind down."""
+        return self.should_stop is not None and bool(self.should_stop())
+
+    def generation_event(self, generation, max_generations, best_fitness, best_idx, started):
+        """Progress of one generation: best fitness, its hard/soft constraint totals, diversity and elapsed time."""
+        # Diversity sampling draws from `random`; restore it so reporting progress does not change the run
+        state = random.getstate()
+        diversity = self.calculate_population_diversity()
+        random.setstate(state)
+        event = {
+            'generation': generation + 1,
+            'max_generations': max_generations,
+            'best_fitness': float(best_fitness),
+            'diversity': float(diversity),
+            'elapsed_seconds': round(time.time() - started, 3),
+        }
+        event.update(violation_summary(self.population_violations[best_idx]))
+        return event
+
+    def _run(self, max_generations, pool, on_generation=None):
+        started = time.time()
         fitness_history = []
-        best_solution = self.population[0]
         diversity_history = []
-        
-        # Calculate initial fitness and find best solution
-        initial_fitness = [self.evaluate_fitness(ind) for ind in self.population]
-        best_idx = np.argmin(initial_fitness)
-        best_solution = self.population[best_idx].copy()
-        best_fitness = initial_fitness[best_idx]
-        
-        # Track fitness for early convergence detection
-        stagnation_counter = 0
 
+        if self.best_solution is None:
+            # Calculate initial fitness once per member and find best solution
+            self.evaluate_population()
+            best_idx = int(np.argmin(self.population_fitness))
+            self.best_solution = self.population[best_idx].copy()
+            self.best_fitness = self.population_fitness[best_idx]
+        best_solution, best_fitness = self.best_solution, self.best_fitness
+        if self.converged:
+            return best_solution, fitness_history, -1, diversity_history
+
+        # Track fitness for early convergence detection (carried over from earlier calls)
+        stagnation_counter = self.stagnation_counter
+        first_generation = self.generations_done
+        total_generations = first_generation + max_generations
+
+        generation = -1
         for generation in range(max_generations):
+            generation_number = first_generation + generation
             generation_improved = False
             
+            # Steps 1-2 in the pool: mutation and crossover for every target at once
+            trials = pool.trials() if pool is not None else None
+
             for i in range(self.pop_size):
-                # Step 1: Mutation
-                mutant_vector = self.mutate(i)
-                
-                # Step 2: Crossover
-                target_vector = self.population[i]
-                trial_vector = self.crossover(target_vector, mutant_vector)
+                # Step 1-2: Mutation and Crossover
+                trial_vector = trials[i] if trials is not None else self.build_trial(i)
                 
                 # Step 3: Evaluation and Selection
-                old_fitness = self.evaluate_fitness(self.population[i])
+                old_fitness = self.population_fitness[i]
                 self.select(i, trial_vector)
-                new_fitness = self.evaluate_fitness(self.population[i])
+                new_fitness = self.population_fitness[i]
                 
                 # Ensure population member has all events after selection
                 self.population[i] = self.verify_and_repair_course_allocations(self.population[i])
+                self.record_member(i)
                 
                 if new_fitness < old_fitness:
                     generation_improved = True
                 
-            # Find best solution more efficiently
-            current_fitness = [self.evaluate_fitness(ind) for ind in self.population]
-            current_best_idx = np.argmin(current_fitness)
-            current_best_fitness = current_fitness[current_best_idx]
+            # Find best solution from the stored population fitness
+            current_best_idx = int(np.argmin(self.population_fitness))
+            current_best_fitness = self.population_fitness[current_best_idx]
             
             if current_best_fitness < best_fitness:
                 best_solution = self.population[current_best_idx].copy()
@@ -570,26 +536,41 @@ class DifferentialEvolution:
             fitness_history.append(best_fitness)
 
             # Calculate diversity less frequently for speed
-            if generation % 20 == 0:
+            if generation_number % 20 == 0:
                 population_diversity = self.calculate_population_diversity()
                 diversity_history.append(population_diversity)
 
-            print(f"Best solution for generation {generation+1}/{max_generations} has a fitness of: {best_fitness}")
+            self.best_solution = best_solution
+            if on_generation is not None:
+                on_generation(self.generation_event(generation_number, total_generations, best_fitness, current_best_idx, started))
+
+            print(f"Best solution for generation {generation_number+1}/{total_generations} has a fitness of: {best_fitness}")
 
             if best_fitness == self.desired_fitness:
-                print(f"Solution with desired fitness of {self.desired_fitness} found at Generation {generation}!")
+                print(f"Solution with desired fitness of {self.desired_fitness} found at Generation {generation_number}!")
+                self.converged = True
                 break
             
             # Early termination if no improvement for many generations
             if stagnation_counter > 50 and best_fitness < 100:
-                print(f"Early termination due to convergence at generation {generation+1}")
+                print(f"Early termination due to convergence at generation {generation_number+1}")
+                self.converged = True
                 break
 
-        # Final verification and repair of the best solution
-        best_solution = self.verify_and_repair_course_allocations(best_solution)
-        
+            if self.stop_requested():
+                print(f"Stopping at generation {generation_number+1}: time budget reached or run cancelled")
+                self.stopped_early = True
+                break
+
+        self.best_fitness = best_fitness
+        self.stagnation_counter = stagnation_counter
+        self.generations_done += generation + 1
         return best_solution, fitness_history, generation, diversity_history
 
+    def repair_best(self, best_solution):
+        """Final verification and repair of the best solution; run once, after the last generation."""
+        return self.verify_and_repair_course_allocations(best_solution)
+
     def print_timetable(self, individual, student_group, days, hours_per_day, day_start_time=9):
         """Print timetable for a specific student group"""
         timetable = [["" for _ in range(days)] for _ in range(hours_per_day)]
@@ -601,30 +582,32 @@ class DifferentialEvolution:
                 if day in [0, 2, 4]:  # Monday, Wednesday, Friday
                     timetable[break_hour][day] = "BREAK"
         
-        for room_idx, room_slots in enumerate(individual):
-            for timeslot_idx, event in enumerate(room_slots):
-                class_event = self.events_map.get(event)
-                if class_event is not None and class_event.student_group.id == student_group.id:
-                    day = timeslot_idx // hours_per_day
-                    hour = timeslot_idx % hours_per_day
-                    
-                    # Check if it's a break slot that should be skipped in the display
-                    is_display_break = (hour == break_hour and day in [0, 2, 4])
-
-                    if day < days and not is_display_break:
-                        course = self.input_data.getCourse(class_event.course_id)
-                        faculty = self.input_data.getFaculty(class_event.faculty_id)
-                        course_code = course.code if course is not None else "Unknown"
-                        faculty_name = faculty.name if faculty is not None else "Unknown"
-                        room_obj = self.input_data.rooms[room_idx]
-                        room_display = getattr(room_obj, "name", getattr(room_obj, "Id", str(room_idx)))
-                        timetable[hour][day] = f"Course: {course_code}, Lecturer: {faculty_name}, Room: {room_display}"
+        individual = CompactChromosome.coerce(individual, len(self.events_list))
+        for event_id in individual.scheduled_events():
+            class_event = self.events_list[event_id]
+            if class_event.student_group.id == student_group.id:
+                room_idx, timeslot_idx = individual.position(event_id)
+                day = timeslot_idx // hours_per_day
+                hour = timeslot_idx % hours_per_day
+                
+                # Check if it's a break slot that should be skipped in the display
+                is_display_break = (hour == break_hour and day in [0, 2, 4])
+
+                if day < days and not is_display_break:
+                    course = self.model.get_course(class_event.course_id)
+                    faculty = self.model.get_faculty(class_event.faculty_id)
+                    course_code = course.code if course is not None else "Unknown"
+                    faculty_name = faculty.name if faculty is not None else "Unknown"
+                    room_obj = self.input_data.rooms[room_idx]
+                    room_display = getattr(room_obj, "name", getattr(room_obj, "Id", str(room_idx)))
+                    timetable[hour][day] = f"Course: {course_code}, Lecturer: {faculty_name}, Room: {room_display}"
         return timetable
 
     def print_all_timetables(self, individual, days, hours_per_day, day_start_time=9):
         """Generate all timetables for the solution"""
         data = []
         student_groups = self.input_data.student_groups
+        individual = CompactChromosome.coerce(individual, len(self.events_list))
         
         for student_group in student_groups:
             timetable = self.print_timetable(individual, student_group, days, hours_per_day, day_start_time)
@@ -641,17 +624,11 @@ class DifferentialEvolution:
         Verify that all courses appear the correct number of times for each student group
         and repair any missing allocations with minimal disruption.
         """
+        chromosome = self.track_occupancy(CompactChromosome.coerce(chromosome, len(self.events_list)))
         max_repair_passes = 3
         
         for repair_pass in range(max_repair_passes):
-            scheduled_events = set()
-            for room_idx in range(len(self.rooms)):
-                for timeslot_idx in range(len(self.timeslots)):
-                    event_id = chromosome[room_idx][timeslot_idx]
-                    if event_id is not None:
-                        scheduled_events.add(event_id)
-            
-            missing_events = [event_id for event_id in range(len(self.events_list)) if event_id not in scheduled_events]
+            missing_events = [int(event_id) for event_id in chromosome.missing_events()]
             
             if not missing_events:
                 break
@@ -659,11 +636,11 @@ class DifferentialEvolution:
             flexibility_level = repair_pass
             
             course_day_room_mapping = {}
-            for r_idx, t_idx in np.argwhere(chromosome != None):
-                event_id = chromosome[r_idx][t_idx]
+            for r_idx, t_idx in chromosome.occupied_cells():
+                event_id = chromosome.grid[r_idx, t_idx]
                 event = self.events_map.get(event_id)
                 if event:
-                    course = self.input_data.getCourse(event.course_id)
+                    course = self.model.get_course(event.course_id)
                     if course:
                         day_idx = t_idx // self.input_data.hours
                         course_id = getattr(course, 'course_id', None) or getattr(course, 'id', None) or getattr(course, 'code', None)
@@ -672,7 +649,7 @@ class DifferentialEvolution:
 
             for missing_event_id in missing_events:
                 event = self.events_list[missing_event_id]
-                course = self.input_data.getCourse(event.course_id)
+                course = self.model.get_course(event.course_id)
                 if not course: 
                     continue
                 
@@ -692,38 +669,25 @@ class DifferentialEvolution:
                                     self._is_student_group_available(chromosome, event.student_group.id, timeslot)):
                                     preferred_slots.append((preferred_room, timeslot))
                     if preferred_slots:
-                        room_idx, timeslot_idx = random.choice(preferred_slots)
-                        chromosome[room_idx][timeslot_idx] = missing_event_id
+                        room_idx, timeslot_idx = self.rng.choice(preferred_slots)
+                        chromosome[room_idx, timeslot_idx] = missing_event_id
                         placed = True
 
                 # Strategy 2: Find any valid slot that respects all hard constraints
                 if not placed:
-                    valid_slots = []
-                    for room_idx, room in enumerate(self.rooms):
-                        if self.is_room_suitable(room, course):
-                            for timeslot_idx in range(len(self.timeslots)):
-                                if (self.is_slot_available_for_event(chromosome, room_idx, timeslot_idx, event) and
-                                    self._is_student_group_available(chromosome, event.student_group.id, timeslot_idx)):
-                                    valid_slots.append((room_idx, timeslot_idx))
+                    valid_slots = self.feasibility.free_cells(chromosome, event, group_free=True)
                     if valid_slots:
-                        room_idx, timeslot_idx = random.choice(valid_slots)
-                        chromosome[room_idx][timeslot_idx] = missing_event_id
+                        room_idx, timeslot_idx = self.rng.choice(valid_slots)
+                        chromosome[room_idx, timeslot_idx] = missing_event_id
                         placed = True
 
                 # Strategy 3 (Final Pass): Only place in a valid, empty slot
                 if not placed and flexibility_level >= 2:
-                    valid_empty_slots = []
-                    for room_idx, room in enumerate(self.rooms):
-                        if self.is_room_suitable(room, course):
-                            for timeslot_idx in range(len(self.timeslots)):
-                                if (chromosome[room_idx][timeslot_idx] is None and
-                                    self.is_slot_available_for_event(chromosome, room_idx, timeslot_idx, event) and
-                                    self._is_student_group_available(chromosome, event.student_group.id, timeslot_idx)):
-                                    valid_empty_slots.append((room_idx, timeslot_idx))
+                    valid_empty_slots = self.feasibility.free_cells(chromosome, event, group_free=True)
                     
                     if valid_empty_slots:
-                        room_idx, timeslot_idx = random.choice(valid_empty_slots)
-                        chromosome[room_idx][timeslot_idx] = missing_event_id
+                        room_idx, timeslot_idx = self.rng.choice(valid_empty_slots)
+                        chromosome[room_idx, timeslot_idx] = missing_event_id
                         placed = True
                         
         return chromosome
@@ -731,15 +695,13 @@ class DifferentialEvolution:
     def count_course_occurrences(self, chromosome, student_group):
         """Count how many times each course appears for a specific student group"""
         course_counts = {}
+        chromosome = CompactChromosome.coerce(chromosome, len(self.events_list))
         
-        for room_idx in range(len(self.rooms)):
-            for timeslot_idx in range(len(self.timeslots)):
-                event_id = chromosome[room_idx][timeslot_idx]
-                if event_id is not None:
-                    event = self.events_map.get(event_id)
-                    if event and event.student_group.id == student_group.id:
-                        course_id = event.course_id
-                        course_counts[course_id] = course_counts.get(course_id, 0) + 1
+        for event_id in chromosome.scheduled_events():
+            event = self.events_list[event_id]
+            if event.student_group.id == student_group.id:
+                course_id = event.course_id
+                course_counts[course_id] = course_counts.get(course_id, 0) + 1
         
         return course_counts
 
@@ -748,16 +710,12 @@ class DifferentialEvolution:
         print("\n=== COURSE ALLOCATION DIAGNOSIS ===")
         
         # Count total scheduled events
-        scheduled_events = set()
-        for room_idx in range(len(self.rooms)):
-            for timeslot_idx in range(len(self.timeslots)):
-                event_id = chromosome[room_idx][timeslot_idx]
-                if event_id is not None:
-                    scheduled_events.add(event_id)
+        chromosome = CompactChromosome.coerce(chromosome, len(self.events_list))
+        scheduled_count = chromosome.count_scheduled()
         
         print(f"Total events: {len(self.events_list)}")
-        print(f"Scheduled events: {len(scheduled_events)}")
-        print(f"Missing events: {len(self.events_list) - len(scheduled_events)}")
+        print(f"Scheduled events: {scheduled_count}")
+        print(f"Missing events: {len(self.events_list) - scheduled_count}")
         
         # Check each student group
         for student_group in self.student_groups:
@@ -0,0 +1,1252 @@
+# differential_evolution_engine.py
+"""
+Differential evolution engine (the original DifferentialEvolution used by
+differential_evolution.py), without the demo run and Dash UI that live in that
+script. Importing this module has no side effects: it does not load the static
+dataset, read or write files in data/, or build any UI, so the Flask app and
+process-pool workers can import it cheaply. The engine only works on the
+input_data instance it is given.
+"""
+
+import random
+import time
+import numpy as np
+from constraints import Constraints
+from vectorized_constraints import VectorizedConstraints, VIOLATION_KEYS, violation_summary
+from incremental_fitness import IncrementalFitness
+from feasibility_masks import FeasibilityMasks
+from fitness_cache import FitnessCache, chromosome_digest
+from parallel_generation import ParallelGeneration
+from vectorized_operators import BatchedRandom, safe_genes
+from problem_model import ProblemModel
+from compact_chromosome import CompactChromosome, EMPTY
+
+
+class DifferentialEvolution:
+    def __init__(self, input_data, pop_size: int, F: float, CR: float):
+        self.desired_fitness = 0
+        self.input_data = input_data
+        self.rooms = input_data.rooms
+        self.timeslots = input_data.create_time_slots(no_hours_per_day=input_data.hours, no_days_per_week=input_data.days, day_start_time=9)
+        self.student_groups = input_data.student_groups
+        self.courses = input_data.courses
+        self.model = ProblemModel(input_data)
+        self.events_list, self.events_map = self.model.events_list, self.model.events_map
+        self.pop_size = pop_size
+        self.F = F
+        self.CR = CR
+        self.constraints = Constraints(input_data, model=self.model)
+        # Vectorised evaluator for the hot path; Constraints stays the reference for debug/detailed reports
+        self.evaluator = VectorizedConstraints(self.constraints)
+        # Room type / break time / lecturer availability per (course, lecturer), built once
+        self.feasibility = FeasibilityMasks(self.evaluator)
+        # Number of candidate slots scored with the incremental evaluator when moving an event
+        self.move_candidates = 8
+        # Chance that a mutation move takes a random safe slot instead of the best-scoring sample
+        self.mutation_explore_rate = 0.5
+        # Operators draw their random decisions in batches (seeded from `random` so runs stay reproducible)
+        self.rng = BatchedRandom(random.getrandbits(64))
+        
+        # Optimization: content-addressed LRU cache of violation breakdowns (see fitness_cache.py)
+        self.fitness_cache = FitnessCache()
+
+        # Cooperative stop (time budget / cancellation): set by run(), checked between generations
+        self.should_stop = None
+        self.stopped_early = False
+        # Best solution of the current run, updated every generation (read by progress callbacks)
+        self.best_solution = None
+        # Generation-loop state that evolve() carries from one call to the next
+        self.best_fitness = None
+        self.stagnation_counter = 0
+        self.generations_done = 0
+        self.converged = False
+        
+        # Optimization: building per room and engineering flag per group come from the compiled model
+        self.room_building_cache = dict(enumerate(self.model.room_building_names))
+        self.engineering_groups = {
+            student_group.id for student_group in self.student_groups
+            if self.model.is_engineering_group(student_group.id)
+        }
+        
+        self.population = self.initialize_population()  # List to hold all chromosomes
+
+    def initialize_population(self):
+        population = [] 
+        for i in range(self.pop_size):
+            chromosome = self.create_chromosome()
+            population.append(chromosome)
+        return population
+
+    def new_chromosome(self):
+        """Empty compact chromosome sized for this problem."""
+        return self.track_occupancy(CompactChromosome(len(self.rooms), len(self.timeslots), len(self.events_list)))
+
+    def track_occupancy(self, chromosome):
+        """Make sure the chromosome keeps group/lecturer x timeslot counts for O(1) availability checks."""
+        if chromosome.group_slots is None:
+            chromosome.track_occupancy(self.model.event_group, self.model.event_lecturer,
+                                       len(self.student_groups), len(self.model.lecturer_index))
+        return chromosome
+
+    def create_chromosome(self):
+        chromosome = self.new_chromosome()
+        
+        # Group events by student group and course to handle them as blocks
+        events_by_group_course = {}
+        for idx, event in enumerate(self.events_list):
+            key = (event.student_group.id, event.course_id)
+            if key not in events_by_group_course:
+                events_by_group_course[key] = []
+            events_by_group_course[key].append(idx)
+
+        # --- STRATEGY: Prioritize placing larger courses first ("big rocks first") ---
+        course_items = sorted(
+            events_by_group_course.items(),
+            key=lambda item: len(item[1]),
+            reverse=True
+        )
+
+        # Trackers for optimized placement
+        hours_per_day_for_group = {sg.id: [0] * self.input_data.days for sg in self.student_groups}
+
+        for (student_group_id, course_id), event_indices in course_items:
+            course = self.model.get_course(course_id)
+            student_group = self.model.get_student_group(student_group_id)
+            hours_required = len(event_indices)
+
+            if hours_required == 0:
+                continue
+
+            # --- STRATEGY: Stricter split strategies to enforce consecutive constraints ---
+            split_strategies = []
+            if hours_required >= 4: # 4-hour courses and above
+                split_strategies = [(4,), (2, 2), (3, 1)]
+            elif hours_required == 3: # 3-hour courses (including 1-credit courses converted to 3 hours)
+                # For 1-credit courses: prioritize 3 consecutive, fallback to 2 consecutive + 1 separate
+                split_strategies = [(3,), (2, 1)]
+            elif hours_required == 2: # 2-hour courses
+                split_strategies = [(2,)] # MUST be consecutive
+            else: # 1-hour courses (only original 1-hour courses that weren't 1-credit)
+                split_strategies = [(1,)]
+
+            course_placed = False
+            for split_strategy in split_strategies:
+                if course_placed:
+                    break
+
+                placements_for_strategy = []
+                all_blocks_found = True
+                temp_chromosome = chromosome.copy()
+                
+                event_idx_counter = 0
+                
+                temp_hours_per_day = hours_per_day_for_group[student_group_id][:]
+                temp_course_days_used = set()
+
+                for block_hours in split_strategy:
+                    placed = False
+                    block_event_indices = event_indices[event_idx_counter : event_idx_counter + block_hours]
+                    
+                    available_days = [d for d in range(self.input_data.days) if d not in temp_course_days_used]
+                    sorted_days = sorted(available_days, key=lambda d: temp_hours_per_day[d])
+
+                    for day_idx in sorted_days:
+                        day_start = day_idx * self.input_data.hours
+                        day_end = (day_idx + 1) * self.input_data.hours
+                        
+                        possible_slots = []
+                        for room_idx, room in enumerate(self.rooms):
+                            # --- STRATEGY: Enforce building constraints during placement ---
+                            is_engineering_group = student_group.id in self.engineering_groups
+                            room_building = self.room_building_cache.get(room_idx, 'UNKNOWN')
+                            
+                            # Non-engineering groups cannot use SST rooms
+                            if not is_engineering_group and room_building == 'SST':
+                                continue # Skip this room entirely for this group
+
+                            if self.is_room_suitable(room, course):
+                                for timeslot_start in range(day_start, day_end - block_hours + 1):
+                                    is_block_placeable = True
+                                    for i in range(block_hours):
+                                        ts = timeslot_start + i
+                                        event_for_slot = self.events_list[block_event_indices[i]]
+                                        if not (self.is_slot_available_for_event(temp_chromosome, room_idx, ts, event_for_slot) and
+                                                self._is_student_group_available(temp_chromosome, student_group_id, ts) and
+                                                self._is_lecturer_available(temp_chromosome, event_for_slot.faculty_id, ts)):
+                                            is_block_placeable = False
+                                            break
+                                    
+                                    if is_block_placeable:
+                                        possible_slots.append((room_idx, timeslot_start))
+                        
+                        if possible_slots:
+                            # Prefer slots that don't cause building conflicts if possible
+                            preferred_slots = []
+                            for r_idx, t_start in possible_slots:
+                                room_bldg = self.room_building_cache.get(r_idx, 'UNKNOWN')
+                                is_eng_grp = student_group.id in self.engineering_groups
+                                if is_eng_grp and room_bldg != 'SST':
+                                    pass # This is a potential soft conflict
+                                else:
+                                    preferred_slots.append((r_idx, t_start))
+                            
+                            if preferred_slots:
+                                room_idx, timeslot_start = random.choice(preferred_slots)
+                            else: # If all options cause a soft conflict, just pick one
+                                room_idx, timeslot_start = random.choice(possible_slots)
+
+                            for i in range(block_hours):
+                                ts = timeslot_start + i
+                                event_id = block_event_indices[i]
+                                placements_for_strategy.append((room_idx, ts, event_id))
+                                temp_chromosome[room_idx, ts] = event_id
+                            
+                            temp_hours_per_day[day_idx] += block_hours
+                            temp_course_days_used.add(day_idx)
+                            placed = True
+                            event_idx_counter += block_hours
+                            break 
+                    
+                    if not placed:
+                        all_blocks_found = False
+                        break
+                
+                if all_blocks_found:
+                    for r, t, e_id in placements_for_strategy:
+                        chromosome[r, t] = e_id
+                    
+                    hours_per_day_for_group[student_group_id] = temp_hours_per_day
+                    
+                    course_placed = True
+                    break
+
+        # Final verification to place any unassigned events
+        chromosome = self.verify_and_repair_course_allocations(chromosome)
+        
+        # Basic clash prevention only
+        chromosome = self.prevent_student_group_clashes(chromosome)
+        
+        return chromosome
+
+    def find_consecutive_slots(self, chromosome, course):
+        # Randomly find consecutive time slots in the same room
+        two_slot_rooms = []
+        for room_idx, room in enumerate(self.rooms):
+            if self.is_room_suitable(room, course):
+                # Collect pairs of consecutive available time slots
+                for i in range(len(self.timeslots) - 1):
+                    if self.is_slot_available(chromosome, room_idx, i) and self.is_slot_available(chromosome, room_idx, i + 1):
+                        two_slot_rooms.append((room_idx, i, i+1))
+
+        if len(two_slot_rooms) != 0:
+            _room_idx, slot1, slot2 = random.choice(two_slot_rooms)           
+            return _room_idx, slot1, slot2
+        
+        return None, None, None
+
+    def find_single_slot(self, chromosome, course):
+        # Randomly find a single available slot
+        single_slot_rooms = []
+        for room_idx, room in enumerate(self.rooms):
+            if self.is_room_suitable(room, course):
+                for i in range(len(self.timeslots)):
+                    if self.is_slot_available(chromosome, room_idx, i):
+                        single_slot_rooms.append((room_idx, i))
+        
+        # Randomly pick from the available single slots
+        if len(single_slot_rooms) > 0:
+            return random.choice(single_slot_rooms)
+        
+        # If no valid single slots are found
+        return None, None
+
+    def is_slot_available(self, chromosome, room_idx, timeslot_idx):
+        # Check if the slot is available (i.e., not already assigned)
+        if chromosome.grid[room_idx, timeslot_idx] != EMPTY:
+            return False
+        
+        # Break time (13:00 - 14:00 on Mon/Wed/Fri) is precomputed in the feasibility masks
+        return self.feasibility.is_open(None, timeslot_idx)
+
+    def is_slot_available_for_event(self, chromosome, room_idx, timeslot_idx, event):
+        """
+        Checks if a slot is available for a specific event, considering lecturer availability.
+        """
+        # Check if the slot is physically empty
+        if chromosome.grid[room_idx, timeslot_idx] != EMPTY:
+            return False
+
+        # Break time and lecturer available days/times come from the precomputed masks
+        return self.feasibility.is_open(event, timeslot_idx)
+
+    def is_room_suitable(self, room, course):
+        if course is None:
+            return False
+        return room.room_type == course.required_room_type
+    
+    def _is_student_group_available(self, chromosome, student_group_id, timeslot_idx):
+        """Checks if a student group is already scheduled at a given timeslot."""
+        group_idx = self.model.group_index.get(student_group_id)
+        if group_idx is None:
+            return True
+        return not self.track_occupancy(chromosome).group_busy(group_idx, timeslot_idx)
+
+    def _is_lecturer_available(self, chromosome, faculty_id, timeslot_idx):
+        """Checks if a lecturer is already scheduled at a given timeslot."""
+        lecturer_idx = self.model.lecturer_index.get(faculty_id)
+        if lecturer_idx is None:
+            return True
+        return not self.track_occupancy(chromosome).lecturer_busy(lecturer_idx, timeslot_idx)
+
+    def find_clash(self, chromosome):
+        """Finds a random timeslot with a student or lecturer clash."""
+        # Student and (assigned) lecturer clashes are read straight from the occupancy counts
+        clash_slots = self.track_occupancy(chromosome).clash_timeslots(self.model.lecturer_is_assigned)
+        if len(clash_slots):
+            return int(self.rng.choice(clash_slots))
+        return None
+    
+    def hamming_distance(self, chromosome1, chromosome2):
+        return np.count_nonzero(chromosome1.grid != chromosome2.grid)
+
+    def calculate_population_diversity(self):
+        # Optimization: Sample diversity calculation instead of full O(n²)
+        grids = self.population_grid
+        if self.pop_size <= 10:
+            # For small populations, every pair from one comparison of the population tensor
+            first, second = np.triu_indices(len(grids), k=1)
+        else:
+            # For larger populations, sample 10 random pairs
+            pairs = [random.sample(range(self.pop_size), 2) for _ in range(10)]
+            first, second = np.array(pairs).T
+        if len(first) == 0:
+            return 0
+        return float(np.mean(np.count_nonzero(grids[first] != grids[second], axis=(1, 2))))
+
+
+    def mutate(self, target_idx):
+        mutant_vector = self.population[target_idx].copy()
+        # Tracks the mutant's fitness so candidate moves can be scored without a full re-evaluation
+        tracker = IncrementalFitness(self.evaluator, mutant_vector)
+        
+        # Increase mutation attempts to encourage exploration
+        mutation_attempts = self.rng.randint(3, 8)
+
+        for _ in range(mutation_attempts):
+            strategy = self.rng.choice(['resolve_clash', 'safe_swap', 'safe_move'])
+
+            # Strategy 1: Find a clash and try to resolve it by moving one event
+            if strategy == 'resolve_clash':
+                clash_timeslot = self.find_clash(mutant_vector)
+                if clash_timeslot is not None:
+                    # Find events involved in the clash
+                    events_in_slot = [(r, int(mutant_vector.grid[r, clash_timeslot])) for r in range(len(self.rooms)) if mutant_vector.grid[r, clash_timeslot] != EMPTY]
+                    if not events_in_slot: continue
+                    
+                    # Pick one event to move
+                    room_to_move_from, event_id_to_move = self.rng.choice(events_in_slot)
+                    event_to_move = self.events_map.get(event_id_to_move)
+                    if not event_to_move: continue
+
+                    # Find a new, valid, empty slot for this event
+                    safe_slots = self.find_safe_empty_slots_for_event(mutant_vector, event_to_move, ignore_pos=(room_to_move_from, clash_timeslot))
+                    new_pos = self.pick_mutation_slot(tracker, event_id_to_move, safe_slots)
+                    if new_pos:
+                        tracker.move(event_id_to_move, new_pos)
+                        continue # Move successful, try another mutation
+
+            # Strategy 2: Swap two existing events if it's safe
+            elif strategy == 'safe_swap':
+                occupied_slots = mutant_vector.occupied_cells()
+                if len(occupied_slots) < 2: continue
+                
+                idx1, idx2 = self.rng.sample(range(len(occupied_slots)), 2)
+                pos1, pos2 = tuple(occupied_slots[idx1]), tuple(occupied_slots[idx2])
+                
+                event1_id, event2_id = int(mutant_vector.grid[pos1]), int(mutant_vector.grid[pos2])
+                event1, event2 = self.events_map.get(event1_id), self.events_map.get(event2_id)
+                
+                if not event1 or not event2: continue
+
+                # Check if swapping is feasible
+                course1, course2 = self.model.get_course(event1.course_id), self.model.get_course(event2.course_id)
+                
+                # Check room suitability
+                room1_ok_for_event2 = self.is_room_suitable(self.rooms[pos1[0]], course2)
+                room2_ok_for_event1 = self.is_room_suitable(self.rooms[pos2[0]], course1)
+
+                if room1_ok_for_event2 and room2_ok_for_event1:
+                    # Check clash constraints for the swap
+                    # Is event2 OK at pos1's timeslot?
+                    clash_free_at_pos1 = not self.constraints.check_student_group_clash_at_slot(mutant_vector, event2.student_group.id, pos1[1], ignore_room_idx=pos2[0]) and \
+                                         not self.constraints.check_lecturer_clash_at_slot(mutant_vector, event2.faculty_id, pos1[1], ignore_room_idx=pos2[0])
+                    
+                    # Is event1 OK at pos2's timeslot?
+                    clash_free_at_pos2 = not self.constraints.check_student_group_clash_at_slot(mutant_vector, event1.student_group.id, pos2[1], ignore_room_idx=pos1[0]) and \
+                                         not self.constraints.check_lecturer_clash_at_slot(mutant_vector, event1.faculty_id, pos2[1], ignore_room_idx=pos1[0])
+
+                    if clash_free_at_pos1 and clash_free_at_pos2:
+                        # Random swaps are kept whatever they do to fitness; the tracker only keeps its counters in step
+                        tracker.swap(pos1, pos2)
+                        continue
+
+            # Strategy 3: Move a single event to a new, safe, empty location
+            elif strategy == 'safe_move':
+                occupied_slots = mutant_vector.occupied_cells()
+                if not len(occupied_slots): continue
+                
+                pos_to_move = tuple(self.rng.choice(occupied_slots))
+                event_id_to_move = int(mutant_vector.grid[pos_to_move])
+                event_to_move = self.events_map.get(event_id_to_move)
+                if not event_to_move: continue
+
+                # Find a new, valid, empty slot
+                safe_slots = self.find_safe_empty_slots_for_event(mutant_vector, event_to_move, ignore_pos=pos_to_move)
+                new_pos = self.pick_mutation_slot(tracker, event_id_to_move, safe_slots)
+                if new_pos:
+                    tracker.move(event_id_to_move, new_pos)
+                    continue
+
+        return mutant_vector
+
+    def pick_mutation_slot(self, tracker, event_id, slots):
+        """Slot for a mutation move: random with probability mutation_explore_rate, otherwise the best-scoring sample."""
+        if not slots:
+            return None
+        if self.rng.random() < self.mutation_explore_rate:
+            return self.rng.choice(slots)
+        return self.pick_best_slot(tracker, event_id, slots)
+
+    def pick_best_slot(self, tracker, event_id, slots):
+        """Score a random sample of candidate slots with the incremental evaluator and return the best one."""
+        if not slots:
+            return None
+        if len(slots) > self.move_candidates:
+            slots = self.rng.sample(slots, self.move_candidates)
+        best_pos, _ = tracker.best_move(event_id, slots)
+        return best_pos
+
+    def find_safe_empty_slot_for_event(self, chromosome, event, ignore_pos=None):
+        """Finds a random empty slot that is safe for the given event."""
+        possible_slots = self.find_safe_empty_slots_for_event(chromosome, event, ignore_pos)
+        return self.rng.choice(possible_slots) if possible_slots else None
+
+    def find_safe_empty_slots_for_event(self, chromosome, event, ignore_pos=None):
+        """Lists every empty slot that is safe for the given event."""
+        course = self.model.get_course(event.course_id)
+        if not course: return []
+
+        # Masked search: suitable room, not break time, lecturer available, and no
+        # student/lecturer clash (classes in the room being vacated do not count)
+        candidate_slots = self.feasibility.free_cells(
+            self.track_occupancy(chromosome), event,
+            group_free=True, lecturer_free=event.faculty_id is not None,
+            ignore_room=ignore_pos[0] if ignore_pos else None)
+        return [pos for pos in candidate_slots if pos != ignore_pos]
+
+    def ensure_valid_solution(self, mutant_vector):
+        """Ensure same course on same day appears in same room and handle course splits."""
+        course_day_room_mapping = {}
+        
+        # First pass: collect course-day-room mappings
+        for room_idx in range(len(self.rooms)):
+            for timeslot_idx in range(len(self.timeslots)):
+                event_id = int(mutant_vector.grid[room_idx, timeslot_idx])
+                if event_id != EMPTY:
+                    class_event = self.events_map.get(event_id)
+                    if class_event:
+                        day_idx = timeslot_idx // self.input_data.hours
+                        course = self.model.get_course(class_event.course_id)
+                        course_id = getattr(course, 'course_id', None) or getattr(course, 'id', None) or getattr(course, 'code', None) if course else class_event.course_id
+                        course_day_key = (course_id, day_idx, class_event.student_group.id)
+                        
+                        if course_day_key not in course_day_room_mapping:
+                            course_day_room_mapping[course_day_key] = room_idx
+        
+        # Second pass: fix room violations
+        events_to_move = []
+        for room_idx in range(len(self.rooms)):
+            for timeslot_idx in range(len(self.timeslots)):
+                event_id = int(mutant_vector.grid[room_idx, timeslot_idx])
+                if event_id != EMPTY:
+                    class_event = self.events_map.get(event_id)
+                    if class_event:
+                        day_idx = timeslot_idx // self.input_data.hours
+                        course = self.model.get_course(class_event.course_id)
+                        course_id = getattr(course, 'course_id', None) or getattr(course, 'id', None) or getattr(course, 'code', None) if course else class_event.course_id
+                        course_day_key = (course_id, day_idx, class_event.student_group.id)
+                        expected_room = course_day_room_mapping.get(course_day_key)
+                        
+                        if expected_room is not None and room_idx != expected_room:
+                            mutant_vector[room_idx, timeslot_idx] = None
+                            events_to_move.append((event_id, expected_room, timeslot_idx))
+        
+        # Third pass: place moved events in correct rooms
+        for event_id, correct_room, original_timeslot in events_to_move:
+            placed = False
+            # Try to find an available slot in the correct room
+            for timeslot in range(len(self.timeslots)):
+                if self.is_slot_available(mutant_vector, correct_room, timeslot):
+                    mutant_vector[correct_room, timeslot] = event_id
+                    placed = True
+                    break
+            
+            # If not placed, it will be handled by the repair function
+        
+        # Repair course allocations to ensure all events are scheduled
+        mutant_vector = self.verify_and_repair_course_allocations(mutant_vector)
+        
+        # Final pass to ensure multi-hour courses are consecutive
+        mutant_vector = self.ensure_consecutive_slots(mutant_vector)
+        
+        # CRITICAL SAFETY: Ensure NO student group clashes after mutation
+        mutant_vector = self.prevent_student_group_clashes(mutant_vector)
+        
+        return mutant_vector
+
+    def prevent_student_group_clashes(self, chromosome):
+        """
+        Smart clash prevention that tries to move conflicting events rather than just deleting them.
+        This prevents missing classes while still eliminating student group clashes.
+        """
+        max_attempts = 5  # Increased attempts
+        chromosome = self.track_occupancy(chromosome)
+        tracker = IncrementalFitness(self.evaluator, chromosome)
+        
+        for attempt in range(max_attempts):
+            if attempt > 0 and self.stop_requested():
+                break
+            clashes_found = False
+            
+            # Check each timeslot for student group conflicts
+            for t_idx in range(len(self.timeslots)):
+                student_groups_seen = {}
+                conflicting_events = []
+                
+                # First pass: identify all conflicts in this timeslot
+                for r_idx in range(len(self.rooms)):
+                    event_id = int(chromosome.grid[r_idx, t_idx])
+                    if event_id != EMPTY:
+                        event = self.events_map.get(event_id)
+                        if event:
+                            sg_id = event.student_group.id
+                            if sg_id in student_groups_seen:
+                                # Conflict detected - both events clash
+                                conflicting_events.append((r_idx, event_id))
+                                clashes_found = True
+                            else:
+                                student_groups_seen[sg_id] = (r_idx, event_id)
+                
+                # Second pass: try to move conflicting events to other slots
+                for r_idx, event_id in conflicting_events:
+                    event = self.events_map.get(event_id)
+                    
+                    # Clear the conflicting position
+                    tracker.move(event_id, None)
+                    
+                    # Try to find an alternative slot for this event
+                    moved = False
+                    alternative_slots = self.feasibility.free_cells(chromosome, event, group_free=True, lecturer_free=True)
+                    
+                    if alternative_slots:
+                        # Move to the best-scoring alternative slot
+                        tracker.move(event_id, self.pick_best_slot(tracker, event_id, alternative_slots))
+                        moved = True
+                    else:
+                        # If no perfect slot, take the first suitable room slot
+                        fallback_slots = self.feasibility.free_cells(chromosome, event)
+                        if fallback_slots:
+                            tracker.move(event_id, fallback_slots[0])
+                            moved = True
+                    
+                    # If we couldn't move it anywhere, it becomes a missing class
+                    # This will be handled by the repair function later
+            
+            if not clashes_found:
+                break
+        
+        return chromosome
+
+    def verify_no_student_group_clashes(self, chromosome):
+        """
+        VERIFICATION FUNCTION: Checks that absolutely NO student group clashes exist.
+        Returns True if no clashes, False if clashes found.
+        """
+        for t_idx in range(len(self.timeslots)):
+            student_groups_seen = set()
+            
+            for r_idx in range(len(self.rooms)):
+                event_id = chromosome.grid[r_idx, t_idx]
+                if event_id != EMPTY:
+                    event = self.events_map.get(event_id)
+                    if event:
+                        sg_id = event.student_group.id
+                        if sg_id in student_groups_seen:
+                            print(f"❌ CRITICAL ERROR: Student group clash detected at timeslot {t_idx}!")
+                            print(f"   Student group {sg_id} appears multiple times at the same time!")
+                            return False
+                        student_groups_seen.add(sg_id)
+        
+        print("✅ VERIFIED: NO student group clashes detected!")
+        return True
+
+    def count_non_none(self, arr):
+        # Count scheduled events (compact chromosome) or non-None cells (legacy grid)
+        if isinstance(arr, CompactChromosome):
+            return arr.count_scheduled()
+        return np.count_nonzero(arr != None)
+    
+    def crossover(self, target_vector, mutant_vector):
+        """
+        Simple, robust crossover that avoids creating student group clashes.
+        """
+        trial_vector = self.track_occupancy(target_vector.copy())
+        mutant_grid = mutant_vector.grid
+        num_rooms, num_timeslots = trial_vector.shape
+        
+        # Whole CR mask in one draw; ensure at least one gene from the mutant vector is picked (j_rand)
+        take = self.rng.mask((num_rooms, num_timeslots), self.CR)
+        take[self.rng.randrange(num_rooms), self.rng.randrange(num_timeslots)] = True
+
+        # Simple placement - if mutant slot is empty, just clear it;
+        # events only come in if their student group is free in that timeslot
+        take = (take & (mutant_grid == EMPTY)) | safe_genes(trial_vector, mutant_grid, take)
+        return trial_vector.inherit(mutant_grid, take)
+
+    
+    def evaluate_fitness(self, chromosome):
+        # Optimization: Use cached fitness if available
+        # Same scores as Constraints.evaluate_fitness, computed from the compiled model
+        return self.get_violations(chromosome)['total']
+
+    def get_violations(self, chromosome):
+        """Per-constraint violations (plus 'total') for a chromosome, served from the fitness cache."""
+        chromosome = CompactChromosome.coerce(chromosome, len(self.events_list))
+        return self.fitness_cache.violations(chromosome, self.evaluator.get_constraint_violations)
+
+    def evaluate_population(self):
+        """
+        Pack the population into one (members, rooms, timeslots) int32 tensor and
+        score it with a single batched evaluator call; select and best tracking
+        read these arrays. Member grids become views into the tensor.
+        """
+        for idx, member in enumerate(self.population):
+            self.population[idx] = self.track_occupancy(CompactChromosome.coerce(member, len(self.events_list)))
+        self.population_grid = np.stack([member.grid for member in self.population]).astype(np.int32, copy=False)
+        for idx, member in enumerate(self.population):
+            member.grid = self.population_grid[idx]
+        self.population_violations = self.evaluator.compute_violation_matrix(self.population_grid)
+        self.population_fitness = np.zeros(len(self.population))
+        for idx, (member, row) in enumerate(zip(self.population, self.population_violations.tolist())):
+            # Same dict (and summation order) as get_violations, so later lookups hit the cache
+            violations = dict(zip(VIOLATION_KEYS, row))
+            violations['total'] = sum(row)
+            self.fitness_cache.put(chromosome_digest(member), violations)
+            self.population_fitness[idx] = violations['total']
+
+    def record_member(self, idx, violations=None):
+        """Store the grid, violation vector and total of population member `idx`."""
+        member = self.population[idx]
+        if violations is None:
+            violations = self.get_violations(member)
+        self.population_grid[idx] = member.grid
+        member.grid = self.population_grid[idx]
+        self.population_violations[idx] = self.evaluator.violation_vector(violations)
+        self.population_fitness[idx] = violations['total']
+
+    # Original DE constraint methods preserved for reference
+    # These are now replaced by the centralized Constraints class above   
+
+    def check_room_constraints(self, chromosome):
+        """
+        rooms must meet the capacity and type of the scheduled event
+        """
+        point = 0
+        for room_idx in range(len(self.rooms)):
+            room = self.rooms[room_idx]
+            for timeslot_idx in range(len(self.timeslots)):
+                class_event = self.events_map.get(chromosome[room_idx][timeslot_idx])
+                if class_event is not None:
+                    course = self.model.get_course(class_event.course_id)
+                    # H1: Room capacity and type constraints
+                    if room.room_type != course.required_room_type or class_event.student_group.no_students > room.capacity:
+                        point += 1
+
+        return point
+       
+    
+    def check_student_group_constraints(self, chromosome):
+        penalty = 0
+        for i in range(len(self.timeslots)):
+            simultaneous_class_events = chromosome[:, i]
+            student_group_watch = set()
+            for class_event_idx in simultaneous_class_events:
+                if class_event_idx != EMPTY:
+                    class_event = self.events_map.get(class_event_idx)
+                    student_group = class_event.student_group
+                    if student_group.id in student_group_watch:
+                        penalty += 1
+                    else:
+                        student_group_watch.add(student_group.id)
+
+        return penalty
+    
+    def check_lecturer_availability(self, chromosome):
+        penalty = 0
+        for i in range(len(self.timeslots)):
+            simultaneous_class_events = chromosome[:, i]
+            lecturer_watch = set()
+            for class_event_idx in simultaneous_class_events:
+                if class_event_idx != EMPTY:
+                    class_event = self.events_map.get(class_event_idx)
+                    faculty_id = class_event.faculty_id
+                    if faculty_id in lecturer_watch:
+                        penalty += 1
+                    else:
+                        lecturer_watch.add(faculty_id)
+
+        return penalty
+
+
+    # def check_room_time_conflict(self, chromosome):
+        penalty = 0
+
+        # Check if multiple events are scheduled in the same room at the same time
+        for room_idx, room_schedule in enumerate(chromosome):
+            for timeslot_idx, class_event in enumerate(room_schedule):
+                if class_event is not None:
+                    # H3: Ensure only one event is scheduled per timeslot per room
+                    if isinstance(class_event, list) and len(class_event) > 1:
+                        penalty += 1000  # Penalty for multiple events in the same room at the same time
+
+        return penalty
+# -------------------------------------------
+    # def check_valid_timeslot(self, chromosome):
+    #     penalty = 0
+        
+    #     for room_idx, room_schedule in enumerate(chromosome):
+    #         for timeslot_idx, class_event in enumerate(room_schedule):
+    #             if class_event is not None:  # Event scheduled
+    #                 # H5: Ensure the timeslot is valid for this event
+    #                 if not self.timeslots[timeslot_idx].is_valid_for_event(class_event):
+    #                     penalty += 500  # Moderate penalty for invalid timeslot
+
+    #     return penalty
+
+
+    def select(self, target_idx, trial_vector):
+        trial_violations = self.get_violations(trial_vector)
+        # The target's violations were stored when it joined the population
+        target_violations = dict(zip(VIOLATION_KEYS, self.population_violations[target_idx]))
+        target_violations['total'] = self.population_fitness[target_idx]
+
+        # Define which constraints are "hard" and must be prioritized
+        hard_constraints = [
+            'student_group_constraints', 
+            'lecturer_availability', 
+            'course_allocation_completeness',
+            'room_time_conflict',
+            'break_time_constraint',
+            'room_constraints',
+            'same_course_same_room_per_day',
+            'lecturer_schedule_constraints',
+            'lecturer_workload_constraints'
+        ]
+
+        trial_hard_violations = sum(trial_violations.get(c, 0) for c in hard_constraints)
+        target_hard_violations = sum(target_violations.get(c, 0) for c in hard_constraints)
+
+        accept = False
+        if trial_hard_violations < target_hard_violations:
+            accept = True
+        elif trial_hard_violations == target_hard_violations:
+            # If hard constraints are equal, compare total fitness (which includes soft constraints)
+            if trial_violations.get('total', float('inf')) <= target_violations.get('total', float('inf')):
+                accept = True
+
+        if accept:
+            # Decouple repair from selection: Accept the trial vector as is.
+            # The repair function will be called on all population members later in the main loop.
+            self.population[target_idx] = trial_vector
+            self.record_member(target_idx, trial_violations)
+        return accept
+
+    def build_trial(self, target_idx):
+        """Mutation, crossover and repair for one target; only reads population[target_idx]."""
+        # Step 1: Mutation
+        mutant_vector = self.mutate(target_idx)
+        
+        # Step 2: Crossover
+        trial_vector = self.crossover(self.population[target_idx], mutant_vector)
+        
+        # Step 3: Repair course allocations FIRST (highest priority)
+        trial_vector = self.verify_and_repair_course_allocations(trial_vector)
+        
+        # Step 4: THEN handle clashes (lower priority)
+        trial_vector = self.prevent_student_group_clashes(trial_vector)
+        
+        # Step 5: Final repair to catch any missing events after clash resolution
+        return self.verify_and_repair_course_allocations(trial_vector)
+
+    def run(self, max_generations, workers=1, on_generation=None, should_stop=None):
+        """
+        Run the differential evolution algorithm. With workers > 1 (0: one per CPU)
+        the trial vectors of each generation are built and scored in a process pool.
+        on_generation(event) is called after every generation with a progress dict
+        (see generation_event); self.best_solution holds the best so far at that
+        point. When should_stop() returns true the run ends after the current
+        generation and returns the best solution so far (stopped_early is set).
+        """
+        self.reset_evolution()
+        best_solution, fitness_history, generation, diversity_history = self.evolve(
+            max_generations, workers, on_generation, should_stop)
+        return self.repair_best(best_solution), fitness_history, generation, diversity_history
+
+    def evolve(self, max_generations, workers=1, on_generation=None, should_stop=None):
+        """
+        Run up to `max_generations` more generations, without the final repairs.
+        Each call carries on from the previous one (best solution, stagnation
+        count, generation number), so island epochs and multi-start chunks stop
+        early as a single run would; reset_evolution() starts over. Returns the
+        same tuple as run() for this call's generations. Once the search has
+        converged (desired fitness or stagnation) it returns at once with no
+        generations and self.converged set.
+        """
+        pool = ParallelGeneration(self, workers) if workers != 1 and not self.converged else None
+        self.should_stop, self.stopped_early = should_stop, False
+        try:
+            return self._run(max_generations, pool, on_generation)
+        finally:
+            self.should_stop = None
+            if pool is not None:
+                pool.close()
+
+    def reset_evolution(self):
+        """Forget the generation-loop state so the next evolve() starts a fresh run."""
+        self.best_solution, self.best_fitness = None, None
+        self.stagnation_counter, self.generations_done = 0, 0
+        self.converged = False
+
+    def stop_requested(self):
+        """True once the run's should_stop callback asks it to wind down."""
+        return self.should_stop is not None and bool(self.should_stop())
+
+    def generation_event(self, generation, max_generations, best_fitness, best_idx, started):
+        """Progress of one generation: best fitness, its hard/soft constraint totals, diversity and elapsed time."""
+        # Diversity sampling draws from `random`; restore it so reporting progress does not change the run
+        state = random.getstate()
+        diversity = self.calculate_population_diversity()
+        random.setstate(state)
+        event = {
+            'generation': generation + 1,
+            'max_generations': max_generations,
+            'best_fitness': float(best_fitness),
+            'diversity': float(diversity),
+            'elapsed_seconds': round(time.time() - started, 3),
+        }
+        event.update(violation_summary(self.population_violations[best_idx]))
+        return event
+
+    def _run(self, max_generations, pool, on_generation=None):
+        started = time.time()
+        # Population already initialized in __init__, don't reinitialize
+        fitness_history = []
+        diversity_history = []
+
+        if self.best_solution is None:
+            # Optimization: Calculate initial fitness once per member and find best solution
+            self.evaluate_population()
+            best_idx = int(np.argmin(self.population_fitness))
+            self.best_solution = self.population[best_idx].copy()
+            self.best_fitness = self.population_fitness[best_idx]
+        best_solution, best_fitness = self.best_solution, self.best_fitness
+        if self.converged:
+            return best_solution, fitness_history, -1, diversity_history
+
+        # Track fitness for early convergence detection (carried over from earlier calls)
+        stagnation_counter = self.stagnation_counter
+        last_improvement = best_fitness
+        first_generation = self.generations_done
+        total_generations = first_generation + max_generations
+
+        generation = -1
+        for generation in range(max_generations):
+            generation_number = first_generation + generation
+            generation_improved = False
+            
+            # Steps 1-5 in the pool: trial vectors for every target at once
+            trials = pool.trials() if pool is not None else None
+
+            for i in range(self.pop_size):
+                # Steps 1-5: Mutation, crossover and repair
+                trial_vector = trials[i] if trials is not None else self.build_trial(i)
+
+                # Step 6: Evaluation and Selection
+                self.select(i, trial_vector)
+                
+            # Optimization: Find best solution from the stored population fitness
+            current_best_idx = int(np.argmin(self.population_fitness))
+            current_best_fitness = self.population_fitness[current_best_idx]
+            
+            if current_best_fitness < best_fitness:
+                best_solution = self.population[current_best_idx].copy()
+                best_fitness = current_best_fitness
+                stagnation_counter = 0
+                last_improvement = best_fitness
+            else:
+                stagnation_counter += 1
+            
+            fitness_history.append(best_fitness)
+
+            # Optimization: Calculate diversity less frequently for speed
+            if generation_number % 20 == 0:  # Only every 20 generations (reduced from 10)
+                population_diversity = self.calculate_population_diversity()
+                diversity_history.append(population_diversity)
+
+            self.best_solution = best_solution
+            if on_generation is not None:
+                on_generation(self.generation_event(generation_number, total_generations, best_fitness, current_best_idx, started))
+
+            print(f"Best solution for generation {generation_number+1}/{total_generations} has a fitness of: {best_fitness}")
+
+            if best_fitness == self.desired_fitness:
+                print(f"Solution with desired fitness of {self.desired_fitness} found at Generation {generation_number}! 🎉")
+                self.converged = True
+                break  # Stop if the best solution has no constraint violations
+            
+            # Early termination if no improvement for 20 generations (reduced from 50)
+            if stagnation_counter >= 20:
+                print(f"Early termination due to stagnation after {stagnation_counter} generations without improvement at generation {generation_number+1}")
+                print(f"Final fitness achieved: {best_fitness}")
+                self.converged = True
+                break
+            
+            # Additional early termination if no improvement for many generations and fitness is acceptable
+            if stagnation_counter > 50 and best_fitness < 100:
+                print(f"Early termination due to convergence at generation {generation_number+1}")
+                self.converged = True
+                break
+
+            if self.stop_requested():
+                print(f"Stopping at generation {generation_number+1}: time budget reached or run cancelled")
+                self.stopped_early = True
+                break
+
+        self.best_fitness = best_fitness
+        self.stagnation_counter = stagnation_counter
+        self.generations_done += generation + 1
+        return best_solution, fitness_history, generation, diversity_history
+
+    def repair_best(self, best_solution):
+        """Post-algorithm repairs of the final best solution; run once, after the last generation."""
+        # CRITICAL: Ensure the final best solution has NO missing classes
+        # Track fitness before post-algorithm repairs
+        pre_repair_fitness = self.evaluate_fitness(best_solution)
+        print(f"\n🔧 APPLYING POST-ALGORITHM REPAIRS...")
+        print(f"   Fitness before repairs: {pre_repair_fitness:.4f}")
+        
+        best_solution = self.verify_and_repair_course_allocations(best_solution)
+        best_solution = self.ensure_consecutive_slots(best_solution)
+        best_solution = self.prevent_student_group_clashes(best_solution)
+        
+        # FINAL repair pass to absolutely guarantee no missing classes
+        best_solution = self.verify_and_repair_course_allocations(best_solution)
+        
+        # Track fitness after repairs
+        post_repair_fitness = self.evaluate_fitness(best_solution)
+        repair_impact = post_repair_fitness - pre_repair_fitness
+        print(f"   Fitness after repairs: {post_repair_fitness:.4f}")
+        
+        if abs(repair_impact) > 0.01:
+            impact_direction = "improved" if repair_impact < 0 else "worsened"
+            print(f"   🎯 Repair impact: {impact_direction} fitness by {abs(repair_impact):.4f} points")
+        else:
+            print(f"   ✅ Repair impact: minimal change ({repair_impact:.4f})")
+        print(f"🔧 POST-ALGORITHM REPAIRS COMPLETE\n")
+        
+        return best_solution
+
+
+    def print_timetable(self, individual, student_group, days, hours_per_day, day_start_time=9):
+        timetable = [["" for _ in range(days)] for _ in range(hours_per_day)]
+        
+        # First, fill break time slots on Mon, Wed, Fri
+        break_hour = 4  # 13:00 is the 5th hour (index 4) starting from 9:00
+        if break_hour < hours_per_day:
+            for day in range(days):
+                if day in [0, 2, 4]: # Monday, Wednesday, Friday
+                    timetable[break_hour][day] = "BREAK"
+        
+        individual = CompactChromosome.coerce(individual, len(self.events_list))
+        for event_id in individual.scheduled_events():
+            class_event = self.events_list[event_id]
+            if class_event.student_group.id == student_group.id:
+                room_idx, timeslot_idx = individual.position(event_id)
+                day = timeslot_idx // hours_per_day
+                hour = timeslot_idx % hours_per_day
+                
+                # Check if it's a break slot that should be skipped in the display
+                is_display_break = (hour == break_hour and day in [0, 2, 4])
+
+                if day < days and not is_display_break:
+                    course = self.model.get_course(class_event.course_id)
+                    faculty = self.model.get_faculty(class_event.faculty_id)
+                    course_code = course.code if course is not None else "Unknown"
+                    
+                    # Use faculty name if available, otherwise use faculty email (ID)
+                    if faculty is not None:
+                        faculty_display = faculty.name if faculty.name else faculty.faculty_id
+                    else:
+                        faculty_display = "Unknown"
+                    
+                    room_obj = self.input_data.rooms[room_idx]
+                    room_display = getattr(room_obj, "name", getattr(room_obj, "Id", str(room_idx)))
+                    
+                    # Format as: Course Code\nRoom Name\nFaculty Name
+                    timetable[hour][day] = f"{course_code}\n{room_display}\n{faculty_display}"
+        return timetable
+
+    def print_all_timetables(self, individual, days, hours_per_day, day_start_time=9):
+        # app.layout = html.Div([
+        #     html.H1("Timetable"),
+        #     html.Div([
+        #         html.Label("Select Student Group:"),
+        #         dcc.Dropdown(
+        #             id='student-group-dropdown',
+        #             options=[{'label': student_group.name, 'value': student_group.id} for student_group in input_data.student_groups],
+        #             value=input_data.student_groups[0].id
+        #         ),
+        #     ]),
+        #     html.Div(id='timetable-container')
+        # ])
+        data = []
+        # Find all unique student groups in the individual
+        student_groups = self.input_data.student_groups
+        individual = CompactChromosome.coerce(individual, len(self.events_list))
+
+        # Print timetable for each student group
+        for student_group in student_groups:
+            timetable = self.print_timetable(individual, student_group, days, hours_per_day, day_start_time)
+            rows = []
+            for hour in range(hours_per_day):
+                time_label = f"{day_start_time + hour}:00"
+                row = [time_label] + [timetable[hour][day] for day in range(days)]
+                rows.append(row)
+            data.append({"student_group": student_group, "timetable": rows})
+        return data
+
+    def ensure_consecutive_slots(self, chromosome):
+        """
+        Scans the timetable and attempts to repair any multi-hour courses
+        that have been split into non-consecutive slots.
+        """
+        # Group all scheduled events by course and student group
+        chromosome = CompactChromosome.coerce(chromosome, len(self.events_list))
+        events_by_course = {}
+        for event_id in chromosome.scheduled_events():
+            event_id = int(event_id)
+            event = self.events_list[event_id]
+
+            course_key = (event.student_group.id, event.course_id)
+            if course_key not in events_by_course:
+                events_by_course[course_key] = []
+            events_by_course[course_key].append({'event_id': event_id, 'pos': chromosome.position(event_id)})
+
+        for course_key, events in events_by_course.items():
+            # Time budget / cancellation: keep the courses repaired so far
+            if self.stop_requested():
+                break
+            hours_required = len(events)
+            if hours_required < 2:
+                continue # Not a multi-hour course that needs checking
+
+            # Check if the events are consecutive
+            positions = sorted([e['pos'] for e in events], key=lambda p: p[1])
+            is_consecutive = True
+            for i in range(len(positions) - 1):
+                # Check if they are in the same room and adjacent timeslots
+                if not (positions[i][0] == positions[i+1][0] and positions[i][1] + 1 == positions[i+1][1]):
+                    is_consecutive = False
+                    break
+            
+            if is_consecutive:
+                continue # This course is fine, move to the next one
+
+            # --- If not consecutive, attempt to repair ---
+            # 1. Find a new, valid, consecutive block of slots for the entire course
+            student_group_id, course_id = course_key
+            course = self.model.get_course(course_id)
+            
+            possible_blocks = []
+            for r_idx, room in enumerate(self.rooms):
+                if self.is_room_suitable(room, course):
+                    for t_start in range(len(self.timeslots) - hours_required + 1):
+                        is_block_valid = True
+                        # Temporarily clear old positions to check availability
+                        temp_chromosome = chromosome.copy()
+                        for event_info in events:
+                            r, t = event_info['pos']
+                            temp_chromosome[r, t] = None
+                        
+                        for i in range(hours_required):
+                            t_check = t_start + i
+                            event_to_place = self.events_list[events[i]['event_id']]
+                            
+                            # Check if the new slot is valid for this event
+                            if not (self.is_slot_available_for_event(temp_chromosome, r_idx, t_check, event_to_place) and
+                                    self._is_student_group_available(temp_chromosome, student_group_id, t_check) and
+                                    self._is_lecturer_available(temp_chromosome, event_to_place.faculty_id, t_check)):
+                                is_block_valid = False
+                                break
+                        
+                        if is_block_valid:
+                            possible_blocks.append((r_idx, t_start))
+            
+            # 2. If a valid block is found, perform the move
+            if possible_blocks:
+                new_r, new_t_start = self.rng.choice(possible_blocks)
+                
+                # Clear the old, non-consecutive event positions
+                for event_info in events:
+                    r, t = event_info['pos']
+                    chromosome[r, t] = None
+                
+                # Place the events in the new consecutive block
+                for i in range(hours_required):
+                    chromosome[new_r, new_t_start + i] = events[i]['event_id']
+
+        return chromosome
+
+    def verify_and_repair_course_allocations(self, chromosome):
+        """
+        AGGRESSIVE method to ensure every required event is scheduled exactly once.
+        MISSING CLASSES MUST NEVER OCCUR - this is the highest priority.
+        """
+        # Phases 1-2 (count + remove duplicates) are implicit: the compact chromosome
+        # keeps every event in at most one cell, so legacy grids are deduplicated here.
+        chromosome = self.track_occupancy(CompactChromosome.coerce(chromosome, len(self.events_list)))
+        max_repair_passes = 5  # Increased from 3
+
+        for pass_num in range(max_repair_passes):
+            # --- Phase 3: AGGRESSIVELY place missing events ---
+            missing_events = [int(event_id) for event_id in chromosome.missing_events()]
+            self.rng.shuffle(missing_events)
+
+            if not missing_events:
+                break  # All events are scheduled
+
+            for event_id in missing_events:
+                event = self.events_list[event_id]
+                course = self.model.get_course(event.course_id)
+                if not course: continue
+
+                placed = False
+                
+                # Strategy 1: Find perfect slots (no conflicts)
+                perfect_slots = self.feasibility.free_cells(chromosome, event, group_free=True, lecturer_free=True)
+                
+                if perfect_slots:
+                    r, t = self.rng.choice(perfect_slots)
+                    chromosome[r, t] = event_id
+                    placed = True
+                    continue
+                
+                # Strategy 2: Accept student/lecturer conflicts but respect room/time constraints
+                acceptable_slots = self.feasibility.free_cells(chromosome, event)
+                
+                if acceptable_slots:
+                    r, t = self.rng.choice(acceptable_slots)
+                    chromosome[r, t] = event_id
+                    placed = True
+                    continue
+                
+                # Strategy 3: FORCE placement by displacing an existing event
+                if not placed:
+                    # Find any suitable room and displace whatever is there
+                    for r_idx, room in enumerate(self.rooms):
+                        if self.is_room_suitable(room, course):
+                            for t_idx in range(len(self.timeslots)):
+                                # Check basic availability (break time, lecturer schedule)
+                                if self.is_slot_available_for_event(chromosome, r_idx, t_idx, event):
+                                    # Force place this event, even if it displaces another
+                                    displaced_event_id = chromosome.place(event_id, r_idx, t_idx)
+                                    placed = True
+
+                                    # If we displaced something, try to reschedule it quickly
+                                    if displaced_event_id != EMPTY:
+                                        self._try_quick_reschedule(chromosome, displaced_event_id)
+                                    break
+                            if placed:
+                                break
+                
+                # If STILL not placed, something is very wrong - but we continue
+
+        return chromosome
+    
+    def _try_quick_reschedule(self, chromosome, displaced_event_id):
+        """Helper to quickly try to reschedule a displaced event"""
+        displaced_event = self.events_list[displaced_event_id]
+        
+        # Collect suitable empty slots and keep the one that hurts fitness least
+        candidate_slots = self.feasibility.free_cells(self.track_occupancy(chromosome), displaced_event)
+        if not candidate_slots:
+            return False
+
+        tracker = IncrementalFitness(self.evaluator, chromosome)
+        tracker.move(displaced_event_id, self.pick_best_slot(tracker, displaced_event_id, candidate_slots))
+        return True
+
+    def count_course_occurrences(self, chromosome, student_group):
+        """
+        Count how many times each course appears for a specific student group
+        """
+        course_counts = {}
+        chromosome = CompactChromosome.coerce(chromosome, len(self.events_list))
+
+        for event_id in chromosome.scheduled_events():
+            event = self.events_list[event_id]
+            if event.student_group.id == student_group.id:
+                course_id = event.course_id
+                course_counts[course_id] = course_counts.get(course_id, 0) + 1
+        
+        return course_counts
+
+    def diagnose_course_allocations(self, chromosome):
+        """
+        Diagnostic method to check course allocations for debugging
+        """
+        print("\n=== COURSE ALLOCATION DIAGNOSIS ===")
+        
+        # Count total scheduled events
+        chromosome = CompactChromosome.coerce(chromosome, len(self.events_list))
+        scheduled_count = chromosome.count_scheduled()
+
+        print(f"Total events: {len(self.events_list)}")
+        print(f"Scheduled events: {scheduled_count}")
+        print(f"Missing events: {len(self.events_list) - scheduled_count}")
+        
+        # Check each student group
+        for student_group in self.student_groups:
+            print(f"\nStudent Group: {student_group.name}")
+            course_counts = self.count_course_occurrences(chromosome, student_group)
+            
+            # Calculate expected hours considering 1-credit = 3-hour conversion
+            expected_hours = []
+            for i in range(len(student_group.hours_required)):
+                required_hours = student_group.hours_required[i]
+                if required_hours == 1:
+                    required_hours = 3
+                expected_hours.append(required_hours)
+            
+            total_expected = sum(expected_hours)
+            total_actual = sum(course_counts.values())
+            
+            print(f"  Total hours: Expected {total_expected}, Got {total_actual}")
+            
+            for i, course_id in enumerate(student_group.courseIDs):
+                expected = expected_hours[i]
+                actual = course_counts.get(course_id, 0)
+                status = "✓" if actual == expected else "✗"
+                print(f"  {course_id}: Expected {expected}, Got {actual} {status}")
+        
+        print("=== END DIAGNOSIS ===\n")
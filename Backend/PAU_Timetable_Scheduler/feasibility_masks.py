@@ -0,0 +1,90 @@
+# feasibility_masks.py
+"""
+Precomputed placement feasibility for the DE engines.
+
+Whether an event may go into (room, timeslot) only depends on its course
+(required room type) and lecturer (available days/times), plus the fixed break
+slots. FeasibilityMasks turns the lecturer availability rule used for scoring
+(Constraints.get_lecturer_schedule_violation, via VectorizedConstraints) into a
+lecturer x timeslot table once, and caches a rooms x timeslots boolean mask per
+distinct (course, lecturer) pair. Candidate-slot searches are then a masked
+np.argwhere against the chromosome's empty cells and occupancy counts instead
+of re-parsing availability strings for every cell.
+"""
+
+import numpy as np
+from compact_chromosome import EMPTY
+
+
+class FeasibilityMasks:
+    def __init__(self, evaluator):
+        self.model = evaluator.model
+        self.num_rooms = evaluator.num_rooms
+        self.num_timeslots = evaluator.num_timeslots
+
+        # Timeslots that are not break time
+        self.timeslot_open = ~evaluator.is_break_slot
+        # Lecturer x timeslot: inside the lecturer's available days/times and not break time
+        self.lecturer_open = (evaluator.lecturer_slot_penalty == 0) & self.timeslot_open[None, :]
+
+        self._masks = {}
+
+    def slot_mask(self, faculty_id):
+        """Timeslots where an event taught by `faculty_id` may be scheduled (break time and lecturer availability)."""
+        lecturer_idx = self.model.lecturer_index.get(faculty_id) if faculty_id is not None else None
+        if lecturer_idx is None:
+            return self.timeslot_open
+        return self.lecturer_open[lecturer_idx]
+
+    def is_open(self, event, timeslot_idx):
+        """Same rule as slot_mask for a single timeslot (event may be None: break time only)."""
+        if not event:
+            return bool(self.timeslot_open[timeslot_idx])
+        return bool(self.slot_mask(event.faculty_id)[timeslot_idx])
+
+    def placement_mask(self, course_id, faculty_id):
+        """Rooms x timeslots mask: suitable room type, not break time, lecturer available."""
+        key = (course_id, faculty_id)
+        mask = self._masks.get(key)
+        if mask is None:
+            course = self.model.get_course(course_id)
+            if course is None:
+                suitable_rooms = np.zeros(self.num_rooms, dtype=bool)
+            else:
+                suitable_rooms = self.model.room_type == self.model.room_type_code(course.required_room_type)
+            mask = suitable_rooms[:, None] & self.slot_mask(faculty_id)[None, :]
+            mask.flags.writeable = False
+            self._masks[key] = mask
+        return mask
+
+    def free_cells(self, chromosome, event, group_free=False, lecturer_free=False, ignore_room=None):
+        """
+        Empty (room, timeslot) cells where `event` may be placed, in room-major order.
+        With group_free/lecturer_free, timeslots where the event's student group or
+        lecturer already has a class are skipped (uses the chromosome's occupancy
+        counts); classes held in `ignore_room` do not count as a clash.
+        """
+        mask = self.placement_mask(event.course_id, event.faculty_id) & (chromosome.grid == EMPTY)
+        if group_free:
+            group_idx = self.model.group_index.get(event.student_group.id)
+            if group_idx is not None:
+                busy = self._busy(chromosome.group_slots[group_idx], chromosome, self.model.event_group,
+                                  group_idx, ignore_room)
+                mask &= (busy == 0)[None, :]
+        if lecturer_free:
+            lecturer_idx = self.model.lecturer_index.get(event.faculty_id)
+            if lecturer_idx is not None:
+                busy = self._busy(chromosome.lecturer_slots[lecturer_idx], chromosome, self.model.event_lecturer,
+                                  lecturer_idx, ignore_room)
+                mask &= (busy == 0)[None, :]
+        return [tuple(cell) for cell in np.argwhere(mask).tolist()]
+
+    def _busy(self, counts, chromosome, event_owner, owner_idx, ignore_room):
+        """Per-timeslot class count for one group/lecturer, leaving out `ignore_room`."""
+        if ignore_room is None:
+            return counts
+        row = chromosome.grid[ignore_room]
+        in_room = np.zeros(len(row), dtype=counts.dtype)
+        occupied = row != EMPTY
+        in_room[occupied] = event_owner[row[occupied]] == owner_idx
+        return counts - in_room
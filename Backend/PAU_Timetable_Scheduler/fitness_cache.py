@@ -0,0 +1,90 @@
+# fitness_cache.py
+"""
+Content-addressed LRU cache for chromosome evaluations.
+
+Entries are keyed by a 128-bit BLAKE2b digest of the chromosome's int32
+assignment grid, so equal timetables always hit regardless of which object
+holds them. Each entry keeps the full violation breakdown (as returned by
+get_constraint_violations, including 'total'), not just the fitness.
+Recency is tracked with an OrderedDict, so lookups, inserts and evictions
+are O(1).
+"""
+
+import hashlib
+from collections import OrderedDict
+
+DEFAULT_CAPACITY = 4096
+
+
+def chromosome_digest(chromosome):
+    """Stable 16-byte digest of a chromosome's assignment."""
+    return hashlib.blake2b(chromosome.tobytes(), digest_size=16).digest()
+
+
+def combine_stats(stats):
+    """Totals of several caches' stats() (e.g. one per island or restart process)."""
+    stats = [s for s in stats if s]
+    totals = {key: sum(s.get(key, 0) for s in stats) for key in ('capacity', 'size', 'hits', 'misses', 'evictions')}
+    lookups = totals['hits'] + totals['misses']
+    totals['hit_rate'] = totals['hits'] / lookups if lookups else 0.0
+    totals['caches'] = len(stats)
+    return totals
+
+
+class FitnessCache:
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = max(1, int(capacity))
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Violation dict for a digest, or None on a miss."""
+        violations = self._entries.get(key)
+        if violations is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return violations
+
+    def put(self, key, violations):
+        self._entries[key] = violations
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def violations(self, chromosome, compute):
+        """Cached violation dict for `chromosome`, calling `compute(chromosome)` on a miss."""
+        key = chromosome_digest(chromosome)
+        violations = self.get(key)
+        if violations is None:
+            violations = compute(chromosome)
+            self.put(key, violations)
+        return violations
+
+    def resize(self, capacity):
+        self.capacity = max(1, int(capacity))
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+
+    def _evict(self):
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'capacity': self.capacity,
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
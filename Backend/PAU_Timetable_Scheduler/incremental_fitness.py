@@ -0,0 +1,371 @@
+# incremental_fitness.py
+"""
+Incremental (delta) fitness evaluation for move-based operators.
+
+IncrementalFitness is bound to one compact chromosome and keeps the counters
+behind every constraint in VectorizedConstraints (group/lecturer slot counts,
+(course, group, day) room counts, hours per course allocation, lecturer hours
+per day, events per group and day, slots per consecutive-rule course). Moving
+or swapping events only updates the counters the affected events touch, so a
+candidate move is scored in O(affected) time instead of re-evaluating the
+whole timetable.
+
+Usage:
+    tracker = IncrementalFitness(evaluator, chromosome)
+    delta = tracker.delta_move(event_id, (room_idx, timeslot_idx))
+    if delta <= 0:
+        tracker.commit()      # applies the move to the chromosome
+    else:
+        tracker.rollback()    # counters go back, chromosome untouched
+
+All counters are integers, so the tracked fitness does not drift; it equals
+VectorizedConstraints.evaluate_fitness up to float summation order.
+"""
+
+import numpy as np
+from compact_chromosome import EMPTY
+
+
+def _extra(count):
+    """Events beyond the first one sharing a slot/day (clash-style counting)."""
+    return count - 1 if count > 1 else 0
+
+
+class IncrementalFitness:
+    def __init__(self, evaluator, chromosome):
+        self.evaluator = evaluator
+        self.model = model = evaluator.model
+        self.chromosome = chromosome
+        self.hours = evaluator.hours
+        self.days = evaluator.days
+        self.num_timeslots = evaluator.num_timeslots
+        self.half_week = evaluator.days // 2
+
+        # Expected hours per allocation key (completeness is summed over every (group, course) entry)
+        self.expected_by_key = {}
+        for key, hours in zip(evaluator.expected_keys.tolist(), evaluator.expected_hours.tolist()):
+            self.expected_by_key.setdefault(key, []).append(hours)
+
+        # Dense key per event for the consecutive-slot rule: (course, group)
+        consecutive_keys = {}
+        self.event_consecutive_key = np.full(len(model.events_list), EMPTY, dtype=np.int32)
+        for event_id in np.flatnonzero(evaluator.event_consecutive_rule):
+            key = (int(model.event_course[event_id]), int(model.event_group[event_id]))
+            if key not in consecutive_keys:
+                consecutive_keys[key] = len(consecutive_keys)
+            self.event_consecutive_key[event_id] = consecutive_keys[key]
+        self.consecutive_credits = [int(evaluator.course_credits[course]) for course, _ in consecutive_keys]
+
+        self._pending = []
+        self._pending_moves = []
+        self.reset()
+
+    # --- state ---
+    def reset(self):
+        """Rebuild every counter from the bound chromosome (drops pending changes)."""
+        evaluator = self.evaluator
+        model = self.model
+        num_groups = evaluator.num_groups
+        num_lecturers = evaluator.num_lecturers
+        num_keys = evaluator.num_allocation_keys
+
+        positions = self.chromosome.positions
+        events = np.flatnonzero(positions >= 0)
+        rooms, timeslots = np.divmod(positions[events].astype(np.int64), self.num_timeslots)
+        days, hours = np.divmod(timeslots, self.hours)
+        groups = model.event_group[events].astype(np.int64)
+        keys = evaluator.event_allocation_key[events].astype(np.int64)
+        has_lecturer = model.event_has_lecturer[events]
+        lecturers = model.event_lecturer[events][has_lecturer].astype(np.int64)
+
+        def counts(index, size, shape):
+            return np.bincount(index, minlength=size).astype(np.int32).reshape(shape)
+
+        def extra(array):
+            return int(np.sum(np.maximum(array - 1, 0)))
+
+        self.group_slot = counts(groups * self.num_timeslots + timeslots, num_groups * self.num_timeslots,
+                                 (num_groups, self.num_timeslots))
+        self.lecturer_slot = counts(lecturers * self.num_timeslots + timeslots[has_lecturer],
+                                    num_lecturers * self.num_timeslots, (num_lecturers, self.num_timeslots))
+        self.key_day_room = counts((keys * self.days + days) * evaluator.num_rooms + rooms,
+                                   num_keys * self.days * evaluator.num_rooms,
+                                   (num_keys, self.days, evaluator.num_rooms))
+        self.key_day_rooms_used = np.count_nonzero(self.key_day_room, axis=2).astype(np.int32)
+        self.allocated_hours = np.bincount(keys, minlength=num_keys + 1).astype(np.int32)
+        self.lecturer_hours = counts((lecturers * self.days + days[has_lecturer]) * self.hours + hours[has_lecturer],
+                                     num_lecturers * self.days * self.hours, (num_lecturers, self.days, self.hours))
+        self.group_day = counts(groups * self.days + days, num_groups * self.days, (num_groups, self.days))
+        self.group_days_used = np.count_nonzero(self.group_day, axis=1).astype(np.int32)
+
+        self.room_halves = int(np.sum(evaluator.event_room_cost[events, rooms]))
+        self.building_halves = int(np.sum(evaluator.event_building_cost[events, rooms]))
+        self.break_count = int(np.count_nonzero(evaluator.is_break_slot[timeslots]))
+        self.student_clashes = extra(self.group_slot)
+        self.lecturer_clashes = extra(self.lecturer_slot)
+        self.same_room_penalty = 2 * extra(self.key_day_rooms_used)
+        self.schedule_penalty = int(np.sum(evaluator.lecturer_slot_penalty[lecturers, timeslots[has_lecturer]]))
+        self.single_event_extra = extra(self.group_day)
+        self.completeness_penalty = sum(self._completeness(key, int(self.allocated_hours[key]))
+                                        for key in self.expected_by_key)
+
+        # Workload per (lecturer, day): longest run of occupied hours
+        occupied = self.lecturer_hours > 0
+        daily_hours = occupied.sum(axis=2)
+        run = np.zeros(daily_hours.shape, dtype=np.int64)
+        longest_run = np.zeros(daily_hours.shape, dtype=np.int64)
+        for hour in range(self.hours):
+            run = (run + 1) * occupied[:, :, hour]
+            np.maximum(longest_run, run, out=longest_run)
+        self.workload = 2 * np.maximum(daily_hours - 4, 0) + 30 * np.where(daily_hours >= 4, np.maximum(longest_run - 3, 0), 0)
+        self.workload_penalty = int(np.sum(self.workload))
+
+        # Spread: groups used on fewer than half the days (groups without events count too)
+        self.clustered_groups = evaluator.num_distinct_group_ids - len(evaluator.distinct_groups)
+        self.clustered_groups += int(np.count_nonzero(self.group_days_used[evaluator.distinct_groups] < self.half_week))
+
+        # Consecutive-slot rule: sorted slots per (course, group)
+        self.consecutive_slots = [[] for _ in self.consecutive_credits]
+        consecutive_keys = self.event_consecutive_key[events]
+        mask = consecutive_keys != EMPTY
+        for key, timeslot_idx in zip(consecutive_keys[mask].tolist(), timeslots[mask].tolist()):
+            self.consecutive_slots[key].append(timeslot_idx)
+        self.two_credit_breaks = 0
+        self.three_credit_breaks = 0
+        for key, slots in enumerate(self.consecutive_slots):
+            slots.sort()
+            two, three = self._consecutive_breaks(key)
+            self.two_credit_breaks += two
+            self.three_credit_breaks += three
+
+        self._pending = []
+        self._pending_moves = []
+
+    def _completeness(self, key, actual):
+        penalty = 0
+        for expected in self.expected_by_key.get(key, ()):
+            difference = abs(expected - actual)
+            penalty += difference * 2 if actual < expected and actual == 0 else difference
+        return penalty
+
+    def _workload(self, lecturer_idx, day_idx):
+        daily_hours = 0
+        run = longest_run = 0
+        for count in self.lecturer_hours[lecturer_idx, day_idx]:
+            if count:
+                daily_hours += 1
+                run += 1
+                longest_run = max(longest_run, run)
+            else:
+                run = 0
+        penalty = 2 * max(daily_hours - 4, 0)
+        if daily_hours >= 4:
+            penalty += 30 * max(longest_run - 3, 0)
+        return penalty
+
+    def _consecutive_breaks(self, key):
+        """(2-credit breaks, 3-credit breaks) contributed by one (course, group) key."""
+        slots = self.consecutive_slots[key]
+        credits = self.consecutive_credits[key]
+        if credits == 2 and len(slots) == 2:
+            return (1 if slots[1] - slots[0] != 1 else 0), 0
+        if credits == 3 and len(slots) == 3:
+            return 0, (1 if slots[1] - slots[0] != 1 and slots[2] - slots[1] != 1 else 0)
+        return 0, 0
+
+    def _update(self, event_id, room_idx, timeslot_idx, sign):
+        """Add (sign=1) or remove (sign=-1) one event at (room, timeslot) from every counter."""
+        evaluator = self.evaluator
+        model = self.model
+        day_idx, hour_idx = divmod(timeslot_idx, self.hours)
+        group_idx = model.event_group[event_id]
+
+        # Placement-local penalties
+        self.room_halves += sign * int(evaluator.event_room_cost[event_id, room_idx])
+        self.building_halves += sign * int(evaluator.event_building_cost[event_id, room_idx])
+        if evaluator.is_break_slot[timeslot_idx]:
+            self.break_count += sign
+
+        # Student group clashes
+        before = int(self.group_slot[group_idx, timeslot_idx])
+        self.group_slot[group_idx, timeslot_idx] = before + sign
+        self.student_clashes += _extra(before + sign) - _extra(before)
+
+        # Lecturer clashes, availability and workload
+        if model.event_has_lecturer[event_id]:
+            lecturer_idx = model.event_lecturer[event_id]
+            before = int(self.lecturer_slot[lecturer_idx, timeslot_idx])
+            self.lecturer_slot[lecturer_idx, timeslot_idx] = before + sign
+            self.lecturer_clashes += _extra(before + sign) - _extra(before)
+            self.schedule_penalty += sign * int(evaluator.lecturer_slot_penalty[lecturer_idx, timeslot_idx])
+
+            hours_before = int(self.lecturer_hours[lecturer_idx, day_idx, hour_idx])
+            self.lecturer_hours[lecturer_idx, day_idx, hour_idx] = hours_before + sign
+            if hours_before == 0 or hours_before + sign == 0:
+                workload = self._workload(lecturer_idx, day_idx)
+                self.workload_penalty += workload - int(self.workload[lecturer_idx, day_idx])
+                self.workload[lecturer_idx, day_idx] = workload
+
+        # Same course for a group on one day stays in one room
+        key = evaluator.event_allocation_key[event_id]
+        before = int(self.key_day_room[key, day_idx, room_idx])
+        self.key_day_room[key, day_idx, room_idx] = before + sign
+        if before == 0 or before + sign == 0:
+            rooms_before = int(self.key_day_rooms_used[key, day_idx])
+            self.key_day_rooms_used[key, day_idx] = rooms_before + sign
+            self.same_room_penalty += 2 * (_extra(rooms_before + sign) - _extra(rooms_before))
+
+        # Course allocation completeness
+        actual = int(self.allocated_hours[key])
+        self.allocated_hours[key] = actual + sign
+        self.completeness_penalty += self._completeness(key, actual + sign) - self._completeness(key, actual)
+
+        # Events per group per day, and days used per group (spread)
+        before = int(self.group_day[group_idx, day_idx])
+        self.group_day[group_idx, day_idx] = before + sign
+        self.single_event_extra += _extra(before + sign) - _extra(before)
+        if before == 0 or before + sign == 0:
+            days_before = int(self.group_days_used[group_idx])
+            self.group_days_used[group_idx] = days_before + sign
+            self.clustered_groups += int(days_before + sign < self.half_week) - int(days_before < self.half_week)
+
+        # Consecutive slots for 2/3-credit courses
+        consecutive_key = self.event_consecutive_key[event_id]
+        if consecutive_key != EMPTY:
+            two_before, three_before = self._consecutive_breaks(consecutive_key)
+            slots = self.consecutive_slots[consecutive_key]
+            if sign > 0:
+                slots.append(timeslot_idx)
+                slots.sort()
+            else:
+                slots.remove(timeslot_idx)
+            two_after, three_after = self._consecutive_breaks(consecutive_key)
+            self.two_credit_breaks += two_after - two_before
+            self.three_credit_breaks += three_after - three_before
+
+    # --- scores ---
+    def violations(self):
+        """Per-constraint penalties, keyed like Constraints.get_constraint_violations."""
+        return {
+            'room_constraints': 0.5 * self.room_halves,
+            'student_group_constraints': self.student_clashes,
+            'lecturer_availability': self.lecturer_clashes,
+            'room_time_conflict': 0,
+            'building_assignments': 0.5 * self.building_halves,
+            'same_course_same_room_per_day': self.same_room_penalty,
+            'break_time_constraint': 50 * self.break_count,
+            'course_allocation_completeness': self.completeness_penalty,
+            'lecturer_schedule_constraints': float(self.schedule_penalty),
+            'lecturer_workload_constraints': self.workload_penalty,
+            'single_event_per_day': 0.05 * self.single_event_extra,
+            'consecutive_timeslots': 0.04 * self.two_credit_breaks + 0.06 * self.three_credit_breaks,
+            'spread_events': 0.025 * self.clustered_groups,
+        }
+
+    @property
+    def fitness(self):
+        """Fitness of the chromosome including any pending (uncommitted) move."""
+        penalty = (0.5 * self.room_halves + self.student_clashes + self.lecturer_clashes +
+                   0.5 * self.building_halves + self.same_room_penalty + 50 * self.break_count +
+                   self.completeness_penalty + self.schedule_penalty + self.workload_penalty)
+        cost = 0.05 * self.single_event_extra + 0.04 * self.two_credit_breaks + \
+            0.06 * self.three_credit_breaks + 0.025 * self.clustered_groups
+        return float(penalty + cost)
+
+    # --- moves ---
+    def _apply(self, changes):
+        before = self.fitness
+        for event_id, old_pos, new_pos in changes:
+            if old_pos is not None:
+                self._update(event_id, old_pos[0], old_pos[1], -1)
+            if new_pos is not None:
+                self._update(event_id, new_pos[0], new_pos[1], 1)
+        self._pending.extend(changes)
+        return self.fitness - before
+
+    def delta_move(self, event_id, new_pos):
+        """
+        Fitness change of moving `event_id` to `new_pos` (None unschedules it).
+        Like CompactChromosome.place, an event already in the target cell is displaced.
+        The move stays pending until commit() or rollback().
+        """
+        self.rollback()
+        event_id = int(event_id)
+        old_pos = self.chromosome.position(event_id)
+        if new_pos is not None:
+            new_pos = (int(new_pos[0]), int(new_pos[1]))
+        if new_pos == old_pos:
+            return 0.0
+        changes = []
+        if new_pos is not None:
+            occupant = int(self.chromosome.grid[new_pos])
+            if occupant != EMPTY:
+                changes.append((occupant, new_pos, None))
+        changes.append((event_id, old_pos, new_pos))
+        self._pending_moves.append(('move', event_id, new_pos))
+        return self._apply(changes)
+
+    def delta_swap(self, pos_a, pos_b):
+        """Fitness change of swapping the contents of two cells (pending until commit/rollback)."""
+        self.rollback()
+        pos_a = (int(pos_a[0]), int(pos_a[1]))
+        pos_b = (int(pos_b[0]), int(pos_b[1]))
+        if pos_a == pos_b:
+            return 0.0
+        event_a = int(self.chromosome.grid[pos_a])
+        event_b = int(self.chromosome.grid[pos_b])
+        changes = []
+        if event_a != EMPTY:
+            changes.append((event_a, pos_a, pos_b))
+        if event_b != EMPTY:
+            changes.append((event_b, pos_b, pos_a))
+        self._pending_moves.append(('swap', pos_a, pos_b))
+        return self._apply(changes)
+
+    def commit(self):
+        """Apply the pending move to the chromosome and keep the updated counters."""
+        for kind, first, second in self._pending_moves:
+            if kind == 'swap':
+                self.chromosome.swap(first, second)
+            elif second is None:
+                self.chromosome.unplace(first)
+            else:
+                self.chromosome.place(first, second[0], second[1])
+        self._pending = []
+        self._pending_moves = []
+
+    def rollback(self):
+        """Undo the counters of a pending move; the chromosome was never modified."""
+        for event_id, old_pos, new_pos in reversed(self._pending):
+            if new_pos is not None:
+                self._update(event_id, new_pos[0], new_pos[1], -1)
+            if old_pos is not None:
+                self._update(event_id, old_pos[0], old_pos[1], 1)
+        self._pending = []
+        self._pending_moves = []
+
+    def move(self, event_id, new_pos):
+        """Score and apply a move in one step; returns the fitness change."""
+        delta = self.delta_move(event_id, new_pos)
+        self.commit()
+        return delta
+
+    def swap(self, pos_a, pos_b):
+        """Score and apply a swap in one step; returns the fitness change."""
+        delta = self.delta_swap(pos_a, pos_b)
+        self.commit()
+        return delta
+
+    def best_move(self, event_id, candidates):
+        """
+        Score every candidate (room, timeslot) for `event_id` and return
+        (best_pos, delta), or (None, None) if there are no candidates.
+        Nothing is applied.
+        """
+        best_pos, best_delta = None, None
+        for pos in candidates:
+            delta = self.delta_move(event_id, pos)
+            self.rollback()
+            if best_delta is None or delta < best_delta:
+                best_pos, best_delta = pos, delta
+        return best_pos, best_delta
@@ -13,6 +13,10 @@ from entitities.Class import Class
 from entitities.time_slot import TimeSlot
 
 
+def _lookup_key(value) -> str:
+    return str(value).strip().lower()
+
+
 class InputData:
     def __init__(self) -> None:
         self.courses = []
@@ -23,46 +27,70 @@ class InputData:
         self.nostudentgroup = 0
         self.hours = 8
         self.days = 5
+        # Hash indexes kept up to date by the add* methods (first entry wins, like the old linear scans)
+        self._courses_by_code = {}
+        self._rooms_by_id = {}
+        self._student_groups_by_id = {}
+        self._student_groups_by_name = {}
+        self._faculties_by_id = {}
+        # Lower-cased course code/name -> course codes, and (group id, course code) -> lecturer id
+        self._course_codes_by_key = {}
+        self._course_lecturers = {}
 
     def addCourse(self, name: str, code: str, credits: int, student_groupsID: List[str], facultyId, required_room_type: str):
-        self.courses.append(Course(name, code, credits, student_groupsID, facultyId, required_room_type))
+        course = Course(name, code, credits, student_groupsID, facultyId, required_room_type)
+        self.courses.append(course)
+        self._courses_by_code.setdefault(code, course)
+        for key in {_lookup_key(code), _lookup_key(name)}:
+            codes = self._course_codes_by_key.setdefault(key, [])
+            if code not in codes:
+                codes.append(code)
 
     def addRoom(self, Id: str, name: str, capacity: int, room_type: str, building: str):
-        self.rooms.append(Room(Id, name, capacity, room_type, building))
+        room = Room(Id, name, capacity, room_type, building)
+        self.rooms.append(room)
+        self._rooms_by_id.setdefault(Id, room)
 
     def addStudentGroup(self, id: str, name: str, no_students: int, courseIDs: str, teacherIDS: str, hours_required: List[int]):
-        self.student_groups.append(StudentGroup(id, name, no_students, courseIDs, teacherIDS, hours_required))
+        student_group = StudentGroup(id, name, no_students, courseIDs, teacherIDS, hours_required)
+        self.student_groups.append(student_group)
+        self._student_groups_by_id.setdefault(id, student_group)
+        self._student_groups_by_name.setdefault(name, student_group)
+        for course_id, teacher_id in zip(student_group.courseIDs, student_group.teacherIDS):
+            self._course_lecturers.setdefault((id, course_id), teacher_id)
 
     def addFaculty(self, id: str, name: str, department: str, courseID: str, avail_days=None, avail_times=None):
         if avail_days is None:
             avail_days = []
         if avail_times is None:
             avail_times = []
-        self.faculties.append(Faculty(id, name, department, courseID, avail_days, avail_times))
+        faculty = Faculty(id, name, department, courseID, avail_days, avail_times)
+        self.faculties.append(faculty)
+        self._faculties_by_id.setdefault(id, faculty)
 
     def getCourse(self, code: str) -> Course:
-        for course in self.courses:
-            if course.code == code:
-                return course
-        return None
+        return self._courses_by_code.get(code)
     
     def getRoom(self, Id: str) -> Room:
-        for room in self.rooms:
-            if room.Id == Id:
-                return room
-        return None
+        return self._rooms_by_id.get(Id)
     
     def getStudentGroup(self, id: str) -> StudentGroup:
-        for student_group in self.student_groups:
-            if student_group.id == id:
-                return student_group
-        return None
+        return self._student_groups_by_id.get(id)
     
     def getFaculty(self, id: str) -> Faculty:
-        for faculty in self.faculties:
-            if faculty.faculty_id == id:
-                return faculty
-        return None
+        return self._faculties_by_id.get(id)
+
+    def getStudentGroupByName(self, name: str) -> StudentGroup:
+        return self._student_groups_by_name.get(name)
+
+    def findCourses(self, identifier) -> List[Course]:
+        """Courses whose code or name matches `identifier`, ignoring case and surrounding whitespace."""
+        codes = self._course_codes_by_key.get(_lookup_key(identifier), [])
+        return [self._courses_by_code[code] for code in codes]
+
+    def getCourseLecturer(self, student_group_id: str, course_code: str):
+        """Lecturer id assigned to teach `course_code` to a student group (from its teacherIDS), or None."""
+        return self._course_lecturers.get((student_group_id, course_code))
     
     def create_time_slots(self, no_hours_per_day, no_days_per_week, day_start_time):
         """
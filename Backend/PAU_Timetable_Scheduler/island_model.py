@@ -0,0 +1,217 @@
+# island_model.py
+"""
+Island-model DE: K independent populations in separate processes with
+periodic elite migration along a ring.
+
+Each island builds its own engine from the same input data with its own F/CR
+and seed. It evolves `migration_interval` generations (engine.evolve, which
+carries the best solution and stagnation count across epochs), sends copies of its
+`migrants` best members (int32 assignment grids) to the next island's inbox
+queue (a pipe with a feeder thread, so sends never block), and puts the
+members it receives from the previous island in place of its worst members.
+After every epoch the islands report their best fitness and grid to the
+parent, which tracks the global best (self.best_grid) and passes its fitness
+to an optional callback (used by the Flask app for job progress and timetable
+previews). An island whose search has converged stops evolving but keeps
+passing migrants on, so its neighbour is never left waiting. After the last
+epoch each island runs the engine's final repairs once on its best solution.
+
+An optional should_stop callback (time budget / cancellation) is polled by the
+parent; once it fires, every island finishes its current generation, skips
+further migration and sends back its repaired best timetable so far.
+"""
+
+import random
+import multiprocessing
+import queue
+import numpy as np
+from compact_chromosome import CompactChromosome
+from fitness_cache import combine_stats
+
+DEFAULT_MIGRATION_INTERVAL = 10
+DEFAULT_MIGRANTS = 2
+STOP_POLL_SECONDS = 1.0
+
+
+def island_parameters(F, CR, islands):
+    """Per-island (F, CR): F spread over [0.5F, 1.5F] and CR over [CR - 0.3, CR], so islands search differently."""
+    if islands == 1:
+        return [(F, CR)]
+    spread = np.linspace(0.0, 1.0, islands)
+    return [
+        (float(np.clip(F * (0.5 + s), 0.05, 2.0)), float(np.clip(CR - 0.3 * (1.0 - s), 0.1, 1.0)))
+        for s in spread
+    ]
+
+
+def emigrants(engine, count):
+    """Grids of the engine's `count` best population members."""
+    order = np.argsort(engine.population_fitness)[:count]
+    return [engine.population[idx].grid.copy() for idx in order]
+
+
+def immigrate(engine, grids):
+    """Replace the engine's worst population members with the incoming grids."""
+    order = np.argsort(engine.population_fitness)[::-1]
+    for idx, grid in zip(order, grids):
+        idx = int(idx)
+        engine.population[idx] = engine.track_occupancy(CompactChromosome.from_grid(grid, len(engine.events_list)))
+        engine.record_member(idx)
+
+
+def _receive(inbox, stop):
+    """Wait for the previous island's migrants; None if the run is stopped first."""
+    while True:
+        try:
+            return inbox.get(timeout=STOP_POLL_SECONDS)
+        except queue.Empty:
+            if stop.is_set():
+                return None
+
+
+def _island_main(island_idx, engine_class, input_data, pop_size, F, CR, seed,
+                 max_generations, migration_interval, migrants, inbox, outbox, results, stop, cache_capacity):
+    """Island process: evolve, migrate, report per epoch; repair and send the best grid at the end."""
+    try:
+        random.seed(seed)
+        np.random.seed(seed % (2 ** 32))
+        engine = engine_class(input_data, pop_size, F, CR)
+        engine.fitness_cache.resize(cache_capacity)
+        num_events = len(engine.events_list)
+
+        generations = 0
+        epochs = -(-max_generations // migration_interval)
+        for epoch in range(epochs):
+            epoch_generations = min(migration_interval, max_generations - epoch * migration_interval)
+            best_solution, fitness_history, generation, diversity_history = engine.evolve(
+                epoch_generations, should_stop=stop.is_set)
+            generations += generation + 1
+            best_grid = CompactChromosome.coerce(best_solution, num_events).grid.copy()
+            results.put(('epoch', island_idx, epoch, list(fitness_history), list(diversity_history),
+                         best_grid, float(engine.best_fitness)))
+
+            if stop.is_set():
+                break
+            if epoch < epochs - 1 and outbox is not None:
+                outbox.put(emigrants(engine, migrants))
+                incoming = _receive(inbox, stop)
+                if incoming is None:
+                    break
+                immigrate(engine, incoming)
+
+        best_solution = engine.repair_best(engine.best_solution)
+        results.put(('done', island_idx, CompactChromosome.coerce(best_solution, num_events).grid.copy(),
+                     engine.evaluate_fitness(best_solution), generations, engine.fitness_cache.stats()))
+    except Exception as e:
+        results.put(('error', island_idx, repr(e)))
+
+
+class IslandModel:
+    def __init__(self, engine, pop_size, islands, migration_interval=DEFAULT_MIGRATION_INTERVAL,
+                 migrants=DEFAULT_MIGRANTS):
+        self.engine = engine
+        self.pop_size = pop_size
+        self.islands = max(1, int(islands))
+        self.migration_interval = max(1, int(migration_interval))
+        self.migrants = max(0, min(int(migrants), pop_size - 1))
+        self.stopped_early = False
+        # Global best grid reported so far (set during run, read by on_epoch callbacks)
+        self.best_grid = None
+        self.best_grid_fitness = float('inf')
+        # Fitness cache stats summed over the islands' engines (set when run returns)
+        self.fitness_cache_stats = None
+
+    def run(self, max_generations, on_epoch=None, should_stop=None):
+        """
+        Run all islands for `max_generations` generations in total and return the
+        same tuple as DifferentialEvolution.run: (best_solution, fitness_history,
+        final_generation, diversity_history). `on_epoch(epoch, epochs, best_fitness)`
+        is called in the parent after every island has finished an epoch. Once
+        should_stop() returns true the islands wind down and the best so far is returned.
+        """
+        max_generations = max(1, int(max_generations))
+        self.best_grid, self.best_grid_fitness = None, float('inf')
+        epochs = -(-max_generations // self.migration_interval)
+        # Ring: island k sends to the inbox of island k+1
+        inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        results = multiprocessing.Queue()
+        stop = multiprocessing.Event()
+        migrate = self.islands > 1 and self.migrants > 0
+
+        processes = []
+        for k, (F, CR) in enumerate(island_parameters(self.engine.F, self.engine.CR, self.islands)):
+            inbox = inboxes[k] if migrate else None
+            outbox = inboxes[(k + 1) % self.islands] if migrate else None
+            process = multiprocessing.Process(
+                target=_island_main,
+                args=(k, type(self.engine), self.engine.input_data, self.pop_size, F, CR,
+                      random.getrandbits(64), max_generations, self.migration_interval, self.migrants,
+                      inbox, outbox, results, stop, self.engine.fitness_cache.capacity),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        try:
+            return self._collect(processes, results, epochs, on_epoch, stop, should_stop)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+    def _collect(self, processes, results, epochs, on_epoch, stop, should_stop):
+        epoch_histories = [dict() for _ in range(epochs)]
+        diversity = [[] for _ in range(epochs)]
+        finished = {}
+        reported = 0
+        best_fitness = float('inf')
+
+        while len(finished) < self.islands:
+            if should_stop is not None and not stop.is_set() and should_stop():
+                print("Stopping islands: time budget reached or run cancelled")
+                stop.set()
+            try:
+                message = results.get(timeout=STOP_POLL_SECONDS)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    raise RuntimeError("Island processes exited without reporting a result")
+                continue
+
+            kind, island_idx = message[0], message[1]
+            if kind == 'error':
+                raise RuntimeError(f"Island {island_idx} failed: {message[2]}")
+            if kind == 'epoch':
+                epoch, fitness_history, diversity_history = message[2], message[3], message[4]
+                if message[5] is not None and message[6] < self.best_grid_fitness:
+                    self.best_grid, self.best_grid_fitness = message[5], message[6]
+                epoch_histories[epoch][island_idx] = fitness_history
+                diversity[epoch].extend(diversity_history)
+                # Report once every island is done with the epoch
+                while reported < epochs and len(epoch_histories[reported]) == self.islands:
+                    best_fitness = min([best_fitness] + [h[-1] for h in epoch_histories[reported].values() if h])
+                    print(f"Islands finished epoch {reported + 1}/{epochs}, global best fitness: {best_fitness}")
+                    if on_epoch is not None:
+                        on_epoch(reported + 1, epochs, best_fitness)
+                    reported += 1
+            elif kind == 'done':
+                finished[island_idx] = message[2:]
+
+        self.stopped_early = stop.is_set()
+        # Global best over the islands' final reports
+        best_island = min(finished, key=lambda k: finished[k][1])
+        best_grid = finished[best_island][0]
+        self.fitness_cache_stats = combine_stats(cache_stats for _, _, _, cache_stats in finished.values())
+        best_solution = self.engine.track_occupancy(CompactChromosome.from_grid(best_grid, len(self.engine.events_list)))
+
+        # Global best fitness per generation: best island value, never worse than before
+        fitness_history = []
+        for histories in epoch_histories:
+            length = max((len(h) for h in histories.values()), default=0)
+            for g in range(length):
+                value = min(h[min(g, len(h) - 1)] for h in histories.values() if h)
+                fitness_history.append(min(value, fitness_history[-1]) if fitness_history else value)
+
+        final_generation = max(generations for _, _, generations, _ in finished.values()) - 1
+        diversity_history = [float(np.mean(values)) for values in diversity if values]
+        return best_solution, fitness_history, final_generation, diversity_history
@@ -0,0 +1,112 @@
+# job_queue.py
+"""
+Bounded job queue with a small pool of worker threads for timetable runs.
+
+Queued jobs live in the SQLite job store (job_store.py), so every API process
+and every standalone worker (worker.py) on the machine sees the same queue.
+Each process that starts workers runs at most `max_workers` jobs at a time;
+the queue holds at most `max_queued` waiting entries, and submit() raises
+QueueFull beyond that so the API can answer 429. Jobs are started in FIFO
+order, or smallest first when `smallest_first` is set (size is an estimate of
+the work, see job_size). Ties keep submission order.
+
+A DE run is CPU-bound Python, and worker threads in one process share its GIL,
+so several of them only take turns on one core. Each process therefore runs
+one job at a time by default (DEFAULT_MAX_WORKERS). For concurrent jobs,
+start one standalone worker process per core (`python worker.py`). Each one
+claims jobs from the shared store and runs them under its own interpreter.
+With max_workers=0 the process only queues jobs and the standalone workers
+run them.
+"""
+
+import threading
+from job_store import worker_identity
+
+DEFAULT_MAX_QUEUED = 20
+DEFAULT_MAX_WORKERS = 1
+POLL_SECONDS = 1.0
+
+
+def estimate_event_count(input_data):
+    """Number of events a run will schedule: one per required hour of every (group, course) pair."""
+    return sum(sum(int(hours) for hours in group.hours_required) for group in input_data.student_groups)
+
+
+def job_size(event_count, pop_size, max_generations):
+    """Rough amount of work in a run: events x population x generations."""
+    return event_count * max(1, pop_size) * max(1, max_generations)
+
+
+class JobQueue:
+    def __init__(self, store, runner, max_workers=DEFAULT_MAX_WORKERS, max_queued=DEFAULT_MAX_QUEUED,
+                 smallest_first=False):
+        """runner(job) runs one claimed job record; at most max_workers run at once in this process."""
+        self.store = store
+        self.runner = runner
+        self.max_workers = max(0, int(max_workers))
+        self.max_queued = max(0, int(max_queued))
+        self.smallest_first = smallest_first
+        self._wakeup = threading.Condition()
+        self._workers = []
+
+    def start(self):
+        """Requeue jobs left behind by dead processes, then start the worker threads."""
+        if self.max_workers == 0:
+            return self
+        for upload_id in self.store.requeue_orphans():
+            print(f"[{upload_id}] Requeued: the process that claimed it has exited")
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"timetable-worker-{k}", daemon=True)
+            for k in range(self.max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def join(self):
+        for worker in self._workers:
+            worker.join()
+
+    def submit(self, job_id, config, start_time, size=0):
+        """
+        Queue a job and return its 1-based queue position. Raises JobActive when the
+        upload's job is still queued or running, QueueFull when max_queued jobs wait.
+        """
+        self.store.enqueue(job_id, config, start_time, size=size, max_queued=self.max_queued)
+        with self._wakeup:
+            self._wakeup.notify()
+        return self.position(job_id)
+
+    def position(self, job_id):
+        """1-based position of a waiting job (1 = next to start), or None if it is not waiting."""
+        return self.store.queue_position(job_id, smallest_first=self.smallest_first)
+
+    def stats(self):
+        counts = self.store.counts()
+        return {
+            'max_workers': self.max_workers,
+            'max_queued': self.max_queued,
+            'running': counts.get('processing', 0),
+            'queued': counts.get('queued', 0),
+            'smallest_first': self.smallest_first,
+            'average_job_seconds': self.store.average_job_seconds(),
+        }
+
+    def _worker(self):
+        identity = worker_identity()
+        while True:
+            try:
+                job = self.store.claim_job(smallest_first=self.smallest_first, claimed_by=identity)
+            except Exception as e:
+                print(f"Warning: could not claim a job: {e}")
+                job = None
+            if job is None:
+                # Other processes queue jobs too, so poll as well as waiting for local submits
+                with self._wakeup:
+                    self._wakeup.wait(POLL_SECONDS)
+                continue
+            try:
+                self.runner(job)
+            except Exception as e:
+                print(f"[{job['upload_id']}] Warning: queued job failed: {e}")
+                self.store.update_job(job['upload_id'], status='error', error=str(e))
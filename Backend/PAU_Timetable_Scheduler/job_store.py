@@ -0,0 +1,632 @@
+# job_store.py
+"""
+SQLite store for uploads and timetable jobs, shared by every API and worker
+process on the machine.
+
+The database runs in WAL mode, so status polls never wait on a worker that is
+writing progress. Each thread gets its own connection. Uploads keep the
+transformer's JSON output, which input_data_api.initialize_input_data_from_json
+turns back into an InputData in whichever process runs the job. Jobs are keyed
+by upload id, like the old in-memory dicts. Results are stored as JSON.
+
+Running jobs append progress events (one per DE generation) to job_events,
+which the API streams to clients; a new run of an upload clears them. They
+also keep one snapshot of the current best assignment grid per job (int32
+rooms x timeslots, stored as raw bytes) for the timetable preview endpoint.
+
+Finished results are not kept in the database: update_job() spills them to
+gzip-compressed JSON files under the results directory (JOB_RESULTS_DIR,
+default data/results next to the database), and get_job() loads them back on
+demand through a size-bounded LRU of parsed results (RESULT_CACHE_MB). Next
+to the file, a job keeps a small summary (the result without its per-group
+lists) and a per-group index in job_groups, one JSON row per student group,
+so status polls and group pages never touch the full result.
+purge_expired() deletes finished jobs, uploads and result files older than a
+TTL; start_sweeper() runs it in the background.
+
+claim_job() moves the next queued job to 'processing' inside one BEGIN
+IMMEDIATE transaction, so two workers can never claim the same job.
+"""
+
+import os
+import gzip
+import json
+import socket
+import sqlite3
+import threading
+import time
+import numpy as np
+from result_cache import ResultCache, DEFAULT_MAX_BYTES
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'jobs.db')
+RECENT_JOBS_FOR_AVERAGE = 20
+# How often start_sweeper() purges expired jobs and uploads
+SWEEP_SECONDS = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    upload_id   TEXT PRIMARY KEY,
+    filename    TEXT,
+    file_path   TEXT,
+    upload_time TEXT,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    json_data   TEXT NOT NULL,
+    created_at  REAL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    upload_id    TEXT PRIMARY KEY,
+    status       TEXT NOT NULL,
+    progress     INTEGER NOT NULL DEFAULT 0,
+    config       TEXT,
+    error        TEXT,
+    result       TEXT,
+    best_fitness REAL,
+    start_time   TEXT,
+    size         INTEGER NOT NULL DEFAULT 0,
+    enqueued_at  REAL,
+    started_at   REAL,
+    finished_at  REAL,
+    claimed_by   TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    result_path  TEXT,
+    result_bytes INTEGER,
+    summary      TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+CREATE TABLE IF NOT EXISTS job_events (
+    event_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+    upload_id  TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    payload    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_events_upload ON job_events (upload_id, event_id);
+CREATE TABLE IF NOT EXISTS job_snapshots (
+    upload_id    TEXT PRIMARY KEY,
+    generation   INTEGER NOT NULL,
+    best_fitness REAL,
+    created_at   REAL NOT NULL,
+    num_rooms    INTEGER NOT NULL,
+    num_slots    INTEGER NOT NULL,
+    grid         BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_groups (
+    upload_id  TEXT NOT NULL,
+    position   INTEGER NOT NULL,
+    group_id   TEXT,
+    name       TEXT,
+    payload    TEXT NOT NULL,
+    PRIMARY KEY (upload_id, position)
+);
+CREATE INDEX IF NOT EXISTS job_groups_id ON job_groups (upload_id, group_id);
+"""
+
+# Columns added after the first release, created on older databases when they are opened
+MIGRATIONS = {
+    'uploads': [('created_at', 'REAL')],
+    'jobs': [('cancel_requested', 'INTEGER NOT NULL DEFAULT 0'), ('result_path', 'TEXT'), ('result_bytes', 'INTEGER'),
+             ('summary', 'TEXT')],
+}
+
+# Job statuses after which nothing runs any more
+FINISHED_STATUSES = ('completed', 'completed_partial', 'cancelled', 'error')
+
+# Columns that hold JSON text
+JSON_COLUMNS = ('config', 'result', 'summary')
+# Everything but the result payload
+STATUS_COLUMNS = ('upload_id, status, progress, config, error, best_fitness, start_time, size, '
+                  'enqueued_at, started_at, finished_at, claimed_by, cancel_requested, result_path, result_bytes')
+
+
+class QueueFull(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Job queue is full, retry in {retry_after} s")
+        self.retry_after = retry_after
+
+
+class JobActive(Exception):
+    def __init__(self, upload_id, status):
+        super().__init__(f"Job {upload_id} is already {status}")
+        self.upload_id = upload_id
+        self.status = status
+
+
+def worker_identity():
+    """host:pid:thread of the calling thread, recorded on the jobs it claims."""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _remove_file(path):
+    if not path:
+        return False
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        print(f"Warning: could not remove {path}: {e}")
+        return False
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to another user
+        return True
+    return True
+
+
+class JobStore:
+    def __init__(self, path=None, results_dir=None, result_cache_bytes=None):
+        self.path = path or os.environ.get('JOB_DB_PATH', DEFAULT_DB_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.results_dir = results_dir or os.environ.get(
+            'JOB_RESULTS_DIR', os.path.join(os.path.dirname(os.path.abspath(self.path)), 'results'))
+        os.makedirs(self.results_dir, exist_ok=True)
+        if result_cache_bytes is None:
+            result_cache_mb = os.environ.get('RESULT_CACHE_MB')
+            result_cache_bytes = float(result_cache_mb) * 1024 * 1024 if result_cache_mb else DEFAULT_MAX_BYTES
+        self.result_cache = ResultCache(result_cache_bytes)
+        self._local = threading.local()
+        db = self._connection()
+        db.executescript(SCHEMA)
+        for table, columns in MIGRATIONS.items():
+            existing = {row['name'] for row in db.execute(f"PRAGMA table_info({table})")}
+            for column, definition in columns:
+                if column not in existing:
+                    db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    def _job_dict(self, row, with_result=False):
+        job = dict(row)
+        for column in JSON_COLUMNS:
+            if job.get(column) is not None:
+                job[column] = json.loads(job[column])
+        if with_result and job.get('result_path'):
+            job['result'] = self._load_result(job['result_path'])
+        return job
+
+    # --- Result files ---
+
+    def _spill_result(self, upload_id, result):
+        """Write a result as gzip JSON and return (path, compressed size); the parsed result goes in the cache."""
+        text = json.dumps(result)
+        data = gzip.compress(text.encode('utf-8'), compresslevel=6)
+        path = os.path.join(self.results_dir, f"{upload_id}-{int(time.time() * 1000)}.json.gz")
+        partial = path + '.tmp'
+        with open(partial, 'wb') as f:
+            f.write(data)
+        os.replace(partial, path)
+        self.result_cache.put(path, result, len(text))
+        return path, len(data)
+
+    @staticmethod
+    def _read_result_file(path):
+        """JSON text of a result file, or None if it is gone."""
+        try:
+            with open(path, 'rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except FileNotFoundError:
+            print(f"Warning: result file {path} is missing")
+            return None
+
+    def _load_result(self, path):
+        result = self.result_cache.get(path)
+        if result is not None:
+            return result
+        text = self._read_result_file(path)
+        if text is None:
+            return None
+        result = json.loads(text)
+        self.result_cache.put(path, result, len(text))
+        return result
+
+    def summary_text(self, upload_id):
+        """A job's result summary as JSON text, or None if it has none."""
+        row = self._connection().execute("SELECT summary FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+        return row['summary'] if row else None
+
+    # --- Per-group index ---
+
+    def save_groups(self, upload_id, entries):
+        """Replace a job's per-group index with `entries` (dicts with 'group_id' and 'name'), in order."""
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.execute("DELETE FROM job_groups WHERE upload_id = ?", (upload_id,))
+            db.executemany(
+                "INSERT INTO job_groups (upload_id, position, group_id, name, payload) VALUES (?, ?, ?, ?, ?)",
+                [(upload_id, position, entry.get('group_id'), entry.get('name'), json.dumps(entry))
+                 for position, entry in enumerate(entries)])
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+
+    def count_groups(self, upload_id):
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM job_groups WHERE upload_id = ?", (upload_id,)).fetchone()[0]
+
+    def group_texts(self, upload_id, offset=0, limit=None):
+        """JSON text of a page of a job's group entries, in index order."""
+        rows = self._connection().execute(
+            "SELECT payload FROM job_groups WHERE upload_id = ? ORDER BY position LIMIT ? OFFSET ?",
+            (upload_id, -1 if limit is None else int(limit), int(offset))).fetchall()
+        return [row['payload'] for row in rows]
+
+    def group_text(self, upload_id, group_key):
+        """JSON text of the group entry whose id (or, failing that, name) is group_key, or None."""
+        db = self._connection()
+        row = db.execute("SELECT payload FROM job_groups WHERE upload_id = ? AND group_id = ? ORDER BY position",
+                         (upload_id, group_key)).fetchone()
+        if row is None:
+            row = db.execute("SELECT payload FROM job_groups WHERE upload_id = ? AND name = ? ORDER BY position",
+                             (upload_id, group_key)).fetchone()
+        return row['payload'] if row else None
+
+    def result_text(self, upload_id):
+        """A job's result as JSON text, without parsing it, or None if it has none."""
+        row = self._connection().execute(
+            "SELECT result_path, result FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+        if row is None:
+            return None
+        if row['result_path']:
+            return self._read_result_file(row['result_path'])
+        return row['result']
+
+    def _drop_result(self, path):
+        if path:
+            self.result_cache.discard(path)
+            _remove_file(path)
+
+    # --- Uploads ---
+
+    def save_upload(self, upload_id, json_data, filename=None, file_path=None, upload_time=None, event_count=0):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO uploads "
+            "(upload_id, filename, file_path, upload_time, event_count, json_data, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (upload_id, filename, file_path, upload_time, int(event_count), json.dumps(json_data), time.time()),
+        )
+
+    def get_upload(self, upload_id):
+        """Upload record with its transformer JSON parsed, or None."""
+        row = self._connection().execute("SELECT * FROM uploads WHERE upload_id = ?", (upload_id,)).fetchone()
+        if row is None:
+            return None
+        upload = dict(row)
+        upload['json_data'] = json.loads(upload['json_data'])
+        return upload
+
+    def has_upload(self, upload_id):
+        return self._connection().execute(
+            "SELECT 1 FROM uploads WHERE upload_id = ?", (upload_id,)).fetchone() is not None
+
+    def upload_event_count(self, upload_id):
+        row = self._connection().execute(
+            "SELECT event_count FROM uploads WHERE upload_id = ?", (upload_id,)).fetchone()
+        return int(row['event_count']) if row else 0
+
+    # --- Jobs ---
+
+    def enqueue(self, upload_id, config, start_time, size=0, max_queued=None):
+        """
+        Queue a job for an upload, replacing any earlier finished job for it. Raises
+        JobActive when the upload's job is still queued or processing, and QueueFull
+        when max_queued jobs are already waiting.
+        """
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            previous = db.execute("SELECT status, result_path FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+            # Checked under the write lock, so two submits (or a submit and a claim) cannot both pass
+            if previous is not None and previous['status'] in ('queued', 'processing'):
+                raise JobActive(upload_id, previous['status'])
+            if max_queued is not None:
+                queued = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+                if queued >= max_queued:
+                    raise QueueFull(self._retry_after(db))
+            db.execute(
+                "INSERT OR REPLACE INTO jobs (upload_id, status, progress, config, start_time, size, enqueued_at) "
+                "VALUES (?, 'queued', 0, ?, ?, ?, ?)",
+                (upload_id, json.dumps(config), start_time, int(size), time.time()),
+            )
+            db.execute("DELETE FROM job_events WHERE upload_id = ?", (upload_id,))
+            db.execute("DELETE FROM job_snapshots WHERE upload_id = ?", (upload_id,))
+            db.execute("DELETE FROM job_groups WHERE upload_id = ?", (upload_id,))
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        if previous is not None:
+            self._drop_result(previous['result_path'])
+
+    def claim_job(self, smallest_first=False, claimed_by=None):
+        """Atomically move the next queued job to 'processing' and return it, or None if none is waiting."""
+        order = "size, rowid" if smallest_first else "rowid"
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            row = db.execute(f"SELECT upload_id FROM jobs WHERE status = 'queued' ORDER BY {order} LIMIT 1").fetchone()
+            if row is None:
+                db.execute('COMMIT')
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'processing', started_at = ?, claimed_by = ? WHERE upload_id = ?",
+                (time.time(), claimed_by or worker_identity(), row['upload_id']),
+            )
+            job = db.execute("SELECT * FROM jobs WHERE upload_id = ?", (row['upload_id'],)).fetchone()
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return self._job_dict(job)
+
+    def update_job(self, upload_id, **fields):
+        """
+        Set job columns; a finished status also stamps finished_at and a result is spilled
+        to a result file. Returns False if there is no such job.
+        """
+        if not fields:
+            return self.get_job(upload_id, with_result=False) is not None
+        previous = None
+        if fields.get('result') is not None:
+            previous = self.get_job(upload_id, with_result=False)
+            if previous is None:
+                return False
+            fields['result_path'], fields['result_bytes'] = self._spill_result(upload_id, fields['result'])
+            fields['result'] = None
+        for column in JSON_COLUMNS:
+            if column in fields and fields[column] is not None:
+                fields[column] = json.dumps(fields[column])
+        if fields.get('status') in FINISHED_STATUSES:
+            fields['finished_at'] = time.time()
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        cursor = self._connection().execute(
+            f"UPDATE jobs SET {assignments} WHERE upload_id = ?", (*fields.values(), upload_id))
+        if previous is not None:
+            self._drop_result(previous['result_path'] if cursor.rowcount else fields['result_path'])
+        return cursor.rowcount > 0
+
+    def request_cancel(self, upload_id):
+        """
+        Cancel a job: a queued job is marked 'cancelled' straight away, a running one gets
+        cancel_requested set for its worker to notice. Returns 'cancelled', 'cancelling',
+        'finished' (nothing left to cancel) or None if there is no such job.
+        """
+        db = self._connection()
+        cursor = db.execute(
+            "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ? "
+            "WHERE upload_id = ? AND status = 'queued'", (time.time(), upload_id))
+        if cursor.rowcount:
+            return 'cancelled'
+        cursor = db.execute(
+            "UPDATE jobs SET cancel_requested = 1 WHERE upload_id = ? AND status = 'processing'", (upload_id,))
+        if cursor.rowcount:
+            return 'cancelling'
+        row = db.execute("SELECT status FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+        return 'finished' if row else None
+
+    def cancel_requested(self, upload_id):
+        row = self._connection().execute(
+            "SELECT cancel_requested FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    def add_event(self, upload_id, event):
+        self._connection().execute(
+            "INSERT INTO job_events (upload_id, created_at, payload) VALUES (?, ?, ?)",
+            (upload_id, time.time(), json.dumps(event)))
+
+    def events_since(self, upload_id, after_id=0):
+        """[(event_id, event)] of a job with event_id > after_id, oldest first."""
+        rows = self._connection().execute(
+            "SELECT event_id, payload FROM job_events WHERE upload_id = ? AND event_id > ? ORDER BY event_id",
+            (upload_id, int(after_id))).fetchall()
+        return [(row['event_id'], json.loads(row['payload'])) for row in rows]
+
+    def save_snapshot(self, upload_id, generation, best_fitness, grid):
+        """Replace the job's best-so-far snapshot with `grid` (rooms x timeslots event ids, -1 = empty)."""
+        grid = np.ascontiguousarray(grid, dtype=np.int32)
+        self._connection().execute(
+            "INSERT OR REPLACE INTO job_snapshots "
+            "(upload_id, generation, best_fitness, created_at, num_rooms, num_slots, grid) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (upload_id, int(generation), float(best_fitness), time.time(), grid.shape[0], grid.shape[1],
+             sqlite3.Binary(grid.tobytes())))
+
+    def get_snapshot(self, upload_id):
+        """The job's latest snapshot as a dict with the grid rebuilt as an int32 array, or None."""
+        row = self._connection().execute(
+            "SELECT * FROM job_snapshots WHERE upload_id = ?", (upload_id,)).fetchone()
+        if row is None:
+            return None
+        snapshot = dict(row)
+        snapshot['grid'] = np.frombuffer(row['grid'], dtype=np.int32).reshape(row['num_rooms'], row['num_slots'])
+        return snapshot
+
+    def get_job(self, upload_id, with_result=True):
+        columns = '*' if with_result else STATUS_COLUMNS
+        row = self._connection().execute(f"SELECT {columns} FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+        return self._job_dict(row, with_result) if row else None
+
+    def list_jobs(self):
+        """All jobs without their result payloads, plus a has_result flag."""
+        rows = self._connection().execute(
+            "SELECT upload_id, status, progress, best_fitness, start_time, "
+            "(result IS NOT NULL OR result_path IS NOT NULL) AS has_result "
+            "FROM jobs ORDER BY rowid").fetchall()
+        return [dict(row) for row in rows]
+
+    def queue_position(self, upload_id, smallest_first=False):
+        """1-based position of a queued job (1 = next to start), or None if it is not queued."""
+        db = self._connection()
+        row = db.execute("SELECT rowid, size FROM jobs WHERE upload_id = ? AND status = 'queued'",
+                         (upload_id,)).fetchone()
+        if row is None:
+            return None
+        if smallest_first:
+            ahead = db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND (size < ? OR (size = ? AND rowid < ?))",
+                (row['size'], row['size'], row['rowid'])).fetchone()[0]
+        else:
+            ahead = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND rowid < ?",
+                               (row['rowid'],)).fetchone()[0]
+        return ahead + 1
+
+    def counts(self):
+        rows = self._connection().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+    def average_job_seconds(self):
+        return self._average_job_seconds(self._connection())
+
+    def _average_job_seconds(self, db):
+        row = db.execute(
+            "SELECT AVG(finished_at - started_at) FROM (SELECT started_at, finished_at FROM jobs "
+            "WHERE status = 'completed' AND started_at IS NOT NULL AND finished_at IS NOT NULL "
+            "ORDER BY finished_at DESC LIMIT ?)", (RECENT_JOBS_FOR_AVERAGE,)).fetchone()
+        return row[0]
+
+    def _retry_after(self, db):
+        """Seconds until a queue slot is likely to free up: the average run time of recent jobs."""
+        average = self._average_job_seconds(db)
+        return max(1, int(round(average))) if average else 60
+
+    def requeue_orphans(self):
+        """Put 'processing' jobs whose claiming process on this host has exited back in the queue."""
+        host = socket.gethostname()
+        db = self._connection()
+        requeued = []
+        for row in db.execute("SELECT upload_id, claimed_by FROM jobs WHERE status = 'processing'").fetchall():
+            try:
+                claim_host, pid, _ = (row['claimed_by'] or '').rsplit(':', 2)
+                pid = int(pid)
+            except ValueError:
+                continue
+            if claim_host == host and not _process_alive(pid):
+                cursor = db.execute(
+                    "UPDATE jobs SET status = 'queued', progress = 0, claimed_by = NULL, started_at = NULL "
+                    "WHERE upload_id = ? AND status = 'processing' AND claimed_by = ?",
+                    (row['upload_id'], row['claimed_by']))
+                if cursor.rowcount:
+                    requeued.append(row['upload_id'])
+        return requeued
+
+    # --- Retention ---
+
+    def purge_expired(self, ttl_seconds):
+        """
+        Delete finished jobs older than ttl_seconds (with their events, snapshot and result
+        file), uploads older than that without a remaining job, and stray result files.
+        Returns the number of jobs, uploads and files removed.
+        """
+        cutoff = time.time() - ttl_seconds
+        placeholders = ', '.join('?' for _ in FINISHED_STATUSES)
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            jobs = db.execute(
+                f"SELECT upload_id, result_path FROM jobs WHERE status IN ({placeholders}) "
+                "AND COALESCE(finished_at, 0) < ?", (*FINISHED_STATUSES, cutoff)).fetchall()
+            for job in jobs:
+                for table in ('jobs', 'job_events', 'job_snapshots', 'job_groups'):
+                    db.execute(f"DELETE FROM {table} WHERE upload_id = ?", (job['upload_id'],))
+            uploads = db.execute(
+                "SELECT upload_id, file_path FROM uploads WHERE COALESCE(created_at, 0) < ? "
+                "AND upload_id NOT IN (SELECT upload_id FROM jobs)", (cutoff,)).fetchall()
+            for upload in uploads:
+                db.execute("DELETE FROM uploads WHERE upload_id = ?", (upload['upload_id'],))
+            referenced = {row['result_path'] for row in db.execute(
+                "SELECT result_path FROM jobs WHERE result_path IS NOT NULL")}
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+
+        files = 0
+        for job in jobs:
+            self.result_cache.discard(job['result_path'])
+            files += _remove_file(job['result_path'])
+        for upload in uploads:
+            files += _remove_file(upload['file_path'])
+        # Result files nobody points at (a worker died between writing one and recording it)
+        for name in os.listdir(self.results_dir):
+            path = os.path.join(self.results_dir, name)
+            try:
+                stale = os.path.getmtime(path) < cutoff
+            except OSError:
+                continue
+            if stale and path not in referenced:
+                files += _remove_file(path)
+        return {'jobs': len(jobs), 'uploads': len(uploads), 'files': files}
+
+    def stats(self):
+        """Row counts, on-disk sizes and result cache residency."""
+        db = self._connection()
+        uploads = db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(json_data)), 0) FROM uploads").fetchone()
+        results = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(result_bytes), 0) FROM jobs WHERE result_path IS NOT NULL").fetchone()
+        db_bytes = 0
+        for suffix in ('', '-wal', '-shm'):
+            try:
+                db_bytes += os.path.getsize(self.path + suffix)
+            except OSError:
+                pass
+        return {
+            'path': self.path,
+            'database_bytes': db_bytes,
+            'uploads': uploads[0],
+            'upload_json_bytes': uploads[1],
+            'jobs': self.counts(),
+            'events': db.execute("SELECT COUNT(*) FROM job_events").fetchone()[0],
+            'snapshots': db.execute("SELECT COUNT(*) FROM job_snapshots").fetchone()[0],
+            'results_dir': self.results_dir,
+            'result_files': results[0],
+            'result_file_bytes': results[1],
+            'result_cache': self.result_cache.stats(),
+        }
+
+
+def start_sweeper(store, ttl_seconds, interval_seconds=SWEEP_SECONDS):
+    """Purge expired jobs and uploads every interval_seconds in a daemon thread; no-op when ttl_seconds <= 0."""
+    if not ttl_seconds or ttl_seconds <= 0:
+        return None
+
+    def sweep():
+        while True:
+            try:
+                purged = store.purge_expired(ttl_seconds)
+                if any(purged.values()):
+                    print(f"Job store sweep: removed {purged['jobs']} job(s), {purged['uploads']} upload(s), "
+                          f"{purged['files']} file(s)")
+            except Exception as e:
+                print(f"Warning: job store sweep failed: {e}")
+            time.sleep(interval_seconds)
+
+    sweeper = threading.Thread(target=sweep, name='job-store-sweeper', daemon=True)
+    sweeper.start()
+    return sweeper
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_job_store():
+    """The process-wide JobStore (JOB_DB_PATH, default data/jobs.db)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore()
+        return _store
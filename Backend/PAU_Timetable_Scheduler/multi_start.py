@@ -0,0 +1,203 @@
+# multi_start.py
+"""
+Parallel multi-start DE: N independent runs with distinct seeds in separate
+processes, a shared wall-clock deadline and best-of-N selection.
+
+Each run evolves `checkpoint_interval` generations at a time (engine.evolve,
+which carries the best solution and stagnation count across chunks) and
+reports its best fitness after every chunk, with its best grid whenever that
+improved. The parent keeps the overall best grid (self.best_grid, for
+timetable previews), passes the leader's fitness to an optional on_checkpoint
+callback (job progress) and stops runs that are clearly behind it (more than
+`prune_margin` worse, after at least `min_checkpoints` reports), so their
+cores are freed early. Every run stops at the shared deadline, at the end of
+the chunk it is working on, or once its search has converged, and sends back
+its best timetable after the engine's final repairs. The parent returns the
+overall best together with the spread of final fitness values. An optional
+should_stop callback (the job's cancellation and time budget check) is polled
+by the parent and stops every run the same way.
+"""
+
+import time
+import random
+import queue
+import multiprocessing
+import numpy as np
+from compact_chromosome import CompactChromosome
+from fitness_cache import combine_stats
+
+DEFAULT_CHECKPOINT_INTERVAL = 5
+DEFAULT_PRUNE_MARGIN = 0.10
+DEFAULT_MIN_CHECKPOINTS = 2
+
+
+def _restart_main(run_idx, engine_class, input_data, pop_size, F, CR, seed,
+                  max_generations, checkpoint_interval, deadline, stop, results, cache_capacity):
+    """Run process: evolve in chunks, report each checkpoint, repair and send the best grid at the end."""
+    try:
+        random.seed(seed)
+        np.random.seed(seed % (2 ** 32))
+        engine = engine_class(input_data, pop_size, F, CR)
+        engine.fitness_cache.resize(cache_capacity)
+
+        fitness_history = []
+        generations = 0
+        reported_fitness = float('inf')
+        while generations < max_generations:
+            chunk = min(checkpoint_interval, max_generations - generations)
+            _, chunk_history, generation, _ = engine.evolve(
+                chunk, should_stop=lambda: stop.is_set() or (deadline is not None and time.time() >= deadline))
+            generations += generation + 1
+            fitness_history.extend(chunk_history)
+            # The grid only travels when it improved, which is enough for the parent's previews
+            best_fitness = float(engine.best_fitness)
+            best_grid = None
+            if best_fitness < reported_fitness:
+                best_grid = CompactChromosome.coerce(engine.best_solution, len(engine.events_list)).grid.copy()
+                reported_fitness = best_fitness
+            results.put(('checkpoint', run_idx, generations, best_fitness, best_grid))
+
+            if engine.converged or stop.is_set():
+                break
+            if deadline is not None and time.time() >= deadline:
+                break
+
+        best_solution = engine.repair_best(engine.best_solution)
+        best_grid = CompactChromosome.coerce(best_solution, len(engine.events_list)).grid.copy()
+        results.put(('done', run_idx, best_grid, engine.evaluate_fitness(best_solution), fitness_history, generations,
+                     engine.fitness_cache.stats()))
+    except Exception as e:
+        results.put(('error', run_idx, repr(e)))
+
+
+class MultiStart:
+    def __init__(self, engine, pop_size, restarts, time_limit_seconds=None,
+                 checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, prune_margin=DEFAULT_PRUNE_MARGIN,
+                 min_checkpoints=DEFAULT_MIN_CHECKPOINTS):
+        self.engine = engine
+        self.pop_size = pop_size
+        self.restarts = max(1, int(restarts))
+        self.time_limit_seconds = time_limit_seconds
+        self.checkpoint_interval = max(1, int(checkpoint_interval))
+        self.prune_margin = prune_margin
+        self.min_checkpoints = max(1, int(min_checkpoints))
+        self.summary = {}
+        self.stopped = False
+        # Runs stopped for falling behind the leader
+        self.pruned = []
+        # Best grid reported so far by any run (set during run, read by on_checkpoint callbacks)
+        self.best_grid = None
+        self.best_grid_fitness = float('inf')
+        # Fitness cache stats summed over the runs' engines (set when run returns)
+        self.fitness_cache_stats = None
+
+    def run(self, max_generations, on_checkpoint=None, should_stop=None):
+        """
+        Run all restarts and return the best one in the same tuple shape as
+        DifferentialEvolution.run. Per-run results are left in self.summary.
+        `on_checkpoint(checkpoint, checkpoints, best_fitness)` is called in the parent
+        after every checkpoint report, with the furthest run's checkpoint count and
+        the leader's fitness.
+        """
+        self.best_grid, self.best_grid_fitness = None, float('inf')
+        self.stopped, self.pruned = False, []
+        checkpoints = -(-max(1, int(max_generations)) // self.checkpoint_interval)
+        deadline = time.time() + self.time_limit_seconds if self.time_limit_seconds else None
+        seeds = [random.getrandbits(64) for _ in range(self.restarts)]
+        stops = [multiprocessing.Event() for _ in range(self.restarts)]
+        results = multiprocessing.Queue()
+
+        processes = []
+        for k in range(self.restarts):
+            process = multiprocessing.Process(
+                target=_restart_main,
+                args=(k, type(self.engine), self.engine.input_data, self.pop_size, self.engine.F, self.engine.CR,
+                      seeds[k], max_generations, self.checkpoint_interval, deadline, stops[k], results,
+                      self.engine.fitness_cache.capacity),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        try:
+            finished = self._collect(processes, results, stops, checkpoints, on_checkpoint, should_stop)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        reported = {k: result for k, result in finished.items() if result[0] is not None}
+        if not reported:
+            raise RuntimeError("No restart produced a timetable")
+        best_run = min(reported, key=lambda k: reported[k][1])
+        best_grid, best_fitness, fitness_history, generations, _ = reported[best_run]
+        self.fitness_cache_stats = combine_stats(result[4] for result in finished.values())
+        best_solution = self.engine.track_occupancy(CompactChromosome.from_grid(best_grid, len(self.engine.events_list)))
+
+        final_fitness = [float(reported[k][1]) for k in sorted(reported)]
+        self.summary = {
+            'restarts': self.restarts,
+            'best_run': best_run,
+            'seeds': [str(seed) for seed in seeds],
+            'final_fitness': final_fitness,
+            'generations': [int(reported[k][3]) for k in sorted(reported)],
+            'pruned': sorted(self.pruned),
+            'best': min(final_fitness),
+            'worst': max(final_fitness),
+            'mean': float(np.mean(final_fitness)),
+            'std': float(np.std(final_fitness)),
+            'deadline_reached': deadline is not None and time.time() >= deadline,
+            'stopped': self.stopped,
+        }
+        print(f"Multi-start: best run {best_run} with fitness {best_fitness}, "
+              f"spread {self.summary['best']:.2f}-{self.summary['worst']:.2f}, pruned {self.summary['pruned']}")
+        return best_solution, fitness_history, generations - 1, []
+
+    def _collect(self, processes, results, stops, total_checkpoints, on_checkpoint=None, should_stop=None):
+        """Read reports until every run is done, stopping runs that fall clearly behind the leader."""
+        checkpoints = [0] * self.restarts
+        current = [float('inf')] * self.restarts
+        finished = {}
+
+        while len(finished) < self.restarts:
+            self._poll_stop(stops, should_stop)
+            try:
+                message = results.get(timeout=1.0)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    raise RuntimeError("Restart processes exited without reporting a result")
+                continue
+
+            kind, run_idx = message[0], message[1]
+            if kind == 'error':
+                print(f"Warning: restart {run_idx} failed: {message[2]}")
+                finished[run_idx] = (None, float('inf'), [], 0, None)
+            elif kind == 'done':
+                finished[run_idx] = message[2:]
+            elif kind == 'checkpoint':
+                checkpoints[run_idx] += 1
+                current[run_idx] = message[3]
+                if message[4] is not None and message[3] < self.best_grid_fitness:
+                    self.best_grid, self.best_grid_fitness = message[4], message[3]
+                leader = min(current)
+                if on_checkpoint is not None:
+                    on_checkpoint(max(checkpoints), total_checkpoints, leader)
+                for k in range(self.restarts):
+                    if (k not in finished and not stops[k].is_set() and checkpoints[k] >= self.min_checkpoints
+                            and current[k] > leader * (1 + self.prune_margin)):
+                        print(f"Stopping restart {k}: fitness {current[k]:.2f} vs leader {leader:.2f}")
+                        stops[k].set()
+                        self.pruned.append(k)
+        # Runs that ended at the shared deadline may all report before the next poll sees it
+        if should_stop is not None and not self.stopped:
+            self.stopped = bool(should_stop())
+        return finished
+
+    def _poll_stop(self, stops, should_stop):
+        """Stop every run once should_stop() returns true."""
+        if should_stop is not None and not self.stopped and should_stop():
+            print("Stopping all restarts: time budget reached or run cancelled")
+            self.stopped = True
+            for stop in stops:
+                stop.set()
@@ -11,6 +11,7 @@ from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 import re
 from collections import defaultdict
 from datetime import datetime
+from problem_model import ENGINEERING_KEYWORDS, is_engineering_group_name
 
 class TimetableExporterAPI:
     def __init__(self, input_data):
@@ -23,11 +24,8 @@ class TimetableExporterAPI:
         self.room_map = {room.name: {'building': room.building, 'capacity': room.capacity} for room in self.input_data.rooms}
         self.faculty_map = {faculty.faculty_id: {'name': faculty.name} for faculty in self.input_data.faculties}
 
-        # Keywords to identify SST (engineering) groups
-        self.sst_keywords = [
-            'engineering', 'eng', 'computer science', 'software engineering', 'data science',
-            'mechatronics', 'electrical', 'mechanical', 'csc', 'sen', 'data', 'ds'
-        ] 
+        # Keywords to identify SST (engineering) groups, shared with the compiled ProblemModel
+        self.sst_keywords = ENGINEERING_KEYWORDS
         
         # Time slots and days
         self.time_slots = [f"{9 + i}:00-{9 + i}:50" for i in range(self.input_data.hours)]
@@ -35,8 +33,7 @@ class TimetableExporterAPI:
 
     def is_sst_group(self, group_name):
         """Check if a student group belongs to SST (engineering) based on keywords."""
-        group_name_lower = group_name.lower()
-        return any(keyword in group_name_lower for keyword in self.sst_keywords)
+        return is_engineering_group_name(group_name)
 
     def extract_main_program_name(self, group_name):
         """Extract the main program name from student group name."""
@@ -0,0 +1,85 @@
+# parallel_generation.py
+"""
+Process-pool generation step for the DE engines.
+
+Within a generation, the trial vector for target i only reads population[i]
+(mutation, crossover and repair never look at other members), so all trials
+can be built and scored at the same time. Each worker process builds its own
+engine (with an empty population) once in the pool initializer, so the problem
+data, compiled model and feasibility masks are set up one time per worker
+instead of per task. Tasks send and return plain int32 assignment grids plus
+the trial's violation breakdown. The parent then runs selection in target order.
+
+Every target gets its own seed, drawn from the parent's `random` stream, so
+results do not depend on which worker picks up which task. A run seeded by
+the caller therefore gives the same result whatever the pool size.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from compact_chromosome import CompactChromosome
+from fitness_cache import chromosome_digest
+
+_engine = None
+
+
+def _init_worker(engine_class, input_data, F, CR, move_candidates):
+    """Pool initializer: build this worker's engine once."""
+    global _engine
+    _engine = engine_class(input_data, 0, F, CR)
+    _engine.move_candidates = move_candidates
+
+
+def _build_trial(task):
+    """Build and score the trial vector for one target: (idx, seed, grid) -> (idx, grid, violations)."""
+    target_idx, seed, grid = task
+    random.seed(seed)
+    _engine.rng.seed(seed)
+    target = _engine.track_occupancy(CompactChromosome.from_grid(grid, len(_engine.events_list)))
+    # build_trial only reads population[target_idx]
+    _engine.population = {target_idx: target}
+    trial_vector = _engine.build_trial(target_idx)
+    return target_idx, trial_vector.grid, _engine.get_violations(trial_vector)
+
+
+def resolve_workers(workers):
+    """Number of worker processes for a `workers` option (0 or None: one per CPU)."""
+    if workers is None or int(workers) <= 0:
+        return os.cpu_count() or 1
+    return int(workers)
+
+
+class ParallelGeneration:
+    def __init__(self, engine, workers):
+        self.engine = engine
+        self.workers = resolve_workers(workers)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(type(engine), engine.input_data, engine.F, engine.CR, engine.move_candidates),
+        )
+
+    def trials(self):
+        """Trial vectors (tracked compact chromosomes) for every target, in target order."""
+        engine = self.engine
+        seeds = [random.getrandbits(64) for _ in range(len(engine.population))]
+        tasks = [(idx, seeds[idx], member.grid) for idx, member in enumerate(engine.population)]
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+
+        trials = []
+        for target_idx, grid, violations in self.executor.map(_build_trial, tasks, chunksize=chunksize):
+            trial_vector = engine.track_occupancy(CompactChromosome.from_grid(grid, len(engine.events_list)))
+            # The worker already scored it; seed the parent's cache so select() does not re-evaluate
+            engine.fitness_cache.put(chromosome_digest(trial_vector), violations)
+            trials.append(trial_vector)
+        return trials
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,200 @@
+# problem_model.py
+"""
+Compiled, integer-coded view of a timetabling problem.
+
+ProblemModel is built once from an InputData/inputData instance and turns the
+object graph (events -> student group / lecturer / course, rooms, groups) into
+flat NumPy tables indexed by event, room and group number. Hot loops in the DE
+engines and in Constraints read these tables instead of resolving Python
+objects and scanning lists on every call.
+"""
+
+import numpy as np
+from entitities.Class import Class
+
+# Keywords used to identify SST (engineering) student groups by name
+ENGINEERING_KEYWORDS = [
+    'engineering', 'eng', 'computer science', 'software engineering', 'data science',
+    'mechatronics', 'electrical', 'mechanical', 'csc', 'sen', 'data', 'ds'
+]
+
+COMPUTER_LAB_TYPES = ['comp lab', 'computer_lab']
+
+BUILDING_UNKNOWN = 0
+BUILDING_SST = 1
+BUILDING_TYD = 2
+BUILDING_CODES = {'UNKNOWN': BUILDING_UNKNOWN, 'SST': BUILDING_SST, 'TYD': BUILDING_TYD}
+
+
+def is_engineering_group_name(group_name):
+    """Check if a student group belongs to SST (engineering) based on its name."""
+    group_name = (group_name or '').lower()
+    return any(keyword in group_name for keyword in ENGINEERING_KEYWORDS)
+
+
+def get_room_building(room):
+    """Determine the building a room belongs to ('SST', 'TYD' or 'UNKNOWN')."""
+    if hasattr(room, 'building'):
+        return room.building.upper()
+    elif hasattr(room, 'name') and room.name:
+        room_name = room.name.upper()
+        if 'SST' in room_name:
+            return 'SST'
+        elif 'TYD' in room_name:
+            return 'TYD'
+    elif hasattr(room, 'room_id'):
+        room_id = str(room.room_id).upper()
+        if 'SST' in room_id:
+            return 'SST'
+        elif 'TYD' in room_id:
+            return 'TYD'
+    return 'UNKNOWN'
+
+
+def course_needs_computer_lab(course):
+    """Course-side part of the computer lab exception used by the building rule."""
+    if course is None:
+        return False
+    course_name = course.name.lower()
+    return (
+        course.required_room_type.lower() in COMPUTER_LAB_TYPES or
+        'lab' in course_name and ('computer' in course_name or
+                                  'programming' in course_name or
+                                  'software' in course_name)
+    )
+
+
+class ProblemModel:
+    def __init__(self, input_data):
+        self.input_data = input_data
+        self.rooms = input_data.rooms
+        self.student_groups = input_data.student_groups
+        self.courses = input_data.courses
+        self.faculties = input_data.faculties
+        self.days = input_data.days
+        self.hours = input_data.hours
+        self.num_timeslots = self.days * self.hours
+
+        # Lookup tables (first match wins, like the linear getX scans on InputData)
+        self.course_by_code = {}
+        for course in self.courses:
+            self.course_by_code.setdefault(course.code, course)
+        self.faculty_by_id = {}
+        for faculty in self.faculties:
+            self.faculty_by_id.setdefault(faculty.faculty_id, faculty)
+        self.group_by_id = {}
+        for student_group in self.student_groups:
+            self.group_by_id.setdefault(student_group.id, student_group)
+
+        self.course_index = {code: idx for idx, code in enumerate(self.course_by_code)}
+        self.group_index = {student_group.id: idx for idx, student_group in enumerate(self.student_groups)}
+        self.lecturer_index = {faculty_id: idx for idx, faculty_id in enumerate(self.faculty_by_id)}
+        self.room_type_codes = {}
+
+        self.events_list, self.events_map = self.create_events()
+        self._build_room_tables()
+        self._build_group_tables()
+        self._build_event_tables()
+
+    def create_events(self):
+        """
+        Expand every (student group, course) pair into one event per required hour.
+        1-credit courses are scheduled as 3 hours everywhere.
+        """
+        events_list = []
+        event_map = {}
+
+        idx = 0
+        for student_group in self.student_groups:
+            for i in range(student_group.no_courses):
+                course = self.get_course(student_group.courseIDs[i])
+                if course and course.credits == 1:
+                    required_hours = 3
+                else:
+                    required_hours = student_group.hours_required[i]
+
+                for _ in range(required_hours):
+                    event = Class(student_group, student_group.teacherIDS[i], student_group.courseIDs[i])
+                    events_list.append(event)
+                    event_map[idx] = event
+                    idx += 1
+
+        return events_list, event_map
+
+    def room_type_code(self, room_type):
+        if room_type not in self.room_type_codes:
+            self.room_type_codes[room_type] = len(self.room_type_codes)
+        return self.room_type_codes[room_type]
+
+    def _build_room_tables(self):
+        num_rooms = len(self.rooms)
+        self.room_type = np.empty(num_rooms, dtype=np.int32)
+        self.room_capacity = np.empty(num_rooms, dtype=np.int32)
+        self.room_building = np.empty(num_rooms, dtype=np.int8)
+        self.room_is_computer_lab = np.zeros(num_rooms, dtype=bool)
+        self.room_building_names = []
+        for idx, room in enumerate(self.rooms):
+            building = get_room_building(room)
+            self.room_building_names.append(building)
+            self.room_type[idx] = self.room_type_code(room.room_type)
+            self.room_capacity[idx] = room.capacity
+            self.room_building[idx] = BUILDING_CODES.get(building, BUILDING_UNKNOWN)
+            self.room_is_computer_lab[idx] = room.room_type.lower() in COMPUTER_LAB_TYPES
+
+    def _build_group_tables(self):
+        num_groups = len(self.student_groups)
+        self.group_size = np.empty(num_groups, dtype=np.int32)
+        self.group_is_engineering = np.zeros(num_groups, dtype=bool)
+        for idx, student_group in enumerate(self.student_groups):
+            self.group_size[idx] = student_group.no_students
+            self.group_is_engineering[idx] = is_engineering_group_name(student_group.name)
+
+    def _build_event_tables(self):
+        num_events = len(self.events_list)
+        self.event_group = np.empty(num_events, dtype=np.int32)
+        self.event_lecturer = np.empty(num_events, dtype=np.int32)
+        self.event_course = np.full(num_events, -1, dtype=np.int32)
+        self.event_room_type = np.full(num_events, -1, dtype=np.int32)
+        self.event_credits = np.zeros(num_events, dtype=np.int32)
+        self.event_has_lecturer = np.zeros(num_events, dtype=bool)
+        self.event_needs_computer_lab = np.zeros(num_events, dtype=bool)
+        for idx, event in enumerate(self.events_list):
+            self.event_group[idx] = self.group_index[event.student_group.id]
+            # Lecturers missing from the faculty list still get their own index so clashes are detected
+            if event.faculty_id not in self.lecturer_index:
+                self.lecturer_index[event.faculty_id] = len(self.lecturer_index)
+            self.event_lecturer[idx] = self.lecturer_index[event.faculty_id]
+            self.event_has_lecturer[idx] = event.faculty_id is not None
+            course = self.get_course(event.course_id)
+            if course is not None:
+                self.event_course[idx] = self.course_index[course.code]
+                self.event_room_type[idx] = self.room_type_code(course.required_room_type)
+                self.event_credits[idx] = course.credits
+                self.event_needs_computer_lab[idx] = course_needs_computer_lab(course)
+
+        # Lecturer rows that count for clash detection (events without a lecturer share one row)
+        self.lecturer_is_assigned = np.ones(len(self.lecturer_index), dtype=bool)
+        if None in self.lecturer_index:
+            self.lecturer_is_assigned[self.lecturer_index[None]] = False
+
+    # --- object lookups ---
+    def get_course(self, code):
+        return self.course_by_code.get(code)
+
+    def get_faculty(self, faculty_id):
+        return self.faculty_by_id.get(faculty_id)
+
+    def get_student_group(self, group_id):
+        return self.group_by_id.get(group_id)
+
+    def is_engineering_group(self, group_id):
+        idx = self.group_index.get(group_id)
+        return idx is not None and bool(self.group_is_engineering[idx])
+
+    def is_room_suitable(self, room_idx, event_id):
+        return self.event_room_type[event_id] == self.room_type[room_idx]
+
+    def __repr__(self):
+        return (f"ProblemModel(events={len(self.events_list)}, rooms={len(self.rooms)}, "
+                f"groups={len(self.student_groups)}, lecturers={len(self.lecturer_index)}, "
+                f"timeslots={self.num_timeslots})")
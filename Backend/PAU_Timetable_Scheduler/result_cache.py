@@ -0,0 +1,76 @@
+# result_cache.py
+"""
+Size-bounded LRU cache for job results loaded from the job store.
+
+Finished results are spilled to compressed files on disk (see job_store.py)
+and loaded back when a client asks for them. Status polls for a finished job
+would otherwise decompress and parse the same file every time, so the parsed
+results are kept here, up to `max_bytes` in total. An entry's size is the
+length of its JSON text, which tracks the memory the parsed result holds
+closely enough for a budget. Keys are result file paths, which change with
+every new result, so a stale entry is never returned.
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResultCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Cached result for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, result, size):
+        """Keep a result of `size` bytes; results larger than the whole budget are not kept."""
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (result, size)
+            self.resident_bytes += size
+            while self.resident_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.resident_bytes -= evicted
+                self.evictions += 1
+
+    def discard(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.resident_bytes -= entry[1]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'max_bytes': self.max_bytes,
+            'resident_bytes': self.resident_bytes,
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import random
+import numpy as np
+from differential_evolution_engine import DifferentialEvolution
+from input_data import input_data
+
+def seeded_run(on_generation=None, should_stop=None, max_generations=3):
+    random.seed(5)
+    np.random.seed(5)
+    de = DifferentialEvolution(input_data, 12, 0.4, 0.9)
+    return de, de.run(max_generations, on_generation=on_generation, should_stop=should_stop)
+
+def test_generation_events():
+    print("Checking per-generation progress events...")
+    events = []
+    _, (best_solution, fitness_history, _, _) = seeded_run(events.append)
+
+    assert [event['generation'] for event in events] == list(range(1, len(fitness_history) + 1))
+    for event, fitness in zip(events, fitness_history):
+        assert event['max_generations'] == 3
+        assert abs(event['best_fitness'] - fitness) < 1e-9
+        assert abs(event['hard'] + event['soft'] - fitness) < 1e-6, "hard + soft should add up to the best fitness"
+        assert event['diversity'] >= 0 and event['elapsed_seconds'] >= 0
+
+    # Reporting progress must not change the run
+    plain, (plain_solution, plain_history, _, _) = seeded_run()
+    assert plain_history == fitness_history
+    assert (plain_solution.grid == best_solution.grid).all()
+    assert not plain.stopped_early
+    print(f"  {len(events)} events OK")
+
+    # A stop request ends the run after the current generation and keeps its best solution
+    stopped = []
+    de, (_, stopped_history, _, _) = seeded_run(stopped.append, should_stop=lambda: len(stopped) >= 2,
+                                                max_generations=50)
+    assert de.stopped_early and len(stopped) == 2 and len(stopped_history) == 2
+
+    # The final repairs of a stopped run still run in full
+    random.seed(5)
+    np.random.seed(5)
+    de = DifferentialEvolution(input_data, 12, 0.4, 0.9)
+    repair, stop_seen = de.ensure_consecutive_slots, []
+    def ensure_consecutive_slots(chromosome):
+        stop_seen.append(de.stop_requested())
+        return repair(chromosome)
+    de.ensure_consecutive_slots = ensure_consecutive_slots
+    de.run(50, should_stop=lambda: True)
+    assert de.stopped_early and stop_seen[-1] is False
+    print("  stop request OK")
+
+def test_evolve_in_chunks():
+    print("Checking that evolve() carries the run across calls and leaves the repairs to the end...")
+    random.seed(5)
+    np.random.seed(5)
+    de = DifferentialEvolution(input_data, 12, 0.4, 0.9)
+    calls = {'evaluate_population': 0, 'ensure_consecutive_slots': 0}
+    for name in calls:
+        def spy(*args, _name=name, _method=getattr(de, name)):
+            calls[_name] += 1
+            return _method(*args)
+        setattr(de, name, spy)
+
+    # Zero generations only scores the initial population
+    assert de.evolve(0)[1:3] == ([], -1)
+    initial_fitness = de.best_fitness
+
+    events, history = [], []
+    for _ in range(2):
+        _, chunk_history, generation, _ = de.evolve(2, on_generation=events.append)
+        assert generation == len(chunk_history) - 1
+        history.extend(chunk_history)
+    assert [event['generation'] for event in events] == list(range(1, len(history) + 1))
+    assert de.generations_done == len(history)
+    assert calls == {'evaluate_population': 1, 'ensure_consecutive_slots': 0}
+
+    # The stagnation count runs on from chunk to chunk
+    stagnant = 0
+    for previous, current in zip([initial_fitness] + history, history):
+        stagnant = stagnant + 1 if current >= previous else 0
+    assert de.stagnation_counter == stagnant
+
+    de.repair_best(de.best_solution)
+    assert calls['ensure_consecutive_slots'] == 1
+
+    # A converged search runs no more generations
+    de.converged = True
+    assert de.evolve(5)[1:3] == ([], -1) and de.generations_done == len(history)
+    print(f"  {len(history)} generations over 2 chunks OK")
+
+if __name__ == "__main__":
+    test_generation_events()
+    test_evolve_in_chunks()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import sys
+import subprocess
+from pathlib import Path
+
+IMPORT_BUDGET_SECONDS = 0.2
+HERE = Path(__file__).parent
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import differential_evolution_engine
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(','.join(name for name in ('dash', 'input_data', 'differential_evolution') if name in sys.modules))
+"""
+
+def data_snapshot():
+    return {path.name: path.stat().st_mtime_ns for path in (HERE / 'data').iterdir()}
+
+def test_import_time():
+    print("Checking that the DE engine imports quickly and without side effects...")
+    before = data_snapshot()
+    # Fresh interpreter so nothing is already imported; best of three runs to ride out scheduler noise
+    timings = []
+    for _ in range(3):
+        result = subprocess.run([sys.executable, '-c', PROBE], cwd=HERE, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        lines = result.stdout.split('\n')
+        assert len(lines) == 3, f"importing the engine printed output: {result.stdout!r}"
+        elapsed, loaded = lines[0], lines[1]
+        assert loaded == '', f"importing the engine pulled in: {loaded}"
+        timings.append(float(elapsed))
+
+    assert data_snapshot() == before, "importing the engine touched files in data/"
+    assert min(timings) < IMPORT_BUDGET_SECONDS, f"import took {min(timings) * 1000:.0f} ms"
+    print(f"  import in {min(timings) * 1000:.0f} ms OK")
+
+def test_app_startup():
+    print("Checking that the Flask app starts without building the Dash UI...")
+    probe = "import sys, app; print(','.join(name for name in ('dash', 'pandas', 'plotly') if name in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', probe], cwd=HERE, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+    assert 'dash' not in loaded and 'plotly' not in loaded, f"importing app pulled in: {loaded}"
+    print("  app import leaves the Dash UI unbuilt OK")
+
+if __name__ == "__main__":
+    test_import_time()
+    test_app_startup()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import random
+from constraints import Constraints
+from vectorized_constraints import VectorizedConstraints
+from incremental_fitness import IncrementalFitness
+from compact_chromosome import CompactChromosome
+from input_data import input_data
+
+def test_incremental_fitness():
+    print("Checking delta fitness against full re-evaluation...")
+    evaluator = VectorizedConstraints(Constraints(input_data))
+    num_rooms, num_timeslots = evaluator.num_rooms, evaluator.num_timeslots
+    num_events = len(evaluator.model.events_list)
+    rng = random.Random(7)
+
+    chromosome = CompactChromosome(num_rooms, num_timeslots, num_events)
+    cells = rng.sample(range(num_rooms * num_timeslots), int(num_events * 0.8))
+    for event_id, cell in enumerate(cells):
+        chromosome.place(event_id, cell // num_timeslots, cell % num_timeslots)
+
+    tracker = IncrementalFitness(evaluator, chromosome)
+    assert abs(tracker.fitness - evaluator.evaluate_fitness(chromosome)) < 1e-9
+
+    for step in range(200):
+        before = evaluator.evaluate_fitness(chromosome)
+        trial = chromosome.copy()
+        if step % 2 == 0:
+            event_id = rng.randrange(num_events)
+            pos = (rng.randrange(num_rooms), rng.randrange(num_timeslots))
+            delta = tracker.delta_move(event_id, pos)
+            trial.place(event_id, *pos)
+        else:
+            pos_a = (rng.randrange(num_rooms), rng.randrange(num_timeslots))
+            pos_b = (rng.randrange(num_rooms), rng.randrange(num_timeslots))
+            delta = tracker.delta_swap(pos_a, pos_b)
+            trial.swap(pos_a, pos_b)
+        assert abs(before + delta - evaluator.evaluate_fitness(trial)) < 1e-9, f"step {step}: wrong delta"
+
+        if rng.random() < 0.5:
+            tracker.commit()
+        else:
+            tracker.rollback()
+        assert abs(tracker.fitness - evaluator.evaluate_fitness(chromosome)) < 1e-9, f"step {step}: counters out of sync"
+
+    # swap() applies the swap whatever its delta
+    occupied = chromosome.occupied_cells()
+    pos_a, pos_b = tuple(occupied[0]), tuple(occupied[-1])
+    event_a, event_b = int(chromosome.grid[pos_a]), int(chromosome.grid[pos_b])
+    tracker.swap(pos_a, pos_b)
+    assert int(chromosome.grid[pos_a]) == event_b and int(chromosome.grid[pos_b]) == event_a
+    assert abs(tracker.fitness - evaluator.evaluate_fitness(chromosome)) < 1e-9, "swap: counters out of sync"
+
+    print(f"  200 moves/swaps OK, final fitness {tracker.fitness:.2f}")
+
+if __name__ == "__main__":
+    test_incremental_fitness()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import threading
+import time
+from job_store import JobStore, QueueFull, JobActive
+from job_queue import JobQueue
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    assert condition(), "timed out"
+
+def test_job_queue():
+    print("Checking queue order, positions, the queue bound and atomic claims...")
+    store = JobStore(os.path.join(tempfile.mkdtemp(), 'jobs.db'))
+    gate = threading.Event()
+    finished = []
+
+    def runner(job):
+        if job['upload_id'] == 'blocker':
+            gate.wait()
+        finished.append(job['upload_id'])
+        store.update_job(job['upload_id'], status='completed', progress=100, result={'ok': True})
+
+    queue = JobQueue(store, runner, max_workers=1, max_queued=3, smallest_first=True).start()
+    queue.submit('blocker', {}, start_time='now')
+    wait_until(lambda: store.get_job('blocker')['status'] == 'processing')
+    assert queue.position('blocker') is None
+
+    for job_id, size in [('large', 100), ('small', 1), ('medium', 10)]:
+        queue.submit(job_id, {'size': size}, start_time='now', size=size)
+    assert [queue.position(job_id) for job_id in ('small', 'medium', 'large')] == [1, 2, 3]
+
+    try:
+        queue.submit('overflow', {}, start_time='now')
+        assert False, "submit should fail on a full queue"
+    except QueueFull as full:
+        assert full.retry_after >= 1
+    assert store.get_job('overflow') is None
+
+    gate.set()
+    wait_until(lambda: len(finished) == 4)
+    assert finished == ['blocker', 'small', 'medium', 'large'], finished
+    assert store.get_job('large')['result'] == {'ok': True}
+    assert queue.stats()['queued'] == 0
+
+    # Another connection sees the same jobs
+    assert JobStore(store.path).get_job('small')['config'] == {'size': 1}
+
+    # Concurrent claims never hand out a job twice
+    other = JobStore(os.path.join(tempfile.mkdtemp(), 'jobs.db'))
+    for k in range(40):
+        other.enqueue(f"job-{k}", {}, start_time='now')
+    claimed = []
+    def claim_all():
+        mine = JobStore(other.path)
+        while True:
+            job = mine.claim_job()
+            if job is None:
+                return
+            claimed.append(job['upload_id'])
+    threads = [threading.Thread(target=claim_all) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == sorted(f"job-{k}" for k in range(40)), "a job was claimed twice or not at all"
+
+    # A queued or running job is never replaced by a second submit
+    other.add_event('job-0', {'generation': 1})
+    other.enqueue('job-x', {}, start_time='now')
+    for job_id, status in (('job-0', 'processing'), ('job-x', 'queued')):
+        for _ in range(2):
+            try:
+                other.enqueue(job_id, {'again': True}, start_time='later')
+                assert False, "enqueue should refuse an active job"
+            except JobActive as active:
+                assert active.status == status
+        job = other.get_job(job_id)
+        assert job['status'] == status and job['config'] == {}
+    assert len(other.events_since('job-0')) == 1
+
+    # Once it has finished the upload can run again
+    other.update_job('job-0', status='completed', result={'ok': True})
+    other.enqueue('job-0', {'again': True}, start_time='later')
+    assert other.get_job('job-0')['status'] == 'queued'
+    print("  queue OK")
+
+if __name__ == "__main__":
+    test_job_queue()
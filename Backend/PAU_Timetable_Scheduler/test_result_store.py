@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import tempfile
+import time
+import numpy as np
+from job_store import JobStore
+from timetable_processor import split_result
+
+def test_result_store():
+    print("Checking result spill files, the result cache budget and TTL purges...")
+    store = JobStore(os.path.join(tempfile.mkdtemp(), 'jobs.db'), result_cache_bytes=3000)
+    result = {'timetables_raw': [{'group': k, 'rows': [['9:00'] + ['FREE'] * 5] * 8} for k in range(4)]}
+
+    for job_id in ('a', 'b', 'c'):
+        store.save_upload(job_id, {'courses': []})
+        store.enqueue(job_id, {}, start_time='now')
+        store.update_job(job_id, status='completed', result=result)
+    job = store.get_job('a', with_result=False)
+    assert job['result_path'].endswith('.json.gz') and os.path.exists(job['result_path'])
+    assert 'result' not in job and store.list_jobs()[0]['has_result']
+
+    # Results come back from the files; the cache never holds more than its budget
+    cache = store.result_cache.stats()
+    assert cache['resident_bytes'] <= 3000 and cache['evictions'] > 0
+    assert all(store.get_job(job_id)['result'] == result for job_id in ('a', 'b', 'c'))
+    assert JobStore(store.path, results_dir=store.results_dir).get_job('c')['result'] == result
+
+    # A new run of an upload drops the old result file
+    store.enqueue('a', {}, start_time='later')
+    assert not os.path.exists(job['result_path']) and store.get_job('a')['result'] is None
+
+    store.add_event('b', {'generation': 1})
+    store.save_snapshot('b', 1, 3.0, np.zeros((2, 3), dtype=np.int32))
+    stats = store.stats()
+    assert stats['uploads'] == 3 and stats['result_files'] == 2 and stats['events'] == 1
+
+    # Nothing is old enough yet; with a zero TTL every finished job goes, the queued one stays
+    assert store.purge_expired(3600) == {'jobs': 0, 'uploads': 0, 'files': 0}
+    time.sleep(0.01)
+    purged = store.purge_expired(0)
+    assert purged['jobs'] == 2 and purged['uploads'] == 2, purged
+    assert store.get_job('a')['status'] == 'queued' and store.get_upload('a') is not None
+    assert store.get_job('b') is None and store.get_snapshot('b') is None
+    assert os.listdir(store.results_dir) == []
+    print(f"  purged {purged}")
+
+def test_group_index():
+    print("Checking the result summary and the per-group index...")
+    store = JobStore(os.path.join(tempfile.mkdtemp(), 'jobs.db'))
+    groups = [{'name': f'Group {k}', 'id': f'G{k}'} for k in range(5)]
+    result = {
+        'fitness_score': 3.0,
+        'summary': {'total_student_groups': 5},
+        'timetables': [{'title': g['name'], 'student_group_id': g['id']} for g in groups if g['id'] != 'G2'],
+        'timetables_raw': [{'student_group': g, 'timetable': [['9:00', g['id']]]} for g in groups],
+        'parsed_timetables': [{'group': g['name'], 'rows': [[g['id']]]} for g in groups],
+    }
+    summary, entries = split_result(result)
+    assert summary == {'fitness_score': 3.0, 'summary': {'total_student_groups': 5}, 'groups': {'count': 5}}
+    # A group without a card (it failed to format) keeps its grid and rows
+    assert entries[2]['card'] is None and entries[2]['rows'] == [['G2']]
+    assert entries[3]['card']['title'] == 'Group 3' and entries[3]['timetable'] == [['9:00', 'G3']]
+
+    store.enqueue('job', {}, start_time='now')
+    store.save_groups('job', entries)
+    store.update_job('job', status='completed', result=result, summary=summary)
+    assert json.loads(store.summary_text('job')) == summary
+    assert store.count_groups('job') == 5
+    page = [json.loads(text) for text in store.group_texts('job', offset=1, limit=2)]
+    assert [entry['group_id'] for entry in page] == ['G1', 'G2']
+    assert json.loads(store.group_text('job', 'G4'))['name'] == 'Group 4'
+    assert json.loads(store.group_text('job', 'Group 0'))['group_id'] == 'G0'
+    assert store.group_text('job', 'G9') is None
+
+    # A new run starts without the old index
+    store.enqueue('job', {}, start_time='later')
+    assert store.count_groups('job') == 0 and store.summary_text('job') is None
+    print("  summary and 5 group entries OK")
+
+if __name__ == "__main__":
+    test_result_store()
+    test_group_index()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import tempfile
+import numpy as np
+from differential_evolution_engine import DifferentialEvolution
+from job_store import JobStore
+from timetable_snapshot import SnapshotRenderer
+from input_data import input_data
+
+def test_timetable_snapshot():
+    print("Checking snapshot previews against the full timetable rendering...")
+    random.seed(3)
+    np.random.seed(3)
+    de = DifferentialEvolution(input_data, 8, 0.4, 0.9)
+    snapshots = []
+    de.run(2, on_generation=lambda event: snapshots.append(de.best_solution.grid.copy()))
+    assert len(snapshots) == 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, 'jobs.db'))
+        store.enqueue('job', {}, 'now')
+        store.save_snapshot('job', 2, 12.5, snapshots[-1])
+        snapshot = store.get_snapshot('job')
+        assert snapshot['generation'] == 2 and snapshot['best_fitness'] == 12.5
+        assert (snapshot['grid'] == snapshots[-1]).all()
+
+        # A new run of the upload starts without a stale preview
+        store.update_job('job', status='completed')
+        store.enqueue('job', {}, 'later')
+        assert store.get_snapshot('job') is None
+
+    renderer = SnapshotRenderer(input_data)
+    expected = de.print_all_timetables(snapshot['grid'], input_data.days, input_data.hours)
+    for item in expected:
+        group = renderer.find_group(item['student_group'].id)
+        assert group is item['student_group']
+        assert renderer.group_rows(snapshot['grid'], group) == item['timetable'], f"{group.name}: rows differ"
+    assert renderer.find_group('no such group') is None
+    print(f"  {len(expected)} group previews OK")
+
+if __name__ == "__main__":
+    test_timetable_snapshot()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import random
+import numpy as np
+from constraints import Constraints
+from vectorized_constraints import VectorizedConstraints, VIOLATION_KEYS
+from compact_chromosome import CompactChromosome
+from input_data import input_data
+
+def random_chromosome(constraints, fraction, rng):
+    num_rooms = len(constraints.rooms)
+    num_timeslots = len(constraints.timeslots)
+    num_events = len(constraints.events_list)
+    chromosome = CompactChromosome(num_rooms, num_timeslots, num_events)
+    cells = rng.sample(range(num_rooms * num_timeslots), int(num_events * fraction))
+    for event_id, cell in enumerate(cells):
+        chromosome.place(event_id, cell // num_timeslots, cell % num_timeslots)
+    return chromosome
+
+def test_vectorized_constraints():
+    print("Comparing vectorised evaluator against Constraints...")
+    constraints = Constraints(input_data)
+    evaluator = VectorizedConstraints(constraints)
+    rng = random.Random(42)
+
+    for fraction in [0.0, 0.3, 0.7, 1.0]:
+        chromosome = random_chromosome(constraints, fraction, rng)
+        expected = constraints.get_constraint_violations(chromosome)
+        actual = evaluator.get_constraint_violations(chromosome)
+        for key, value in expected.items():
+            assert abs(value - actual[key]) < 1e-9, f"{key}: expected {value}, got {actual[key]}"
+        assert abs(constraints.evaluate_fitness(chromosome) - evaluator.evaluate_fitness(chromosome)) < 1e-9
+        print(f"  {int(fraction * 100)}% placed: fitness {evaluator.evaluate_fitness(chromosome):.2f} OK")
+
+def test_batched_population_evaluation():
+    print("Comparing batched population evaluation against per-chromosome scores...")
+    constraints = Constraints(input_data)
+    evaluator = VectorizedConstraints(constraints)
+    rng = random.Random(7)
+
+    population = [random_chromosome(constraints, fraction, rng) for fraction in [0.0, 0.3, 0.7, 1.0, 1.0]]
+    matrix = evaluator.compute_violation_matrix(np.stack([chromosome.grid for chromosome in population]))
+    assert matrix.shape == (len(population), len(VIOLATION_KEYS))
+    for row, chromosome in zip(matrix, population):
+        expected = constraints.get_constraint_violations(chromosome)
+        for key, value in zip(VIOLATION_KEYS, row):
+            assert abs(expected[key] - value) < 1e-9, f"{key}: expected {expected[key]}, got {value}"
+    print(f"  {len(population)} members scored in one call OK")
+
+if __name__ == "__main__":
+    test_vectorized_constraints()
+    test_batched_population_evaluation()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import random
+import numpy as np
+from problem_model import ProblemModel
+from compact_chromosome import CompactChromosome
+from vectorized_operators import BatchedRandom, safe_genes
+from input_data import input_data
+
+def random_chromosome(model, num_rooms, num_timeslots, rng):
+    num_events = len(model.events_list)
+    chromosome = CompactChromosome(num_rooms, num_timeslots, num_events)
+    cells = rng.sample(range(num_rooms * num_timeslots), int(num_events * 0.8))
+    for event_id, cell in enumerate(cells):
+        chromosome.place(event_id, cell // num_timeslots, cell % num_timeslots)
+    return chromosome.track_occupancy(model.event_group, model.event_lecturer,
+                                      len(model.group_index), len(model.lecturer_index))
+
+def test_vectorized_crossover():
+    print("Checking masked crossover against cell-by-cell assignment...")
+    model = ProblemModel(input_data)
+    num_rooms, num_timeslots = len(input_data.rooms), input_data.days * input_data.hours
+    rng = random.Random(11)
+    target = random_chromosome(model, num_rooms, num_timeslots, rng)
+    donor = random_chromosome(model, num_rooms, num_timeslots, rng)
+    batch = BatchedRandom(3)
+
+    for step in range(20):
+        take = batch.mask(target.shape, 0.5)
+        child = target.inherit(donor.grid, take)
+        expected = target.copy()
+        for r, t in zip(*np.nonzero(take)):
+            expected[r, t] = donor.grid[r, t]
+        assert (child.grid == expected.grid).all(), f"step {step}: grids differ"
+        assert (child.positions == expected.positions).all(), f"step {step}: positions differ"
+        assert (child.group_slots == expected.group_slots).all(), f"step {step}: occupancy differs"
+
+        # Genes accepted by safe_genes never give their group or lecturer a second class
+        safe = safe_genes(target, donor.grid, take, lecturer=True)
+        child = target.inherit(donor.grid, safe)
+        for r, t in zip(*np.nonzero(safe)):
+            event_id = donor.grid[r, t]
+            assert child.group_slots[model.event_group[event_id], t] == 1, f"step {step}: group clash at {(r, t)}"
+            assert child.lecturer_slots[model.event_lecturer[event_id], t] == 1, f"step {step}: lecturer clash at {(r, t)}"
+
+    first, second = BatchedRandom(5), BatchedRandom(5)
+    assert [first.randrange(100) for _ in range(5000)] == [second.randrange(100) for _ in range(5000)]
+    print("  20 masked crossovers OK")
+
+if __name__ == "__main__":
+    test_vectorized_crossover()
@@ -0,0 +1,856 @@
+# timetable_processor.py
+"""
+Runs one timetable generation job: builds the DE engine for the upload's
+input data, runs it (serial, process pool, island model or multi-start, as the
+job config asks), formats the timetables and writes progress and the result
+to the shared job store.
+
+Used by the API's in-process job workers and by the standalone worker.py, so
+it does not import Flask or the Dash UI.
+"""
+
+import os
+import random
+import time
+import numpy as np
+from datetime import datetime
+from input_data_api import initialize_input_data_from_json
+from differential_evolution_api import DifferentialEvolution
+from compact_chromosome import CompactChromosome
+from export_service import TimetableExportService
+from island_model import IslandModel, DEFAULT_MIGRATION_INTERVAL, DEFAULT_MIGRANTS
+from multi_start import MultiStart, DEFAULT_PRUNE_MARGIN
+from job_store import get_job_store
+
+# How often a running job checks the job store for a cancel request
+CANCEL_POLL_SECONDS = 1.0
+
+# Best-so-far snapshots for the preview endpoint: every N generations or T seconds,
+# whichever comes first (job config: snapshot_generations / snapshot_seconds)
+SNAPSHOT_EVERY_GENERATIONS = 10
+SNAPSHOT_EVERY_SECONDS = 5.0
+
+# Final job status by the reason the run was stopped early
+STOP_STATUSES = {None: 'completed', 'time_budget': 'completed_partial', 'cancelled': 'cancelled'}
+
+# Prefer the OG DifferentialEvolution implementation if available to match OG behavior
+DifferentialEvolutionClass = DifferentialEvolution
+try:
+    # The engine module has no import-time side effects (no demo run, Dash UI or data/ I/O)
+    from differential_evolution_engine import DifferentialEvolution as DifferentialEvolutionClass
+    print("Using DifferentialEvolution from: differential_evolution_engine.py")
+except Exception as e:
+    print(f"Warning: Could not load alternative DifferentialEvolution. Using API version. Error: {e}")
+
+
+def make_json_serializable(obj):
+    """
+    Convert custom objects to JSON-serializable format
+    Recursively handles complex nested structures
+    """
+    if obj is None:
+        return None
+    elif isinstance(obj, (str, int, float, bool)):
+        return obj
+    elif isinstance(obj, (list, tuple)):
+        return [make_json_serializable(item) for item in obj]
+    elif isinstance(obj, dict):
+        return {str(k): make_json_serializable(v) for k, v in obj.items()}
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif hasattr(obj, '__dict__'):
+        # Convert custom objects to dictionaries using their attributes
+        result = {}
+        try:
+            # Get all non-private, non-method attributes
+            for attr_name in dir(obj):
+                if (not attr_name.startswith('_') and 
+                    not callable(getattr(obj, attr_name, None))):
+                    try:
+                        attr_value = getattr(obj, attr_name)
+                        # Skip methods, properties, and complex objects that might cause recursion
+                        if not callable(attr_value):
+                            result[attr_name] = make_json_serializable(attr_value)
+                    except (AttributeError, TypeError, ValueError):
+                        # Skip attributes that can't be accessed or serialized
+                        continue
+                        
+            # Also try common attributes that might not show up in dir()
+            for common_attr in ['id', 'name', 'code', 'title', 'value']:
+                if (hasattr(obj, common_attr) and 
+                    common_attr not in result):
+                    try:
+                        attr_val = getattr(obj, common_attr)
+                        if attr_val is not None and not callable(attr_val):
+                            result[common_attr] = str(attr_val)
+                    except (AttributeError, TypeError):
+                        continue
+                        
+            return result if result else str(obj)
+        except Exception:
+            # If all else fails, convert to string
+            return str(obj)
+    else:
+        # Fallback: convert to string
+        try:
+            return str(obj)
+        except Exception:
+            return "unserializable_object"
+
+
+# Result keys that hold one entry per student group; served page by page from the group index
+GROUP_RESULT_KEYS = ('timetables', 'timetables_raw', 'parsed_timetables')
+
+
+def split_result(result):
+    """
+    Split a JSON-safe result into (summary, group entries). The summary is the result without
+    its per-group lists plus a group count; each entry joins one group's card, raw grid and
+    parsed rows (matched by group id and name, as the lists can skip groups that failed to format).
+    """
+    cards = {card.get('student_group_id'): card for card in result.get('timetables') or []}
+    parsed = {item.get('group'): item.get('rows') for item in result.get('parsed_timetables') or []}
+    entries = []
+    for item in result.get('timetables_raw') or []:
+        group = item.get('student_group') or {}
+        group_id, name = group.get('id'), group.get('name')
+        entries.append({
+            'group_id': str(group_id) if group_id is not None else name,
+            'name': name,
+            'card': cards.get(group_id),
+            'timetable': item.get('timetable', []),
+            'rows': parsed.get(name, []),
+        })
+    summary = {key: value for key, value in result.items() if key not in GROUP_RESULT_KEYS}
+    summary['groups'] = {'count': len(entries)}
+    return summary, entries
+
+
+def update_job_status(upload_id, status=None, progress=None, error=None, result=None, best_fitness=None):
+    """Update the job record in the shared job store with JSON serialization."""
+    fields = {}
+    if status is not None:
+        fields['status'] = str(status)
+    if progress is not None:
+        fields['progress'] = int(progress)
+    if error is not None:
+        fields['error'] = str(error)
+    if best_fitness is not None:
+        fields['best_fitness'] = float(best_fitness)
+    if result is not None:
+        # Ensure result is JSON serializable before storing
+        fields['result'] = make_json_serializable(result)
+        # Status polls get the small summary; group timetables are served from the per-group index
+        fields['summary'], entries = split_result(fields['result'])
+        get_job_store().save_groups(upload_id, entries)
+    if not get_job_store().update_job(upload_id, **fields):
+        return
+
+    # simple stdout log for debugging
+    print(f"[{upload_id}] status={fields.get('status')} progress={fields.get('progress')} error={fields.get('error')}")
+
+
+# --- Timetable Processor ---
+class TimetableProcessor:
+    def __init__(self, upload_id, input_data, config):
+        self.upload_id = upload_id
+        self.input_data = input_data
+        self.config = config or {}
+        self.start_time = datetime.now()
+        self.deadline = None
+        self.stop_reason = None
+        self._cancel_checked = 0.0
+        self._snapshot_generation = None
+        self._snapshot_time = 0.0
+
+    def start_time_budget(self):
+        """Set the wall-clock deadline from the job's time_budget_seconds (counted from the start of the run)."""
+        budget = self.config.get('time_budget_seconds')
+        self.deadline = time.time() + float(budget) if budget else None
+
+    def cancel_requested(self, job_id):
+        """True once the job has been cancelled (the store is read at most every CANCEL_POLL_SECONDS)."""
+        if self.stop_reason != 'cancelled' and time.time() - self._cancel_checked >= CANCEL_POLL_SECONDS:
+            self._cancel_checked = time.time()
+            if get_job_store().cancel_requested(job_id):
+                self.stop_reason = 'cancelled'
+        return self.stop_reason == 'cancelled'
+
+    def should_stop(self, job_id):
+        """Cooperative stop check for the engines: cancelled, or past the time budget."""
+        if self.cancel_requested(job_id):
+            return True
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.stop_reason = self.stop_reason or 'time_budget'
+            return True
+        return False
+
+    def update_job_progress(self, job_id, pct=None, message=None):
+        """Update job progress with thread safety"""
+        if pct is None:
+            job = get_job_store().get_job(job_id, with_result=False) or {}
+            pct = job.get('progress', 0)
+        update_job_status(job_id, progress=int(pct))
+
+    def record_generation(self, job_id, event, de=None):
+        """Store a per-generation progress event and move the job's progress through the 5-85 % run phase."""
+        store = get_job_store()
+        store.add_event(job_id, event)
+        done = event.get('generation', 0) / max(1, event.get('max_generations', 1))
+        store.update_job(job_id, progress=int(5 + 80 * done), best_fitness=float(event['best_fitness']))
+        best_solution = getattr(de, 'best_solution', None)
+        if best_solution is not None:
+            self.record_snapshot(job_id, event['generation'], event['best_fitness'], best_solution.grid)
+
+    def record_snapshot(self, job_id, generation, best_fitness, grid, force=False):
+        """Store the best-so-far grid if enough generations or seconds have passed since the last snapshot."""
+        every_generations = int(self.config.get('snapshot_generations', SNAPSHOT_EVERY_GENERATIONS))
+        every_seconds = float(self.config.get('snapshot_seconds', SNAPSHOT_EVERY_SECONDS))
+        due = (force or self._snapshot_generation is None
+               or generation - self._snapshot_generation >= every_generations
+               or time.time() - self._snapshot_time >= every_seconds)
+        if not due:
+            return
+        try:
+            get_job_store().save_snapshot(job_id, generation, best_fitness, grid)
+            self._snapshot_generation, self._snapshot_time = generation, time.time()
+        except Exception as e:
+            print(f"[{job_id}] Warning: could not store timetable snapshot: {e}")
+
+    def record_epoch(self, job_id, epoch, epochs, best_fitness, best_grid=None, generation=None):
+        """
+        Island and multi-start progress: one event per migration epoch or checkpoint with the
+        global best fitness, plus a snapshot of the best grid (taken at `generation`).
+        """
+        get_job_store().add_event(job_id, {
+            'epoch': epoch,
+            'epochs': epochs,
+            'best_fitness': float(best_fitness),
+            'elapsed_seconds': round((datetime.now() - self.start_time).total_seconds(), 3),
+        })
+        update_job_status(job_id, status="processing", progress=5 + 80 * epoch / epochs, best_fitness=best_fitness)
+        if best_grid is not None:
+            self.record_snapshot(job_id, generation, best_fitness, best_grid)
+
+    def update_job_result(self, job_id, result):
+        # A run stopped by its time budget or a cancel request still delivers its best timetable
+        update_job_status(job_id, status=STOP_STATUSES[self.stop_reason], progress=100, result=result)
+
+    def update_job_error(self, job_id, error_msg):
+        update_job_status(job_id, status="error", error=error_msg)
+
+    def make_timetables_json_safe(self, all_timetables):
+        """Convert timetables into a JSON-friendly structure to avoid deep recursion."""
+        safe_list = []
+        for item in all_timetables or []:
+            try:
+                sg = item.get('student_group')
+                # Extract basic identifiers only
+                sg_name = None
+                sg_id = None
+                if sg is not None:
+                    try:
+                        if hasattr(sg, 'name') and getattr(sg, 'name') is not None:
+                            sg_name = str(getattr(sg, 'name'))
+                    except Exception:
+                        pass
+                    for attr in ['id', 'student_group_id', 'group_id']:
+                        try:
+                            if hasattr(sg, attr) and getattr(sg, attr) is not None:
+                                sg_id = str(getattr(sg, attr))
+                                break
+                        except Exception:
+                            continue
+                if not sg_name:
+                    # Fallback to string repr (kept minimal)
+                    try:
+                        sg_name = str(sg) if sg is not None else 'Unknown Group'
+                    except Exception:
+                        sg_name = 'Unknown Group'
+
+                # Timetable grid rows
+                rows = item.get('timetable', [])
+                rows = make_json_serializable(rows)
+
+                safe_list.append({
+                    'student_group': {
+                        'name': sg_name,
+                        'id': sg_id
+                    },
+                    'timetable': rows
+                })
+            except Exception:
+                # Skip any problematic entry instead of blocking the whole job
+                continue
+        return safe_list
+
+    def build_empty_timetables(self, de):
+        """Build empty grids per student group so UI can render even if optimization failed."""
+        try:
+            days = int(getattr(de.input_data, 'days', 5) or 5)
+            hours = int(getattr(de.input_data, 'hours', 6) or 6)
+            day_start_time = 9
+            data = []
+            for sg in getattr(de.input_data, 'student_groups', []) or []:
+                rows = []
+                for h in range(hours):
+                    time_label = f"{day_start_time + h}:00"
+                    row = [time_label] + ["FREE" for _ in range(days)]
+                    rows.append(row)
+                data.append({"student_group": sg, "timetable": rows})
+            return data
+        except Exception as e:
+            print(f"Warning: build_empty_timetables failed: {e}")
+            return []
+
+    def run_optimization(self, job_id, input_data, pop_size, max_gen, F, CR):
+        """
+        Runs the differential evolution optimization in the background.
+        This version is modified to be closer to the Sept 13 `differential_evolution.py` script's flow.
+        """
+        self.start_time = datetime.now()
+        self.start_time_budget()
+        de = None
+        try:
+            # Ensure randomized runs
+            try:
+                import secrets
+                seed = secrets.randbits(64)
+                random.seed(seed)
+                np.random.seed(None) # Use system entropy for numpy
+                print(f"[{job_id}] RNG seeded for this run (seed bits set) with pop={pop_size}, gens={max_gen}")
+            except Exception as seed_err:
+                print(f"[{job_id}] Warning: RNG seeding failed: {seed_err}")
+
+            # Island and multi-start modes: each process builds its own population, so
+            # the engine kept here only needs the compiled problem data
+            islands = int(self.config.get('islands', 1))
+            restarts = int(self.config.get('restarts', 1))
+            engine_pop_size = 0 if islands > 1 or restarts > 1 else pop_size
+
+            # Initialize DE with correct parameters
+            try:
+                de = DifferentialEvolutionClass(input_data, engine_pop_size, F, CR)
+            except TypeError:
+                try:
+                    de = DifferentialEvolutionClass(input_data=input_data, pop_size=engine_pop_size, F=F, CR=CR)
+                except TypeError:
+                    de = DifferentialEvolutionClass(input_data, engine_pop_size)
+
+            # Optional fitness cache capacity from the job config
+            cache_size = self.config.get('fitness_cache_size')
+            if cache_size and hasattr(getattr(de, 'fitness_cache', None), 'resize'):
+                de.fitness_cache.resize(int(cache_size))
+        except Exception as e:
+            print(f"FATAL: DifferentialEvolution initialization failed: {e}")
+            self.update_job_error(job_id, f"DE Initialization failed: {e}")
+            return
+
+        best_solution = None
+        fitness_history = []
+        final_generation = 0
+        best_fitness = float("inf")
+        restart_summary = None
+        # Fitness cache stats of the engines that did the evaluating: in island and multi-start
+        # modes the workers' summed stats (the parent engine's cache stays empty there)
+        cache_stats = None
+
+        try:
+            self.update_job_progress(job_id, pct=5)
+
+            # This block mirrors the Sept 13 differential_evolution.py execution flow
+            # The run method returns: best_solution, fitness_history, final_generation, diversity_history
+            if hasattr(de, 'run'):
+                try:
+                    print(f"[{job_id}] Starting DE algorithm run for {max_gen} generations...")
+                    # Optional process pool for the generation step (1: serial, 0: one worker per CPU)
+                    workers = int(self.config.get('workers', 1))
+                    if restarts > 1:
+                        # N independent runs with distinct seeds and a shared deadline; keep the best
+                        time_limit = self.config.get('time_limit_seconds')
+                        time_limit = float(time_limit) if time_limit else None
+                        if self.deadline is not None:
+                            # The job's time budget caps the restarts' shared deadline
+                            remaining = max(0.0, self.deadline - time.time())
+                            time_limit = remaining if time_limit is None else min(time_limit, remaining)
+                        multi_start = MultiStart(
+                            de, pop_size, restarts,
+                            time_limit_seconds=time_limit,
+                            prune_margin=float(self.config.get('restart_prune_margin', DEFAULT_PRUNE_MARGIN)),
+                        )
+                        run_result = multi_start.run(
+                            max_gen,
+                            on_checkpoint=lambda checkpoint, checkpoints, fitness: self.record_epoch(
+                                job_id, checkpoint, checkpoints, fitness, multi_start.best_grid,
+                                checkpoint * multi_start.checkpoint_interval),
+                            should_stop=lambda: self.should_stop(job_id),
+                        )
+                        restart_summary = multi_start.summary
+                        cache_stats = multi_start.fitness_cache_stats
+                    elif islands > 1:
+                        # Island model: K populations with ring migration; report the global best per epoch
+                        island_model = IslandModel(
+                            de, pop_size, islands,
+                            migration_interval=int(self.config.get('migration_interval', DEFAULT_MIGRATION_INTERVAL)),
+                            migrants=int(self.config.get('migrants', DEFAULT_MIGRANTS)),
+                        )
+                        run_result = island_model.run(
+                            max_gen,
+                            on_epoch=lambda epoch, epochs, fitness: self.record_epoch(
+                                job_id, epoch, epochs, fitness, island_model.best_grid,
+                                epoch * island_model.migration_interval),
+                            should_stop=lambda: self.should_stop(job_id),
+                        )
+                        cache_stats = island_model.fitness_cache_stats
+                    else:
+                        run_result = de.run(max_gen, workers=workers,
+                                            on_generation=lambda event: self.record_generation(job_id, event, de),
+                                            should_stop=lambda: self.should_stop(job_id))
+                        if hasattr(getattr(de, 'fitness_cache', None), 'stats'):
+                            cache_stats = de.fitness_cache.stats()
+                    
+                    # Sept 13 version returns exactly 4 values
+                    if isinstance(run_result, tuple) and len(run_result) >= 2:
+                        best_solution = run_result[0]
+                        fitness_history = run_result[1]
+                        
+                        # Optional: capture generation and diversity if available
+                        if len(run_result) > 2:
+                            final_generation = run_result[2]
+                        else:
+                            final_generation = len(fitness_history) if fitness_history else max_gen
+                            
+                        if len(run_result) > 3:
+                            diversity_history = run_result[3]
+                    else:
+                        # Fallback if return format is unexpected
+                        best_solution = run_result if not isinstance(run_result, tuple) else run_result[0]
+                        fitness_history = []
+                        final_generation = max_gen
+                    
+                    # Get the best fitness score
+                    if fitness_history and len(fitness_history) > 0:
+                        best_fitness = float(fitness_history[-1])
+                        print(f"[{job_id}] DE completed - Final fitness: {best_fitness:.4f}")
+                    else:
+                        best_fitness = float("inf")
+                        print(f"[{job_id}] DE completed - No fitness history available")
+
+                    # CRITICAL: The Sept 13 version re-evaluates the best solution with verbose=True
+                    # to get final violations printed to console
+                    if best_solution is not None and hasattr(de, 'evaluate_fitness'):
+                        print(f"[{job_id}] Re-evaluating final best solution for constraint violations...")
+                        try:
+                            # Try with verbose flag if supported, otherwise call without it
+                            de.evaluate_fitness(best_solution, verbose=True)
+                        except TypeError:
+                            # API version doesn't support verbose parameter
+                            de.evaluate_fitness(best_solution)
+                    
+                    self.update_job_progress(job_id, pct=85)
+
+                except Exception as e:
+                    print(f"[{job_id}] ERROR: de.run() failed. Error: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    best_solution = None
+                    fitness_history = []
+                    final_generation = 0
+            else:
+                # Fallback if `run` method is not present
+                print(f"[{job_id}] ERROR: DE instance lacks a `run` method.")
+                self.update_job_error(job_id, "DE instance is missing the 'run' method.")
+                return
+
+        except Exception as main_error:
+            print(f"[{job_id}] FATAL ERROR in run_optimization: {main_error}")
+            import traceback
+            traceback.print_exc()
+            self.update_job_error(job_id, f"Optimization failed: {str(main_error)}")
+            return
+        finally:
+            # Progress update after optimization finishes
+            self.update_job_progress(job_id, pct=90)
+
+
+        # Post-processing
+        self.update_job_progress(job_id, pct=95)
+
+        # Final repairs if method exists
+        if best_solution is not None:
+            try:
+                if hasattr(de, 'verify_and_repair_course_allocations'):
+                    best_solution = de.verify_and_repair_course_allocations(best_solution)
+            except Exception as e:
+                print(f"Warning: Course allocation repair failed: {e}")
+            try:
+                # The preview endpoint shows the final timetable from here on
+                final_grid = CompactChromosome.coerce(best_solution, len(de.events_list)).grid
+                self.record_snapshot(job_id, int(final_generation) + 1, best_fitness, final_grid, force=True)
+            except Exception as e:
+                print(f"Warning: Final timetable snapshot failed: {e}")
+
+        # Generate timetables
+        all_timetables = []
+        if best_solution is not None:
+            try:
+                # The original script uses `print_all_timetables` to get the final grid data.
+                # CRITICAL: print_all_timetables requires 4 parameters matching Sept 13 signature
+                if hasattr(de, 'print_all_timetables'):
+                    days = getattr(de.input_data, 'days', 5)
+                    hours = getattr(de.input_data, 'hours', 8)
+                    day_start_time = 9
+                    print(f"[{job_id}] Generating timetables with days={days}, hours={hours}, start_time={day_start_time}")
+                    all_timetables = de.print_all_timetables(best_solution, days, hours, day_start_time)
+                    print(f"[{job_id}] Generated {len(all_timetables) if all_timetables else 0} timetables")
+                else:
+                    print(f"[{job_id}] Warning: DE instance lacks `print_all_timetables` method.")
+            except Exception as e:
+                print(f"[{job_id}] ERROR: Timetable generation failed: {e}")
+                import traceback
+                traceback.print_exc()
+                all_timetables = []
+
+        # Fallback: if empty, build blank timetables so UI still works
+        if not all_timetables and de is not None:
+            print(f"[{job_id}] No timetables produced; building empty grids as fallback")
+            all_timetables = self.build_empty_timetables(de)
+
+        # Build UI card summaries
+        timetable_cards = self.format_timetable_results_from_raw(all_timetables)
+
+        # Get constraint violations - BOTH summary and detailed for UI
+        violations = {}
+        detailed_violations = {}
+        if best_solution is not None and hasattr(de, 'constraints'):
+            try:
+                # Get summary violations (numerical counts)
+                if hasattr(de.constraints, 'get_constraint_violations'):
+                    violations = de.constraints.get_constraint_violations(best_solution, debug=True)
+                    print(f"[{job_id}] Got constraint violations summary: {violations.get('total', 0)} total violations")
+                
+                # Get detailed violations (with locations and descriptions) for UI
+                if hasattr(de.constraints, 'get_detailed_constraint_violations'):
+                    detailed_violations = de.constraints.get_detailed_constraint_violations(best_solution)
+                    print(f"[{job_id}] Got detailed constraint violations with {len(detailed_violations)} constraint types")
+                    # Print summary of detailed violations
+                    for constraint_type, violation_list in detailed_violations.items():
+                        if violation_list:
+                            print(f"  - {constraint_type}: {len(violation_list)} violations")
+            except Exception as e:
+                print(f"Warning: Constraint violation check failed: {e}")
+                import traceback
+                traceback.print_exc()
+
+        # Build parsed timetables for frontend
+        parsed = []
+        if all_timetables:
+            exporter = TimetableExportService()
+            for item in all_timetables:
+                try:
+                    student_group = item.get("student_group")
+                    if hasattr(student_group, "name"):
+                        group_name = str(student_group.name)
+                    else:
+                        group_name = str(student_group)
+                    rows = exporter._grid_to_rows(item.get("timetable", []))
+                    serializable_rows = make_json_serializable(rows)
+                    parsed.append({"group": group_name, "rows": serializable_rows})
+                except Exception as e:
+                    print(f"Warning: Parsing timetable failed: {e}")
+
+        # Convert raw timetables into a safe, lightweight structure
+        self.update_job_progress(job_id, pct=99)
+        safe_all_timetables = self.make_timetables_json_safe(all_timetables)
+
+        # Make all result data JSON serializable
+        result = {
+            "timetables": timetable_cards,
+            "timetables_raw": safe_all_timetables,
+            "parsed_timetables": parsed,
+            "fitness_score": best_fitness if best_fitness != float("inf") else None,
+            "generations_completed": int(final_generation) + 1 if isinstance(final_generation, (int, np.integer)) else 1,
+            "fitness_history": fitness_history[-20:] if isinstance(fitness_history, list) else [],
+            "summary": make_json_serializable(self.generate_summary_safe(de, best_solution, violations)) if best_solution is not None else {},
+            "constraint_violations": make_json_serializable(violations),
+            "performance_metrics": {
+                "population_size": pop_size,
+                "total_events": len(getattr(de, "events_list", [])),
+                "scheduled_events": self.count_scheduled_events(best_solution),
+                "optimization_time_seconds": (datetime.now() - self.start_time).total_seconds(),
+                "time_budget_seconds": self.config.get('time_budget_seconds'),
+                "stop_reason": self.stop_reason,
+            },
+        }
+        if cache_stats:
+            result["performance_metrics"]["fitness_cache"] = cache_stats
+        if restart_summary:
+            # Spread of final fitness across the independent runs
+            result["performance_metrics"]["restarts"] = restart_summary
+
+        # Persist violations separately for Dash UI and print a concise summary to console
+        try:
+            dash_data_dir = os.path.join(os.path.dirname(__file__), 'data')
+            os.makedirs(dash_data_dir, exist_ok=True)
+            
+            # Save DETAILED violations for Dash UI (with locations and descriptions)
+            violations_path = os.path.join(dash_data_dir, 'constraint_violations.json')
+            with open(violations_path, 'w', encoding='utf-8') as vf:
+                import json as _json
+                # Save the detailed violations, not the summary
+                detailed_to_save = make_json_serializable(detailed_violations) if detailed_violations else {}
+                _json.dump(detailed_to_save, vf, indent=2, ensure_ascii=False)
+                print(f"[{job_id}] Saved {len(detailed_to_save)} detailed constraint types to {violations_path}")
+            
+            # Print a compact summary
+            try:
+                if isinstance(detailed_violations, dict):
+                    print("[DETAILED VIOLATIONS] Summary:")
+                    for k, val in detailed_violations.items():
+                        try:
+                            count = len(val) if isinstance(val, list) else (int(val) if isinstance(val, (int, float)) else 1)
+                        except Exception:
+                            count = 0
+                        if count > 0:
+                            print(f"  - {k}: {count}")
+                else:
+                    print("[DETAILED VIOLATIONS] No detailed violations dict available")
+            except Exception as _log_err:
+                print(f"[DETAILED VIOLATIONS] Warning: could not print summary: {_log_err}")
+        except Exception as dash_save_error:
+            print(f"[{job_id}] WARNING: Could not save constraint violations for Dash UI. Error: {dash_save_error}")
+            import traceback
+            traceback.print_exc()
+
+        try:
+            dash_data_dir = os.path.join(os.path.dirname(__file__), 'data')
+            os.makedirs(dash_data_dir, exist_ok=True)
+            dash_save_path = os.path.join(dash_data_dir, 'timetable_data.json')
+            fresh_save_path = os.path.join(dash_data_dir, 'fresh_timetable_data.json')
+
+            if safe_all_timetables:
+                import json
+                data_to_save = {
+                    'timetables': safe_all_timetables,
+                    'manual_cells': []
+                }
+                # Write session file used by Dash for persistence + manual edits
+                with open(dash_save_path, 'w', encoding='utf-8') as f:
+                    json.dump(data_to_save, f, indent=2)
+                # Write fresh results file preferred by Dash on startup
+                try:
+                    with open(fresh_save_path, 'w', encoding='utf-8') as f2:
+                        json.dump(safe_all_timetables, f2, indent=2)
+                    print(f"[{job_id}] Successfully saved data for Dash UI at: {dash_save_path} and fresh: {fresh_save_path}")
+                except Exception as fresh_err:
+                    print(f"[{job_id}] WARNING: Could not save fresh timetable JSON. Error: {fresh_err}")
+
+        except Exception as dash_save_error:
+            print(f"[{job_id}] WARNING: Could not save data for Dash UI. Error: {dash_save_error}")
+
+        # Save and mark job completed
+        self.update_job_result(job_id, result)
+        return result
+
+    def count_scheduled_events(self, solution):
+        """Count scheduled events in solution"""
+        if solution is None:
+            return 0
+        
+        count = 0
+        try:
+            if isinstance(solution, CompactChromosome):
+                count = solution.count_scheduled()
+            elif isinstance(solution, np.ndarray):
+                # Count non-None values
+                count = np.count_nonzero(solution != None)
+            else:
+                # Handle other solution formats
+                for room_schedule in solution:
+                    if not room_schedule:
+                        continue
+                    for event in room_schedule:
+                        if event is not None:
+                            count += 1
+        except Exception as e:
+            print(f"Warning: Could not count scheduled events: {e}")
+        
+        return count
+
+    def format_timetable_results_from_raw(self, all_timetables):
+        """Create compact UI cards from raw timetables - JSON serializable"""
+        timetables = []
+        if not all_timetables:
+            return timetables
+            
+        for timetable_data in all_timetables:
+            try:
+                student_group = timetable_data.get('student_group', {})
+                timetable_rows = timetable_data.get('timetable', [])
+
+                courses = set()
+                total_hours = 0
+                
+                for row in timetable_rows:
+                    if not row or len(row) < 2:
+                        continue
+                    # Skip time label (first column)
+                    for i, cell in enumerate(row[1:], 1):
+                        if cell and 'Course:' in str(cell) and 'BREAK' not in str(cell).upper():
+                            try:
+                                course_part = str(cell).split('Course:')[1].split(',')[0].strip()
+                                if course_part and course_part != "Unknown":
+                                    courses.add(course_part)
+                                    total_hours += 1
+                            except Exception:
+                                continue
+
+                # Safely extract group information and convert to JSON-safe types
+                title = "Unknown Group"
+                student_group_id = None
+                student_count = 0
+                
+                if hasattr(student_group, "name"):
+                    title = str(student_group.name)
+                elif hasattr(student_group, "id"):
+                    title = f"Group {student_group.id}"
+                    
+                if hasattr(student_group, 'id'):
+                    student_group_id = str(student_group.id)  # Convert to string
+                    
+                if hasattr(student_group, 'no_students'):
+                    student_count = int(student_group.no_students) if student_group.no_students else 0
+
+                timetables.append({
+                    'title': title,
+                    'department': str(self.extract_department(student_group)),
+                    'level': str(self.extract_level(student_group)),
+                    'student_group_id': student_group_id,
+                    'courses': [str(c) for c in list(courses)[:10]],  # Convert to strings
+                    'total_courses': len(courses),
+                    'total_hours_scheduled': total_hours,
+                    'student_count': student_count
+                })
+            except Exception as e:
+                print(f"Warning: Error formatting timetable card: {e}")
+                continue
+                
+        return timetables
+
+    def extract_level(self, student_group):
+        """Extract level from student group"""
+        try:
+            if hasattr(student_group, 'level') and student_group.level:
+                return f"{student_group.level} Level"
+            
+            name = getattr(student_group, "name", "") or ""
+            name_lower = name.lower()
+            
+            if "year 1" in name_lower or name.startswith("1"):
+                return "100 Level"
+            elif "year 2" in name_lower or name.startswith("2"):
+                return "200 Level"
+            elif "year 3" in name_lower or name.startswith("3"):
+                return "300 Level"
+            elif "year 4" in name_lower or name.startswith("4"):
+                return "400 Level"
+        except Exception:
+            pass
+        return "Unknown Level"
+
+    def extract_department(self, student_group):
+        """Extract department from student group"""
+        try:
+            if hasattr(student_group, 'dept') and getattr(student_group, 'dept'):
+                return student_group.dept
+            
+            name = getattr(student_group, "name", "") or ""
+            parts = name.split()
+            if len(parts) > 1:
+                return ' '.join(parts[1:])
+        except Exception:
+            pass
+        return "Unknown Department"
+
+    def generate_summary_safe(self, de, best_solution, violations):
+        """Safe summary builder that won't crash if properties are missing - returns JSON serializable data"""
+        try:
+            total_events = len(getattr(de, 'events_list', []))
+        except Exception:
+            total_events = 0
+        
+        scheduled_events = self.count_scheduled_events(best_solution)
+        
+        # Calculate completion rates safely
+        group_completion_rates = []
+        try:
+            student_groups = getattr(de, 'student_groups', [])
+            for student_group in student_groups:
+                expected = sum(getattr(student_group, 'hours_required', []) or [])
+                actual = 0
+                
+                try:
+                    if hasattr(de, 'count_course_occurrences'):
+                        counts = de.count_course_occurrences(best_solution, student_group)
+                        actual = sum(counts.values()) if isinstance(counts, dict) else 0
+                except Exception:
+                    actual = 0
+                
+                if expected > 0:
+                    group_completion_rates.append((actual / expected) * 100)
+        except Exception:
+            group_completion_rates = []
+
+        avg_completion_rate = (sum(group_completion_rates) / len(group_completion_rates) 
+                              if group_completion_rates else 0)
+
+        # Safe fitness evaluation
+        fitness_score = None
+        try:
+            if best_solution is not None and hasattr(de, 'evaluate_fitness'):
+                fitness_score = float(de.evaluate_fitness(best_solution))  # Ensure it's a float
+        except Exception:
+            fitness_score = None
+
+        # Ensure all values are JSON serializable
+        return {
+            'total_student_groups': int(len(getattr(de, 'student_groups', []))),
+            'total_courses': int(len(getattr(de, 'courses', []))),
+            'total_rooms': int(len(getattr(de, 'rooms', []))),
+            'total_events': int(total_events),
+            'scheduled_events': int(scheduled_events),
+            'completion_rate': float(avg_completion_rate),
+            'scheduling_efficiency': float((scheduled_events / total_events * 100) if total_events > 0 else 0),
+            'hard_constraints_satisfied': bool(violations.get('total', float('inf')) < 100 if isinstance(violations, dict) else False),
+            'fitness_score': fitness_score,
+            'constraint_satisfaction_score': float(max(0, 100 - violations.get('total', 100)) if isinstance(violations, dict) else 0),
+            'groups_fully_scheduled': int(len([r for r in group_completion_rates if r >= 100]))
+        }
+
+
+def run_parameters(config):
+    """(pop_size, max_generations, F, CR) from a job config, with the API defaults."""
+    pop_size = int(config.get('population_size', 50))
+    max_gen = int(config.get('max_generations', 40))
+    F = float(config.get('F', config.get('mutation_factor', 0.4)))
+    CR = float(config.get('CR', config.get('crossover_rate', 0.9)))
+    return pop_size, max_gen, F, CR
+
+
+def run_job(job):
+    """Run a claimed job record from the job store: rebuild its InputData from the upload and optimise."""
+    upload_id = job['upload_id']
+    upload = get_job_store().get_upload(upload_id)
+    if upload is None:
+        update_job_status(upload_id, status='error', error='Upload not found')
+        return
+    input_data = initialize_input_data_from_json(upload['json_data'])
+    config = job.get('config') or {}
+    pop_size, max_gen, F, CR = run_parameters(config)
+    print(f"[{upload_id}] Running generation (pop={pop_size}, gens={max_gen}, F={F}, CR={CR})")
+    processor = TimetableProcessor(upload_id, input_data, config)
+    processor.run_optimization(upload_id, input_data, pop_size, max_gen, F, CR)
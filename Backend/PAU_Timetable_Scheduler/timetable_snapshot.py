@@ -0,0 +1,73 @@
+# timetable_snapshot.py
+"""
+Best-so-far timetable previews for running jobs.
+
+While a job runs, the processor stores a snapshot of its current best
+assignment grid (int32 rooms x timeslots event ids, see compact_chromosome.py)
+in the job store every few generations or seconds. Nothing is rendered at that
+point. SnapshotRenderer turns one student group's part of a snapshot into the
+same rows as the finished result (a time label plus one cell per day) when a
+client asks for that group, so a preview costs one group's events, not all.
+"""
+
+import numpy as np
+from problem_model import ProblemModel
+
+DAY_START_TIME = 9
+# Display break: 13:00 on Monday, Wednesday and Friday, as in DifferentialEvolution.print_timetable
+BREAK_HOUR = 4
+BREAK_DAYS = (0, 2, 4)
+
+
+class SnapshotRenderer:
+    def __init__(self, input_data):
+        self.input_data = input_data
+        self.model = ProblemModel(input_data)
+        self.days = int(getattr(input_data, 'days', 5) or 5)
+        self.hours = int(getattr(input_data, 'hours', 8) or 8)
+
+    def groups(self):
+        """[{'id', 'name'}] of every student group, in input order."""
+        return [{'id': str(group.id), 'name': str(getattr(group, 'name', group.id))}
+                for group in self.input_data.student_groups]
+
+    def find_group(self, key):
+        """The student group whose id or name is `key`, or None."""
+        key = str(key).strip()
+        for group in self.input_data.student_groups:
+            if str(group.id) == key or str(getattr(group, 'name', '')) == key:
+                return group
+        return None
+
+    def group_rows(self, grid, student_group):
+        """Rows of `student_group`'s timetable in the snapshot grid: [time label] + one cell per day."""
+        timetable = [["" for _ in range(self.days)] for _ in range(self.hours)]
+        if BREAK_HOUR < self.hours:
+            for day in BREAK_DAYS:
+                if day < self.days:
+                    timetable[BREAK_HOUR][day] = "BREAK"
+
+        # Only the cells holding this group's events are looked at
+        group_events = np.flatnonzero(self.model.event_group == self.model.group_index[student_group.id])
+        grid = np.asarray(grid)
+        rooms, timeslots = np.nonzero(np.isin(grid, group_events))
+        # Cells go in event id order so that, when a group clash puts two events in
+        # one slot, the later event wins as it does in print_timetable
+        order = np.argsort(grid[rooms, timeslots], kind='stable')
+        for room_idx, timeslot_idx in zip(rooms[order], timeslots[order]):
+            day, hour = divmod(int(timeslot_idx), self.hours)
+            if day >= self.days or (hour == BREAK_HOUR and day in BREAK_DAYS):
+                continue
+            class_event = self.model.events_list[int(grid[room_idx, timeslot_idx])]
+            course = self.model.get_course(class_event.course_id)
+            faculty = self.model.get_faculty(class_event.faculty_id)
+            course_code = course.code if course is not None else "Unknown"
+            if faculty is not None:
+                faculty_display = faculty.name if faculty.name else faculty.faculty_id
+            else:
+                faculty_display = "Unknown"
+            room = self.input_data.rooms[int(room_idx)]
+            room_display = getattr(room, "name", getattr(room, "Id", str(room_idx)))
+            timetable[hour][day] = f"{course_code}\n{room_display}\n{faculty_display}"
+
+        return [[f"{DAY_START_TIME + hour}:00"] + timetable[hour] for hour in range(self.hours)]
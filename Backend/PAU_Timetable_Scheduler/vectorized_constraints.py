@@ -0,0 +1,304 @@
+# vectorized_constraints.py
+"""
+Vectorised constraint evaluator.
+
+VectorizedConstraints is a drop-in for Constraints.evaluate_fitness and
+Constraints.get_constraint_violations. Instead of walking the rooms x timeslots
+grid once per check, it works from the compact chromosome's event -> position
+index and the ProblemModel attribute tables, and computes every hard and soft
+penalty with a handful of NumPy operations (bincount / boolean masks over
+(timeslot, group), (timeslot, lecturer), (course, day, room) keys, gathered
+room masks, ...).
+
+Weights are the ones used by constraints.py, so scores are the same as the
+reference implementation (up to floating point summation order for the
+fractional soft penalties). Debug output and detailed violation reports are
+still produced by Constraints.
+"""
+
+import numpy as np
+from compact_chromosome import CompactChromosome
+from problem_model import BUILDING_SST
+
+BREAK_HOUR = 4  # 13:00 is the 5th hour (index 4) starting from 9:00
+BREAK_DAYS = [0, 2, 4]  # Monday, Wednesday, Friday
+
+# Order of the per-constraint entries in violation vectors (same keys as Constraints.get_constraint_violations)
+VIOLATION_KEYS = (
+    'room_constraints',
+    'student_group_constraints',
+    'lecturer_availability',
+    'room_time_conflict',
+    'building_assignments',
+    'same_course_same_room_per_day',
+    'break_time_constraint',
+    'course_allocation_completeness',
+    'lecturer_schedule_constraints',
+    'lecturer_workload_constraints',
+    'single_event_per_day',
+    'consecutive_timeslots',
+    'spread_events',
+)
+# Hard constraints (H1-H10) come first in VIOLATION_KEYS, soft ones (S1-S3) last
+HARD_CONSTRAINT_KEYS = VIOLATION_KEYS[:10]
+SOFT_CONSTRAINT_KEYS = VIOLATION_KEYS[10:]
+
+
+def violation_summary(row):
+    """Hard/soft totals and per-constraint values of one violation vector (a VIOLATION_KEYS-ordered row)."""
+    values = {key: float(value) for key, value in zip(VIOLATION_KEYS, row)}
+    return {
+        'hard': sum(values[key] for key in HARD_CONSTRAINT_KEYS),
+        'soft': sum(values[key] for key in SOFT_CONSTRAINT_KEYS),
+        'constraints': values,
+    }
+
+
+class VectorizedConstraints:
+    def __init__(self, constraints):
+        self.constraints = constraints
+        self.model = model = constraints.model
+        self.num_rooms = len(model.rooms)
+        self.days = model.days
+        self.hours = model.hours
+        self.num_timeslots = model.num_timeslots
+        self.num_groups = len(model.student_groups)
+        self.num_lecturers = len(model.lecturer_index)
+
+        # Break slots (Mon/Wed/Fri at 13:00)
+        self.is_break_slot = np.zeros(self.num_timeslots, dtype=bool)
+        if BREAK_HOUR < self.hours:
+            for day in BREAK_DAYS:
+                if day < self.days:
+                    self.is_break_slot[day * self.hours + BREAK_HOUR] = True
+
+        # (course, student group) key per event, shared by completeness and same-room checks
+        allocation_keys = {}
+        self.event_allocation_key = np.empty(len(model.events_list), dtype=np.int32)
+        for idx, event in enumerate(model.events_list):
+            key = (event.course_id, event.student_group.id)
+            if key not in allocation_keys:
+                allocation_keys[key] = len(allocation_keys)
+            self.event_allocation_key[idx] = allocation_keys[key]
+        self.num_allocation_keys = len(allocation_keys)
+
+        # Expected hours for every (group, course) entry; keys with no events count as 0 hours
+        expected_keys = []
+        expected_hours = []
+        for student_group in model.student_groups:
+            for i, course_id in enumerate(student_group.courseIDs):
+                course = model.get_course(course_id)
+                if course and course.credits == 1:
+                    expected_hours.append(3)
+                else:
+                    expected_hours.append(student_group.hours_required[i])
+                expected_keys.append(allocation_keys.get((course_id, student_group.id), self.num_allocation_keys))
+        self.expected_keys = np.array(expected_keys, dtype=np.int64)
+        self.expected_hours = np.array(expected_hours, dtype=np.int64)
+
+        # Lecturer x timeslot schedule penalty (2 when outside available days/times)
+        self.lecturer_slot_penalty = np.zeros((self.num_lecturers, self.num_timeslots), dtype=np.float64)
+        for faculty_id, lecturer_idx in model.lecturer_index.items():
+            if faculty_id is None:
+                continue
+            faculty = model.get_faculty(faculty_id)
+            if not faculty:
+                continue
+            for timeslot in constraints.timeslots:
+                if constraints.get_lecturer_schedule_violation(faculty, timeslot) is not None:
+                    self.lecturer_slot_penalty[lecturer_idx, timeslot.id] = 2
+
+        # Consecutive-slot rule only applies to 2- and 3-credit courses
+        self.event_consecutive_rule = (model.event_course >= 0) & np.isin(model.event_credits, [2, 3])
+        self.course_credits = np.array([course.credits for course in model.course_by_code.values()], dtype=np.int32)
+
+        # Spread rule counts each distinct student group id once
+        self.distinct_groups = np.unique(model.event_group) if len(model.events_list) else np.array([], dtype=np.int32)
+        self.num_distinct_group_ids = len(set(sg.id for sg in model.student_groups))
+
+        # Event x room penalties in half points (room type/capacity and building rule),
+        # used by IncrementalFitness to score a placement without touching the grid
+        type_mismatch = model.event_room_type[:, None] != model.room_type[None, :]
+        over_capacity = model.group_size[model.event_group][:, None] > model.room_capacity[None, :]
+        self.event_room_cost = type_mismatch.astype(np.int32) + over_capacity
+        exempt = ((model.event_course < 0) | model.event_needs_computer_lab)[:, None] | model.room_is_computer_lab[None, :]
+        wrong_building = model.group_is_engineering[model.event_group][:, None] != (model.room_building == BUILDING_SST)[None, :]
+        self.event_building_cost = (~exempt & wrong_building).astype(np.int32)
+
+    def compute_violations(self, chromosome):
+        """Per-constraint penalties, keyed like Constraints.get_constraint_violations."""
+        chromosome = CompactChromosome.coerce(chromosome, len(self.model.events_list))
+        row = self.compute_violation_matrix(chromosome.grid[None])[0]
+        return dict(zip(VIOLATION_KEYS, row.tolist()))
+
+    def compute_violation_matrix(self, grids):
+        """
+        Score a whole population at once: `grids` is a (members, rooms, timeslots)
+        int32 tensor of event indices (EMPTY for free cells). Returns a
+        (members, len(VIOLATION_KEYS)) float array. Every count is one bincount or
+        boolean scatter with the member index folded into the key, so the batch
+        costs about as many NumPy calls as a single chromosome.
+        """
+        model = self.model
+        grids = np.asarray(grids)
+        num_members = grids.shape[0]
+        members, rooms, timeslots = np.nonzero(grids >= 0)
+        events = grids[members, rooms, timeslots].astype(np.int64)
+        days = timeslots // self.hours
+        groups = model.event_group[events].astype(np.int64)
+        has_lecturer = model.event_has_lecturer[events]
+        lecturer_members = members[has_lecturer]
+        lecturers = model.event_lecturer[events][has_lecturer].astype(np.int64)
+        lecturer_slots = timeslots[has_lecturer]
+        num_scheduled = np.bincount(members, minlength=num_members)
+
+        def per_member(mask, member_idx=members):
+            return np.bincount(member_idx, weights=mask, minlength=num_members)
+
+        violations = np.zeros((num_members, len(VIOLATION_KEYS)), dtype=np.float64)
+        column = {key: idx for idx, key in enumerate(VIOLATION_KEYS)}
+
+        # H1: Room type and capacity
+        type_mismatch = model.room_type[rooms] != model.event_room_type[events]
+        over_capacity = model.group_size[groups] > model.room_capacity[rooms]
+        violations[:, column['room_constraints']] = 0.5 * per_member(type_mismatch) + 0.5 * per_member(over_capacity)
+
+        # H2/H3: every extra event of the same group/lecturer in a timeslot is one clash
+        group_slots = np.bincount((members * self.num_timeslots + timeslots) * self.num_groups + groups,
+                                  minlength=num_members * self.num_timeslots * self.num_groups)
+        violations[:, column['student_group_constraints']] = (
+            num_scheduled - np.count_nonzero(group_slots.reshape(num_members, -1), axis=1))
+        lecturer_slot_counts = np.bincount((lecturer_members * self.num_timeslots + lecturer_slots) * self.num_lecturers + lecturers,
+                                           minlength=num_members * self.num_timeslots * self.num_lecturers)
+        violations[:, column['lecturer_availability']] = (
+            np.bincount(lecturer_members, minlength=num_members) -
+            np.count_nonzero(lecturer_slot_counts.reshape(num_members, -1), axis=1))
+
+        # H5: Building assignments (computer lab courses/rooms are exempt)
+        exempt = (model.event_course[events] < 0) | model.event_needs_computer_lab[events] | model.room_is_computer_lab[rooms]
+        is_engineering = model.group_is_engineering[groups]
+        in_sst = model.room_building[rooms] == BUILDING_SST
+        violations[:, column['building_assignments']] = 0.5 * per_member(~exempt & (is_engineering != in_sst))
+
+        # H6: Same course for a group on the same day must stay in one room
+        allocation_keys = self.event_allocation_key[events].astype(np.int64)
+        key_days = self.num_allocation_keys * self.days
+        key_day_rooms = np.zeros((num_members, key_days, self.num_rooms), dtype=bool)
+        key_day_rooms[members, allocation_keys * self.days + days, rooms] = True
+        violations[:, column['same_course_same_room_per_day']] = 2 * (
+            np.count_nonzero(key_day_rooms, axis=(1, 2)) - np.count_nonzero(key_day_rooms.any(axis=2), axis=1))
+
+        # H7: No classes during break time
+        violations[:, column['break_time_constraint']] = 50 * per_member(self.is_break_slot[timeslots])
+
+        # H8: Course allocation completeness
+        num_keys = self.num_allocation_keys + 1
+        actual = np.bincount(members * num_keys + allocation_keys,
+                             minlength=num_members * num_keys).reshape(num_members, num_keys)[:, self.expected_keys]
+        difference = np.abs(self.expected_hours - actual)
+        missing = actual < self.expected_hours
+        violations[:, column['course_allocation_completeness']] = np.sum(
+            np.where(missing, difference * np.where(actual == 0, 2, 1), difference), axis=1)
+
+        # H9: Lecturer available days/times
+        violations[:, column['lecturer_schedule_constraints']] = per_member(
+            self.lecturer_slot_penalty[lecturers, lecturer_slots], lecturer_members)
+
+        # H10: Lecturer workload (max 4 hours/day, max 3 consecutive hours)
+        occupancy = np.zeros((num_members, self.num_lecturers, self.num_timeslots), dtype=bool)
+        occupancy[lecturer_members, lecturers, lecturer_slots] = True
+        occupancy = occupancy.reshape(num_members, self.num_lecturers, self.days, self.hours)
+        daily_hours = occupancy.sum(axis=3)
+        run = np.zeros(daily_hours.shape, dtype=np.int64)
+        longest_run = np.zeros(daily_hours.shape, dtype=np.int64)
+        for hour in range(self.hours):
+            run = (run + 1) * occupancy[..., hour]
+            np.maximum(longest_run, run, out=longest_run)
+        violations[:, column['lecturer_workload_constraints']] = (
+            2 * np.sum(np.maximum(daily_hours - 4, 0), axis=(1, 2)) +
+            30 * np.sum(np.where(daily_hours >= 4, np.maximum(longest_run - 3, 0), 0), axis=(1, 2)))
+
+        # S1: More than one event per day for a group
+        group_day_counts = np.bincount((members * self.num_groups + groups) * self.days + days,
+                                       minlength=num_members * self.num_groups * self.days)
+        violations[:, column['single_event_per_day']] = 0.05 * np.sum(
+            np.maximum(group_day_counts.reshape(num_members, -1) - 1, 0), axis=1)
+
+        # S2: 2-credit courses in 2 consecutive slots, 3-credit courses with a 2-hour block
+        violations[:, column['consecutive_timeslots']] = self._consecutive_cost(num_members, members, events, timeslots)
+
+        # S3: Groups whose events are clustered in less than half the week
+        group_days = np.zeros((num_members, self.num_groups, self.days), dtype=bool)
+        group_days[members, groups, days] = True
+        days_used = group_days.sum(axis=2)[:, self.distinct_groups]
+        clustered = np.count_nonzero(days_used < self.days // 2, axis=1)
+        # Groups with no events at all still count as clustered
+        clustered += self.num_distinct_group_ids - len(self.distinct_groups)
+        violations[:, column['spread_events']] = 0.025 * clustered
+
+        return violations
+
+    def _consecutive_cost(self, num_members, members, events, timeslots):
+        model = self.model
+        cost = np.zeros(num_members, dtype=np.float64)
+        mask = self.event_consecutive_rule[events]
+        if not np.any(mask):
+            return cost
+        events = events[mask]
+        num_keys = len(self.course_credits) * self.num_groups
+        keys = ((members[mask].astype(np.int64) * len(self.course_credits) + model.event_course[events]) *
+                self.num_groups + model.event_group[events])
+        # One sort orders events by (member, course, group) and then by timeslot
+        combined = np.sort(keys * self.num_timeslots + timeslots[mask])
+        keys = combined // self.num_timeslots
+        slots = combined % self.num_timeslots
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        counts = np.diff(np.r_[starts, len(keys)])
+        key_members = keys[starts] // num_keys
+        key_credits = self.course_credits[(keys[starts] % num_keys) // self.num_groups]
+
+        two = (key_credits == 2) & (counts == 2)
+        if np.any(two):
+            first = starts[two]
+            cost += 0.04 * np.bincount(key_members[two], weights=slots[first + 1] - slots[first] != 1,
+                                       minlength=num_members)
+
+        three = (key_credits == 3) & (counts == 3)
+        if np.any(three):
+            first = starts[three]
+            first_gap = slots[first + 1] - slots[first]
+            second_gap = slots[first + 2] - slots[first + 1]
+            cost += 0.06 * np.bincount(key_members[three], weights=(first_gap != 1) & (second_gap != 1),
+                                       minlength=num_members)
+
+        return cost
+
+    def evaluate_population(self, grids):
+        """Fitness of every member of a (members, rooms, timeslots) population tensor."""
+        return self.compute_violation_matrix(grids).sum(axis=1)
+
+    def get_constraint_violations(self, chromosome, debug=False):
+        """Same dictionary as Constraints.get_constraint_violations (debug output comes from Constraints)."""
+        if debug:
+            return self.constraints.get_constraint_violations(chromosome, debug=True)
+        violations = self.compute_violations(chromosome)
+        violations['total'] = sum(violations.values())
+        return violations
+
+    def violation_vector(self, violations):
+        """Violation dict -> float array ordered like VIOLATION_KEYS."""
+        return np.array([violations[key] for key in VIOLATION_KEYS], dtype=np.float64)
+
+    def evaluate_fitness(self, chromosome):
+        """
+        Evaluate the overall fitness of a chromosome by checking all constraints.
+        Lower values indicate better fitness.
+        """
+        violations = self.compute_violations(chromosome)
+        penalty = (violations['room_constraints'] + violations['student_group_constraints'] +
+                   violations['lecturer_availability'] + violations['room_time_conflict'] +
+                   violations['building_assignments'] + violations['same_course_same_room_per_day'] +
+                   violations['break_time_constraint'] + violations['course_allocation_completeness'] +
+                   violations['lecturer_schedule_constraints'] + violations['lecturer_workload_constraints'])
+        cost = violations['single_event_per_day'] + violations['consecutive_timeslots'] + violations['spread_events']
+        return float(penalty + cost)
@@ -0,0 +1,126 @@
+# vectorized_operators.py
+"""
+Array versions of the DE operators' inner loops.
+
+BatchedRandom serves the operators' random decisions (random(), randrange(),
+choice(), sample(), shuffle()) from blocks of uniforms drawn with one
+numpy.random.Generator call, instead of one Python `random` call per decision.
+A whole crossover mask is a single Generator call.
+
+clash_cells and safe_genes read the chromosome's group/lecturer occupancy
+counts (CompactChromosome.track_occupancy), so crossover can pick its genes
+with boolean masks and apply them with CompactChromosome.inherit in one
+assignment.
+"""
+
+import numpy as np
+from compact_chromosome import EMPTY
+
+BATCH_SIZE = 4096
+
+
+class BatchedRandom:
+    def __init__(self, seed=None, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        self.generator = np.random.default_rng(seed)
+        self._buffer = self.generator.random(self.batch_size)
+        self._pos = 0
+
+    def random(self):
+        """Uniform float in [0, 1)."""
+        if self._pos >= self.batch_size:
+            self._buffer = self.generator.random(self.batch_size)
+            self._pos = 0
+        value = self._buffer[self._pos]
+        self._pos += 1
+        return float(value)
+
+    def randrange(self, n):
+        """Integer in [0, n)."""
+        if n <= 0:
+            raise ValueError("empty range for randrange()")
+        return min(int(self.random() * n), n - 1)
+
+    def randint(self, a, b):
+        """Integer in [a, b], both included."""
+        return a + self.randrange(b - a + 1)
+
+    def choice(self, seq):
+        if len(seq) == 0:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randrange(len(seq))]
+
+    def sample(self, population, k):
+        """k distinct items from a sequence (meant for k much smaller than the population)."""
+        n = len(population)
+        if k > n:
+            raise ValueError("Sample larger than population")
+        picked = []
+        seen = set()
+        while len(picked) < k:
+            idx = self.randrange(n)
+            if idx not in seen:
+                seen.add(idx)
+                picked.append(population[idx])
+        return picked
+
+    def shuffle(self, items):
+        """In-place Fisher-Yates shuffle."""
+        for i in range(len(items) - 1, 0, -1):
+            j = self.randrange(i + 1)
+            items[i], items[j] = items[j], items[i]
+
+    def mask(self, shape, p):
+        """Boolean array of `shape`, each cell True with probability p."""
+        return self.generator.random(shape) < p
+
+
+def clash_cells(chromosome):
+    """Rooms x timeslots mask of events whose group or lecturer has another event in the same timeslot."""
+    occupied = chromosome.grid != EMPTY
+    events = chromosome.grid[occupied]
+    timeslots = np.nonzero(occupied)[1]
+    clash = ((chromosome.group_slots[chromosome.event_group[events], timeslots] > 1) |
+             (chromosome.lecturer_slots[chromosome.event_lecturer[events], timeslots] > 1))
+    cells = np.zeros(chromosome.grid.shape, dtype=bool)
+    cells[occupied] = clash
+    return cells
+
+
+def safe_genes(trial, donor_grid, take, lecturer=False):
+    """
+    Cells of `take` whose donor event can be copied into `trial` without giving its
+    student group (and, with lecturer=True, its lecturer) a second class in that
+    timeslot. The event overwritten in the target cell does not count. When several
+    incoming genes would clash with each other, the first in row-major order wins,
+    as when the cells are set one at a time.
+    """
+    candidates = take & (donor_grid != EMPTY) & (donor_grid != trial.grid)
+    rooms, timeslots = np.nonzero(candidates)
+    events = donor_grid[rooms, timeslots]
+    occupants = trial.grid[rooms, timeslots]
+    has_occupant = occupants != EMPTY
+    occupants = np.where(has_occupant, occupants, 0)
+
+    owners = [(trial.event_group, trial.group_slots)]
+    if lecturer:
+        owners.append((trial.event_lecturer, trial.lecturer_slots))
+
+    ok = np.ones(len(events), dtype=bool)
+    for event_owner, counts in owners:
+        owner = event_owner[events]
+        busy = counts[owner, timeslots] - (has_occupant & (event_owner[occupants] == owner))
+        ok &= busy == 0
+        # Keep one incoming gene per (owner, timeslot)
+        keys = owner.astype(np.int64) * trial.grid.shape[1] + timeslots
+        accepted = np.flatnonzero(ok)
+        _, first = np.unique(keys[accepted], return_index=True)
+        ok[:] = False
+        ok[accepted[first]] = True
+
+    safe = np.zeros(take.shape, dtype=bool)
+    safe[rooms[ok], timeslots[ok]] = True
+    return safe
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Standalone optimisation worker.
+
+Claims queued timetable jobs from the shared SQLite job store (JOB_DB_PATH),
+runs them and writes progress and results back, so API processes can stay
+stateless. Each worker runs one job at a time by default: a DE run is
+CPU-bound and job threads in one process share its GIL. Run the API with
+EMBEDDED_WORKERS=false and start one of these per core instead:
+
+    for i in $(seq $(nproc)); do python worker.py & done
+
+MAX_CONCURRENT_JOBS, SCHEDULE_SMALLEST_FIRST and JOB_TTL_HOURS are read as in app.py.
+"""
+
+import os
+import argparse
+from job_store import get_job_store, start_sweeper
+from job_queue import JobQueue, DEFAULT_MAX_WORKERS
+from timetable_processor import run_job
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued timetable generation jobs.")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('MAX_CONCURRENT_JOBS', DEFAULT_MAX_WORKERS)),
+                        help="jobs to run at the same time in this process (default: 1; start more processes instead)")
+    parser.add_argument('--smallest-first', action='store_true',
+                        default=os.environ.get('SCHEDULE_SMALLEST_FIRST', 'False').lower() == 'true',
+                        help="start the smallest queued job first instead of the oldest")
+    args = parser.parse_args()
+
+    store = get_job_store()
+    start_sweeper(store, float(os.environ.get('JOB_TTL_HOURS', 24)) * 3600)
+    queue = JobQueue(store, run_job, max_workers=max(1, args.workers), smallest_first=args.smallest_first).start()
+    print(f"Worker {os.getpid()} running {queue.max_workers} job slot(s) on {store.path}")
+    try:
+        queue.join()
+    except KeyboardInterrupt:
+        print("Worker stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -184,6 +184,40 @@ export const generateTimetable = async (uploadId, progressCallback, options) =>
   }
 };
 
+/**
+ * Fetch one page of a finished job's group timetables
+ * @param {string} uploadId - Upload ID of the finished job
+ * @param {number} offset - Index of the first group to return
+ * @param {number} limit - Number of groups to return (the server caps this at 100)
+ * @returns {Promise<Object>} Page with total, offset, limit, next and groups
+ */
+export const fetchTimetableGroups = async (uploadId, offset = 0, limit = 20) => {
+  const response = await makeRequestWithRetry(() =>
+    apiClient.get(`/jobs/${uploadId}/groups`, { params: { offset, limit } })
+  );
+  return response.data;
+};
+
+/**
+ * Fetch every group timetable of a finished job, page by page
+ * @param {string} uploadId - Upload ID of the finished job
+ * @param {number} pageSize - Groups per request (the server caps this at 100)
+ * @returns {Promise<Array>} Group entries in result order
+ */
+export const fetchAllTimetableGroups = async (uploadId, pageSize = 100) => {
+  const groups = [];
+  let total = Infinity;
+  while (groups.length < total) {
+    const page = await fetchTimetableGroups(uploadId, groups.length, pageSize);
+    total = page.total;
+    if (!page.groups || page.groups.length === 0) {
+      break;
+    }
+    groups.push(...page.groups);
+  }
+  return groups;
+};
+
 /**
  * Poll the server for generation completion status with CORS handling
  * @param {string} uploadId - Upload ID to check status for
@@ -233,18 +267,19 @@ const pollForCompletion = async (uploadId, progressCallback) => {
           });
         }
 
-        if (normalized.status === 'completed') {
+        // A job cancelled before it started has no timetable to show
+        if (normalized.status === 'cancelled' && !normalized.result) {
+          reject(new Error(normalized.message || 'Timetable generation cancelled'));
+          return;
+        }
+
+        // A run stopped by its time budget or cancelled while running still returns the best timetable found
+        if (['completed', 'completed_partial', 'cancelled'].includes(normalized.status)) {
           const result = normalized.result;
           if (result) {
-            if (!result.timetables && result.timetables_raw) {
-              result.timetables = result.timetables_raw;
-            }
-            if (result.parsed_timetables && result.timetables) {
-              result.timetables = result.timetables.map((timetable, index) => {
-                const parsed = result.parsed_timetables[index];
-                return { ...timetable, rows: parsed ? parsed.rows : [] };
-              });
-            }
+            // The status only carries the result summary; fetch every group timetable
+            const groups = await fetchAllTimetableGroups(uploadId);
+            result.timetables = groups.map((group) => ({ ...(group.card || {}), rows: group.rows || [] }));
           }
           // ensure UI reflects completion
           if (progressCallback) {
@@ -7,6 +7,7 @@ module.exports = function(app) {
     '/generate-timetable', 
     '/get-timetable-status',
     '/export-timetable',
+    '/jobs',
     '/api/download-template'
   ];
   